@@ -0,0 +1,66 @@
+"""Store embedding vectors as packed float32 bytes
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+Replaces the JSON embedding columns with binary columns holding packed
+little-endian float32 values (BYTEA on PostgreSQL, BLOB on SQLite).
+
+The existing JSON data is kept in renamed *_json columns so the upgrade
+itself stays fast on large tables. Convert it with:
+
+    python -m scripts.backfill_embeddings --clear-legacy
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_COLUMNS = [
+    ("framework_requirements", "embedding"),
+    ("requirement_clusters", "embedding_centroid"),
+]
+
+
+def upgrade() -> None:
+    for table, column in VECTOR_COLUMNS:
+        op.alter_column(table, column, new_column_name=f"{column}_json")
+        op.add_column(table, sa.Column(column, sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    import numpy as np
+
+    bind = op.get_bind()
+    for table, column in VECTOR_COLUMNS:
+        # Restore JSON for rows that were converted and had their legacy value cleared
+        t = sa.table(
+            table,
+            sa.column("id"),
+            sa.column(column, sa.LargeBinary()),
+            sa.column(f"{column}_json", sa.JSON()),
+        )
+        rows = bind.execute(
+            sa.select(t.c.id, t.c[column]).where(
+                t.c[column].isnot(None), t.c[f"{column}_json"].is_(None)
+            )
+        ).fetchall()
+        for row_id, data in rows:
+            bind.execute(
+                t.update().where(t.c.id == row_id).values(
+                    {f"{column}_json": np.frombuffer(data, dtype="<f4").tolist()}
+                )
+            )
+
+        op.drop_column(table, column)
+        op.alter_column(table, f"{column}_json", new_column_name=column)
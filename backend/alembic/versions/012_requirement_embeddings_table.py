@@ -0,0 +1,138 @@
+"""Move requirement embeddings into a dedicated requirement_embeddings table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+Vectors on framework_requirements were transferred by every list, tree and
+search query even though only the similarity services use them. This moves
+them to requirement_embeddings, keyed by requirement id, model name and
+dimension, and drops the embedding columns from the hot table.
+
+Existing vectors are copied from the binary column, or from the legacy JSON
+column for rows that were not backfilled after migration 011. They are
+attributed to the currently configured embedding model.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _embedding_model() -> str:
+    from app.core.config import settings
+    return settings.embedding_model
+
+
+def upgrade() -> None:
+    embeddings = op.create_table(
+        "requirement_embeddings",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "requirement_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("framework_requirements.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("dimensions", sa.Integer, nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("updated_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("requirement_id", "model", "dimensions"),
+    )
+    op.create_index(
+        "ix_requirement_embeddings_requirement_id",
+        "requirement_embeddings",
+        ["requirement_id"],
+    )
+
+    # Copy existing vectors, keyset-paginated so large tables stay in bounded memory
+    bind = op.get_bind()
+    requirements = sa.table(
+        "framework_requirements",
+        sa.column("id", postgresql.UUID(as_uuid=True)),
+        sa.column("embedding", sa.LargeBinary()),
+        sa.column("embedding_json", sa.JSON()),
+    )
+    model = _embedding_model()
+    now = datetime.utcnow()
+    last_id = None
+
+    while True:
+        query = (
+            sa.select(requirements.c.id, requirements.c.embedding, requirements.c.embedding_json)
+            .where(
+                sa.or_(
+                    requirements.c.embedding.isnot(None),
+                    requirements.c.embedding_json.isnot(None),
+                )
+            )
+            .order_by(requirements.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(requirements.c.id > last_id)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+
+        batch = []
+        for req_id, packed, legacy in rows:
+            if packed is None:
+                packed = np.asarray(legacy, dtype="<f4").tobytes()
+            packed = bytes(packed)
+            batch.append({
+                "id": uuid.uuid4(),
+                "requirement_id": req_id,
+                "model": model,
+                "dimensions": len(packed) // 4,
+                "vector": packed,
+                "created_at": now,
+                "updated_at": now,
+            })
+        op.bulk_insert(embeddings, batch)
+        last_id = rows[-1][0]
+
+    op.drop_column("framework_requirements", "embedding")
+    op.drop_column("framework_requirements", "embedding_json")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "framework_requirements",
+        sa.Column("embedding_json", postgresql.JSONB, nullable=True),
+    )
+    op.add_column(
+        "framework_requirements",
+        sa.Column("embedding", sa.LargeBinary(), nullable=True),
+    )
+
+    # Restore vectors for the configured model onto the requirement rows
+    op.execute(
+        sa.text(
+            "UPDATE framework_requirements SET embedding = ("
+            " SELECT e.vector FROM requirement_embeddings e"
+            " WHERE e.requirement_id = framework_requirements.id AND e.model = :model"
+            " LIMIT 1)"
+        ).bindparams(model=_embedding_model())
+    )
+
+    op.drop_index(
+        "ix_requirement_embeddings_requirement_id",
+        table_name="requirement_embeddings",
+    )
+    op.drop_table("requirement_embeddings")
@@ -0,0 +1,47 @@
+"""Add content-addressed embedding cache
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+Vectors are keyed by the SHA-256 of the embedded text plus model name and
+dimension, so unchanged or duplicated text is never sent to the provider
+twice. last_used_at is indexed for least-recently-used eviction.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("dimensions", sa.Integer, nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("hit_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("last_used_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("content_hash", "model", "dimensions"),
+    )
+    op.create_index(
+        "ix_embedding_cache_last_used_at",
+        "embedding_cache",
+        ["last_used_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_last_used_at", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
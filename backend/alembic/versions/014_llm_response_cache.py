@@ -0,0 +1,51 @@
+"""Add LLM response cache
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+Responses are keyed by the SHA-256 of (model, temperature, max tokens,
+prompt). created_at is indexed for TTL expiry and last_used_at for
+least-recently-used eviction.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("request_hash", sa.String(64), nullable=False, unique=True),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("response_text", sa.Text, nullable=False),
+        sa.Column("hit_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("last_used_at", sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        "ix_llm_response_cache_created_at",
+        "llm_response_cache",
+        ["created_at"],
+    )
+    op.create_index(
+        "ix_llm_response_cache_last_used_at",
+        "llm_response_cache",
+        ["last_used_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_response_cache_last_used_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_created_at", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
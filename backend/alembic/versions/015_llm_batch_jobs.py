@@ -0,0 +1,52 @@
+"""Add LLM batch jobs
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+
+Mapping and crosswalk runs submitted to a provider batch API. Each row
+keeps the run's work items, the batch in flight and the answers gathered
+so far, so a restarted worker can resume polling and ingest.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_batch_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("provider_batch_id", sa.String(200), nullable=True),
+        sa.Column("round", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("round_model", sa.String(100), nullable=True),
+        sa.Column("params", sa.JSON, nullable=False),
+        sa.Column("items", sa.JSON, nullable=False),
+        sa.Column("requests", sa.JSON, nullable=True),
+        sa.Column("results", sa.JSON, nullable=True),
+        sa.Column("request_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("summary", sa.JSON, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("updated_at", sa.DateTime, nullable=False),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_llm_batch_jobs_status", "llm_batch_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_batch_jobs_status", table_name="llm_batch_jobs")
+    op.drop_table("llm_batch_jobs")
@@ -0,0 +1,49 @@
+"""Add background jobs
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+
+Queue for long-running generation endpoints called with async=true. Workers
+claim rows by status with SKIP LOCKED, so the (status, created_at) index
+serves the claim query.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("params", sa.JSON, nullable=False),
+        sa.Column("progress", sa.JSON, nullable=True),
+        sa.Column("result", sa.JSON, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(200), nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+        sa.Column("updated_at", sa.DateTime, nullable=False),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_jobs_status_created_at", "jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_created_at", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,50 @@
+"""Add indexes for keyset pagination of list endpoints
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-17
+
+Each list endpoint pages by a key ending in the primary key, e.g.
+(created_at, id). An index on the endpoint's filter column followed by that
+key turns every page, however deep, into one index range scan. The mapping
+lists join through controls and policies, so their foreign keys are indexed
+as well.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_controls_assessment_created", "controls", ["assessment_id", "created_at", "id"]),
+    ("ix_policies_assessment_created", "policies", ["assessment_id", "created_at", "id"]),
+    ("ix_control_mappings_control_id", "control_mappings", ["control_id"]),
+    ("ix_control_mappings_created", "control_mappings", ["created_at", "id"]),
+    ("ix_policy_mappings_policy_id", "policy_mappings", ["policy_id"]),
+    ("ix_policy_mappings_created", "policy_mappings", ["created_at", "id"]),
+    ("ix_deviations_assessment_risk", "deviations", ["assessment_id", "risk_score", "id"]),
+    (
+        "ix_framework_requirements_display_order",
+        "framework_requirements",
+        ["framework_id", "display_order", "id"],
+    ),
+    ("ix_requirement_crosswalks_confidence", "requirement_crosswalks", ["confidence_score", "id"]),
+    ("ix_requirement_clusters_created", "requirement_clusters", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
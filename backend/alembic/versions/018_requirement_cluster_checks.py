@@ -0,0 +1,42 @@
+"""Record which requirements clustering runs have considered
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17
+
+Incremental cluster assignment picks up only requirements without a check
+for the cluster type, or whose embedding changed after it, instead of every
+requirement that is not in a cluster.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "requirement_cluster_checks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "requirement_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("framework_requirements.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("cluster_type", sa.String(50), nullable=False),
+        sa.Column("checked_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("requirement_id", "cluster_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("requirement_cluster_checks")
@@ -1,4 +1,10 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.llm_cache import llm_cache
+from app.core.metrics import metrics
+from app.core.request_metrics import update_pool_gauges
+from app.db.session import engine
 
 router = APIRouter()
 
@@ -7,3 +13,16 @@ router = APIRouter()
 def health_check():
     """Check the health of the API."""
     return {"status": "healthy"}
+
+
+@router.get("/health/llm-cache")
+def llm_cache_stats():
+    """Hit-rate counters of the LLM response cache since startup."""
+    return llm_cache.stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Request, database pool and LLM call metrics (Prometheus text format)."""
+    update_pool_gauges(engine.pool)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
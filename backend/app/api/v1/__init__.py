@@ -15,6 +15,8 @@ from app.api.v1.framework import router as framework_router
 from app.api.v1.frameworks import router as frameworks_router
 from app.api.v1.crosswalks import router as crosswalks_router
 from app.api.v1.clusters import router as clusters_router
+from app.api.v1.llm_batches import router as llm_batches_router
+from app.api.v1.jobs import router as jobs_router
 
 api_router = APIRouter()
 
@@ -42,3 +44,7 @@ api_router.include_router(framework_router, prefix="/framework", tags=["framewor
 api_router.include_router(frameworks_router, prefix="/frameworks", tags=["frameworks"])
 api_router.include_router(crosswalks_router, prefix="/crosswalks", tags=["crosswalks"])
 api_router.include_router(clusters_router, prefix="/clusters", tags=["clusters"])
+api_router.include_router(llm_batches_router, prefix="/llm-batches", tags=["llm-batches"])
+
+# Background jobs
+api_router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
@@ -24,7 +24,7 @@ router = APIRouter()
 
 
 @router.post("", response_model=AssessmentResponse, status_code=status.HTTP_201_CREATED)
-async def create_assessment(
+def create_assessment(
     assessment_in: AssessmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -61,7 +61,7 @@ async def create_assessment(
 
 
 @router.get("", response_model=AssessmentListResponse)
-async def list_assessments(
+def list_assessments(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None, alias="status"),
@@ -81,7 +81,7 @@ async def list_assessments(
 
 
 @router.get("/{assessment_id}", response_model=AssessmentResponse)
-async def get_assessment(
+def get_assessment(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -99,7 +99,7 @@ async def get_assessment(
 
 
 @router.patch("/{assessment_id}", response_model=AssessmentResponse)
-async def update_assessment(
+def update_assessment(
     assessment_id: uuid.UUID,
     assessment_in: AssessmentUpdate,
     db: Session = Depends(get_db),
@@ -165,7 +165,7 @@ async def update_assessment(
 
 
 @router.delete("/{assessment_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_assessment(
+def delete_assessment(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -196,7 +196,7 @@ async def delete_assessment(
 
 
 @router.get("/{assessment_id}/transitions")
-async def get_available_transitions(
+def get_available_transitions(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
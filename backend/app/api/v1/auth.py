@@ -20,7 +20,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     data: UserRegister,
     db: Session = Depends(get_db),
 ):
@@ -50,7 +50,7 @@ async def register(
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(
+def login(
     data: UserLogin,
     db: Session = Depends(get_db),
 ):
@@ -78,7 +78,7 @@ async def login(
 
 
 @router.post("/guest", response_model=TokenResponse)
-async def guest_login(
+def guest_login(
     db: Session = Depends(get_db),
 ):
     """
@@ -101,7 +101,7 @@ async def guest_login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(
+def refresh_token(
     data: TokenRefresh,
     db: Session = Depends(get_db),
 ):
@@ -136,7 +136,7 @@ async def refresh_token(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout():
+def logout():
     """
     Logout the current user.
 
@@ -148,7 +148,7 @@ async def logout():
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(require_user),
 ):
     """
@@ -158,7 +158,7 @@ async def get_current_user_info(
 
 
 @router.post("/change-password", status_code=status.HTTP_204_NO_CONTENT)
-async def change_password(
+def change_password(
     data: PasswordChange,
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
@@ -1,16 +1,24 @@
 """API endpoints for requirement clusters and interview optimization."""
 
+import asyncio
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.api.v1.jobs import job_accepted
+from app.db.pagination import paginate
 from app.db.session import get_db
-from app.models.unified_framework import ClusterType
+from app.models.unified_framework import ClusterType, RequirementCluster, RequirementClusterMember
+from app.schemas.common import CursorPage, CursorParams
 from app.services.clustering.clustering_service import ClusteringService
+from app.services.clustering.embedding_pipeline import EmbeddingPipeline
 from app.services.clustering.embedding_service import EmbeddingService
+from app.services.jobs import JobService
+from app.services.jobs.handlers import cluster_summary, embedding_summary
 
 router = APIRouter()
 
@@ -60,13 +68,14 @@ class InterviewReductionResponse(BaseModel):
 
 # Endpoints - specific paths MUST come before parameterized paths
 
-@router.get("", response_model=list[ClusterResponse])
-async def list_clusters(
+@router.get("", response_model=CursorPage[ClusterResponse])
+def list_clusters(
     cluster_type: Optional[str] = None,
     is_active: bool = True,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
 ):
-    """List all requirement clusters."""
+    """List requirement clusters, oldest first."""
     service = ClusteringService(db)
 
     ct = None
@@ -79,27 +88,36 @@ async def list_clusters(
                 detail=f"Invalid cluster type: {cluster_type}",
             )
 
-    clusters = service.list_clusters(
-        cluster_type=ct,
-        is_active=is_active,
+    result = paginate(
+        service.query_clusters(cluster_type=ct, is_active=is_active),
+        (RequirementCluster.created_at, RequirementCluster.id),
+        page,
     )
 
-    return [
+    # One grouped count for the page instead of loading every cluster's members
+    member_counts = dict(
+        db.query(RequirementClusterMember.cluster_id, func.count())
+        .filter(RequirementClusterMember.cluster_id.in_([c.id for c in result.items]))
+        .group_by(RequirementClusterMember.cluster_id)
+        .all()
+    )
+    result.items = [
         ClusterResponse(
             id=str(c.id),
             name=c.name,
             description=c.description,
             cluster_type=c.cluster_type,
-            member_count=len(c.members) if c.members else 0,
+            member_count=member_counts.get(c.id, 0),
             is_active=c.is_active,
             interview_question=c.interview_question,
         )
-        for c in clusters
+        for c in result.items
     ]
+    return result
 
 
 @router.get("/interview-reduction", response_model=InterviewReductionResponse)
-async def estimate_interview_reduction(
+def estimate_interview_reduction(
     framework_ids: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
@@ -115,7 +133,7 @@ async def estimate_interview_reduction(
 
 
 @router.get("/embeddings/stats", response_model=EmbeddingStatsResponse)
-async def get_embedding_stats(
+def get_embedding_stats(
     framework_id: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
@@ -131,7 +149,7 @@ async def get_embedding_stats(
 
     total = query.count()
     with_embeddings = query.filter(
-        FrameworkRequirement.embedding.isnot(None)
+        EmbeddingService(db).has_embedding()
     ).count()
 
     return EmbeddingStatsResponse(
@@ -143,35 +161,74 @@ async def get_embedding_stats(
 
 
 @router.post("/embeddings/generate")
-async def generate_embeddings(
+def generate_embeddings(
     framework_id: Optional[str] = None,
     force: bool = False,
+    pipeline: bool = False,
+    concurrency: Optional[int] = Query(None, ge=1, le=64),
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
 ):
-    """Generate embeddings for requirements."""
+    """Generate embeddings for requirements.
+
+    With ``pipeline=true`` several provider requests run concurrently and
+    each batch is committed as it completes. With ``async=true`` the work is
+    queued as a background job; poll it under /jobs.
+    """
+    if run_async:
+        return job_accepted(JobService(db).enqueue("embeddings.generate", {
+            "framework_id": framework_id,
+            "force": force,
+            "pipeline": pipeline,
+            "concurrency": concurrency,
+        }))
+
     service = EmbeddingService(db)
 
     fid = uuid.UUID(framework_id) if framework_id else None
 
-    stats = service.embed_all_requirements(
-        framework_id=fid,
-        force=force,
-    )
+    if pipeline:
+        # The pipeline gets its own event loop on this worker thread; its
+        # database work would otherwise block the server's loop
+        stats = asyncio.run(EmbeddingPipeline(service, concurrency=concurrency).run(
+            framework_id=fid,
+            force=force,
+        ))
+    else:
+        stats = service.embed_all_requirements(
+            framework_id=fid,
+            force=force,
+        )
+
+    return embedding_summary(stats)
+
+
+@router.post("/index/rebuild")
+def rebuild_similarity_index(
+    nlist: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Rebuild the nearest-neighbour index over requirement embeddings."""
+    service = EmbeddingService(db)
+    index = service.rebuild_index(nlist=nlist)
 
     return {
-        "message": "Embedding generation complete",
-        "processed": stats["processed"],
-        "skipped": stats["skipped"],
-        "failed": stats["failed"],
+        "message": "Similarity index rebuilt",
+        "indexed": len(index),
+        "lists": index.nlist,
     }
 
 
 @router.post("/generate")
-async def generate_clusters(
+def generate_clusters(
     data: ClusterGenerateRequest,
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
 ):
-    """Generate requirement clusters using AI-powered similarity analysis."""
+    """Generate requirement clusters using AI-powered similarity analysis.
+
+    With ``async=true`` the work is queued as a background job; poll it under /jobs.
+    """
     service = ClusteringService(db)
 
     try:
@@ -182,6 +239,9 @@ async def generate_clusters(
             detail=f"Invalid cluster type: {data.cluster_type}. Must be one of: semantic, topic, interview",
         )
 
+    if run_async:
+        return job_accepted(JobService(db).enqueue("clusters.generate", data.model_dump()))
+
     framework_ids = [uuid.UUID(fid) for fid in data.framework_ids] if data.framework_ids else None
 
     clusters = service.generate_clusters(
@@ -191,22 +251,50 @@ async def generate_clusters(
         cluster_type=cluster_type,
     )
 
+    return cluster_summary(clusters)
+
+
+@router.post("/assign")
+def assign_new_requirements(
+    data: ClusterGenerateRequest,
+    db: Session = Depends(get_db),
+):
+    """Add requirements new since the last run to existing clusters without regenerating them.
+
+    Requirements join the nearest existing cluster above the threshold; the
+    rest form new clusters among themselves and similar older unclustered
+    requirements. Existing cluster ids are kept.
+    """
+    service = ClusteringService(db)
+
+    try:
+        cluster_type = ClusterType(data.cluster_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cluster type: {data.cluster_type}. Must be one of: semantic, topic, interview",
+        )
+
+    framework_ids = [uuid.UUID(fid) for fid in data.framework_ids] if data.framework_ids else None
+
+    stats = service.assign_new_requirements(
+        framework_ids=framework_ids,
+        threshold=data.threshold,
+        min_cluster_size=data.min_cluster_size,
+        cluster_type=cluster_type,
+    )
+
     return {
-        "message": f"Generated {len(clusters)} clusters",
-        "total_clusters": len(clusters),
-        "clusters": [
-            {
-                "id": str(c.id),
-                "name": c.name,
-                "member_count": len(c.members) if c.members else 0,
-            }
-            for c in clusters
-        ],
+        "message": (
+            f"Assigned {stats['assigned']} requirements to existing clusters, "
+            f"created {stats['clusters_created']} new clusters"
+        ),
+        **stats,
     }
 
 
 @router.delete("")
-async def delete_clusters(
+def delete_clusters(
     cluster_type: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
@@ -228,7 +316,7 @@ async def delete_clusters(
 
 
 @router.get("/requirement/{requirement_id}/cluster")
-async def get_requirement_cluster(
+def get_requirement_cluster(
     requirement_id: str,
     cluster_type: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -267,7 +355,7 @@ async def get_requirement_cluster(
 
 # Parameterized routes MUST come after specific paths
 @router.get("/{cluster_id}", response_model=ClusterResponse)
-async def get_cluster(
+def get_cluster(
     cluster_id: str,
     db: Session = Depends(get_db),
 ):
@@ -293,7 +381,7 @@ async def get_cluster(
 
 
 @router.get("/{cluster_id}/members", response_model=list[ClusterMemberResponse])
-async def get_cluster_members(
+def get_cluster_members(
     cluster_id: str,
     db: Session = Depends(get_db),
 ):
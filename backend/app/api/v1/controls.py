@@ -5,9 +5,11 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 
+from app.db.pagination import paginate
 from app.db.session import get_db
 from app.models.control import Control
 from app.models.user import User
+from app.schemas.common import CursorPage, CursorParams
 from app.schemas.control import (
     ControlResponse,
     ControlUploadResponse,
@@ -23,7 +25,7 @@ router = APIRouter()
     "/assessments/{assessment_id}/controls/upload",
     response_model=ControlUploadResponse,
 )
-async def upload_controls(
+def upload_controls(
     assessment_id: uuid.UUID,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -41,7 +43,7 @@ async def upload_controls(
         )
 
     # Check file size
-    content = await file.read()
+    content = file.file.read()
     if len(content) > settings.max_upload_size_mb * 1024 * 1024:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,19 +68,20 @@ async def upload_controls(
     )
 
 
-@router.get("/assessments/{assessment_id}/controls", response_model=list[ControlResponse])
-async def list_controls(
+@router.get("/assessments/{assessment_id}/controls", response_model=CursorPage[ControlResponse])
+def list_controls(
     assessment_id: uuid.UUID,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
 ):
-    """List all controls for an assessment."""
-    controls = db.query(Control).filter(Control.assessment_id == assessment_id).all()
-    return controls
+    """List the controls of an assessment, oldest first."""
+    query = db.query(Control).filter(Control.assessment_id == assessment_id)
+    return paginate(query, (Control.created_at, Control.id), page)
 
 
 @router.get("/controls/{control_id}", response_model=ControlResponse)
-async def get_control(
+def get_control(
     control_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -96,7 +99,7 @@ async def get_control(
 
 
 @router.delete("/controls/{control_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_control(
+def delete_control(
     control_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -3,13 +3,20 @@
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Header
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from app.api.v1.jobs import job_accepted
+from app.db.pagination import paginate
 from app.db.session import get_db
-from app.models.unified_framework import MappingType
+from app.models.unified_framework import MappingType, RequirementCrosswalk
+from app.schemas.common import CursorPage, CursorParams
+from app.schemas.llm_batch import LLMBatchJobResponse
+from app.services.batch import LLMBatchService
 from app.services.frameworks.crosswalk_service import CrosswalkService
+from app.services.jobs import JobService
+from app.services.jobs.handlers import crosswalk_summary
 
 router = APIRouter()
 
@@ -22,6 +29,8 @@ class CrosswalkGenerateRequest(BaseModel):
     top_k_per_requirement: int = Field(default=5, ge=1, le=20)
     validate_with_llm: bool = True
     auto_approve_threshold: float = Field(default=0.9, ge=0.0, le=1.0)
+    batch_size: Optional[int] = Field(default=None, ge=1, le=100)
+    concurrency: Optional[int] = Field(default=None, ge=1, le=32)
 
 
 class CrosswalkCreateRequest(BaseModel):
@@ -73,16 +82,17 @@ class BulkCrosswalkResponse(BaseModel):
 
 # Endpoints - specific paths MUST come before parameterized paths
 
-@router.get("", response_model=list[CrosswalkResponse])
-async def list_crosswalks(
+@router.get("", response_model=CursorPage[CrosswalkResponse])
+def list_crosswalks(
     source_framework_id: Optional[str] = None,
     target_framework_id: Optional[str] = None,
     is_approved: Optional[bool] = None,
     mapping_type: Optional[str] = None,
     min_confidence: Optional[float] = None,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
 ):
-    """List cross-framework mappings with optional filters."""
+    """List cross-framework mappings with optional filters, highest confidence first."""
     service = CrosswalkService(db)
 
     mt = None
@@ -95,15 +105,24 @@ async def list_crosswalks(
                 detail=f"Invalid mapping type: {mapping_type}",
             )
 
-    crosswalks = service.list_crosswalks(
+    query = service.query_crosswalks(
         source_framework_id=uuid.UUID(source_framework_id) if source_framework_id else None,
         target_framework_id=uuid.UUID(target_framework_id) if target_framework_id else None,
         is_approved=is_approved,
         mapping_type=mt,
         min_confidence=min_confidence,
+    ).options(
+        selectinload(RequirementCrosswalk.source_requirement),
+        selectinload(RequirementCrosswalk.target_requirement),
+    )
+    result = paginate(
+        query,
+        (RequirementCrosswalk.confidence_score, RequirementCrosswalk.id),
+        page,
+        descending=True,
     )
 
-    return [
+    result.items = [
         CrosswalkResponse(
             id=str(cw.id),
             source_requirement_id=str(cw.source_requirement_id),
@@ -117,12 +136,13 @@ async def list_crosswalks(
             is_approved=cw.is_approved,
             approved_at=cw.approved_at.isoformat() if cw.approved_at else None,
         )
-        for cw in crosswalks
+        for cw in result.items
     ]
+    return result
 
 
 @router.get("/stats", response_model=CrosswalkStatsResponse)
-async def get_crosswalk_stats(
+def get_crosswalk_stats(
     db: Session = Depends(get_db),
 ):
     """Get statistics about crosswalks."""
@@ -132,12 +152,23 @@ async def get_crosswalk_stats(
 
 
 @router.post("/generate")
-async def generate_crosswalks(
+def generate_crosswalks(
     data: CrosswalkGenerateRequest,
+    run_async: bool = Query(False, alias="async"),
     x_user_id: str = Header(None),
     db: Session = Depends(get_db),
 ):
-    """Generate AI-powered cross-framework mappings between two frameworks."""
+    """Generate AI-powered cross-framework mappings between two frameworks.
+
+    With ``async=true`` the work is queued as a background job; poll it under /jobs.
+    """
+    if run_async:
+        return job_accepted(JobService(db).enqueue(
+            "crosswalks.generate",
+            data.model_dump(),
+            user_id=uuid.UUID(x_user_id) if x_user_id else None,
+        ))
+
     service = CrosswalkService(db)
 
     crosswalks = service.generate_crosswalks(
@@ -147,29 +178,39 @@ async def generate_crosswalks(
         top_k_per_requirement=data.top_k_per_requirement,
         validate_with_llm=data.validate_with_llm,
         auto_approve_threshold=data.auto_approve_threshold,
+        batch_size=data.batch_size,
+        concurrency=data.concurrency,
     )
 
-    return {
-        "message": f"Generated {len(crosswalks)} crosswalk mappings",
-        "total_generated": len(crosswalks),
-        "auto_approved": sum(1 for cw in crosswalks if cw.is_approved),
-        "pending_review": sum(1 for cw in crosswalks if not cw.is_approved),
-        "crosswalks": [
-            {
-                "id": str(cw.id),
-                "source_requirement_id": str(cw.source_requirement_id),
-                "target_requirement_id": str(cw.target_requirement_id),
-                "mapping_type": cw.mapping_type,
-                "confidence_score": cw.confidence_score,
-                "is_approved": cw.is_approved,
-            }
-            for cw in crosswalks
-        ],
-    }
+    return crosswalk_summary(crosswalks, service.model_tiers)
+
+
+@router.post(
+    "/generate-batch",
+    response_model=LLMBatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def generate_crosswalks_batch(
+    data: CrosswalkGenerateRequest,
+    x_user_id: str = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Submit crosswalk validation as a provider batch job; poll it under /llm-batches."""
+    job = LLMBatchService(db).create_crosswalk_job(
+        source_framework_id=uuid.UUID(data.source_framework_id),
+        target_framework_id=uuid.UUID(data.target_framework_id),
+        user_id=uuid.UUID(x_user_id) if x_user_id else None,
+        similarity_threshold=data.similarity_threshold,
+        top_k_per_requirement=data.top_k_per_requirement,
+        auto_approve_threshold=data.auto_approve_threshold,
+        batch_size=data.batch_size,
+    )
+
+    return LLMBatchJobResponse.from_job(job)
 
 
 @router.post("", response_model=CrosswalkResponse, status_code=status.HTTP_201_CREATED)
-async def create_crosswalk(
+def create_crosswalk(
     data: CrosswalkCreateRequest,
     x_user_id: str = Header(None),
     db: Session = Depends(get_db),
@@ -211,7 +252,7 @@ async def create_crosswalk(
 
 
 @router.get("/requirement/{requirement_id}/mappings")
-async def get_requirement_crosswalks(
+def get_requirement_crosswalks(
     requirement_id: str,
     as_source: bool = True,
     as_target: bool = True,
@@ -244,7 +285,7 @@ async def get_requirement_crosswalks(
 
 
 @router.get("/requirement/{requirement_id}/equivalents")
-async def get_equivalent_requirements(
+def get_equivalent_requirements(
     requirement_id: str,
     transitive: bool = False,
     db: Session = Depends(get_db),
@@ -269,7 +310,7 @@ async def get_equivalent_requirements(
 
 # Parameterized routes MUST come after specific paths
 @router.get("/{crosswalk_id}", response_model=CrosswalkResponse)
-async def get_crosswalk(
+def get_crosswalk(
     crosswalk_id: str,
     db: Session = Depends(get_db),
 ):
@@ -299,7 +340,7 @@ async def get_crosswalk(
 
 
 @router.post("/{crosswalk_id}/approve")
-async def approve_crosswalk(
+def approve_crosswalk(
     crosswalk_id: str,
     x_user_id: str = Header(...),
     db: Session = Depends(get_db),
@@ -325,7 +366,7 @@ async def approve_crosswalk(
 
 
 @router.delete("/{crosswalk_id}")
-async def reject_crosswalk(
+def reject_crosswalk(
     crosswalk_id: str,
     db: Session = Depends(get_db),
 ):
@@ -343,7 +384,7 @@ async def reject_crosswalk(
 
 
 @router.post("/bulk-approve", response_model=BulkCrosswalkResponse)
-async def bulk_approve_crosswalks(
+def bulk_approve_crosswalks(
     request: BulkCrosswalkRequest,
     x_user_id: str = Header(...),
     db: Session = Depends(get_db),
@@ -399,7 +440,7 @@ async def bulk_approve_crosswalks(
 
 
 @router.post("/bulk-reject", response_model=BulkCrosswalkResponse)
-async def bulk_reject_crosswalks(
+def bulk_reject_crosswalks(
     request: BulkCrosswalkRequest,
     db: Session = Depends(get_db),
 ):
@@ -32,7 +32,7 @@ router = APIRouter()
 
 
 @router.get("/summary", response_model=DashboardSummary)
-async def get_dashboard_summary(
+def get_dashboard_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
 ):
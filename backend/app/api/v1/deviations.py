@@ -4,12 +4,16 @@ import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.responses import FastJSONResponse
+from app.db.pagination import paginate
 from app.db.session import get_db
 from app.models.deviation import Deviation
 from app.models.user import User
 from app.models.framework import CSFSubcategory
+from app.schemas.common import CursorParams
 from app.schemas.deviation import DeviationResponse, DeviationListResponse, RiskSummaryResponse
 from app.dependencies.auth import get_current_user, require_user
 from app.services.deviation.detector import DeviationDetector
@@ -18,7 +22,7 @@ router = APIRouter()
 
 
 @router.post("/assessments/{assessment_id}/deviations/detect")
-async def detect_deviations(
+def detect_deviations(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -37,33 +41,50 @@ async def detect_deviations(
 
 
 @router.get("/assessments/{assessment_id}/deviations")
-async def get_deviations(
+def get_deviations(
     assessment_id: uuid.UUID,
     severity: Optional[str] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
 ):
-    """Get all deviations for an assessment with optional filters."""
+    """Get deviations for an assessment with optional filters, highest risk first.
+
+    The counts cover every matching deviation, not just the page.
+    """
     detector = DeviationDetector(db)
-    deviations = detector.get_deviations(
+    query = detector.query_deviations(
         assessment_id=assessment_id,
         severity=severity,
         status=status_filter,
     )
+    result = paginate(query, (Deviation.risk_score, Deviation.id), page, descending=True)
 
-    items = []
     severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
     status_counts = {}
+    counts = (
+        query.with_entities(Deviation.severity, Deviation.status, func.count())
+        .group_by(Deviation.severity, Deviation.status)
+        .all()
+    )
+    for dev_severity, dev_status, count in counts:
+        severity_counts[dev_severity] = severity_counts.get(dev_severity, 0) + count
+        status_counts[dev_status] = status_counts.get(dev_status, 0) + count
+
+    subcategory_codes = dict(
+        db.query(CSFSubcategory.id, CSFSubcategory.code)
+        .filter(CSFSubcategory.id.in_({dev.subcategory_id for dev in result.items}))
+        .all()
+    )
 
-    for dev in deviations:
-        subcat = db.query(CSFSubcategory).filter(CSFSubcategory.id == dev.subcategory_id).first()
-
+    items = []
+    for dev in result.items:
         items.append({
             "id": dev.id,
             "assessment_id": dev.assessment_id,
             "subcategory_id": dev.subcategory_id,
-            "subcategory_code": subcat.code if subcat else None,
+            "subcategory_code": subcategory_codes.get(dev.subcategory_id),
             "deviation_type": dev.deviation_type,
             "severity": dev.severity,
             "status": dev.status,
@@ -79,19 +100,18 @@ async def get_deviations(
             "updated_at": dev.updated_at,
         })
 
-        severity_counts[dev.severity] = severity_counts.get(dev.severity, 0) + 1
-        status_counts[dev.status] = status_counts.get(dev.status, 0) + 1
-
-    return {
+    return FastJSONResponse({
         "items": items,
-        "total": len(items),
+        "next_cursor": result.next_cursor,
+        "total_estimate": result.total_estimate,
+        "total": sum(status_counts.values()),
         "by_severity": severity_counts,
         "by_status": status_counts,
-    }
+    })
 
 
 @router.get("/assessments/{assessment_id}/risk-summary", response_model=RiskSummaryResponse)
-async def get_risk_summary(
+def get_risk_summary(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -102,7 +122,7 @@ async def get_risk_summary(
 
 
 @router.patch("/deviations/{deviation_id}")
-async def update_deviation(
+def update_deviation(
     deviation_id: uuid.UUID,
     status_update: Optional[str] = None,
     remediation_notes: Optional[str] = None,
@@ -12,7 +12,7 @@ router = APIRouter()
 
 
 @router.get("/functions", response_model=list[CSFFunctionResponse])
-async def get_functions(
+def get_functions(
     include_categories: bool = False,
     db: Session = Depends(get_db),
 ):
@@ -29,7 +29,7 @@ async def get_functions(
 
 
 @router.get("/functions/{function_code}")
-async def get_function(
+def get_function(
     function_code: str,
     include_categories: bool = True,
     db: Session = Depends(get_db),
@@ -76,7 +76,7 @@ async def get_function(
 
 
 @router.get("/categories")
-async def get_categories(
+def get_categories(
     function_code: str | None = None,
     db: Session = Depends(get_db),
 ):
@@ -101,7 +101,7 @@ async def get_categories(
 
 
 @router.get("/subcategories")
-async def get_subcategories(
+def get_subcategories(
     category_code: str | None = None,
     function_code: str | None = None,
     db: Session = Depends(get_db),
@@ -136,7 +136,7 @@ async def get_subcategories(
 
 
 @router.get("/summary", response_model=FrameworkSummary)
-async def get_framework_summary(
+def get_framework_summary(
     db: Session = Depends(get_db),
 ):
     """Get a summary of the CSF framework."""
@@ -152,7 +152,7 @@ async def get_framework_summary(
 
 
 @router.post("/seed")
-async def seed_framework(
+def seed_framework(
     db: Session = Depends(get_db),
 ):
     """Seed the framework with NIST CSF 2.0 data and interview questions."""
@@ -7,8 +7,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.responses import stream_json_array
+from app.db.pagination import paginate
 from app.db.session import get_db
-from app.models.unified_framework import Framework, FrameworkType
+from app.models.unified_framework import Framework, FrameworkRequirement, FrameworkType
+from app.schemas.common import CursorPage, CursorParams
 from app.services.frameworks.framework_service import FrameworkService
 from app.services.frameworks.requirement_service import RequirementService
 from app.services.frameworks.loaders.document_loader import DocumentFrameworkLoader
@@ -84,7 +87,7 @@ class FrameworkUploadConfirm(BaseModel):
 
 # Endpoints
 @router.get("", response_model=list[FrameworkResponse])
-async def list_frameworks(
+def list_frameworks(
     is_active: Optional[bool] = True,
     framework_type: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -114,7 +117,7 @@ async def list_frameworks(
 
 
 @router.get("/{framework_id}", response_model=FrameworkResponse)
-async def get_framework(
+def get_framework(
     framework_id: str,
     db: Session = Depends(get_db),
 ):
@@ -144,7 +147,7 @@ async def get_framework(
 
 
 @router.post("", response_model=FrameworkResponse, status_code=status.HTTP_201_CREATED)
-async def create_framework(
+def create_framework(
     data: FrameworkCreate,
     db: Session = Depends(get_db),
 ):
@@ -185,7 +188,7 @@ async def create_framework(
 
 
 @router.patch("/{framework_id}", response_model=FrameworkResponse)
-async def update_framework(
+def update_framework(
     framework_id: str,
     data: FrameworkUpdate,
     db: Session = Depends(get_db),
@@ -222,7 +225,7 @@ async def update_framework(
 
 
 @router.delete("/{framework_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_framework(
+def delete_framework(
     framework_id: str,
     db: Session = Depends(get_db),
 ):
@@ -246,7 +249,7 @@ async def delete_framework(
 
 
 @router.get("/{framework_id}/stats", response_model=FrameworkStatsResponse)
-async def get_framework_stats(
+def get_framework_stats(
     framework_id: str,
     db: Session = Depends(get_db),
 ):
@@ -263,25 +266,29 @@ async def get_framework_stats(
     return FrameworkStatsResponse(**stats)
 
 
-@router.get("/{framework_id}/requirements")
-async def get_framework_requirements(
+@router.get("/{framework_id}/requirements", response_model=CursorPage[dict[str, Any]])
+def get_framework_requirements(
     framework_id: str,
     parent_id: Optional[str] = None,
     level: Optional[int] = None,
     is_assessable: Optional[bool] = None,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
 ):
-    """Get requirements for a framework with optional filters."""
+    """Get requirements for a framework with optional filters, in display order."""
     req_service = RequirementService(db)
 
-    requirements = req_service.list_requirements(
+    query = req_service.query_requirements(
         framework_id=uuid.UUID(framework_id),
         parent_id=uuid.UUID(parent_id) if parent_id else None,
         level=level,
         is_assessable=is_assessable,
     )
+    result = paginate(
+        query, (FrameworkRequirement.display_order, FrameworkRequirement.id), page
+    )
 
-    return [
+    result.items = [
         {
             "id": str(req.id),
             "code": req.code,
@@ -293,27 +300,32 @@ async def get_framework_requirements(
             "parent_id": str(req.parent_id) if req.parent_id else None,
             "display_order": req.display_order,
         }
-        for req in requirements
+        for req in result.items
     ]
+    return result
 
 
 @router.get("/{framework_id}/hierarchy")
-async def get_framework_hierarchy(
+def get_framework_hierarchy(
     framework_id: str,
     max_depth: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
-    """Get the full requirement hierarchy as a nested tree."""
+    """Get the full requirement hierarchy as a nested tree.
+
+    Large frameworks produce megabytes of JSON, so the root nodes are sent
+    in chunks as they are encoded.
+    """
     req_service = RequirementService(db)
     tree = req_service.get_hierarchy_tree(
         framework_id=uuid.UUID(framework_id),
         max_depth=max_depth,
     )
-    return tree
+    return stream_json_array(tree)
 
 
 @router.post("/load-builtin")
-async def load_builtin_frameworks(
+def load_builtin_frameworks(
     framework_type: Optional[str] = Query(
         None,
         description="Specific framework type to load (nist_csf, iso_27001, soc2_tsc). Load all if not specified.",
@@ -350,7 +362,7 @@ async def load_builtin_frameworks(
 
 # Document upload endpoints
 @router.post("/upload/preview")
-async def upload_framework_preview(
+def upload_framework_preview(
     file: UploadFile = File(...),
     column_mapping: Optional[str] = Form(None),
 ):
@@ -374,7 +386,7 @@ async def upload_framework_preview(
             detail=f"Unsupported file type: .{ext}. Allowed: {', '.join('.' + e for e in sorted(allowed))}",
         )
 
-    content = await file.read()
+    content = file.file.read()
 
     if len(content) > 10 * 1024 * 1024:  # 10MB
         raise HTTPException(status_code=400, detail="File too large (max 10MB)")
@@ -402,7 +414,7 @@ async def upload_framework_preview(
             }
         else:
             # Parse document with AI
-            requirements = await DocumentFrameworkLoader.parse_document_with_ai(
+            requirements = DocumentFrameworkLoader.parse_document_with_ai(
                 content, file.filename
             )
             return {
@@ -422,7 +434,7 @@ async def upload_framework_preview(
 
 
 @router.post("/upload/confirm", response_model=FrameworkResponse, status_code=status.HTTP_201_CREATED)
-async def upload_framework_confirm(
+def upload_framework_confirm(
     data: FrameworkUploadConfirm,
     db: Session = Depends(get_db),
 ):
@@ -470,7 +482,7 @@ async def upload_framework_confirm(
 
 # Company framework selection endpoints
 @router.get("/companies/{organization_name}/frameworks")
-async def get_company_frameworks(
+def get_company_frameworks(
     organization_name: str,
     is_active: Optional[bool] = True,
     db: Session = Depends(get_db),
@@ -497,7 +509,7 @@ async def get_company_frameworks(
 
 
 @router.post("/companies/{organization_name}/frameworks")
-async def add_company_framework(
+def add_company_framework(
     organization_name: str,
     data: CompanyFrameworkCreate,
     db: Session = Depends(get_db),
@@ -520,7 +532,7 @@ async def add_company_framework(
 
 
 @router.delete("/companies/{organization_name}/frameworks/{framework_id}")
-async def remove_company_framework(
+def remove_company_framework(
     organization_name: str,
     framework_id: str,
     db: Session = Depends(get_db),
@@ -543,7 +555,7 @@ async def remove_company_framework(
 
 # Assessment scope endpoints
 @router.get("/assessments/{assessment_id}/scope")
-async def get_assessment_scope(
+def get_assessment_scope(
     assessment_id: str,
     db: Session = Depends(get_db),
 ):
@@ -565,7 +577,7 @@ async def get_assessment_scope(
 
 
 @router.post("/assessments/{assessment_id}/scope")
-async def set_assessment_scope(
+def set_assessment_scope(
     assessment_id: str,
     data: AssessmentScopeCreate,
     db: Session = Depends(get_db),
@@ -588,7 +600,7 @@ async def set_assessment_scope(
 
 
 @router.delete("/assessments/{assessment_id}/scope/{framework_id}")
-async def remove_assessment_scope(
+def remove_assessment_scope(
     assessment_id: str,
     framework_id: str,
     db: Session = Depends(get_db),
@@ -26,7 +26,7 @@ router = APIRouter()
     response_model=InterviewSessionResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_interview_session(
+def create_interview_session(
     assessment_id: uuid.UUID,
     session_in: InterviewSessionCreate,
     db: Session = Depends(get_db),
@@ -47,7 +47,7 @@ async def create_interview_session(
 
 
 @router.get("/{session_id}", response_model=InterviewSessionResponse)
-async def get_interview_session(
+def get_interview_session(
     session_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -65,7 +65,7 @@ async def get_interview_session(
 
 
 @router.get("/{session_id}/next-question")
-async def get_next_question(
+def get_next_question(
     session_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -84,7 +84,7 @@ async def get_next_question(
 
 
 @router.post("/{session_id}/responses")
-async def submit_response(
+def submit_response(
     session_id: uuid.UUID,
     response_in: InterviewResponseCreate,
     db: Session = Depends(get_db),
@@ -113,7 +113,7 @@ async def submit_response(
 
 
 @router.get("/assessments/{assessment_id}/sessions", response_model=list[InterviewSessionResponse])
-async def list_assessment_sessions(
+def list_assessment_sessions(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -130,7 +130,7 @@ async def list_assessment_sessions(
 
 
 @router.get("/assessments/{assessment_id}/progress")
-async def get_assessment_interview_progress(
+def get_assessment_interview_progress(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -159,7 +159,7 @@ async def get_assessment_interview_progress(
 
 
 @router.post("/{session_id}/pause")
-async def pause_interview(
+def pause_interview(
     session_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -178,7 +178,7 @@ async def pause_interview(
 
 
 @router.post("/{session_id}/resume")
-async def resume_interview(
+def resume_interview(
     session_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
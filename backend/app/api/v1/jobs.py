@@ -0,0 +1,43 @@
+"""Background job endpoints."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.job import JobResponse
+from app.dependencies.auth import get_current_user
+from app.services.jobs import JobService
+
+router = APIRouter()
+
+
+def job_accepted(job: Job) -> JSONResponse:
+    """202 response for an endpoint called with async=true: the queued job and where to poll it."""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(JobResponse.model_validate(job)),
+        headers={"Location": f"{settings.api_v1_prefix}/jobs/{job.id}"},
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user),
+):
+    """Get a background job's status, progress and, once finished, result."""
+    job = JobService(db).get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return JobResponse.model_validate(job)
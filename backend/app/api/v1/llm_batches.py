@@ -0,0 +1,46 @@
+"""Provider batch job endpoints."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.llm_batch import LLMBatchJobResponse
+from app.dependencies.auth import get_current_user, require_user
+from app.services.batch import LLMBatchService
+
+router = APIRouter()
+
+
+def _get_job_or_404(service: LLMBatchService, job_id: uuid.UUID):
+    job = service.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch job not found",
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=LLMBatchJobResponse)
+def get_batch_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user),
+):
+    """Get a batch job's progress."""
+    return LLMBatchJobResponse.from_job(_get_job_or_404(LLMBatchService(db), job_id))
+
+
+@router.post("/{job_id}/advance", response_model=LLMBatchJobResponse)
+def advance_batch_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_user),
+):
+    """Poll the provider and move the job on: submit the next round or ingest."""
+    service = LLMBatchService(db)
+    job = service.advance(_get_job_or_404(service, job_id))
+    return LLMBatchJobResponse.from_job(job)
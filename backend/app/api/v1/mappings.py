@@ -3,10 +3,13 @@
 import uuid
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.session import get_db
+from app.api.v1.jobs import job_accepted
+from app.core.streaming import event_stream
+from app.db.pagination import paginate
+from app.db.session import get_db, get_session_factory
 from app.models.control import ControlMapping
 from app.models.policy import PolicyMapping
 from app.models.user import User
@@ -18,9 +21,13 @@ from app.schemas.mapping import (
     BulkMappingRequest,
     BulkMappingResponse,
 )
+from app.schemas.common import CursorPage, CursorParams
+from app.schemas.llm_batch import MappingBatchRequest, LLMBatchJobResponse
 from app.schemas.control import ControlMappingResponse
 from app.schemas.policy import PolicyMappingResponse
 from app.dependencies.auth import get_current_user, require_user
+from app.services.batch import LLMBatchService
+from app.services.jobs import JobService
 from app.services.mapping.ai_mapper import AIMappingService
 from app.services.mapping.gap_detector import GapDetectionService
 
@@ -31,13 +38,25 @@ router = APIRouter()
     "/assessments/{assessment_id}/generate",
     response_model=MappingGenerateResponse,
 )
-async def generate_mappings(
+def generate_mappings(
     assessment_id: uuid.UUID,
     request: MappingGenerateRequest,
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
 ):
-    """Generate AI-powered mapping suggestions for an assessment."""
+    """Generate AI-powered mapping suggestions for an assessment.
+
+    With ``async=true`` the work is queued as a background job; poll it under
+    /jobs, whose progress counts mapped entities.
+    """
+    if run_async:
+        return job_accepted(JobService(db).enqueue(
+            "mappings.generate",
+            {"assessment_id": assessment_id, "user_id": current_user.id, **request.model_dump()},
+            user_id=current_user.id,
+        ))
+
     mapper = AIMappingService(db)
 
     result = mapper.generate_mappings_for_assessment(
@@ -46,19 +65,84 @@ async def generate_mappings(
         include_policies=request.include_policies,
         include_controls=request.include_controls,
         confidence_threshold=request.confidence_threshold,
+        shortlist_size=request.shortlist_size,
+        concurrency=request.concurrency,
+        batch_size=request.batch_size,
     )
 
     return MappingGenerateResponse(**result)
 
 
-@router.get("/assessments/{assessment_id}/policies")
-async def get_policy_mappings(
+@router.post("/assessments/{assessment_id}/generate-stream")
+def generate_mappings_stream(
+    assessment_id: uuid.UUID,
+    request: MappingGenerateRequest,
+    http_request: Request,
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(require_user),
+):
+    """Generate AI mapping suggestions, streaming each entity's as it is saved.
+
+    Responds with NDJSON, or Server-Sent Events if the client accepts
+    ``text/event-stream``. Events are ``start``, then ``entity`` and
+    ``progress`` per mapped entity, then ``complete`` (or ``error``).
+
+    The stream runs after the request's own session is closed, so it
+    opens a session of its own.
+    """
+    def events():
+        db = session_factory()
+        try:
+            yield from AIMappingService(db).stream_mappings_for_assessment(
+                assessment_id=assessment_id,
+                user_id=current_user.id,
+                include_policies=request.include_policies,
+                include_controls=request.include_controls,
+                confidence_threshold=request.confidence_threshold,
+                shortlist_size=request.shortlist_size,
+                concurrency=request.concurrency,
+                batch_size=request.batch_size,
+            )
+        finally:
+            db.close()
+
+    return event_stream(http_request, events())
+
+
+@router.post(
+    "/assessments/{assessment_id}/generate-batch",
+    response_model=LLMBatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def generate_mappings_batch(
+    assessment_id: uuid.UUID,
+    request: MappingBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_user),
+):
+    """Submit mapping generation as a provider batch job; poll it under /llm-batches."""
+    job = LLMBatchService(db).create_mapping_job(
+        assessment_id=assessment_id,
+        user_id=current_user.id,
+        include_policies=request.include_policies,
+        include_controls=request.include_controls,
+        confidence_threshold=request.confidence_threshold,
+        shortlist_size=request.shortlist_size,
+        batch_size=request.batch_size,
+    )
+
+    return LLMBatchJobResponse.from_job(job)
+
+
+@router.get("/assessments/{assessment_id}/policies", response_model=CursorPage[PolicyMappingResponse])
+def get_policy_mappings(
     assessment_id: uuid.UUID,
     approved_only: bool = False,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
 ):
-    """Get all policy mappings for an assessment."""
+    """Get the policy mappings of an assessment, oldest first."""
     from app.models.policy import Policy
 
     query = (
@@ -70,19 +154,18 @@ async def get_policy_mappings(
     if approved_only:
         query = query.filter(PolicyMapping.is_approved == True)
 
-    mappings = query.all()
+    return paginate(query, (PolicyMapping.created_at, PolicyMapping.id), page)
 
-    return [PolicyMappingResponse.model_validate(m) for m in mappings]
 
-
-@router.get("/assessments/{assessment_id}/controls")
-async def get_control_mappings(
+@router.get("/assessments/{assessment_id}/controls", response_model=CursorPage[ControlMappingResponse])
+def get_control_mappings(
     assessment_id: uuid.UUID,
     approved_only: bool = False,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
 ):
-    """Get all control mappings for an assessment."""
+    """Get the control mappings of an assessment, oldest first."""
     from app.models.control import Control
 
     query = (
@@ -94,13 +177,11 @@ async def get_control_mappings(
     if approved_only:
         query = query.filter(ControlMapping.is_approved == True)
 
-    mappings = query.all()
-
-    return [ControlMappingResponse.model_validate(m) for m in mappings]
+    return paginate(query, (ControlMapping.created_at, ControlMapping.id), page)
 
 
 @router.post("/{mapping_id}/approve")
-async def approve_mapping(
+def approve_mapping(
     mapping_id: uuid.UUID,
     mapping_type: Literal["policy", "control"],
     request: MappingApproveRequest,
@@ -127,7 +208,7 @@ async def approve_mapping(
 
 
 @router.post("/{mapping_id}/reject")
-async def reject_mapping(
+def reject_mapping(
     mapping_id: uuid.UUID,
     mapping_type: Literal["policy", "control"],
     db: Session = Depends(get_db),
@@ -153,7 +234,7 @@ async def reject_mapping(
 
 
 @router.get("/assessments/{assessment_id}/gaps", response_model=GapListResponse)
-async def get_gaps(
+def get_gaps(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -166,7 +247,7 @@ async def get_gaps(
 
 
 @router.post("/bulk-approve", response_model=BulkMappingResponse)
-async def bulk_approve_mappings(
+def bulk_approve_mappings(
     request: BulkMappingRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -243,7 +324,7 @@ async def bulk_approve_mappings(
 
 
 @router.post("/bulk-reject", response_model=BulkMappingResponse)
-async def bulk_reject_mappings(
+def bulk_reject_mappings(
     request: BulkMappingRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
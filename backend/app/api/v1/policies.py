@@ -6,9 +6,11 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
 
+from app.db.pagination import paginate
 from app.db.session import get_db
 from app.models.policy import Policy
 from app.models.user import User
+from app.schemas.common import CursorPage, CursorParams
 from app.schemas.policy import (
     PolicyResponse,
     PolicyUploadResponse,
@@ -24,7 +26,7 @@ router = APIRouter()
     "/assessments/{assessment_id}/policies/upload",
     response_model=PolicyUploadResponse,
 )
-async def upload_policy(
+def upload_policy(
     assessment_id: uuid.UUID,
     file: UploadFile = File(...),
     name: Optional[str] = Form(None),
@@ -46,7 +48,7 @@ async def upload_policy(
         )
 
     # Check file size
-    content = await file.read()
+    content = file.file.read()
     if len(content) > settings.max_upload_size_mb * 1024 * 1024:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,19 +76,20 @@ async def upload_policy(
     )
 
 
-@router.get("/assessments/{assessment_id}/policies", response_model=list[PolicyResponse])
-async def list_policies(
+@router.get("/assessments/{assessment_id}/policies", response_model=CursorPage[PolicyResponse])
+def list_policies(
     assessment_id: uuid.UUID,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
 ):
-    """List all policies for an assessment."""
-    policies = db.query(Policy).filter(Policy.assessment_id == assessment_id).all()
-    return policies
+    """List the policies of an assessment, oldest first."""
+    query = db.query(Policy).filter(Policy.assessment_id == assessment_id)
+    return paginate(query, (Policy.created_at, Policy.id), page)
 
 
 @router.get("/policies/{policy_id}", response_model=PolicyResponse)
-async def get_policy(
+def get_policy(
     policy_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -104,7 +107,7 @@ async def get_policy(
 
 
 @router.delete("/policies/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_policy(
+def delete_policy(
     policy_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -3,14 +3,17 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from app.api.v1.jobs import job_accepted
+from app.core.responses import FastJSONResponse
 from app.db.session import get_db
 from app.models.report import Report
 from app.models.user import User
 from app.schemas.report import ReportResponse
 from app.dependencies.auth import get_current_user, require_user
+from app.services.jobs import JobService
 from app.services.report.generator import ReportGenerator
 from app.services.report.pdf_generator import PDFGenerator
 
@@ -18,12 +21,23 @@ router = APIRouter()
 
 
 @router.post("/assessments/{assessment_id}/generate", response_model=ReportResponse)
-async def generate_report(
+def generate_report(
     assessment_id: uuid.UUID,
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
 ):
-    """Generate a full assessment report."""
+    """Generate a full assessment report.
+
+    With ``async=true`` the work is queued as a background job; poll it under /jobs.
+    """
+    if run_async:
+        return job_accepted(JobService(db).enqueue(
+            "reports.generate",
+            {"assessment_id": assessment_id, "user_id": current_user.id},
+            user_id=current_user.id,
+        ))
+
     generator = ReportGenerator(db)
 
     try:
@@ -40,7 +54,7 @@ async def generate_report(
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
-async def get_report(
+def get_report(
     report_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -59,7 +73,7 @@ async def get_report(
 
 
 @router.get("/{report_id}/download")
-async def download_report(
+def download_report(
     report_id: uuid.UUID,
     format: str = Query("json", description="Output format: json or pdf"),
     db: Session = Depends(get_db),
@@ -82,7 +96,7 @@ async def download_report(
         )
 
     if format == "json":
-        return JSONResponse(
+        return FastJSONResponse(
             content=report.content,
             headers={
                 "Content-Disposition": f'attachment; filename="report_{report_id}.json"',
@@ -118,7 +132,7 @@ async def download_report(
 
 
 @router.get("/{report_id}/preview")
-async def preview_report_html(
+def preview_report_html(
     report_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -154,7 +168,7 @@ async def preview_report_html(
 
 
 @router.get("/assessments/{assessment_id}/list")
-async def list_reports(
+def list_reports(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -170,7 +184,7 @@ async def list_reports(
 
 
 @router.patch("/{report_id}/finalize")
-async def finalize_report(
+def finalize_report(
     report_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
@@ -3,9 +3,10 @@
 import uuid
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.api.v1.jobs import job_accepted
 from app.db.session import get_db
 from app.models.score import SubcategoryScore, CategoryScore, FunctionScore
 from app.models.user import User
@@ -16,18 +17,30 @@ from app.schemas.score import (
     ScoreSummaryResponse,
 )
 from app.dependencies.auth import get_current_user, require_user
+from app.services.jobs import JobService
 from app.services.scoring.scoring_engine import ScoringEngine
 
 router = APIRouter()
 
 
 @router.post("/assessments/{assessment_id}/calculate")
-async def calculate_scores(
+def calculate_scores(
     assessment_id: uuid.UUID,
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_user),
 ):
-    """Calculate all scores for an assessment."""
+    """Calculate all scores for an assessment.
+
+    With ``async=true`` the work is queued as a background job; poll it under /jobs.
+    """
+    if run_async:
+        return job_accepted(JobService(db).enqueue(
+            "scores.calculate",
+            {"assessment_id": assessment_id, "user_id": current_user.id},
+            user_id=current_user.id,
+        ))
+
     scoring_engine = ScoringEngine(db)
 
     result = scoring_engine.calculate_all_scores(
@@ -39,7 +52,7 @@ async def calculate_scores(
 
 
 @router.get("/assessments/{assessment_id}/summary")
-async def get_score_summary(
+def get_score_summary(
     assessment_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
@@ -50,7 +63,7 @@ async def get_score_summary(
 
 
 @router.get("/assessments/{assessment_id}/{level}")
-async def get_scores_by_level(
+def get_scores_by_level(
     assessment_id: uuid.UUID,
     level: Literal["subcategories", "categories", "functions"],
     db: Session = Depends(get_db),
@@ -123,7 +136,7 @@ async def get_scores_by_level(
 
 
 @router.get("/{score_id}/explanation")
-async def get_score_explanation(
+def get_score_explanation(
     score_id: uuid.UUID,
     score_type: Literal["subcategory", "category", "function"],
     db: Session = Depends(get_db),
@@ -21,7 +21,7 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserProfileResponse)
-async def get_current_user_profile(
+def get_current_user_profile(
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -32,7 +32,7 @@ async def get_current_user_profile(
 
 
 @router.patch("/me", response_model=UserProfileResponse)
-async def update_current_user_profile(
+def update_current_user_profile(
     data: UserUpdate,
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
@@ -79,7 +79,7 @@ async def update_current_user_profile(
 
 
 @router.get("/me/preferences", response_model=UserPreferencesResponse)
-async def get_current_user_preferences(
+def get_current_user_preferences(
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -107,7 +107,7 @@ async def get_current_user_preferences(
 
 
 @router.patch("/me/preferences", response_model=UserPreferencesResponse)
-async def update_current_user_preferences(
+def update_current_user_preferences(
     data: UserPreferencesUpdate,
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
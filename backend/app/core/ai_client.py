@@ -1,38 +1,288 @@
 """AI client for interacting with Anthropic Claude API."""
 
 import json
-from typing import Any
+import logging
+import threading
+from typing import Any, Callable, Iterable, Optional, Sequence
 
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
+from app.core.ai_governor import (
+    INTERACTIVE,
+    PRIORITIES,
+    AIGovernor,
+    AIUnavailableError,
+    call_priority,
+    current_priority,
+    is_transient,
+)
 from app.core.config import settings
+from app.core.llm_cache import llm_cache, request_hash
+from app.core.llm_metrics import (
+    current_stage,
+    observe_call,
+    record_parse_failure,
+    record_rate_limit_wait,
+    record_retry,
+)
+from app.core.metrics import metrics
+from app.core.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Model tiers recorded on routed results
+FAST_TIER = "fast"
+STRONG_TIER = "strong"
+
+ROUTED_ITEMS = metrics.counter(
+    "llm_routed_items_total",
+    "Routed mapping and crosswalk items by the model tier that answered.",
+    ["tier"],
+)
 
 
 class AIClient:
-    """Client for Anthropic Claude API."""
+    """Client for Anthropic Claude API.
+
+    Safe to share between threads: every request goes through one
+    ``RateLimiter``, so concurrent callers together stay under
+    ``settings.ai_requests_per_minute``.
+
+    When ``settings.ai_fast_model`` is set, mapping and crosswalk prompts
+    are routed: the fast model answers first, and only results it could not
+    parse or scored inside the ambiguous confidence band are asked again of
+    ``settings.ai_model``.
+
+    Requests are admitted by an ``AIGovernor`` (adaptive concurrency limit,
+    circuit breaker, caller priority); the rate limiter serves waiting
+    callers in the same priority order. Transient failures are retried here,
+    after the slot is released, rather than by the SDK or by each caller.
+    """
 
     def __init__(self):
         self._client = None
+        self._client_lock = threading.Lock()
+        self.rate_limiter = RateLimiter(settings.ai_requests_per_minute)
+        self.governor = AIGovernor.from_settings()
+        self.tier_counts = {FAST_TIER: 0, STRONG_TIER: 0, "escalated": 0}
+        self._stats_lock = threading.Lock()
 
     @property
     def client(self):
         """Lazy initialization of Anthropic client."""
         if self._client is None:
-            if not settings.anthropic_api_key:
-                raise ValueError("ANTHROPIC_API_KEY not configured")
-            from anthropic import Anthropic
-            self._client = Anthropic(api_key=settings.anthropic_api_key)
+            with self._client_lock:
+                if self._client is None:
+                    if not settings.anthropic_api_key:
+                        raise ValueError("ANTHROPIC_API_KEY not configured")
+                    from anthropic import Anthropic
+                    # Retries happen in _send, outside the governor's slot
+                    self._client = Anthropic(
+                        api_key=settings.anthropic_api_key,
+                        base_url=settings.anthropic_base_url,
+                        max_retries=0,
+                    )
         return self._client
 
+    def complete_json(
+        self,
+        prompt: str,
+        model: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> Any:
+        """Send a single-turn prompt and decode the JSON in the reply.
+
+        Replies are served from the LLM response cache when the same request
+        was answered before, and identical requests in flight at the same
+        time share one API call. Only replies that decode are cached.
+
+        Args:
+            prompt: User message
+            model: Model name (default settings.ai_model)
+            max_tokens: Response token limit (default settings.ai_max_tokens)
+            temperature: Sampling temperature (default settings.ai_temperature)
+
+        Returns:
+            Decoded JSON value
+
+        Raises:
+            json.JSONDecodeError: If the reply is not valid JSON
+            IndexError: If the reply has no content
+            AIUnavailableError: If the governor refused the call
+        """
+        model = model or settings.ai_model
+        max_tokens = max_tokens or settings.ai_max_tokens
+        if temperature is None:
+            temperature = settings.ai_temperature
+
+        def request() -> str:
+            response = self._send(prompt, model, max_tokens, temperature)
+            try:
+                text = response.content[0].text
+                self.parse_json(text)  # Raise before caching an unusable reply
+            except (json.JSONDecodeError, IndexError):
+                record_parse_failure()
+                raise
+            return text
+
+        if settings.llm_cache_enabled:
+            text = llm_cache.get_or_compute(
+                request_hash(model, temperature, max_tokens, prompt), model, request
+            )
+        else:
+            text = request()
+        return self.parse_json(text)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(is_transient),
+        before_sleep=record_retry,
+        reraise=True,
     )
+    def _send(self, prompt: str, model: str, max_tokens: int, temperature: float) -> Any:
+        """One Messages API request, made inside a governor slot.
+
+        The rate-limit token is taken before the slot, so callers waiting
+        for tokens do not hold slots that higher-priority callers need.
+        """
+        priority = current_priority()
+        record_rate_limit_wait(self.rate_limiter.acquire(PRIORITIES.index(priority)))
+        with self.governor.slot(priority):
+            return observe_call("anthropic", model, lambda: self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+            ))
+
+    @property
+    def routing_enabled(self) -> bool:
+        return bool(settings.ai_fast_model) and settings.ai_fast_model != settings.ai_model
+
+    @staticmethod
+    def is_ambiguous(confidence: Any) -> bool:
+        """Whether a confidence is too uncertain to accept from the fast model."""
+        if not isinstance(confidence, (int, float)):
+            return True
+        return (
+            settings.ai_escalation_min_confidence
+            <= confidence
+            < settings.ai_escalation_max_confidence
+        )
+
+    def route(
+        self,
+        items: Sequence[Any],
+        ask: Callable[[Sequence[Any], str], list[Optional[Any]]],
+        confidences: Callable[[Any], Iterable[Any]],
+    ) -> list[tuple[Optional[Any], str]]:
+        """Answer items with the fast model, escalating uncertain ones to the strong model.
+
+        Args:
+            items: Work items, e.g. prompts or the entities of a batched prompt
+            ask: Sends ``items`` to ``model`` and returns one result per item;
+                None where the reply was missing or could not be parsed
+            confidences: Confidence scores found in one item's result
+
+        Returns:
+            (result, tier) per item, in item order. The result is None where
+            the strong model could not answer either.
+        """
+        if not self.routing_enabled:
+            results = [(result, STRONG_TIER) for result in ask(items, settings.ai_model)]
+            self._record_tiers(strong=len(results))
+            return results
+
+        try:
+            fast = ask(items, settings.ai_fast_model)
+        except AIUnavailableError:
+            raise
+        except Exception as e:
+            # The strong model's answer (or error) stands in for a failed fast call
+            logger.warning(
+                "Fast model error in stage %s, escalating: %s", current_stage(), e
+            )
+            fast = [None] * len(items)
+        results = [(result, FAST_TIER) for result in fast]
+        escalate = [
+            i for i, (result, _) in enumerate(results)
+            if result is None or any(self.is_ambiguous(c) for c in confidences(result))
+        ]
+        if escalate:
+            strong = ask([items[i] for i in escalate], settings.ai_model)
+            for i, result in zip(escalate, strong):
+                results[i] = (result, STRONG_TIER)
+
+        self._record_tiers(
+            fast=len(results) - len(escalate), strong=len(escalate), escalated=len(escalate)
+        )
+        return results
+
+    def _record_tiers(self, fast: int = 0, strong: int = 0, escalated: int = 0) -> None:
+        with self._stats_lock:
+            self.tier_counts[FAST_TIER] += fast
+            self.tier_counts[STRONG_TIER] += strong
+            self.tier_counts["escalated"] += escalated
+        if fast:
+            ROUTED_ITEMS.inc(fast, tier=FAST_TIER)
+        if strong:
+            ROUTED_ITEMS.inc(strong, tier=STRONG_TIER)
+
+    def routing_stats(self) -> dict[str, int]:
+        """Items answered by each tier since startup, and how many were escalated."""
+        with self._stats_lock:
+            return dict(self.tier_counts)
+
+    def _complete_or_none(self, prompt: str, model: str) -> Any:
+        try:
+            return self.complete_json(prompt, model=model)
+        except (json.JSONDecodeError, IndexError):
+            return None
+
+    @staticmethod
+    def suggestion_confidences(
+        suggestions: list, confidence_threshold: Optional[float] = None
+    ) -> list[Any]:
+        """Confidence scores in a list of mapping suggestions, for routing.
+
+        Scores below ``confidence_threshold`` are left out: those suggestions
+        are dropped by the caller, so their uncertainty is no reason to ask
+        the strong model.
+        """
+        confidences = [s.get("confidence_score") for s in suggestions if isinstance(s, dict)]
+        if confidence_threshold is None:
+            return confidences
+        return [
+            c for c in confidences
+            if not isinstance(c, (int, float)) or c >= confidence_threshold
+        ]
+
+    @staticmethod
+    def _tag_tier(suggestions: list, tier: str) -> list:
+        for suggestion in suggestions:
+            if isinstance(suggestion, dict):
+                suggestion["model_tier"] = tier
+        return suggestions
+
+    @staticmethod
+    def parse_json(text: str) -> Any:
+        """Decode JSON from a reply, allowing a markdown code block around it."""
+        content = text.strip()
+        # Handle potential markdown code blocks
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.startswith("json"):
+                content = content[4:]
+        return json.loads(content)
+
     def generate_mapping_suggestions(
         self,
         entity_text: str,
         entity_type: str,
         subcategories: list[dict[str, str]],
+        confidence_threshold: Optional[float] = None,
     ) -> list[dict[str, Any]]:
         """
         Generate mapping suggestions for a policy or control.
@@ -41,16 +291,79 @@ class AIClient:
             entity_text: The text content of the policy/control
             entity_type: Either "policy" or "control"
             subcategories: List of subcategories with code and description
+            confidence_threshold: Confidence below which the caller drops a
+                suggestion; such suggestions never trigger escalation
 
         Returns:
-            List of suggested mappings with confidence scores
+            List of suggested mappings with confidence scores, each tagged
+            with the "model_tier" that answered
         """
+        prompt = self.mapping_prompt(entity_text, entity_type, subcategories)
+
+        def ask(prompts: Sequence[str], model: str) -> list[Optional[list]]:
+            result = self._complete_or_none(prompts[0], model)
+            return [result if isinstance(result, list) else None]
+
+        [(result, tier)] = self.route(
+            [prompt], ask, lambda result: self.suggestion_confidences(result, confidence_threshold)
+        )
+        return self._tag_tier(result or [], tier)
+
+    def generate_batch_mapping_suggestions(
+        self,
+        entities: list[dict[str, str]],
+        entity_type: str,
+        subcategories: list[dict[str, str]],
+        confidence_threshold: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Generate mapping suggestions for several policies or controls in one prompt.
+
+        Args:
+            entities: Entities with a unique "key" and their "text"
+            entity_type: Either "policy" or "control"
+            subcategories: Subcategories offered to every entity, with code and description
+            confidence_threshold: Confidence below which the caller drops a
+                suggestion; such suggestions never trigger escalation
+
+        Returns:
+            Dictionary mapping entity key to its list of suggested mappings,
+            each tagged with the "model_tier" that answered. Entities neither
+            model answered are missing, so callers must check each entity.
+        """
+        def ask(batch: Sequence[dict[str, str]], model: str) -> list[Optional[list]]:
+            result = self._complete_or_none(
+                self.batch_mapping_prompt(batch, entity_type, subcategories), model
+            )
+            if not isinstance(result, dict):
+                return [None] * len(batch)
+            return [
+                result.get(entity["key"]) if isinstance(result.get(entity["key"]), list) else None
+                for entity in batch
+            ]
+
+        routed = self.route(
+            entities, ask, lambda result: self.suggestion_confidences(result, confidence_threshold)
+        )
+        return {
+            entity["key"]: self._tag_tier(result, tier)
+            for entity, (result, tier) in zip(entities, routed)
+            if result is not None
+        }
+
+    @staticmethod
+    def mapping_prompt(
+        entity_text: str,
+        entity_type: str,
+        subcategories: list[dict[str, str]],
+    ) -> str:
+        """Prompt asking for one policy's or control's mappings (a JSON array)."""
         subcategories_text = "\n".join(
             f"- {sc['code']}: {sc['description']}"
             for sc in subcategories
         )
 
-        prompt = f"""Analyze the following {entity_type} and determine which NIST CSF 2.0 subcategories it maps to.
+        return f"""Analyze the following {entity_type} and determine which NIST CSF 2.0 subcategories it maps to.
 
 {entity_type.upper()} TEXT:
 {entity_text[:4000]}
@@ -67,28 +380,38 @@ Only include mappings with confidence >= 0.3. Return an empty array if no mappin
 
 Respond ONLY with the JSON array, no other text."""
 
-        response = self.client.messages.create(
-            model=settings.ai_model,
-            max_tokens=settings.ai_max_tokens,
-            temperature=settings.ai_temperature,
-            messages=[{"role": "user", "content": prompt}],
+    @staticmethod
+    def batch_mapping_prompt(
+        entities: Sequence[dict[str, str]],
+        entity_type: str,
+        subcategories: list[dict[str, str]],
+    ) -> str:
+        """Prompt asking for several entities' mappings (a JSON object keyed by entity key)."""
+        subcategories_text = "\n".join(
+            f"- {sc['code']}: {sc['description']}"
+            for sc in subcategories
         )
+        entities_text = "\n\n".join(
+            f"### {entity['key']}\n{entity['text'][:2000]}"
+            for entity in entities
+        )
+        return f"""Analyze each of the following {len(entities)} {entity_type}s and determine which NIST CSF 2.0 subcategories each one maps to. Each {entity_type} starts with a line "### <identifier>".
 
-        try:
-            content = response.content[0].text.strip()
-            # Handle potential markdown code blocks
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            return json.loads(content)
-        except (json.JSONDecodeError, IndexError):
-            return []
+{entity_type.upper()}S:
+{entities_text}
+
+AVAILABLE SUBCATEGORIES:
+{subcategories_text}
+
+Respond with a JSON object keyed by {entity_type} identifier, exactly as written after "###". Each value is a JSON array of mappings for that {entity_type}. Each mapping should have:
+- "subcategory_code": The CSF subcategory code (e.g., "GV.OC-01")
+- "confidence_score": A number between 0.0 and 1.0 indicating confidence
+- "reasoning": A brief explanation of why this mapping applies
+
+Only include mappings with confidence >= 0.3. Include every identifier, with an empty array if no mappings apply.
+
+Respond ONLY with the JSON object, no other text."""
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def analyze_interview_response(
         self,
         question: str,
@@ -126,20 +449,10 @@ Analyze and respond with JSON containing:
 
 Respond ONLY with the JSON object, no other text."""
 
-        response = self.client.messages.create(
-            model=settings.ai_model,
-            max_tokens=settings.ai_max_tokens,
-            temperature=settings.ai_temperature,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
         try:
-            content = response.content[0].text.strip()
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            return json.loads(content)
+            # Interview analysis is interactive; it is admitted ahead of bulk runs
+            with call_priority(INTERACTIVE):
+                return self.complete_json(prompt)
         except (json.JSONDecodeError, IndexError):
             return {
                 "maturity_indicators": [],
@@ -0,0 +1,345 @@
+"""Shared admission control for outbound AI calls.
+
+Every Anthropic request takes a slot from one ``AIGovernor`` per client,
+which provides:
+
+- An adaptive concurrency limit (AIMD). The limit halves when the provider
+  answers 429 or 5xx, and grows by one after ``limit`` consecutive
+  successes. A ``retry-after`` pauses every caller, not just the one that
+  was throttled.
+- A circuit breaker. After ``failure_threshold`` consecutive failures, calls
+  fail fast with ``CircuitOpenError`` for ``reset_seconds``. Then a single
+  probe call is let through, and its outcome closes or re-opens the circuit.
+- Priority admission. Waiting callers are admitted highest priority first,
+  so interactive work (interview analysis) overtakes bulk mapping and
+  crosswalk runs. Callers set their priority with ``call_priority``; like
+  the pipeline stage, it follows worker threads of ``run_concurrently``.
+
+State is exported as ``ai_governor_*`` metrics.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Caller priorities, highest first
+INTERACTIVE = "interactive"
+DEFAULT = "default"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, DEFAULT, BULK)
+
+# Circuit states, with their ai_governor_circuit_state values
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_CIRCUIT_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Call outcomes: overload is the provider shedding load (429, 5xx), error a
+# failed connection, client_error anything the provider is not to blame for
+OK = "ok"
+OVERLOAD = "overload"
+ERROR = "error"
+CLIENT_ERROR = "client_error"
+
+# Longest pause a retry-after header can impose on all callers
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+LIMIT = metrics.gauge(
+    "ai_governor_concurrency_limit",
+    "Adaptive limit on AI calls in flight.",
+)
+IN_FLIGHT = metrics.gauge(
+    "ai_governor_in_flight",
+    "AI calls in flight.",
+)
+QUEUED = metrics.gauge(
+    "ai_governor_queued",
+    "Callers waiting for an AI call slot, by priority.",
+    ["priority"],
+)
+CIRCUIT = metrics.gauge(
+    "ai_governor_circuit_state",
+    "AI circuit breaker state: 0 closed, 1 half-open, 2 open.",
+)
+OUTCOMES = metrics.counter(
+    "ai_governor_outcomes_total",
+    "Finished AI calls by outcome (ok, overload, error, client_error).",
+    ["outcome"],
+)
+REJECTED = metrics.counter(
+    "ai_governor_rejected_total",
+    "AI calls refused without reaching the provider, by reason and priority.",
+    ["reason", "priority"],
+)
+QUEUE_WAIT = metrics.histogram(
+    "ai_governor_queue_wait_seconds",
+    "Time callers waited for an AI call slot, by priority.",
+    ["priority"],
+)
+
+_priority: ContextVar[str] = ContextVar("ai_priority", default=DEFAULT)
+
+
+class AIUnavailableError(RuntimeError):
+    """An AI call the governor refused without sending it to the provider."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(AIUnavailableError):
+    """The provider is failing; calls are refused until the circuit resets."""
+
+
+class QueueTimeoutError(AIUnavailableError):
+    """No call slot freed up within the queue timeout."""
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def call_priority(priority: str) -> Iterator[None]:
+    """Admit AI calls made inside the block at ``priority``."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown AI call priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def classify_error(error: BaseException) -> str:
+    """Outcome of a call that raised ``error``."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return OVERLOAD if status == 429 or status >= 500 else CLIENT_ERROR
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return ERROR
+    try:
+        from anthropic import APIConnectionError  # Includes APITimeoutError
+    except ImportError:
+        return CLIENT_ERROR
+    return ERROR if isinstance(error, APIConnectionError) else CLIENT_ERROR
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The ``retry-after`` header of a failed API response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        value = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return min(max(value, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed call is worth retrying (never when the governor refused it)."""
+    if isinstance(error, AIUnavailableError):
+        return False
+    return classify_error(error) in (OVERLOAD, ERROR)
+
+
+class AIGovernor:
+    """Adaptive concurrency limit, circuit breaker and priority queue for AI calls.
+
+    Safe to share between threads. Use ``slot`` around each API request.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        queue_timeout: float = 0.0,
+    ):
+        """
+        Args:
+            initial_limit: Calls in flight allowed at first
+            min_limit: Floor the limit never halves below
+            max_limit: Ceiling the limit never grows above
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: How long the circuit stays open before a probe
+            queue_timeout: Longest wait for a slot in seconds (0 = no limit)
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.state = CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._resume_at = 0.0
+        # Bumped on every decrease, so a burst of 429s from calls sent at the
+        # old limit halves it only once
+        self._epoch = 0
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._publish()
+
+    @classmethod
+    def from_settings(cls) -> "AIGovernor":
+        return cls(
+            initial_limit=settings.ai_concurrency_initial,
+            min_limit=settings.ai_concurrency_min,
+            max_limit=settings.ai_concurrency_max,
+            failure_threshold=settings.ai_circuit_failure_threshold,
+            reset_seconds=settings.ai_circuit_reset_seconds,
+            queue_timeout=settings.ai_queue_timeout_seconds,
+        )
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None) -> Iterator[None]:
+        """Hold a call slot for the block, recording how the call went.
+
+        Args:
+            priority: Admission priority (default: the caller's ``call_priority``)
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            QueueTimeoutError: If no slot freed up within the queue timeout
+        """
+        priority = priority or _priority.get()
+        probe, epoch = self._acquire(priority)
+        try:
+            yield
+        except BaseException as e:
+            self._release(probe, epoch, classify_error(e), retry_after_seconds(e))
+            raise
+        self._release(probe, epoch, OK, None)
+
+    def snapshot(self) -> dict[str, object]:
+        """Current limit, load and circuit state."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": len(self._queue),
+                "circuit": self.state,
+                "consecutive_failures": self._failures,
+            }
+
+    def _acquire(self, priority: str) -> tuple[bool, int]:
+        start = time.monotonic()
+        deadline = start + self.queue_timeout if self.queue_timeout > 0 else None
+        entry = (PRIORITIES.index(priority), next(self._sequence))
+
+        with self._condition:
+            self._check_circuit(priority, start)
+            heapq.heappush(self._queue, entry)
+            QUEUED.inc(priority=priority)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._check_circuit(priority, now)
+                    wait = self._admission_wait(entry, now)
+                    if wait == 0:
+                        break
+                    if deadline is not None:
+                        if now >= deadline:
+                            REJECTED.inc(reason="queue_timeout", priority=priority)
+                            raise QueueTimeoutError(
+                                f"No AI call slot within {self.queue_timeout:g}s"
+                            )
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                QUEUED.dec(priority=priority)
+                # The head of the queue may have changed
+                self._condition.notify_all()
+
+            probe = self.state == HALF_OPEN
+            if probe:
+                self._probing = True
+            self.in_flight += 1
+            epoch = self._epoch
+            self._publish()
+
+        QUEUE_WAIT.observe(time.monotonic() - start, priority=priority)
+        return probe, epoch
+
+    def _check_circuit(self, priority: str, now: float) -> None:
+        """Raise if the circuit refuses calls; move an expired open circuit to half-open."""
+        if self.state == OPEN and now >= self._opened_at + self.reset_seconds:
+            self.state = HALF_OPEN
+            self._publish()
+        if self.state == OPEN:
+            REJECTED.inc(reason="circuit_open", priority=priority)
+            raise CircuitOpenError(
+                "AI provider circuit is open after repeated failures",
+                retry_after=self._opened_at + self.reset_seconds - now,
+            )
+        if self.state == HALF_OPEN and self._probing:
+            REJECTED.inc(reason="circuit_open", priority=priority)
+            raise CircuitOpenError(
+                "AI provider circuit is half-open; a probe call is in flight",
+                retry_after=self.reset_seconds,
+            )
+
+    def _admission_wait(self, entry: tuple[int, int], now: float) -> Optional[float]:
+        """0 if ``entry`` may go now, else seconds to wait (None: until notified)."""
+        if self._queue[0] != entry or self.in_flight >= self.limit:
+            return None
+        if self._resume_at > now:
+            return self._resume_at - now
+        return 0
+
+    def _release(self, probe: bool, epoch: int, outcome: str, retry_after: Optional[float]) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if probe:
+                self._probing = False
+            now = time.monotonic()
+
+            if outcome in (OK, CLIENT_ERROR):
+                # The provider answered, so it is up
+                self._failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                if outcome == OK:
+                    self._successes += 1
+                    if self._successes >= self.limit and self.limit < self.max_limit:
+                        self.limit += 1
+                        self._successes = 0
+            else:
+                self._failures += 1
+                self._successes = 0
+                if outcome == OVERLOAD:
+                    if epoch == self._epoch:
+                        self.limit = max(self.min_limit, self.limit // 2)
+                        self._epoch += 1
+                    if retry_after:
+                        self._resume_at = max(self._resume_at, now + retry_after)
+                if probe or self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                    self.state = OPEN
+                    self._opened_at = now
+
+            OUTCOMES.inc(outcome=outcome)
+            self._publish()
+            self._condition.notify_all()
+
+    def _publish(self) -> None:
+        LIMIT.set(self.limit)
+        IN_FLIGHT.set(self.in_flight)
+        CIRCUIT.set(_CIRCUIT_VALUES[self.state])
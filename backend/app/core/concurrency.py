@@ -0,0 +1,70 @@
+"""Helpers for running blocking API calls concurrently."""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, Sequence
+
+
+def run_concurrently(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    concurrency: int,
+) -> list[Any]:
+    """Apply ``fn`` to each item on a thread pool, returning results in item order.
+
+    ``fn`` runs on worker threads, so it must not use a database session;
+    give it plain data and write results back on the calling thread. Each
+    call sees a copy of the caller's context variables (e.g. the pipeline
+    stage its API calls are attributed to).
+
+    Args:
+        fn: Function making one blocking call
+        items: Arguments for ``fn``
+        concurrency: Maximum calls in flight; 1 runs them sequentially
+
+    Returns:
+        Results in item order
+    """
+    if concurrency <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(lambda item: context.copy().run(fn, item), items))
+
+
+def iter_concurrently(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    concurrency: int,
+) -> Iterator[tuple[int, Any]]:
+    """Like ``run_concurrently``, but yield ``(index, result)`` as each call finishes.
+
+    The caller can act on (and commit) each result while later calls are
+    still in flight. Closing the iterator early cancels the calls that have
+    not started and waits for the running ones.
+
+    Args:
+        fn: Function making one blocking call
+        items: Arguments for ``fn``
+        concurrency: Maximum calls in flight; 1 runs them sequentially
+
+    Yields:
+        Index into ``items`` and its result, in completion order
+    """
+    if concurrency <= 1 or len(items) <= 1:
+        for i, item in enumerate(items):
+            yield i, fn(item)
+        return
+
+    context = contextvars.copy_context()
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(items)))
+    try:
+        futures = {
+            executor.submit(lambda item: context.copy().run(fn, item), item): i
+            for i, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,201 @@
+"""Provider batch APIs for large, latency-tolerant LLM runs.
+
+A batch is a JSONL file of requests, one per line::
+
+    {"custom_id": "r1", "params": {"model": ..., "max_tokens": ...,
+                                   "temperature": ..., "messages": [...]}}
+
+submitted in one call and answered by the provider some time later, at a
+lower price and outside the interactive rate limit. Providers are looked up
+by name so a job written by one process can be polled by another.
+"""
+
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from app.core.config import settings
+
+# Batch states reported by ``BatchProvider.status``
+BATCH_IN_PROGRESS = "in_progress"
+BATCH_ENDED = "ended"
+
+
+@dataclass
+class BatchPrompt:
+    """A prompt of a batch job and the work items its reply answers."""
+
+    prompt: str
+    keys: list[str]
+    max_tokens: int
+    temperature: float
+
+
+def batch_request(custom_id: str, prompt: str, model: str, max_tokens: int, temperature: float) -> dict:
+    """One line of a batch request file: a single-turn prompt."""
+    return {
+        "custom_id": custom_id,
+        "params": {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        },
+    }
+
+
+def write_batch_file(path: Path, requests: Iterable[dict]) -> Path:
+    """Write batch requests as JSONL, replacing any earlier attempt at the same file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def read_batch_file(path: Path) -> list[dict]:
+    with Path(path).open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class BatchProvider(ABC):
+    """Submits batch request files and collects their answers."""
+
+    name = "base"
+
+    @abstractmethod
+    def submit(self, path: Path) -> str:
+        """Submit the requests in a JSONL file and return the provider's batch id."""
+        pass
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """BATCH_IN_PROGRESS or BATCH_ENDED."""
+        pass
+
+    @abstractmethod
+    def results(self, batch_id: str) -> dict[str, Optional[str]]:
+        """Reply text per custom_id of an ended batch; None for failed requests."""
+        pass
+
+
+class AnthropicBatchProvider(BatchProvider):
+    """The Anthropic Message Batches API, through the shared AI client."""
+
+    name = "anthropic"
+
+    def _batches(self):
+        from app.core.ai_client import ai_client
+        return ai_client.client.messages.batches
+
+    def submit(self, path: Path) -> str:
+        return self._batches().create(requests=read_batch_file(path)).id
+
+    def status(self, batch_id: str) -> str:
+        batch = self._batches().retrieve(batch_id)
+        return BATCH_ENDED if batch.processing_status == "ended" else BATCH_IN_PROGRESS
+
+    def results(self, batch_id: str) -> dict[str, Optional[str]]:
+        replies = {}
+        for entry in self._batches().results(batch_id):
+            # Errored, canceled and expired requests have no message
+            if entry.result.type == "succeeded" and entry.result.message.content:
+                replies[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                replies[entry.custom_id] = None
+        return replies
+
+
+class LocalBatchProvider(BatchProvider):
+    """File-based stand-in for a provider batch API.
+
+    Each batch is a directory holding the submitted ``requests.jsonl``; it
+    has ended once a ``results.jsonl`` in the Anthropic results format sits
+    beside it. With a ``responder``, results are written at submit time;
+    without one, something else (a test, or
+    ``scripts/run_llm_batches.py --answer-locally``) has to write them.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        responder: Optional[Callable[[str, str], Optional[str]]] = None,
+    ):
+        """
+        Args:
+            directory: Where batches are kept (default settings.llm_batch_dir)
+            responder: Answers (prompt, model) with reply text, or None to
+                report the request as errored
+        """
+        self.directory = Path(directory or settings.llm_batch_dir) / "local"
+        self.responder = responder
+
+    def _batch_dir(self, batch_id: str) -> Path:
+        return self.directory / batch_id
+
+    def submit(self, path: Path) -> str:
+        batch_id = f"localbatch_{uuid.uuid4().hex}"
+        requests = read_batch_file(path)
+        write_batch_file(self._batch_dir(batch_id) / "requests.jsonl", requests)
+        if self.responder is not None:
+            self.answer(batch_id, self.responder)
+        return batch_id
+
+    def answer(self, batch_id: str, responder: Callable[[str, str], Optional[str]]) -> None:
+        """End a batch by answering each of its requests with ``responder``."""
+        lines = []
+        for request in read_batch_file(self._batch_dir(batch_id) / "requests.jsonl"):
+            params = request["params"]
+            text = responder(params["messages"][0]["content"], params["model"])
+            if text is None:
+                result = {"type": "errored", "error": {"type": "api_error"}}
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": {"content": [{"type": "text", "text": text}]},
+                }
+            lines.append({"custom_id": request["custom_id"], "result": result})
+        write_batch_file(self._batch_dir(batch_id) / "results.jsonl", lines)
+
+    def pending_batches(self) -> list[str]:
+        """Submitted batches that have no results yet."""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            path.name for path in self.directory.iterdir()
+            if path.is_dir() and not (path / "results.jsonl").exists()
+        )
+
+    def status(self, batch_id: str) -> str:
+        if not self._batch_dir(batch_id).exists():
+            raise ValueError(f"Unknown batch {batch_id}")
+        if (self._batch_dir(batch_id) / "results.jsonl").exists():
+            return BATCH_ENDED
+        return BATCH_IN_PROGRESS
+
+    def results(self, batch_id: str) -> dict[str, Optional[str]]:
+        replies = {}
+        for entry in read_batch_file(self._batch_dir(batch_id) / "results.jsonl"):
+            result = entry["result"]
+            if result["type"] == "succeeded" and result["message"]["content"]:
+                replies[entry["custom_id"]] = result["message"]["content"][0]["text"]
+            else:
+                replies[entry["custom_id"]] = None
+        return replies
+
+
+def get_batch_provider(name: str | None = None) -> BatchProvider:
+    """Batch provider by name (default settings.llm_batch_provider)."""
+    name = name or settings.llm_batch_provider
+    if name == "anthropic":
+        return AnthropicBatchProvider()
+    if name == "local":
+        return LocalBatchProvider()
+    raise ValueError(f"Unknown LLM batch provider: {name}")
@@ -0,0 +1,208 @@
+"""Persistent cache of LLM responses with single-flight request coalescing."""
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.llm_cache import LLMResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def request_hash(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    """SHA-256 hex digest identifying an LLM request."""
+    payload = json.dumps([model, temperature, max_tokens, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """A request in progress that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMResponseCache:
+    """Database-backed LLM response cache shared by all threads.
+
+    Entries expire ``ttl_hours`` after they were stored, and the least
+    recently used are evicted beyond ``max_entries``. Identical requests made
+    while one is already in flight wait for its answer instead of calling the
+    API again.
+
+    Each lookup and store uses its own short-lived session, so the cache can
+    be called from worker threads. Database errors are logged and treated as
+    misses; the cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        ttl_hours: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        self.ttl_hours = ttl_hours if ttl_hours is not None else settings.llm_cache_ttl_hours
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._in_flight: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def get_or_compute(self, key: str, model: str, compute: Callable[[], str]) -> str:
+        """Return the cached response for ``key``, computing and storing it on a miss.
+
+        Args:
+            key: Request hash from ``request_hash``
+            model: Model name, stored for inspection
+            compute: Sends the request; raise to keep the result out of the cache
+
+        Returns:
+            Response text
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.put(key, model, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a live entry and mark it as recently used."""
+        try:
+            with self._session() as db:
+                entry = db.execute(
+                    select(LLMResponseCacheEntry.id, LLMResponseCacheEntry.response_text)
+                    .where(
+                        LLMResponseCacheEntry.request_hash == key,
+                        LLMResponseCacheEntry.created_at >= self._expiry_cutoff(),
+                    )
+                ).first()
+                if entry is None:
+                    return None
+
+                db.execute(
+                    update(LLMResponseCacheEntry)
+                    .where(LLMResponseCacheEntry.id == entry.id)
+                    .values(
+                        last_used_at=datetime.utcnow(),
+                        hit_count=LLMResponseCacheEntry.hit_count + 1,
+                    )
+                )
+                db.commit()
+        except Exception as e:
+            self._record_error(e)
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry.response_text
+
+    def put(self, key: str, model: str, text: str) -> None:
+        """Store a response, replacing any expired entry for the same request."""
+        now = datetime.utcnow()
+        try:
+            with self._session() as db:
+                db.execute(
+                    delete(LLMResponseCacheEntry).where(LLMResponseCacheEntry.request_hash == key)
+                )
+                db.add(LLMResponseCacheEntry(
+                    request_hash=key,
+                    model=model,
+                    response_text=text,
+                    created_at=now,
+                    last_used_at=now,
+                ))
+                db.flush()
+                self._evict(db)
+                db.commit()
+        except Exception as e:
+            self._record_error(e)
+
+    def _evict(self, db: Session) -> int:
+        """Delete expired entries, then least recently used ones beyond ``max_entries``."""
+        removed = db.execute(
+            delete(LLMResponseCacheEntry)
+            .where(LLMResponseCacheEntry.created_at < self._expiry_cutoff())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        overflow = db.scalar(select(func.count(LLMResponseCacheEntry.id))) - self.max_entries
+        if overflow > 0:
+            oldest = (
+                select(LLMResponseCacheEntry.id)
+                .order_by(LLMResponseCacheEntry.last_used_at, LLMResponseCacheEntry.created_at)
+                .limit(overflow)
+            )
+            db.execute(
+                delete(LLMResponseCacheEntry)
+                .where(LLMResponseCacheEntry.id.in_(oldest.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            removed += overflow
+        return removed
+
+    def _expiry_cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(hours=self.ttl_hours)
+
+    def _record_error(self, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        logger.warning("LLM response cache error: %s", error)
+
+    def stats(self) -> dict[str, float]:
+        """Counters since startup; coalesced requests count as hits in the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+# Global cache used by the AI client
+llm_cache = LLMResponseCache()
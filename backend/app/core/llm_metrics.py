@@ -0,0 +1,235 @@
+"""Instrumentation of LLM and embedding API calls.
+
+Every Anthropic and OpenAI request goes through ``observe_call`` (or
+``observe_call_async``), which records latency, token usage, estimated cost
+and outcome against the current pipeline stage. Stages are set with
+``pipeline_stage`` or ``llm_run``; the latter also collects a ``RunSummary``
+of everything called inside it, for the run's audit log entry.
+
+Stage and run travel in context variables, so they follow asyncio tasks and
+the worker threads of ``app.core.concurrency.run_concurrently``.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CALLS = metrics.counter(
+    "llm_calls_total",
+    "LLM and embedding API calls by outcome (ok or error).",
+    ["provider", "stage", "model", "outcome"],
+)
+LATENCY = metrics.histogram(
+    "llm_call_duration_seconds",
+    "Wall-clock time of LLM and embedding API calls.",
+    ["provider", "stage", "model"],
+)
+TOKENS = metrics.counter(
+    "llm_tokens_total",
+    "Tokens reported by the API, by direction (input or output).",
+    ["provider", "stage", "model", "direction"],
+)
+COST = metrics.counter(
+    "llm_cost_usd_total",
+    "Estimated spend from settings.llm_prices_per_million_tokens.",
+    ["provider", "stage", "model"],
+)
+RETRIES = metrics.counter(
+    "llm_retries_total",
+    "Calls retried after an error, by retrying function.",
+    ["stage", "call"],
+)
+PARSE_FAILURES = metrics.counter(
+    "llm_parse_failures_total",
+    "Replies that could not be decoded as the expected JSON.",
+    ["stage"],
+)
+RATE_LIMIT_WAIT = metrics.counter(
+    "llm_rate_limit_wait_seconds_total",
+    "Time spent waiting on the shared client-side rate limiter.",
+    ["stage"],
+)
+
+_stage: ContextVar[str] = ContextVar("llm_stage", default="other")
+_run: ContextVar[Optional["RunSummary"]] = ContextVar("llm_run", default=None)
+
+
+class RunSummary:
+    """Totals of the API calls made during one pipeline run."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.parse_failures = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_seconds = 0.0
+        self.cost_usd = 0.0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, **amounts) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "parse_failures": self.parse_failures,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "api_seconds": round(self.latency_seconds, 3),
+                "wall_seconds": round(time.perf_counter() - self._started, 3),
+                "cost_usd": round(self.cost_usd, 6),
+            }
+
+
+def current_stage() -> str:
+    return _stage.get()
+
+
+@contextmanager
+def pipeline_stage(stage: str) -> Iterator[None]:
+    """Attribute API calls made inside the block to ``stage``."""
+    token = _stage.set(stage)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+@contextmanager
+def llm_run(stage: str) -> Iterator[RunSummary]:
+    """Attribute calls to ``stage`` and total them in the yielded summary."""
+    summary = RunSummary(stage)
+    stage_token, run_token = _stage.set(stage), _run.set(summary)
+    try:
+        yield summary
+    finally:
+        _run.reset(run_token)
+        _stage.reset(stage_token)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Dollar cost of a call; 0 for models without a configured price."""
+    prices = settings.llm_prices_per_million_tokens.get(model)
+    if not prices:
+        return 0.0
+    input_price, output_price = prices
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def _usage(response: Any) -> tuple[int, int]:
+    """(input, output) tokens from an Anthropic message or OpenAI embedding response."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_tokens", 0)
+    return int(input_tokens or 0), int(getattr(usage, "output_tokens", 0) or 0)
+
+
+def _record(provider: str, model: str, elapsed: float, response: Any, failed: bool) -> None:
+    stage = _stage.get()
+    labels = {"provider": provider, "stage": stage, "model": model}
+    CALLS.inc(outcome="error" if failed else "ok", **labels)
+    LATENCY.observe(elapsed, **labels)
+
+    input_tokens, output_tokens = (0, 0) if failed else _usage(response)
+    cost = estimate_cost(model, input_tokens, output_tokens)
+    if input_tokens:
+        TOKENS.inc(input_tokens, direction="input", **labels)
+    if output_tokens:
+        TOKENS.inc(output_tokens, direction="output", **labels)
+    if cost:
+        COST.inc(cost, **labels)
+
+    run = _run.get()
+    if run is not None:
+        run.add(
+            calls=1,
+            errors=int(failed),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_seconds=elapsed,
+            cost_usd=cost,
+        )
+
+
+def observe_call(provider: str, model: str, call: Callable[[], T]) -> T:
+    """Make an API call, recording its latency, tokens and outcome.
+
+    Args:
+        provider: "anthropic" or "openai"
+        model: Model the call uses, for labels and pricing
+        call: Makes the request and returns the SDK response
+
+    Returns:
+        The response, unchanged; errors are recorded and re-raised
+    """
+    start = time.perf_counter()
+    try:
+        response = call()
+    except Exception:
+        _record(provider, model, time.perf_counter() - start, None, failed=True)
+        raise
+    _record(provider, model, time.perf_counter() - start, response, failed=False)
+    return response
+
+
+async def observe_call_async(provider: str, model: str, call: Callable[[], Awaitable[T]]) -> T:
+    """``observe_call`` for coroutine API calls."""
+    start = time.perf_counter()
+    try:
+        response = await call()
+    except Exception:
+        _record(provider, model, time.perf_counter() - start, None, failed=True)
+        raise
+    _record(provider, model, time.perf_counter() - start, response, failed=False)
+    return response
+
+
+def record_parse_failure() -> None:
+    PARSE_FAILURES.inc(stage=_stage.get())
+    run = _run.get()
+    if run is not None:
+        run.add(parse_failures=1)
+
+
+def record_rate_limit_wait(seconds: float) -> None:
+    if seconds > 0:
+        RATE_LIMIT_WAIT.inc(seconds, stage=_stage.get())
+
+
+def record_retry(retry_state) -> None:
+    """Tenacity ``before_sleep`` hook: count the retry and log why it happened."""
+    name = getattr(retry_state.fn, "__qualname__", "unknown")
+    RETRIES.inc(stage=_stage.get(), call=name)
+    run = _run.get()
+    if run is not None:
+        run.add(retries=1)
+
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    wait = retry_state.next_action.sleep if retry_state.next_action else 0
+    logger.warning(
+        "Retrying %s in %.1fs after attempt %d (stage %s): %s",
+        name, wait, retry_state.attempt_number, _stage.get(), error,
+    )
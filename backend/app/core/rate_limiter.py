@@ -0,0 +1,76 @@
+"""Thread-safe request rate limiting for outbound API calls."""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that calls the same API.
+
+    Allows bursts of up to ``burst`` requests, then spaces requests out to
+    ``requests_per_minute``. A rate of 0 or less disables limiting.
+
+    Waiting callers take tokens in priority order (lowest value first), and
+    in arrival order within a priority, so urgent requests are not queued
+    behind every token bulk callers are already waiting for.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int | None = None):
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, burst if burst is not None else int(requests_per_minute // 6) or 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently waiting for a token."""
+        with self._condition:
+            return len(self._waiting)
+
+    def acquire(self, priority: int = 0) -> float:
+        """Block until a request may be sent.
+
+        Args:
+            priority: Lower values are served first
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        start = time.monotonic()
+        waited = False
+        entry = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    rate = self.requests_per_minute / 60.0
+                    now = time.monotonic()
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+                    self._updated = now
+                    if self._waiting[0] != entry:
+                        # The head of the queue notifies when it leaves
+                        self._condition.wait()
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    else:
+                        self._condition.wait((1 - self._tokens) / rate)
+                    waited = True
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+        return time.monotonic() - start if waited else 0.0
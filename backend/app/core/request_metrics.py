@@ -0,0 +1,209 @@
+"""Per-request timing and database instrumentation.
+
+``RequestMetricsMiddleware`` times every HTTP request and, through the
+SQLAlchemy hooks installed by ``instrument_engine``, the statements it runs:
+database time, query count and rows. Totals are recorded as histograms
+labelled by route template (``/api/v1/frameworks/{framework_id}``, not the
+concrete path) and returned to the client in a ``Server-Timing`` header.
+
+The request's totals travel in a context variable, so statements run by the
+route's worker thread, or by threads of ``app.core.concurrency``, are
+counted against it.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+from starlette.routing import replace_params
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Seconds; API requests are mostly well under a second
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+ROW_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds",
+    "Wall-clock time from request to response headers.",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+REQUEST_DB_DURATION = metrics.histogram(
+    "http_request_db_duration_seconds",
+    "Time a request spent executing SQL statements.",
+    ["method", "route"],
+    buckets=REQUEST_BUCKETS,
+)
+REQUEST_DB_QUERIES = metrics.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ["method", "route"],
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_ROWS = metrics.histogram(
+    "http_request_db_rows",
+    "Rows returned or changed per request, as reported by the driver "
+    "(SQLite does not report rows returned by SELECT).",
+    ["method", "route"],
+    buckets=ROW_BUCKETS,
+)
+POOL_SIZE = metrics.gauge(
+    "db_pool_size",
+    "Connections kept open by the database pool.",
+)
+POOL_CHECKED_OUT = metrics.gauge(
+    "db_pool_checked_out",
+    "Pool connections currently in use.",
+)
+POOL_OVERFLOW = metrics.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is filling).",
+)
+POOL_CHECKOUT_WAIT = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+_QUERY_STARTED_AT = "request_metrics_query_started_at"
+
+_request: ContextVar[Optional["RequestStats"]] = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """Database totals of one request."""
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds: float, rows: int) -> None:
+        with self._lock:
+            self.db_seconds += seconds
+            self.queries += 1
+            self.rows += max(rows, 0)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info[_QUERY_STARTED_AT] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.pop(_QUERY_STARTED_AT, None)
+    stats = _request.get()
+    if stats is None or started_at is None:
+        return
+    # psycopg2 reports the rows a SELECT returned; SQLite only rows changed
+    stats.add_query(time.perf_counter() - started_at, cursor.rowcount)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time the engine's statements against the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def update_pool_gauges(pool: Pool) -> None:
+    """Set the pool gauges from the pool's current state, before a scrape."""
+    if isinstance(pool, QueuePool):
+        POOL_SIZE.set(pool.size())
+        POOL_CHECKED_OUT.set(pool.checkedout())
+        POOL_OVERFLOW.set(pool.overflow())
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request.
+
+    Routes of included routers only know their own part of the path, so the
+    prefix is taken from the concrete path in front of it.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return "unmatched"
+
+    path = scope["path"]
+    tail, _ = replace_params(path_format, route.param_convertors, dict(scope.get("path_params", {})))
+    if path.endswith(tail):
+        return path[:len(path) - len(tail)] + path_format
+    return path_format
+
+
+def _server_timing(total: float, stats: RequestStats) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="queries={stats.queries}", '
+        f"total;dur={total * 1000:.1f}"
+    )
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording request timing and database totals.
+
+    Times are taken when the response headers are sent, so the header and
+    the histograms agree; for streamed responses they leave out the body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request.set(stats)
+        start = time.perf_counter()
+        recorded = False
+
+        def record(status: int) -> float:
+            nonlocal recorded
+            recorded = True
+            elapsed = time.perf_counter() - start
+            labels = {"method": scope["method"], "route": route_template(scope)}
+            REQUEST_DURATION.observe(elapsed, status=status, **labels)
+            REQUEST_DB_DURATION.observe(stats.db_seconds, **labels)
+            REQUEST_DB_QUERIES.observe(stats.queries, **labels)
+            REQUEST_DB_ROWS.observe(stats.rows, **labels)
+            return elapsed
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and not recorded:
+                elapsed = record(message["status"])
+                if settings.server_timing_header:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(elapsed, stats).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            if not recorded:
+                record(500)
+            raise
+        finally:
+            _request.reset(token)
@@ -0,0 +1,75 @@
+"""JSON responses rendered with orjson."""
+
+from typing import Any, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON bytes.
+
+    orjson handles dicts, lists, UUIDs, datetimes, enums, dataclasses and
+    NumPy values itself; Pydantic models and anything else go through
+    FastAPI's encoder.
+    """
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson instead of the stdlib encoder.
+
+    For large payloads built from trusted database rows, return one directly
+    from a route that has no ``response_model``: that skips FastAPI's
+    ``jsonable_encoder`` pass, which costs far more than the encoding itself.
+    Routes with a ``response_model`` are already serialized by Pydantic's
+    Rust encoder and gain nothing from it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def stream_json_array(
+    items: Iterable[Any],
+    chunk_size: int = 100,
+    headers: Optional[dict[str, str]] = None,
+) -> StreamingResponse:
+    """Send a large JSON array in chunks instead of one encoded body.
+
+    The client starts receiving data after the first ``chunk_size`` items,
+    and the server never holds the whole encoded array. ``items`` is
+    consumed while the response is sent, when the route's database session
+    may already be closed, so it must not load anything lazily.
+
+    Args:
+        items: JSON-serializable array elements
+        chunk_size: Elements encoded per chunk
+        headers: Extra response headers
+    """
+
+    def body() -> Iterator[bytes]:
+        separator = b"["
+        chunk: list[bytes] = []
+        for item in items:
+            chunk.append(dumps(item))
+            if len(chunk) == chunk_size:
+                yield separator + b",".join(chunk)
+                separator, chunk = b",", []
+        if chunk:
+            yield separator + b",".join(chunk)
+        elif separator == b"[":
+            yield separator
+        yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json", headers=headers)
@@ -0,0 +1,74 @@
+"""Streaming responses for long-running generation endpoints."""
+
+import contextvars
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import anyio
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.ai_governor import AIUnavailableError
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+
+
+def _ndjson(event: dict[str, Any]) -> str:
+    return json.dumps(jsonable_encoder(event)) + "\n"
+
+
+def _sse(event: dict[str, Any]) -> str:
+    data = jsonable_encoder(event)
+    return f"event: {data.get('event', 'message')}\ndata: {json.dumps(data)}\n\n"
+
+
+def event_stream(request: Request, events: Iterator[dict[str, Any]]) -> StreamingResponse:
+    """Stream a blocking event generator as NDJSON, or as SSE if the client accepts it.
+
+    The generator runs on the thread pool, one event at a time, always in the
+    same context (so context variables it sets survive between events). When
+    the client disconnects the generator is closed, letting it stop work and
+    record what it finished. An exception ends the stream with an ``error``
+    event, since the response status has already been sent.
+
+    Args:
+        request: The incoming request (for its Accept header and disconnects)
+        events: Generator of JSON-serializable dicts with an ``event`` key
+    """
+    media_type = SSE if SSE in request.headers.get("accept", "") else NDJSON
+    encode: Callable[[dict[str, Any]], str] = _sse if media_type == SSE else _ndjson
+    context = contextvars.copy_context()
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await run_in_threadpool(context.run, next, events, None)
+                except Exception as e:
+                    error: dict[str, Any] = {"event": "error", "detail": str(e)}
+                    if isinstance(e, AIUnavailableError):
+                        error["retry_after"] = e.retry_after
+                    else:
+                        logger.exception("Stream failed")
+                    yield encode(error)
+                    return
+                if event is None:
+                    return
+                yield encode(event)
+        finally:
+            # Runs on disconnect too, when the task is being cancelled
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(context.run, events.close)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,125 @@
+"""Keyset (cursor) pagination for list queries."""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import ColumnElement
+
+from app.schemas.common import CursorPage, CursorParams
+
+
+class InvalidCursorError(ValueError):
+    """The cursor was not issued for this list, or was tampered with."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(key: ColumnElement, value: Any) -> Any:
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type in (int, float, str, bool):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[ColumnElement]) -> list[Any]:
+    """Turn a cursor back into the key values of the row it points after.
+
+    Raises:
+        InvalidCursorError: If the cursor does not fit ``keys``
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of values")
+        return [_decode_value(key, value) for key, value in zip(keys, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def estimate_count(query: Query) -> int:
+    """Approximate number of rows the query returns.
+
+    Uses the planner's row estimate on PostgreSQL, which costs no scan;
+    other databases get an exact count.
+    """
+    query = query.order_by(None)
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return query.count()
+
+    compiled = query.statement.compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = query.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[ColumnElement],
+    params: CursorParams,
+    descending: bool = False,
+) -> CursorPage:
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    The keys must be non-null and unique together (end with the primary
+    key), and should match an index so each page is a range scan however deep
+    the client pages. The page's items are the query's rows; callers convert
+    them to response models.
+
+    Args:
+        query: Filtered query, without ordering or limits
+        keys: Columns the list is ordered by, e.g. (created_at, id)
+        params: Cursor, page size and whether to estimate the total
+        descending: Order by all keys descending instead of ascending
+
+    Returns:
+        Page of rows with the cursor for the next page
+
+    Raises:
+        InvalidCursorError: If ``params.cursor`` was not issued for these keys
+    """
+    total = estimate_count(query) if params.include_total else None
+
+    if params.cursor:
+        after = tuple_(*decode_cursor(params.cursor, keys))
+        query = query.filter(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    rows = query.order_by(*order).limit(params.limit + 1).all()
+
+    next_cursor: Optional[str] = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+
+    return CursorPage(items=rows, next_cursor=next_cursor, total_estimate=total)
@@ -2,8 +2,20 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.request_metrics import TimedQueuePool, instrument_engine
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# Pool sizes apply to server databases; SQLite picks its own pool class
+_pool_options = (
+    {}
+    if settings.database_url.startswith("sqlite")
+    else {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+    }
+)
+engine = create_engine(settings.database_url, pool_pre_ping=True, **_pool_options)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -13,3 +25,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_session_factory():
+    """The session factory, for work that outlives the request's session."""
+    return SessionLocal
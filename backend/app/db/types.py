@@ -0,0 +1,54 @@
+"""Custom column types."""
+
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# Little-endian float32, fixed so stored bytes are portable across hosts
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class Vector(TypeDecorator):
+    """Embedding vector stored as packed float32 bytes.
+
+    Maps to ``BYTEA`` on PostgreSQL and ``BLOB`` on SQLite. A 1536-dim
+    vector takes 6 KB instead of ~20 KB of JSON text and needs no parsing.
+
+    Accepts lists, NumPy arrays or raw bytes on write. Reads return a
+    read-only ``numpy.ndarray`` that wraps the driver's buffer via
+    ``numpy.frombuffer`` without copying; call ``.copy()`` before mutating.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+    # Arrays can't be hashed, so the ORM must not try to unique rows on them
+    hashable = False
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return np.asarray(value, dtype=VECTOR_DTYPE).tobytes()
+
+    def process_result_value(self, value: Any, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=VECTOR_DTYPE)
+
+    def compare_values(self, x: Any, y: Any) -> bool:
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(np.asarray(x), np.asarray(y))
+
+
+def pack_vector(values: Any) -> bytes:
+    """Pack a sequence of floats into the ``Vector`` storage format."""
+    return np.asarray(values, dtype=VECTOR_DTYPE).tobytes()
+
+
+def unpack_vector(data: bytes | memoryview) -> np.ndarray:
+    """Zero-copy view of ``Vector`` storage bytes as a float32 array."""
+    return np.frombuffer(data, dtype=VECTOR_DTYPE)
@@ -53,11 +53,15 @@ async def get_current_user_id(
     return None
 
 
-async def get_current_user(
+def get_current_user(
     user_id: UUID | None = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ) -> User | None:
-    """Get the current user from the database."""
+    """Get the current user from the database.
+
+    A plain function, so FastAPI runs the query on its thread pool instead
+    of the event loop.
+    """
     if user_id is None:
         return None
 
@@ -86,7 +90,7 @@ async def require_user(
 def require_permission(permission: Permission):
     """Factory for permission-checking dependencies."""
 
-    async def check_permission(
+    def check_permission(
         user: User = Depends(require_user),
     ) -> User:
         user_roles = [role.name for role in user.roles]
@@ -103,7 +107,7 @@ def require_permission(permission: Permission):
 def require_any_permission(*permissions: Permission):
     """Factory for checking any of multiple permissions."""
 
-    async def check_permissions(
+    def check_permissions(
         user: User = Depends(require_user),
     ) -> User:
         user_roles = [role.name for role in user.roles]
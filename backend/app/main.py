@@ -1,14 +1,42 @@
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.health import router as health_router
 from app.api.v1 import api_router
+from app.core.ai_governor import AIUnavailableError
 from app.core.config import settings
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.db.pagination import InvalidCursorError
+from app.services.jobs import JobWorker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Route handlers doing blocking work are plain functions, run on this
+    # bounded pool so they never stall the event loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+
+    # Background jobs run on worker threads of this process unless they are
+    # left to separate `python -m app.worker` processes
+    worker = None
+    if settings.job_workers_in_process > 0:
+        worker = JobWorker(concurrency=settings.job_workers_in_process)
+        worker.start()
+    yield
+    if worker:
+        worker.stop(timeout=10)
+
 
 app = FastAPI(
     title=settings.app_name,
     description="AI-driven NIST CSF 2.0 compliance assessment engine",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -20,6 +48,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Timing and query counts of every request, served at /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+
+@app.exception_handler(AIUnavailableError)
+async def ai_unavailable_handler(request: Request, exc: AIUnavailableError):
+    """The AI provider is failing or saturated: tell the client when to retry."""
+    headers = {}
+    if exc.retry_after is not None:
+        headers["Retry-After"] = str(max(1, math.ceil(exc.retry_after)))
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """A list endpoint got a cursor it did not issue."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Health check (no prefix)
 app.include_router(health_router, tags=["health"])
 
@@ -23,15 +23,21 @@ from app.models.unified_framework import (
     Framework,
     FrameworkType,
     FrameworkRequirement,
+    RequirementEmbedding,
     RequirementCrosswalk,
     MappingType,
     MappingSource,
     RequirementCluster,
     RequirementClusterMember,
+    RequirementClusterCheck,
     ClusterType,
     CompanyFramework,
     AssessmentFrameworkScope,
 )
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.models.llm_cache import LLMResponseCacheEntry
+from app.models.llm_batch import LLMBatchJob
+from app.models.job import Job
 
 __all__ = [
     # User & RBAC
@@ -46,14 +52,20 @@ __all__ = [
     "Framework",
     "FrameworkType",
     "FrameworkRequirement",
+    "RequirementEmbedding",
     "RequirementCrosswalk",
     "MappingType",
     "MappingSource",
     "RequirementCluster",
     "RequirementClusterMember",
+    "RequirementClusterCheck",
     "ClusterType",
     "CompanyFramework",
     "AssessmentFrameworkScope",
+    "EmbeddingCacheEntry",
+    "LLMResponseCacheEntry",
+    "LLMBatchJob",
+    "Job",
     # Assessment
     "Assessment",
     "AssessmentStatus",
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+import numpy as np
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.types import Vector
+
+
+class EmbeddingCacheEntry(Base):
+    """Embedding vector cached by the SHA-256 of the text that produced it.
+
+    Shared by every caller of the embedding provider, so identical text
+    (e.g. the same requirement wording in several frameworks) is only
+    embedded once per model and dimension.
+    """
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (
+        UniqueConstraint("content_hash", "model", "dimensions"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    dimensions: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[np.ndarray] = mapped_column(Vector, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    # Drives least-recently-used eviction
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, JSON, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Job(Base):
+    """A long-running operation queued by an API request and run by a worker.
+
+    Workers claim queued rows with ``FOR UPDATE SKIP LOCKED``, so any number
+    of worker processes on any number of nodes can share the queue. A running
+    job's worker refreshes ``heartbeat_at``; a job whose heartbeat stops (its
+    worker died) is queued again, up to ``settings.job_max_attempts`` runs.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_created_at", "status", "created_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # Handler name, e.g. "crosswalks.generate"
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    # queued -> running -> succeeded or failed (running -> queued if the worker died)
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    # Handler arguments, JSON-encoded
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # Latest progress the handler reported: {"completed": n, "total": m}
+    progress: Mapped[dict | None] = mapped_column(JSON)
+    # What the synchronous endpoint would have returned
+    result: Mapped[dict | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    worker_id: Mapped[str | None] = mapped_column(String(200))
+    created_by_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime)
@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, JSON, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LLMBatchJob(Base):
+    """A mapping or crosswalk run executed through a provider batch API.
+
+    The row holds everything needed to carry on after a restart: the work
+    items and their prompt inputs, the provider batch in flight, and the
+    answers gathered so far. Rows are written only when the final round has
+    been ingested, in the same transaction that marks the job ingested.
+    """
+
+    __tablename__ = "llm_batch_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # "mapping" or "crosswalk"
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    # pending -> submitted -> (pending -> submitted)* -> ingested, or failed
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
+    provider: Mapped[str] = mapped_column(String(50), nullable=False)
+    provider_batch_id: Mapped[str | None] = mapped_column(String(200))
+    # Rounds submitted so far; later rounds re-ask unanswered or uncertain items
+    round: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    round_model: Mapped[str | None] = mapped_column(String(100))
+    # Run options (assessment or framework ids, thresholds, requirement snapshot)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # Work items in run order, each with a unique "key"
+    items: Mapped[list] = mapped_column(JSON, nullable=False)
+    # Current round: request custom_id -> item keys it covers
+    requests: Mapped[dict | None] = mapped_column(JSON)
+    # Accepted answers so far: item key -> parsed result
+    results: Mapped[dict | None] = mapped_column(JSON)
+    request_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Ingest counts, set when the job is ingested
+    summary: Mapped[dict | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_by_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime)
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LLMResponseCacheEntry(Base):
+    """LLM response text cached by the SHA-256 of its request.
+
+    The key covers model, temperature, max tokens and prompt, so re-running
+    generation on unchanged data replays earlier answers instead of calling
+    the API again.
+    """
+
+    __tablename__ = "llm_response_cache"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    request_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response_text: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+    # Drives least-recently-used eviction
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
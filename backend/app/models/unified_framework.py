@@ -8,11 +8,15 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, String, Text, Float, JSON, DateTime, Boolean, Integer
+import numpy as np
+from sqlalchemy import (
+    ForeignKey, String, Text, Float, JSON, DateTime, Boolean, Integer, UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import Vector
 
 if TYPE_CHECKING:
     from app.models.assessment import Assessment
@@ -118,8 +122,6 @@ class FrameworkRequirement(Base):
     display_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     # Additional metadata (e.g., implementation examples, references)
     extra_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON, nullable=True)
-    # Vector embedding for similarity search (stored as list, indexed by pgvector)
-    embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -152,6 +154,11 @@ class FrameworkRequirement(Base):
     cluster_memberships: Mapped[list["RequirementClusterMember"]] = relationship(
         back_populates="requirement"
     )
+    embeddings: Mapped[list["RequirementEmbedding"]] = relationship(
+        back_populates="requirement",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     # Unique constraint: code must be unique within a framework
     __table_args__ = (
@@ -160,6 +167,45 @@ class FrameworkRequirement(Base):
     )
 
 
+class RequirementEmbedding(Base):
+    """Embedding vector for a requirement, produced by a specific model.
+
+    Kept out of ``framework_requirements`` so list, tree and search queries
+    over requirements never transfer multi-KB vectors. Similarity services
+    load vectors in bulk with explicit column projections instead.
+    """
+    __tablename__ = "requirement_embeddings"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    requirement_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("framework_requirements.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False
+    )
+    # Embedding model name (e.g., "text-embedding-3-small")
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    dimensions: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Packed float32 vector, read as a NumPy array
+    vector: Mapped[np.ndarray] = mapped_column(Vector, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    # Relationships
+    requirement: Mapped["FrameworkRequirement"] = relationship(
+        back_populates="embeddings"
+    )
+
+    # One vector per requirement, model and dimension
+    __table_args__ = (
+        UniqueConstraint("requirement_id", "model", "dimensions"),
+    )
+
+
 class RequirementCrosswalk(Base):
     """Cross-framework mapping between requirements.
 
@@ -232,7 +278,7 @@ class RequirementCluster(Base):
         String(50), default=ClusterType.SEMANTIC.value, nullable=False
     )
     # Centroid embedding for the cluster (average of member embeddings)
-    embedding_centroid: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    embedding_centroid: Mapped[Optional[np.ndarray]] = mapped_column(Vector, nullable=True)
     # Representative question that covers all cluster members
     interview_question: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     # Metadata (e.g., clustering parameters, quality metrics)
@@ -285,6 +331,32 @@ class RequirementClusterMember(Base):
     )
 
 
+class RequirementClusterCheck(Base):
+    """Marks that a clustering run of a cluster type considered a requirement.
+
+    ``ClusteringService.assign_new_requirements`` only looks at requirements
+    without a check, or whose embedding changed after it, so requirements
+    that stayed unclustered are not scored again on every run.
+    """
+    __tablename__ = "requirement_cluster_checks"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    requirement_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("framework_requirements.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    cluster_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Start of the run that last considered the requirement
+    checked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("requirement_id", "cluster_type"),
+    )
+
+
 class CompanyFramework(Base):
     """Tracks which frameworks a company has selected for compliance.
 
@@ -74,9 +74,16 @@ from app.schemas.mapping import (
     GapResponse,
     GapListResponse,
 )
+from app.schemas.llm_batch import (
+    MappingBatchRequest,
+    LLMBatchJobResponse,
+)
+from app.schemas.job import JobResponse
 from app.schemas.common import (
     PaginationParams,
     PaginatedResponse,
+    CursorParams,
+    CursorPage,
     StatusResponse,
     ErrorResponse,
 )
@@ -149,9 +156,16 @@ __all__ = [
     "MappingApproveRequest",
     "GapResponse",
     "GapListResponse",
+    # LLM batch jobs
+    "MappingBatchRequest",
+    "LLMBatchJobResponse",
+    # Background jobs
+    "JobResponse",
     # Common
     "PaginationParams",
     "PaginatedResponse",
+    "CursorParams",
+    "CursorPage",
     "StatusResponse",
     "ErrorResponse",
 ]
@@ -19,6 +19,7 @@ class AIPromptOverrides(BaseModel):
     """Schema for AI prompt customization."""
     mapping_prompt_suffix: str | None = None
     analysis_prompt_suffix: str | None = None
+    mapping_shortlist_size: int | None = Field(default=None, ge=0)
 
 
 class AssessmentCreate(AssessmentBase):
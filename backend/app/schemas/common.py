@@ -23,6 +23,26 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int
 
 
+class CursorParams(BaseModel):
+    """Keyset pagination parameters for list endpoints.
+
+    ``cursor`` is the ``next_cursor`` of the previous page; omit it for the
+    first page.
+    """
+    cursor: str | None = None
+    limit: int = Field(default=100, ge=1, le=500)
+    include_total: bool = False
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+    items: list[T]
+    # None on the last page
+    next_cursor: str | None = None
+    # Only with include_total=true; a query planner estimate on PostgreSQL
+    total_estimate: int | None = None
+
+
 class StatusResponse(BaseModel):
     """Generic status response."""
     status: str
@@ -6,6 +6,7 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from app.schemas.common import CursorPage
 from app.models.deviation import DeviationType, DeviationSeverity, DeviationStatus
 
 
@@ -48,9 +49,8 @@ class DeviationResponse(DeviationBase):
     model_config = {"from_attributes": True}
 
 
-class DeviationListResponse(BaseModel):
-    """List of deviations with summary."""
-    items: list[DeviationResponse]
+class DeviationListResponse(CursorPage[DeviationResponse]):
+    """Page of deviations with counts over all matching deviations."""
     total: int
     by_severity: dict[str, int]
     by_status: dict[str, int]
@@ -0,0 +1,23 @@
+"""Schemas for background jobs."""
+
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    """A background job's state; ``result`` is set once it has succeeded."""
+    id: UUID
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: dict[str, Any] | None = None
+    result: Any = None
+    error: str | None = None
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
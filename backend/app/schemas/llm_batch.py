@@ -0,0 +1,51 @@
+"""Schemas for provider batch jobs."""
+
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class MappingBatchRequest(BaseModel):
+    """Request to generate AI mappings through a provider batch job."""
+    include_policies: bool = True
+    include_controls: bool = True
+    confidence_threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    shortlist_size: int | None = Field(default=None, ge=0)
+    batch_size: int | None = Field(default=None, ge=1, le=100)
+
+
+class LLMBatchJobResponse(BaseModel):
+    """Progress of a provider batch job."""
+    id: UUID
+    kind: Literal["mapping", "crosswalk"]
+    status: Literal["pending", "submitted", "ingested", "failed"]
+    provider: str
+    round: int
+    round_model: str | None = None
+    item_count: int
+    answered_count: int
+    request_count: int
+    summary: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+
+    @classmethod
+    def from_job(cls, job) -> "LLMBatchJobResponse":
+        return cls(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            provider=job.provider,
+            round=job.round,
+            round_model=job.round_model,
+            item_count=len(job.items),
+            answered_count=len(job.results or {}),
+            request_count=job.request_count,
+            summary=job.summary,
+            error=job.error,
+            created_at=job.created_at,
+            completed_at=job.completed_at,
+        )
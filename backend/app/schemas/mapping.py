@@ -11,6 +11,9 @@ class MappingGenerateRequest(BaseModel):
     include_policies: bool = True
     include_controls: bool = True
     confidence_threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    shortlist_size: int | None = Field(default=None, ge=0)
+    concurrency: int | None = Field(default=None, ge=1, le=32)
+    batch_size: int | None = Field(default=None, ge=1, le=100)
 
 
 class MappingSuggestion(BaseModel):
@@ -22,6 +25,8 @@ class MappingSuggestion(BaseModel):
     subcategory_code: str
     confidence_score: float
     reasoning: str | None = None
+    # "fast" or "strong": the model tier that answered
+    model_tier: str | None = None
 
 
 class MappingGenerateResponse(BaseModel):
@@ -30,6 +35,7 @@ class MappingGenerateResponse(BaseModel):
     suggestions_count: int
     policy_mappings: int
     control_mappings: int
+    prompt_count: int = 0
     suggestions: list[MappingSuggestion]
 
 
@@ -0,0 +1,5 @@
+"""Provider batch-job execution of mapping and crosswalk runs."""
+
+from app.services.batch.llm_batch_service import LLMBatchService
+
+__all__ = ["LLMBatchService"]
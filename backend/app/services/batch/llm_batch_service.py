@@ -0,0 +1,319 @@
+"""Mapping and crosswalk runs executed through a provider batch API."""
+
+import logging
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.ai_client import FAST_TIER, STRONG_TIER, ai_client
+from app.core.config import settings
+from app.core.llm_batch import (
+    BATCH_ENDED,
+    BatchProvider,
+    batch_request,
+    get_batch_provider,
+    write_batch_file,
+)
+from app.models.llm_batch import LLMBatchJob
+from app.services.frameworks.crosswalk_service import CrosswalkService
+from app.services.mapping.ai_mapper import AIMappingService
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SUBMITTED = "submitted"
+INGESTED = "ingested"
+FAILED = "failed"
+
+# Services that know how to build, parse and ingest each kind of job
+HANDLERS = {
+    "mapping": AIMappingService,
+    "crosswalk": CrosswalkService,
+}
+
+
+class LLMBatchService:
+    """Drives batch jobs from prompt file to ingested rows.
+
+    A job moves through rounds. Each round writes the prompts for every item
+    still unanswered to a JSONL file, submits it and, once the provider has
+    answered, keeps the usable replies. With model routing on, the first
+    round goes to the fast model and items it could not answer or scored as
+    ambiguous are asked of the strong model in the next round. When nothing
+    is left to ask, or after ``settings.llm_batch_max_rounds`` rounds, all
+    answers are ingested in one transaction.
+
+    Every step is committed before the next starts, so ``advance`` can pick
+    a job up in a fresh process after a restart.
+    """
+
+    def __init__(self, db: Session, provider: Optional[BatchProvider] = None):
+        """
+        Args:
+            db: Database session
+            provider: Batch provider to use for jobs of its name (default:
+                looked up from each job's provider)
+        """
+        self.db = db
+        self.provider = provider
+
+    def _provider(self, job: LLMBatchJob) -> BatchProvider:
+        if self.provider is not None and self.provider.name == job.provider:
+            return self.provider
+        return get_batch_provider(job.provider)
+
+    def _handler(self, job: LLMBatchJob):
+        return HANDLERS[job.kind](self.db)
+
+    def create_mapping_job(
+        self,
+        assessment_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+        **options: Any,
+    ) -> LLMBatchJob:
+        """Start a batch job generating mapping suggestions for an assessment.
+
+        Args:
+            assessment_id: Assessment to generate mappings for
+            user_id: User requesting the generation
+            **options: As for ``AIMappingService.prepare_batch_job``
+
+        Returns:
+            The job, with its first round submitted
+        """
+        return self._create_job(
+            "mapping", user_id, assessment_id=assessment_id, **options
+        )
+
+    def create_crosswalk_job(
+        self,
+        source_framework_id: uuid.UUID,
+        target_framework_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+        **options: Any,
+    ) -> LLMBatchJob:
+        """Start a batch job validating crosswalk candidates between two frameworks.
+
+        Args:
+            source_framework_id: Source framework UUID
+            target_framework_id: Target framework UUID
+            user_id: User requesting the generation
+            **options: As for ``CrosswalkService.prepare_batch_job``
+
+        Returns:
+            The job, with its first round submitted
+        """
+        return self._create_job(
+            "crosswalk", user_id,
+            source_framework_id=source_framework_id,
+            target_framework_id=target_framework_id,
+            **options,
+        )
+
+    def _create_job(self, kind: str, user_id: uuid.UUID | None, **options: Any) -> LLMBatchJob:
+        params, items = HANDLERS[kind](self.db).prepare_batch_job(**options)
+        job = LLMBatchJob(
+            id=uuid.uuid4(),
+            kind=kind,
+            status=PENDING,
+            provider=self.provider.name if self.provider else settings.llm_batch_provider,
+            round=0,
+            params=params,
+            items=items,
+            results={},
+            request_count=0,
+            created_by_id=user_id,
+        )
+        self.db.add(job)
+        self.db.commit()
+        return self.advance(job)
+
+    def get_job(self, job_id: uuid.UUID) -> Optional[LLMBatchJob]:
+        return self.db.query(LLMBatchJob).filter(LLMBatchJob.id == job_id).first()
+
+    def _lock(self, job: LLMBatchJob) -> bool:
+        """Lock the job's row and reload it, unless another caller holds it.
+
+        Returns:
+            Whether this session now holds the lock; the job's attributes are
+            current either way
+        """
+        locked = (
+            self.db.query(LLMBatchJob)
+            .filter(LLMBatchJob.id == job.id)
+            .with_for_update(skip_locked=True)
+            .populate_existing()
+            .first()
+        )
+        if locked is None:
+            self.db.rollback()
+            self.db.refresh(job)
+            return False
+        return True
+
+    def advance(self, job: LLMBatchJob) -> LLMBatchJob:
+        """Take a job as far as it can go without waiting on the provider.
+
+        Submits the next round of a pending job, collects an ended round, and
+        ingests a job with nothing left to ask. Each step runs with the job's
+        row locked and its status read again, so callers in other processes
+        (the advance endpoint and ``scripts/run_llm_batches.py``) cannot
+        submit or ingest the same round twice; a job another caller is
+        advancing is returned as it is.
+
+        Returns:
+            The job, updated and committed
+        """
+        if not self._lock(job):
+            return job
+
+        if job.status == SUBMITTED:
+            provider = self._provider(job)
+            if provider.status(job.provider_batch_id) != BATCH_ENDED:
+                self.db.rollback()
+                return job
+            self._collect(job, provider.results(job.provider_batch_id))
+            # Collecting committed, which released the lock
+            if not self._lock(job):
+                return job
+
+        if job.status == PENDING:
+            remaining = [item["key"] for item in job.items if item["key"] not in job.results]
+            if remaining and job.round < settings.llm_batch_max_rounds:
+                self._submit(job, remaining)
+            else:
+                self._ingest(job)
+        else:
+            self.db.rollback()
+        return job
+
+    def advance_all(self) -> list[LLMBatchJob]:
+        """Advance every unfinished job, e.g. from a worker after a restart.
+
+        A job whose provider call fails is left as it was, to be retried on
+        the next pass; one locked by another caller is skipped.
+        """
+        jobs = (
+            self.db.query(LLMBatchJob)
+            .filter(LLMBatchJob.status.in_([PENDING, SUBMITTED]))
+            .order_by(LLMBatchJob.created_at)
+            .all()
+        )
+        for job in jobs:
+            try:
+                self.advance(job)
+            except Exception:
+                self.db.rollback()
+                logger.exception("LLM batch job %s could not advance", job.id)
+        return jobs
+
+    def wait(
+        self,
+        job: LLMBatchJob,
+        poll_seconds: float | None = None,
+        timeout: float | None = None,
+    ) -> LLMBatchJob:
+        """Advance a job until it is ingested or failed.
+
+        Raises:
+            TimeoutError: If the job is still running after ``timeout`` seconds
+        """
+        if poll_seconds is None:
+            poll_seconds = settings.llm_batch_poll_seconds
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.advance(job).status not in (INGESTED, FAILED):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"LLM batch job {job.id} is still {job.status}")
+            time.sleep(poll_seconds)
+        return job
+
+    def _round_model(self, job: LLMBatchJob) -> str:
+        if job.round == 1 and ai_client.routing_enabled:
+            return settings.ai_fast_model
+        return settings.ai_model
+
+    def _submit(self, job: LLMBatchJob, keys: list[str]) -> None:
+        job.round += 1
+        model = self._round_model(job)
+        prompts = self._handler(job).batch_prompts(job, keys)
+
+        requests = {}
+        lines = []
+        for n, prompt in enumerate(prompts, start=1):
+            custom_id = f"r{job.round}-{n}"
+            requests[custom_id] = prompt.keys
+            lines.append(batch_request(
+                custom_id, prompt.prompt, model, prompt.max_tokens, prompt.temperature
+            ))
+        path = write_batch_file(
+            Path(settings.llm_batch_dir) / str(job.id) / f"round-{job.round}.jsonl", lines
+        )
+
+        # A crash between submit and commit leaves the job pending, and the
+        # round is submitted again on resume
+        job.provider_batch_id = self._provider(job).submit(path)
+        job.round_model = model
+        job.requests = requests
+        job.request_count += len(lines)
+        job.status = SUBMITTED
+        self.db.commit()
+
+    def _collect(self, job: LLMBatchJob, replies: dict[str, Optional[str]]) -> None:
+        handler = self._handler(job)
+        tier = FAST_TIER if job.round_model != settings.ai_model else STRONG_TIER
+        last_round = job.round >= settings.llm_batch_max_rounds
+
+        # JSON columns are not mutation-tracked, so build a new dict
+        results = dict(job.results or {})
+        for custom_id, keys in job.requests.items():
+            text = replies.get(custom_id)
+            parsed = handler.parse_batch_reply(job, keys, text) if text else {}
+            for key, result in parsed.items():
+                # Ambiguous fast answers are asked again of the strong model
+                if tier == FAST_TIER and not last_round and any(
+                    ai_client.is_ambiguous(c) for c in handler.batch_confidences(job, result)
+                ):
+                    continue
+                results[key] = {"result": result, "model_tier": tier}
+
+        job.results = results
+        job.requests = None
+        job.provider_batch_id = None
+        job.status = PENDING
+        self.db.commit()
+
+    def _ingest(self, job: LLMBatchJob) -> None:
+        # Move the job out of pending in the same transaction as its rows, so
+        # a second caller's transition matches nothing and it ingests nothing
+        claimed = (
+            self.db.query(LLMBatchJob)
+            .filter(LLMBatchJob.id == job.id, LLMBatchJob.status == PENDING)
+            .update({LLMBatchJob.status: INGESTED}, synchronize_session=False)
+        )
+        if not claimed:
+            self.db.rollback()
+            self.db.refresh(job)
+            return
+
+        answers = {
+            key: (answer["result"], answer["model_tier"])
+            for key, answer in (job.results or {}).items()
+        }
+        try:
+            summary = self._handler(job).ingest_batch_results(job, answers)
+        except Exception as e:
+            self.db.rollback()
+            job.status = FAILED
+            job.error = str(e)
+            self.db.commit()
+            raise
+
+        summary["unanswered"] = len(job.items) - len(answers)
+        job.summary = summary
+        job.status = INGESTED
+        job.completed_at = datetime.utcnow()
+        self.db.commit()
@@ -2,6 +2,14 @@
 
 from app.services.clustering.embedding_service import EmbeddingService
 from app.services.clustering.clustering_service import ClusteringService
+from app.services.clustering.similarity_graph import SimilarityGraph
 from app.services.clustering.similarity_service import SimilarityService
+from app.services.clustering.vector_engine import VectorEngine
 
-__all__ = ["EmbeddingService", "ClusteringService", "SimilarityService"]
+__all__ = [
+    "EmbeddingService",
+    "ClusteringService",
+    "SimilarityGraph",
+    "SimilarityService",
+    "VectorEngine",
+]
@@ -0,0 +1,433 @@
+"""Persistent approximate nearest-neighbour index over requirement embeddings.
+
+Implements an IVF-flat index in NumPy: vectors are partitioned into inverted
+lists around k-means centroids, and a query only scores the vectors in the
+``nprobe`` lists whose centroids are closest to it. Small corpora use a single
+list, which makes search exact.
+"""
+
+import os
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.clustering.vector_engine import VectorEngine
+
+
+class RequirementIndex:
+    """IVF-flat index with framework and assessability filters.
+
+    Rows are keyed by requirement id. Adding a vector for an id that is
+    already indexed replaces it in place, so re-embedding a requirement keeps
+    the index consistent without a rebuild.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        nprobe: Optional[int] = None,
+        model: Optional[str] = None,
+    ):
+        self.dimensions = dimensions
+        # Embedding model the vectors came from
+        self.model = model
+        self.nprobe = nprobe or settings.ann_index_nprobe
+        self.vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self.ids: list[str] = []
+        self.framework_ids: list[str] = []
+        self.framework_codes = np.zeros(0, dtype=np.int32)
+        self.assessable = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.centroids = np.zeros((1, dimensions), dtype=np.float32)
+        self._row_by_id: dict[str, int] = {}
+        self._framework_code_by_id: dict[str, int] = {}
+        self._list_order: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return int(self.active.sum())
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        entries: Sequence[tuple[uuid.UUID, uuid.UUID, bool, Sequence[float]]],
+        dimensions: Optional[int] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        seed: int = 0,
+        model: Optional[str] = None,
+    ) -> "RequirementIndex":
+        """Build an index from (requirement_id, framework_id, is_assessable, vector) entries.
+
+        Args:
+            entries: Requirements and their embedding vectors
+            dimensions: Vector dimension (defaults to settings.embedding_dimensions)
+            nlist: Number of inverted lists (defaults to sqrt(n) above the exact-search size)
+            nprobe: Lists scanned per query
+            seed: Random seed for k-means training
+            model: Embedding model the vectors came from
+
+        Returns:
+            A trained RequirementIndex
+        """
+        dimensions = dimensions or settings.embedding_dimensions
+        index = cls(dimensions, nprobe=nprobe, model=model)
+        index.add(entries)
+
+        n = len(index.ids)
+        if nlist is None:
+            nlist = 1 if n < settings.ann_index_min_size else int(np.sqrt(n))
+        index.train(max(1, min(nlist, n)), seed=seed)
+        return index
+
+    def train(self, nlist: int, iterations: int = 10, seed: int = 0) -> None:
+        """Train the coarse quantizer with spherical k-means and reassign all rows."""
+        with self._lock:
+            n = self.vectors.shape[0]
+            if nlist <= 1 or n == 0:
+                self.centroids = np.zeros((1, self.dimensions), dtype=np.float32)
+                self.assignments = np.zeros(n, dtype=np.int32)
+                self._invalidate_lists()
+                return
+
+            rng = np.random.default_rng(seed)
+            sample_size = min(n, nlist * 32)
+            sample = self.vectors[rng.choice(n, size=sample_size, replace=False)]
+            centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = np.bincount(labels, minlength=nlist) == 0
+                # Re-seed empty lists so every centroid stays useful
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+                centroids = VectorEngine.normalize_rows(sums)
+
+            self.centroids = centroids
+            self.assignments = self._assign(self.vectors)
+            self._invalidate_lists()
+
+    def _assign(self, vectors: np.ndarray, block_size: int = 4096) -> np.ndarray:
+        """Nearest-centroid assignment, computed in row blocks."""
+        if self.nlist == 1:
+            return np.zeros(vectors.shape[0], dtype=np.int32)
+        labels = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], block_size):
+            block = vectors[start:start + block_size]
+            labels[start:start + block_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        entries: Iterable[tuple[uuid.UUID, uuid.UUID, bool, Sequence[float]]],
+    ) -> int:
+        """Insert or replace vectors for the given requirements.
+
+        Args:
+            entries: (requirement_id, framework_id, is_assessable, vector) tuples
+
+        Returns:
+            Number of rows written
+        """
+        # Last write wins for ids repeated within one call
+        entries = list({
+            str(e[0]): e for e in entries
+            if e[3] is not None and len(e[3]) == self.dimensions
+        }.values())
+        if not entries:
+            return 0
+
+        with self._lock:
+            vectors = VectorEngine.normalize_rows(
+                np.asarray([e[3] for e in entries], dtype=np.float32)
+            )
+            labels = self._assign(vectors)
+
+            new_rows = []
+            for (req_id, framework_id, is_assessable, _), vector, label in zip(
+                entries, vectors, labels
+            ):
+                key = str(req_id)
+                code = self._framework_code(str(framework_id))
+                row = self._row_by_id.get(key)
+                if row is not None:
+                    self.vectors[row] = vector
+                    self.framework_codes[row] = code
+                    self.assessable[row] = bool(is_assessable)
+                    self.assignments[row] = label
+                    self.active[row] = True
+                    continue
+                self._row_by_id[key] = len(self.ids) + len(new_rows)
+                new_rows.append((key, code, bool(is_assessable), vector, label))
+
+            if new_rows:
+                keys, codes, assessable, vecs, rows_labels = zip(*new_rows)
+                self.ids.extend(keys)
+                self.vectors = np.vstack([self.vectors, np.asarray(vecs)])
+                self.framework_codes = np.concatenate(
+                    [self.framework_codes, np.asarray(codes, dtype=np.int32)]
+                )
+                self.assessable = np.concatenate([self.assessable, np.asarray(assessable)])
+                self.active = np.concatenate([self.active, np.ones(len(new_rows), dtype=bool)])
+                self.assignments = np.concatenate(
+                    [self.assignments, np.asarray(rows_labels, dtype=np.int32)]
+                )
+
+            self._invalidate_lists()
+            return len(entries)
+
+    def remove(self, requirement_ids: Iterable[uuid.UUID]) -> int:
+        """Drop requirements from search results (rows are compacted on rebuild)."""
+        removed = 0
+        with self._lock:
+            for req_id in requirement_ids:
+                row = self._row_by_id.get(str(req_id))
+                if row is not None and self.active[row]:
+                    self.active[row] = False
+                    removed += 1
+        return removed
+
+    def remove_framework(self, framework_id: uuid.UUID) -> int:
+        """Drop every requirement of a framework from search results."""
+        with self._lock:
+            code = self._framework_code_by_id.get(str(framework_id))
+            if code is None:
+                return 0
+            rows = self.active & (self.framework_codes == code)
+            self.active = self.active & ~rows
+            return int(rows.sum())
+
+    def set_assessable(self, requirement_ids: Iterable[uuid.UUID], is_assessable: bool) -> int:
+        """Update the assessability filter flag for indexed requirements."""
+        updated = 0
+        with self._lock:
+            for req_id in requirement_ids:
+                row = self._row_by_id.get(str(req_id))
+                if row is not None:
+                    self.assessable[row] = bool(is_assessable)
+                    updated += 1
+        return updated
+
+    def get_vector(self, requirement_id: uuid.UUID) -> Optional[np.ndarray]:
+        """Return the stored (normalized) vector for a requirement."""
+        row = self._row_by_id.get(str(requirement_id))
+        if row is None or not self.active[row]:
+            return None
+        return self.vectors[row]
+
+    def _framework_code(self, framework_id: str) -> int:
+        code = self._framework_code_by_id.get(framework_id)
+        if code is None:
+            code = len(self.framework_ids)
+            self.framework_ids.append(framework_id)
+            self._framework_code_by_id[framework_id] = code
+        return code
+
+    def _invalidate_lists(self) -> None:
+        self._list_order = None
+        self._list_offsets = None
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        """Row ids grouped by list, as (order, offsets) in CSR layout."""
+        if self._list_order is None:
+            self._list_order = np.argsort(self.assignments, kind="stable")
+            counts = np.bincount(self.assignments, minlength=self.nlist)
+            self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._list_order, self._list_offsets
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int = 20,
+        threshold: float = 0.0,
+        framework_id: Optional[uuid.UUID] = None,
+        exclude_framework_id: Optional[uuid.UUID] = None,
+        only_assessable: bool = False,
+        exclude_ids: Optional[Iterable[uuid.UUID]] = None,
+        nprobe: Optional[int] = None,
+    ) -> list[tuple[uuid.UUID, float]]:
+        """Find the indexed requirements most similar to a query vector.
+
+        If the filters leave fewer than ``top_k`` candidates in the probed
+        lists, the probe widens until enough candidates are found or every
+        list has been scanned.
+
+        Args:
+            vector: Query embedding
+            top_k: Maximum number of results
+            threshold: Minimum cosine similarity
+            framework_id: Only return requirements from this framework
+            exclude_framework_id: Skip requirements from this framework
+            only_assessable: Only return assessable requirements
+            exclude_ids: Requirement ids to skip
+            nprobe: Lists to scan (defaults to the index setting)
+
+        Returns:
+            List of (requirement_id, similarity) tuples, sorted by similarity
+        """
+        if vector is None or len(vector) != self.dimensions or not self.ids:
+            return []
+
+        query = VectorEngine.normalize_rows(
+            np.asarray(vector, dtype=np.float32).reshape(1, -1).copy()
+        )[0]
+
+        with self._lock:
+            mask = self.active
+            if only_assessable:
+                mask = mask & self.assessable
+            if framework_id is not None:
+                code = self._framework_code_by_id.get(str(framework_id))
+                if code is None:
+                    return []
+                mask = mask & (self.framework_codes == code)
+            if exclude_framework_id is not None:
+                code = self._framework_code_by_id.get(str(exclude_framework_id))
+                if code is not None:
+                    mask = mask & (self.framework_codes != code)
+            if exclude_ids:
+                mask = mask.copy()
+            for req_id in exclude_ids or ():
+                row = self._row_by_id.get(str(req_id))
+                if row is not None:
+                    mask[row] = False
+
+            order, offsets = self._inverted_lists()
+            probe_order = np.argsort(-(self.centroids @ query), kind="stable")
+            probes = min(nprobe or self.nprobe, self.nlist)
+
+            while True:
+                rows = np.concatenate(
+                    [order[offsets[c]:offsets[c + 1]] for c in probe_order[:probes]]
+                )
+                rows = np.sort(rows[mask[rows]])
+                if rows.size >= top_k or probes >= self.nlist:
+                    break
+                probes = min(probes * 2, self.nlist)
+
+            scores = self.vectors[rows] @ query
+            return [
+                (uuid.UUID(self.ids[rows[i]]), score)
+                for i, score in VectorEngine.select_top_k(scores, top_k, threshold)
+            ]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the index to disk atomically (inactive rows are dropped)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            keep = self.active
+            # A temp file of its own, so concurrent savers never share one
+            tmp = tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+            )
+            try:
+                with tmp:
+                    np.savez(
+                        tmp,
+                        vectors=self.vectors[keep],
+                        ids=np.asarray(self.ids, dtype="U36")[keep],
+                        framework_ids=np.asarray(self.framework_ids, dtype="U36"),
+                        framework_codes=self.framework_codes[keep],
+                        assessable=self.assessable[keep],
+                        assignments=self.assignments[keep],
+                        centroids=self.centroids,
+                        nprobe=np.asarray(self.nprobe),
+                        model=np.asarray(self.model or ""),
+                    )
+                os.replace(tmp.name, path)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "RequirementIndex":
+        """Load an index written by ``save``."""
+        with np.load(path) as data:
+            centroids = data["centroids"]
+            model = str(data["model"]) if "model" in data.files else ""
+            index = cls(centroids.shape[1], nprobe=int(data["nprobe"]), model=model or None)
+            index.vectors = data["vectors"]
+            index.ids = data["ids"].tolist()
+            index.framework_ids = data["framework_ids"].tolist()
+            index.framework_codes = data["framework_codes"]
+            index.assessable = data["assessable"]
+            index.assignments = data["assignments"]
+            index.centroids = centroids
+
+        index.active = np.ones(len(index.ids), dtype=bool)
+        index._row_by_id = {req_id: row for row, req_id in enumerate(index.ids)}
+        index._framework_code_by_id = {
+            fid: code for code, fid in enumerate(index.framework_ids)
+        }
+        return index
+
+
+_index: Optional[RequirementIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_requirement_index() -> Optional[RequirementIndex]:
+    """Return the process-wide index, (re)loading it from disk if it changed.
+
+    Returns None when the index is disabled or has not been built yet.
+    """
+    global _index, _index_mtime
+
+    if not settings.ann_index_enabled:
+        return None
+
+    path = Path(settings.ann_index_path)
+    with _index_lock:
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return _index
+        if _index is None or mtime != _index_mtime:
+            _index = RequirementIndex.load(path)
+            _index_mtime = mtime
+        return _index
+
+
+def set_requirement_index(index: Optional[RequirementIndex], persist: bool = True) -> None:
+    """Install an index as the process-wide instance, optionally saving it.
+
+    An index installed without saving is used until the file on disk changes.
+    """
+    global _index, _index_mtime
+
+    with _index_lock:
+        _index = index
+        if index is not None and persist:
+            path = Path(settings.ann_index_path)
+            index.save(path)
+            _index_mtime = path.stat().st_mtime
@@ -1,19 +1,32 @@
 """Service for clustering similar requirements across frameworks."""
 
 import uuid
+from datetime import datetime
 from typing import Optional
 from collections import defaultdict
 
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, joinedload
 
 from app.core.config import settings
 from app.models.unified_framework import (
     FrameworkRequirement,
     RequirementCluster,
+    RequirementClusterCheck,
     RequirementClusterMember,
+    RequirementEmbedding,
     ClusterType,
 )
+from app.services.clustering.linkage import cluster_graph, cluster_vectors
+from app.services.clustering.similarity_graph import SimilarityGraph
 from app.services.clustering.similarity_service import SimilarityService
+from app.services.clustering.vector_engine import VectorEngine
+
+# Requirement ids per statement when recording clustering checks
+CHECK_CHUNK = 1000
+# Older unclustered requirements compared with each new one
+NEIGHBOUR_CANDIDATES = 10
 
 
 class ClusteringService:
@@ -46,135 +59,374 @@ class ClusteringService:
         Returns:
             List of created RequirementCluster objects
         """
-        # Build similarity matrix
-        requirements, similarity_matrix = self.similarity_service.build_similarity_matrix(
+        started_at = datetime.utcnow()
+        requirements, vectors = self.similarity_service.get_requirement_vectors(
             framework_ids=framework_ids,
             only_assessable=True,
-            threshold=threshold,
         )
 
         if not requirements:
             return []
 
+        # Sparse graph of pairs at or above the threshold
+        graph = SimilarityGraph.build(VectorEngine(vectors), threshold)
+
         # Run hierarchical clustering
         clusters = self._hierarchical_clustering(
             requirements=requirements,
-            similarity_matrix=similarity_matrix,
+            graph=graph,
             threshold=threshold,
             min_cluster_size=min_cluster_size,
         )
 
+        embeddings = {req.id: vector for req, vector in zip(requirements, vectors)}
+
         # Create cluster records
         created_clusters = []
         for cluster_requirements in clusters:
             cluster = self._create_cluster(
                 requirements=cluster_requirements,
+                embeddings=embeddings,
                 cluster_type=cluster_type,
             )
             if cluster:
                 created_clusters.append(cluster)
 
+        self._record_checks([req.id for req in requirements], cluster_type, started_at)
         self.db.commit()
         return created_clusters
 
-    def _hierarchical_clustering(
+    def assign_new_requirements(
         self,
-        requirements: list[FrameworkRequirement],
-        similarity_matrix: list[list[float]],
-        threshold: float,
-        min_cluster_size: int,
-    ) -> list[list[FrameworkRequirement]]:
-        """Perform hierarchical agglomerative clustering.
-
-        Uses single-linkage clustering with early termination when
-        maximum similarity falls below threshold.
+        framework_ids: Optional[list[uuid.UUID]] = None,
+        threshold: float = 0.85,
+        min_cluster_size: int = 2,
+        cluster_type: ClusterType = ClusterType.SEMANTIC,
+    ) -> dict[str, int]:
+        """Cluster requirements added since the last run, keeping existing clusters.
+
+        A requirement is new if no run of ``cluster_type`` has considered it
+        (see ``RequirementClusterCheck``), or its embedding changed after the
+        last run that did, and it is not in a cluster. Requirements left
+        unclustered by an earlier run are therefore not reported again.
+
+        Each new requirement joins the existing cluster whose centroid it is
+        most similar to, if that similarity reaches ``threshold``; the
+        centroids of clusters that gain members are updated in place. The
+        rest are clustered as in ``generate_clusters``, together with the
+        older unclustered requirements of any framework that are most similar
+        to them. Work scales with the number of new requirements: existing
+        members are neither reloaded nor re-scored.
 
         Args:
-            requirements: List of requirements to cluster
-            similarity_matrix: Pairwise similarity matrix
-            threshold: Similarity threshold for merging
-            min_cluster_size: Minimum cluster size
+            framework_ids: Frameworks to take new requirements from (None for all)
+            threshold: Similarity threshold for joining and for new clusters
+            min_cluster_size: Minimum requirements to form a new cluster
+            cluster_type: Type of cluster to assign to and create
 
         Returns:
-            List of clusters (each cluster is a list of requirements)
+            Dictionary with counts of new requirements, assigned requirements,
+            updated clusters, created clusters and new requirements left unclustered
         """
-        n = len(requirements)
-        if n == 0:
-            return []
+        started_at = datetime.utcnow()
+        in_cluster = (
+            self.db.query(RequirementClusterMember.id)
+            .join(RequirementCluster, RequirementCluster.id == RequirementClusterMember.cluster_id)
+            .filter(
+                RequirementClusterMember.requirement_id == FrameworkRequirement.id,
+                RequirementCluster.cluster_type == cluster_type.value,
+                RequirementCluster.is_active == True,
+            )
+            .exists()
+        )
+        query = (
+            self.similarity_service.embedding_service
+            .query_with_embeddings(FrameworkRequirement, RequirementEmbedding.vector)
+            .outerjoin(
+                RequirementClusterCheck,
+                (RequirementClusterCheck.requirement_id == FrameworkRequirement.id)
+                & (RequirementClusterCheck.cluster_type == cluster_type.value),
+            )
+            .filter(
+                FrameworkRequirement.is_assessable == True,
+                ~in_cluster,
+                or_(
+                    RequirementClusterCheck.id.is_(None),
+                    RequirementClusterCheck.checked_at < RequirementEmbedding.updated_at,
+                ),
+            )
+        )
+        if framework_ids:
+            query = query.filter(FrameworkRequirement.framework_id.in_(framework_ids))
 
-        # Initialize each requirement as its own cluster
-        clusters = [[i] for i in range(n)]
-        active = set(range(n))  # Active cluster indices
-
-        while len(active) > 1:
-            # Find most similar pair of clusters
-            best_sim = -1
-            best_pair = None
-
-            active_list = list(active)
-            for i in range(len(active_list)):
-                for j in range(i + 1, len(active_list)):
-                    ci, cj = active_list[i], active_list[j]
-                    sim = self._cluster_similarity(
-                        clusters[ci], clusters[cj], similarity_matrix
-                    )
-                    if sim > best_sim:
-                        best_sim = sim
-                        best_pair = (ci, cj)
-
-            # Stop if best similarity is below threshold
-            if best_sim < threshold or best_pair is None:
-                break
-
-            # Merge clusters
-            ci, cj = best_pair
-            clusters[ci] = clusters[ci] + clusters[cj]
-            active.remove(cj)
-
-        # Convert indices back to requirements and filter by size
-        result = []
-        for i in active:
-            if len(clusters[i]) >= min_cluster_size:
-                cluster_reqs = [requirements[idx] for idx in clusters[i]]
-                result.append(cluster_reqs)
+        rows = query.all()
+        stats = {
+            "new_requirements": len(rows),
+            "assigned": 0,
+            "clusters_updated": 0,
+            "clusters_created": 0,
+            "unclustered": 0,
+        }
+        if not rows:
+            return stats
+
+        requirements = [req for req, _ in rows]
+        vectors = [vector for _, vector in rows]
+        engine = VectorEngine(vectors)
+
+        # Match against existing centroids; only ids and vectors are loaded
+        centroid_rows = (
+            self.db.query(RequirementCluster.id, RequirementCluster.embedding_centroid)
+            .filter(
+                RequirementCluster.cluster_type == cluster_type.value,
+                RequirementCluster.is_active == True,
+                RequirementCluster.embedding_centroid.isnot(None),
+            )
+            .all()
+        )
+        joins: dict[uuid.UUID, list[int]] = defaultdict(list)
+        if centroid_rows:
+            centroids = VectorEngine(
+                (centroid for _, centroid in centroid_rows),
+                dimensions=engine.dimensions,
+            )
+            rows_idx, cols, _ = SimilarityGraph.between(
+                engine, centroids, threshold=threshold, top_k=1
+            ).edges()
+            for i, j in zip(rows_idx.tolist(), cols.tolist()):
+                joins[centroid_rows[j][0]].append(i)
+
+        if joins:
+            self._extend_clusters(joins, requirements, vectors)
+            stats["clusters_updated"] = len(joins)
+            stats["assigned"] = sum(len(members) for members in joins.values())
+
+        # Cluster what is left together with similar older unclustered requirements
+        joined = {i for members in joins.values() for i in members}
+        remaining = [i for i in range(len(requirements)) if i not in joined]
+        candidates = [requirements[i] for i in remaining]
+        candidate_vectors = [vectors[i] for i in remaining]
+        if remaining:
+            older, older_vectors = self._unclustered_neighbours(
+                candidate_vectors,
+                {req.id for req in requirements},
+                in_cluster,
+                threshold,
+                engine.dimensions,
+            )
+            candidates += older
+            candidate_vectors += older_vectors
+
+        embeddings = {req.id: vector for req, vector in zip(candidates, candidate_vectors)}
+        clustered = 0
+        for local in cluster_vectors(
+            VectorEngine(candidate_vectors, dimensions=engine.dimensions),
+            threshold,
+            min_cluster_size,
+        ):
+            cluster = self._create_cluster(
+                requirements=[candidates[i] for i in local],
+                embeddings=embeddings,
+                cluster_type=cluster_type,
+            )
+            if cluster:
+                stats["clusters_created"] += 1
+                clustered += sum(1 for i in local if i < len(remaining))
 
-        return result
+        stats["unclustered"] = len(remaining) - clustered
+        self._record_checks([req.id for req in requirements], cluster_type, started_at)
+        self.db.commit()
+        return stats
 
-    def _cluster_similarity(
+    def _unclustered_neighbours(
         self,
-        cluster1: list[int],
-        cluster2: list[int],
-        similarity_matrix: list[list[float]],
-    ) -> float:
-        """Compute similarity between two clusters using average linkage.
+        vectors: list[np.ndarray],
+        new_ids: set[uuid.UUID],
+        in_cluster,
+        threshold: float,
+        dimensions: int,
+    ) -> tuple[list[FrameworkRequirement], list[np.ndarray]]:
+        """Find older unclustered requirements similar to new ones.
+
+        Uses the nearest-neighbour index when one is available; otherwise
+        the vectors of all older unclustered requirements are scanned.
 
         Args:
-            cluster1: Indices of requirements in first cluster
-            cluster2: Indices of requirements in second cluster
-            similarity_matrix: Pairwise similarity matrix
+            vectors: Embeddings of the new requirements still unclustered
+            new_ids: Ids of this run's new requirements, which are skipped
+            in_cluster: EXISTS clause for membership in an active cluster
+            threshold: Minimum similarity to a new requirement
+            dimensions: Embedding dimensions
 
         Returns:
-            Average similarity between cluster members
+            Tuple of (requirements, vectors) in matching order
         """
-        total_sim = 0.0
-        count = 0
+        embedding_service = self.similarity_service.embedding_service
+        index = embedding_service.get_index()
+        if index is not None:
+            candidate_ids = {
+                requirement_id
+                for vector in vectors
+                for requirement_id, _ in index.search(
+                    vector,
+                    top_k=NEIGHBOUR_CANDIDATES,
+                    threshold=threshold,
+                    only_assessable=True,
+                    exclude_ids=new_ids,
+                )
+            }
+        else:
+            older = [
+                (requirement_id, vector)
+                for requirement_id, vector in (
+                    embedding_service
+                    .query_with_embeddings(FrameworkRequirement.id, RequirementEmbedding.vector)
+                    .filter(FrameworkRequirement.is_assessable == True, ~in_cluster)
+                )
+                if requirement_id not in new_ids
+            ]
+            _, cols, _ = SimilarityGraph.between(
+                VectorEngine(vectors, dimensions=dimensions),
+                VectorEngine((vector for _, vector in older), dimensions=dimensions),
+                threshold=threshold,
+                top_k=NEIGHBOUR_CANDIDATES,
+            ).edges()
+            candidate_ids = {older[j][0] for j in cols.tolist()}
+
+        if not candidate_ids:
+            return [], []
+        rows = (
+            embedding_service
+            .query_with_embeddings(FrameworkRequirement, RequirementEmbedding.vector)
+            .filter(FrameworkRequirement.id.in_(candidate_ids), ~in_cluster)
+            .all()
+        )
+        return [req for req, _ in rows], [vector for _, vector in rows]
 
-        for i in cluster1:
-            for j in cluster2:
-                total_sim += similarity_matrix[i][j]
-                count += 1
+    def _record_checks(
+        self,
+        requirement_ids: list[uuid.UUID],
+        cluster_type: ClusterType,
+        checked_at: datetime,
+    ) -> None:
+        """Record that a run of ``cluster_type`` starting at ``checked_at`` considered requirements.
+
+        Args:
+            requirement_ids: Requirements the run considered
+            cluster_type: Type of cluster the run assigned
+            checked_at: Start of the run
+        """
+        for start in range(0, len(requirement_ids), CHECK_CHUNK):
+            chunk = requirement_ids[start:start + CHECK_CHUNK]
+            checks = self.db.query(RequirementClusterCheck).filter(
+                RequirementClusterCheck.cluster_type == cluster_type.value,
+                RequirementClusterCheck.requirement_id.in_(chunk),
+            )
+            checked = {requirement_id for (requirement_id,) in checks.with_entities(
+                RequirementClusterCheck.requirement_id
+            )}
+            checks.update(
+                {RequirementClusterCheck.checked_at: checked_at}, synchronize_session=False
+            )
+            self.db.add_all(
+                RequirementClusterCheck(
+                    id=uuid.uuid4(),
+                    requirement_id=requirement_id,
+                    cluster_type=cluster_type.value,
+                    checked_at=checked_at,
+                )
+                for requirement_id in chunk
+                if requirement_id not in checked
+            )
 
-        return total_sim / count if count > 0 else 0.0
+    def _extend_clusters(
+        self,
+        joins: dict[uuid.UUID, list[int]],
+        requirements: list[FrameworkRequirement],
+        vectors: list[np.ndarray],
+    ) -> None:
+        """Add requirements to existing clusters and move their centroids.
+
+        Args:
+            joins: Cluster id to indices (into ``requirements``) of joining requirements
+            requirements: New requirements
+            vectors: Their embeddings, in the same order
+        """
+        clusters = {
+            c.id: c
+            for c in self.db.query(RequirementCluster).filter(
+                RequirementCluster.id.in_(list(joins))
+            )
+        }
+        members_by_cluster = defaultdict(list)
+        for cluster_id, requirement in (
+            self.db.query(RequirementClusterMember.cluster_id, FrameworkRequirement)
+            .join(FrameworkRequirement, FrameworkRequirement.id == RequirementClusterMember.requirement_id)
+            .filter(RequirementClusterMember.cluster_id.in_(list(joins)))
+            # Descriptions name each member's framework
+            .options(joinedload(FrameworkRequirement.framework))
+        ):
+            members_by_cluster[cluster_id].append(requirement)
+
+        for cluster_id, indices in joins.items():
+            cluster = clusters[cluster_id]
+            existing = members_by_cluster[cluster_id]
+
+            # Running mean: old centroid weighted by the existing member count
+            added = np.stack([vectors[i] for i in indices]).astype(np.float32)
+            count = len(existing)
+            centroid = (cluster.embedding_centroid * count + added.sum(axis=0)) / (count + len(indices))
+            cluster.embedding_centroid = centroid.astype(np.float32)
+
+            similarities = VectorEngine(added).scores(centroid)
+            for i, similarity in zip(indices, similarities.tolist()):
+                self.db.add(RequirementClusterMember(
+                    id=uuid.uuid4(),
+                    cluster_id=cluster.id,
+                    requirement_id=requirements[i].id,
+                    similarity_score=similarity,
+                ))
+
+            self._summarize_cluster(cluster, existing + [requirements[i] for i in indices])
+
+    def _hierarchical_clustering(
+        self,
+        requirements: list[FrameworkRequirement],
+        graph: SimilarityGraph,
+        threshold: float,
+        min_cluster_size: int,
+    ) -> list[list[FrameworkRequirement]]:
+        """Perform hierarchical agglomerative clustering.
+
+        Uses average linkage over similarities below ``threshold`` set to 0,
+        merging until no pair of clusters reaches the threshold. See
+        ``linkage.cluster_graph`` for the algorithm.
+
+        Args:
+            requirements: List of requirements to cluster
+            graph: Similarity graph indexed like ``requirements``
+            threshold: Similarity threshold for merging
+            min_cluster_size: Minimum cluster size
+
+        Returns:
+            List of clusters (each cluster is a list of requirements)
+        """
+        return [
+            [requirements[idx] for idx in cluster]
+            for cluster in cluster_graph(graph, threshold, min_cluster_size)
+        ]
 
     def _create_cluster(
         self,
         requirements: list[FrameworkRequirement],
+        embeddings: dict[uuid.UUID, np.ndarray],
         cluster_type: ClusterType,
     ) -> Optional[RequirementCluster]:
         """Create a cluster record with its members.
 
         Args:
             requirements: Requirements to include in the cluster
+            embeddings: Requirement embeddings keyed by requirement id
             cluster_type: Type of cluster
 
         Returns:
@@ -183,46 +435,28 @@ class ClusteringService:
         if not requirements:
             return None
 
-        # Generate cluster name from requirement codes
-        codes = sorted([r.code for r in requirements])
-        frameworks = set(r.framework_id for r in requirements)
-
-        if len(codes) <= 3:
-            name = " + ".join(codes)
-        else:
-            name = f"{codes[0]} + {len(codes) - 1} related requirements"
-
-        # Generate description
-        description = self._generate_cluster_description(requirements)
-
         # Calculate centroid embedding
-        centroid = self._calculate_centroid(requirements)
+        vectors = [embeddings.get(r.id) for r in requirements]
+        centroid = self._calculate_centroid(vectors)
 
         # Create cluster
         cluster = RequirementCluster(
             id=uuid.uuid4(),
-            name=name,
-            description=description,
             cluster_type=cluster_type.value,
             embedding_centroid=centroid,
             is_active=True,
-            metadata={
-                "requirement_count": len(requirements),
-                "framework_count": len(frameworks),
-                "framework_ids": [str(f) for f in frameworks],
-            },
         )
+        self._summarize_cluster(cluster, requirements)
         self.db.add(cluster)
         self.db.flush()
 
         # Add members
-        for req in requirements:
-            similarity = (
-                self.similarity_service.cosine_similarity(req.embedding, centroid)
-                if req.embedding and centroid
-                else 0.0
-            )
-
+        member_similarities = (
+            VectorEngine(vectors).scores(centroid)
+            if centroid is not None
+            else np.zeros(len(requirements))
+        )
+        for req, similarity in zip(requirements, member_similarities.tolist()):
             member = RequirementClusterMember(
                 id=uuid.uuid4(),
                 cluster_id=cluster.id,
@@ -233,36 +467,53 @@ class ClusteringService:
 
         return cluster
 
-    def _calculate_centroid(
+    def _summarize_cluster(
         self,
+        cluster: RequirementCluster,
         requirements: list[FrameworkRequirement],
-    ) -> Optional[list[float]]:
+    ) -> None:
+        """Set a cluster's name, description and metadata from its members.
+
+        Args:
+            cluster: Cluster to update
+            requirements: All requirements in the cluster
+        """
+        # Generate cluster name from requirement codes
+        codes = sorted([r.code for r in requirements])
+        frameworks = set(r.framework_id for r in requirements)
+
+        if len(codes) <= 3:
+            cluster.name = " + ".join(codes)
+        else:
+            cluster.name = f"{codes[0]} + {len(codes) - 1} related requirements"
+
+        cluster.description = self._generate_cluster_description(requirements)
+        cluster.extra_metadata = {
+            **(cluster.extra_metadata or {}),
+            "requirement_count": len(requirements),
+            "framework_count": len(frameworks),
+            "framework_ids": [str(f) for f in frameworks],
+        }
+
+    def _calculate_centroid(
+        self,
+        vectors: list[Optional[np.ndarray]],
+    ) -> Optional[np.ndarray]:
         """Calculate the centroid embedding for a set of requirements.
 
         Args:
-            requirements: Requirements to calculate centroid for
+            vectors: Member embeddings (None for members without one)
 
         Returns:
             Average embedding vector, or None if no embeddings available
         """
-        embeddings = [
-            r.embedding for r in requirements
-            if r.embedding is not None
-        ]
+        embeddings = [v for v in vectors if v is not None]
 
         if not embeddings:
             return None
 
-        # Calculate element-wise average
-        n = len(embeddings)
-        dim = len(embeddings[0])
-
-        centroid = [0.0] * dim
-        for emb in embeddings:
-            for i, val in enumerate(emb):
-                centroid[i] += val / n
-
-        return centroid
+        # Element-wise average
+        return np.mean(np.stack(embeddings), axis=0, dtype=np.float32)
 
     def _generate_cluster_description(
         self,
@@ -350,6 +601,14 @@ class ClusteringService:
         Returns:
             List of RequirementCluster objects
         """
+        return self.query_clusters(cluster_type=cluster_type, is_active=is_active).all()
+
+    def query_clusters(
+        self,
+        cluster_type: Optional[ClusterType] = None,
+        is_active: Optional[bool] = True,
+    ) -> Query:
+        """Unordered query of clusters matching the filters of ``list_clusters``."""
         query = self.db.query(RequirementCluster)
 
         if cluster_type:
@@ -358,7 +617,7 @@ class ClusteringService:
         if is_active is not None:
             query = query.filter(RequirementCluster.is_active == is_active)
 
-        return query.all()
+        return query
 
     def get_requirement_cluster(
         self,
@@ -410,6 +669,12 @@ class ClusteringService:
         clusters = query.all()
         count = 0
 
+        # Requirements of deleted clusters count as new again
+        checks = self.db.query(RequirementClusterCheck)
+        if cluster_type:
+            checks = checks.filter(RequirementClusterCheck.cluster_type == cluster_type.value)
+        checks.delete(synchronize_session=False)
+
         for cluster in clusters:
             # Delete members first
             self.db.query(RequirementClusterMember).filter(
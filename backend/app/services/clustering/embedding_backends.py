@@ -0,0 +1,285 @@
+"""Embedding backends: where requirement and query vectors come from."""
+
+import asyncio
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+import numpy as np
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from app.core.config import settings
+from app.core.llm_metrics import observe_call, observe_call_async, record_retry
+
+
+class RateLimitedError(Exception):
+    """The embedding provider rejected a request with HTTP 429."""
+
+    def __init__(self, message: str = "Rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EmbeddingBackend(ABC):
+    """Abstract base class for embedding backends.
+
+    A backend turns a batch of texts into fixed-size vectors. ``model`` is
+    recorded with every stored vector, so switching backends never mixes
+    vectors from different embedding spaces.
+    """
+
+    #: Whether results are worth keeping in the embedding cache
+    cacheable: bool = True
+
+    def __init__(self, dimensions: Optional[int] = None):
+        self.dimensions = dimensions or settings.embedding_dimensions
+
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Identifier stored alongside generated vectors."""
+        pass
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> list[Sequence[float]]:
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        pass
+
+    async def aembed(self, texts: list[str]) -> list[Sequence[float]]:
+        """Async variant of ``embed``; runs it in a worker thread by default."""
+        return await asyncio.to_thread(self.embed, texts)
+
+    @staticmethod
+    def get_backend(name: Optional[str] = None) -> "EmbeddingBackend":
+        """Factory method for the configured embedding backend.
+
+        Args:
+            name: Backend name (openai, hashing); defaults to settings.embedding_backend
+
+        Returns:
+            A backend instance
+
+        Raises:
+            ValueError: If the backend is not supported
+        """
+        backends = {
+            "openai": OpenAIEmbeddingBackend,
+            "hashing": HashingEmbeddingBackend,
+        }
+
+        name = name or settings.embedding_backend
+        if name not in backends:
+            raise ValueError(f"Unsupported embedding backend: {name}")
+
+        return backends[name]()
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """OpenAI embeddings API (text-embedding-3-small or configured alternative)."""
+
+    def __init__(self, dimensions: Optional[int] = None):
+        super().__init__(dimensions)
+        self._client = None
+        self._async_client = None
+
+    @property
+    def model(self) -> str:
+        return settings.embedding_model
+
+    @property
+    def client(self):
+        """Lazy initialization of OpenAI client."""
+        if self._client is None:
+            if not settings.openai_api_key:
+                raise ValueError("OPENAI_API_KEY not configured")
+            from openai import OpenAI
+            self._client = OpenAI(api_key=settings.openai_api_key)
+        return self._client
+
+    @property
+    def async_client(self):
+        """Lazy initialization of the async OpenAI client."""
+        if self._async_client is None:
+            if not settings.openai_api_key:
+                raise ValueError("OPENAI_API_KEY not configured")
+            from openai import AsyncOpenAI
+            # Retries are left to the embedding pipeline so 429s also shrink concurrency
+            self._async_client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        return self._async_client
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        before_sleep=record_retry,
+    )
+    def embed(self, texts: list[str]) -> list[Sequence[float]]:
+        response = observe_call("openai", self.model, lambda: self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            dimensions=self.dimensions,
+        ))
+
+        # Sort by index to maintain order
+        sorted_data = sorted(response.data, key=lambda x: x.index)
+        return [d.embedding for d in sorted_data]
+
+    async def aembed(self, texts: list[str]) -> list[Sequence[float]]:
+        from openai import RateLimitError
+
+        try:
+            response = await observe_call_async(
+                "openai",
+                self.model,
+                lambda: self.async_client.embeddings.create(
+                    model=self.model,
+                    input=texts,
+                    dimensions=self.dimensions,
+                ),
+            )
+        except RateLimitError as e:
+            retry_after = e.response.headers.get("retry-after") if e.response else None
+            raise RateLimitedError(
+                str(e), retry_after=float(retry_after) if retry_after else None
+            ) from e
+
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """In-process character n-gram vectors; no network, no model files.
+
+    Each text is lower-cased and split into overlapping byte n-grams
+    (3 to 5 by default). Every n-gram is hashed into one of ``dimensions``
+    buckets with a hashed sign, counts are damped with ``log1p`` and rows are
+    L2-normalised, so cosine similarity tracks shared wording. Hashing runs
+    over the whole batch at once in NumPy and handles thousands of texts per
+    second on one core.
+    """
+
+    cacheable = False
+
+    # Multipliers for the polynomial rolling hash and the final mix (64-bit wraparound)
+    _BASE = np.uint64(0x100000001B3)
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, dimensions: Optional[int] = None, ngram_range: tuple[int, int] = (3, 5)):
+        super().__init__(dimensions)
+        self.ngram_range = ngram_range
+
+    @property
+    def model(self) -> str:
+        low, high = self.ngram_range
+        return f"hashing-char-{low}-{high}"
+
+    def embed(self, texts: list[str]) -> list[Sequence[float]]:
+        return list(self.embed_matrix(texts))
+
+    def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts into an (n, dimensions) float32 matrix."""
+        out = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if not texts:
+            return out
+
+        # Concatenate all texts; separator bytes belong to no document
+        encoded = [
+            (" " + self._WHITESPACE.sub(" ", t.lower()).strip() + " ").encode("utf-8")
+            for t in texts
+        ]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b"\0".join(encoded), dtype=np.uint8).astype(np.uint64)
+        doc_index = np.repeat(np.arange(len(texts)), lengths)
+        doc = np.full(len(data), -1, dtype=np.int64)
+        # Byte i of text k sits after k separators
+        doc[np.arange(len(doc_index)) + doc_index] = doc_index
+
+        buckets, signs, owners = [], [], []
+        low, high = self.ngram_range
+        with np.errstate(over="ignore"):
+            for n in range(low, high + 1):
+                count = len(data) - n + 1
+                if count <= 0:
+                    continue
+                h = np.full(count, n, dtype=np.uint64)
+                for j in range(n):
+                    h = h * self._BASE + data[j:j + count]
+                # An n-gram is valid if it starts and ends inside the same text
+                valid = (doc[:count] >= 0) & (doc[:count] == doc[n - 1:n - 1 + count])
+                h = h[valid] * self._MIX
+                buckets.append((h >> np.uint64(32)) % np.uint64(self.dimensions))
+                signs.append(np.where(h & np.uint64(1 << 31), -1.0, 1.0))
+                owners.append(doc[:count][valid])
+
+        if not owners:
+            return out
+
+        flat = np.concatenate(owners) * self.dimensions + np.concatenate(buckets).astype(np.int64)
+        counts = np.bincount(flat, weights=np.concatenate(signs), minlength=out.size)
+        out[:] = counts.reshape(out.shape)
+
+        np.copysign(np.log1p(np.abs(out)), out, out=out)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+class StubEmbeddingBackend(EmbeddingBackend):
+    """Simulated remote provider for tests and benchmarks.
+
+    Returns deterministic unit vectors derived from the text hash after a
+    simulated round trip. With ``max_concurrent`` set, async requests beyond
+    that many in flight are rejected with ``RateLimitedError`` like a real API.
+    """
+
+    def __init__(
+        self,
+        dimensions: Optional[int] = None,
+        latency: float = 0.05,
+        latency_per_1k_tokens: float = 0.0,
+        max_concurrent: Optional[int] = None,
+    ):
+        super().__init__(dimensions)
+        self.latency = latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.max_concurrent = max_concurrent
+        self.requests = 0
+        self.rate_limited = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+
+    @property
+    def model(self) -> str:
+        return "stub"
+
+    def vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def embed(self, texts: list[str]) -> list[Sequence[float]]:
+        self.requests += 1
+        return [self.vector(t) for t in texts]
+
+    async def aembed(self, texts: list[str]) -> list[Sequence[float]]:
+        self.requests += 1
+        if self.max_concurrent is not None and self._in_flight >= self.max_concurrent:
+            self.rate_limited += 1
+            raise RateLimitedError(retry_after=self.latency)
+
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            tokens = sum(len(t) // 4 + 1 for t in texts)
+            await asyncio.sleep(self.latency + self.latency_per_1k_tokens * tokens / 1000)
+        finally:
+            self._in_flight -= 1
+
+        return [self.vector(t) for t in texts]
@@ -0,0 +1,153 @@
+"""Content-addressed cache of embedding vectors."""
+
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the exact text sent to the embedding provider."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Database-backed embedding cache with least-recently-used eviction.
+
+    Entries are keyed by (content hash, model, dimensions) for the given
+    embedding model. Writes go through the caller's session and are persisted
+    when it commits, so a failed batch that is rolled back leaves no entries.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model: str,
+        dimensions: int,
+        max_entries: Optional[int] = None,
+    ):
+        self.db = db
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries or settings.embedding_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, hashes: Iterable[str]) -> dict[str, np.ndarray]:
+        """Look up cached vectors and mark the found entries as recently used.
+
+        Args:
+            hashes: Content hashes to look up
+
+        Returns:
+            Dictionary mapping content hash to vector (misses omitted)
+        """
+        hashes = list(set(hashes))
+        if not hashes:
+            return {}
+
+        rows = self.db.execute(
+            select(EmbeddingCacheEntry.id, EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.vector)
+            .where(
+                EmbeddingCacheEntry.content_hash.in_(hashes),
+                *self._active_model_filter(),
+            )
+        ).all()
+
+        if rows:
+            self.db.execute(
+                update(EmbeddingCacheEntry)
+                .where(EmbeddingCacheEntry.id.in_([row.id for row in rows]))
+                .values(
+                    last_used_at=datetime.utcnow(),
+                    hit_count=EmbeddingCacheEntry.hit_count + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        return {row.content_hash: row.vector for row in rows}
+
+    def put_many(self, vectors: dict[str, Sequence[float]]) -> None:
+        """Add freshly generated vectors, evicting the oldest entries if over capacity.
+
+        Hashes another session cached concurrently are skipped rather than
+        failing the caller's transaction on the unique constraint.
+
+        Args:
+            vectors: Dictionary mapping content hash to vector
+        """
+        if not vectors:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "content_hash": digest,
+                "model": self.model,
+                "dimensions": self.dimensions,
+                "vector": vector,
+                "hit_count": 0,
+                "created_at": now,
+                "last_used_at": now,
+            }
+            for digest, vector in vectors.items()
+        ]
+
+        insert = _CONFLICT_INSERTS.get(self.db.get_bind().dialect.name)
+        if insert is not None:
+            self.db.execute(
+                insert(EmbeddingCacheEntry).on_conflict_do_nothing(
+                    index_elements=["content_hash", "model", "dimensions"]
+                ),
+                rows,
+            )
+        else:
+            for row in rows:
+                try:
+                    with self.db.begin_nested():
+                        self.db.add(EmbeddingCacheEntry(**row))
+                except IntegrityError:
+                    pass
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries beyond ``max_entries``.
+
+        Returns:
+            Number of entries removed
+        """
+        total = self.db.scalar(select(func.count(EmbeddingCacheEntry.id)))
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return 0
+
+        oldest = (
+            select(EmbeddingCacheEntry.id)
+            .order_by(EmbeddingCacheEntry.last_used_at, EmbeddingCacheEntry.created_at)
+            .limit(overflow)
+        )
+        self.db.execute(
+            delete(EmbeddingCacheEntry)
+            .where(EmbeddingCacheEntry.id.in_(oldest.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return overflow
+
+    def _active_model_filter(self) -> tuple:
+        return (
+            EmbeddingCacheEntry.model == self.model,
+            EmbeddingCacheEntry.dimensions == self.dimensions,
+        )
@@ -0,0 +1,265 @@
+"""Concurrent embedding generation with token-budgeted batches.
+
+The sequential path in ``EmbeddingService.embed_all_requirements`` waits for
+each provider round trip before sending the next batch. The pipeline here
+keeps several requests in flight, packs batches by estimated token count
+rather than a fixed number of texts, and backs off when the provider
+answers with HTTP 429. Each batch is committed as soon as it returns, so an
+interrupted run keeps everything finished so far.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.unified_framework import FrameworkRequirement
+from app.services.clustering.embedding_backends import RateLimitedError
+from app.services.clustering.embedding_cache import content_hash
+from app.services.clustering.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+# Bound on hashes per cache lookup, to keep IN lists reasonable
+CACHE_LOOKUP_CHUNK = 1000
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that halves on rate limiting and recovers gradually.
+
+    After a 429 every caller waits out the retry delay before sending again.
+    Each run of ``limit`` consecutive successes raises the limit by one, up
+    to ``maximum``.
+    """
+
+    def __init__(self, maximum: int):
+        self.maximum = max(1, maximum)
+        self.limit = self.maximum
+        self._in_flight = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self, retry_after: Optional[float] = None) -> None:
+        """Release a slot; pass ``retry_after`` when the request was rate limited."""
+        async with self._condition:
+            self._in_flight -= 1
+            if retry_after is not None:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+@dataclass
+class _Batch:
+    hashes: list[str]
+    texts: list[str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def pack_batches(
+    items: list[tuple[str, str]],
+    max_batch_size: int,
+    max_batch_tokens: int,
+) -> list[_Batch]:
+    """Group (hash, text) items into batches under both size and token budgets.
+
+    Items keep their order; a single text over the token budget gets a
+    batch of its own.
+    """
+    batches = []
+    current = _Batch([], [])
+    tokens = 0
+
+    for digest, text in items:
+        cost = estimate_tokens(text)
+        if current.texts and (
+            len(current.texts) >= max_batch_size or tokens + cost > max_batch_tokens
+        ):
+            batches.append(current)
+            current = _Batch([], [])
+            tokens = 0
+        current.hashes.append(digest)
+        current.texts.append(text)
+        tokens += cost
+
+    if current.texts:
+        batches.append(current)
+    return batches
+
+
+class EmbeddingPipeline:
+    """Embed requirements with several requests to the service's backend in flight."""
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        concurrency: Optional[int] = None,
+        max_batch_size: int = 100,
+        max_batch_tokens: Optional[int] = None,
+        max_retries: int = 5,
+    ):
+        self.service = service
+        self.db = service.db
+        self.backend = service.backend
+        self.concurrency = concurrency or settings.embedding_concurrency
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens or settings.embedding_batch_max_tokens
+        self.max_retries = max_retries
+
+    async def run(
+        self,
+        framework_id: Optional[uuid.UUID] = None,
+        force: bool = False,
+    ) -> dict[str, int]:
+        """Generate and store embeddings for all requirements that need one.
+
+        Args:
+            framework_id: Optional framework filter
+            force: If True, regenerate all embeddings (cached text is reused)
+
+        Returns:
+            Same counts as ``EmbeddingService.embed_all_requirements``, plus
+            the number of batches sent and of rate-limited requests
+        """
+        requirements = self.service.requirements_to_embed(framework_id, force)
+        stats = {
+            "processed": 0,
+            "skipped": 0,
+            "failed": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "batches": 0,
+            "rate_limited": 0,
+        }
+
+        # Requirements sharing the same text need only one vector
+        by_hash: dict[str, list[FrameworkRequirement]] = {}
+        texts: dict[str, str] = {}
+        for requirement in requirements:
+            text = self.service.truncate_text(
+                self.service.prepare_requirement_text(requirement)
+            )
+            digest = content_hash(text)
+            by_hash.setdefault(digest, []).append(requirement)
+            texts.setdefault(digest, text)
+
+        embedded: list[tuple[FrameworkRequirement, Sequence[float]]] = []
+
+        cached = self._lookup_cache(list(by_hash))
+        if cached:
+            rows = [(req, cached[h]) for h in cached for req in by_hash[h]]
+            self.service.store_embeddings([(req.id, vector) for req, vector in rows])
+            self.db.commit()
+            stats["processed"] += len(rows)
+            embedded.extend(rows)
+
+        pending = [(h, texts[h]) for h in by_hash if h not in cached]
+        stats["cache_hits"] = len(requirements) - len(pending)
+        stats["cache_misses"] = len(pending)
+        if self.service.cache:
+            self.service.cache.hits += stats["cache_hits"]
+            self.service.cache.misses += stats["cache_misses"]
+
+        batches = pack_batches(pending, self.max_batch_size, self.max_batch_tokens)
+        stats["batches"] = len(batches)
+        limiter = AdaptiveConcurrency(self.concurrency)
+        tasks = [
+            asyncio.create_task(self._embed_batch(batch, limiter, stats))
+            for batch in batches
+        ]
+
+        # Store each batch as it lands; DB writes stay on the event loop thread
+        for finished in asyncio.as_completed(tasks):
+            batch, vectors, error = await finished
+            count = sum(len(by_hash[h]) for h in batch.hashes)
+            if error is not None:
+                logger.warning(
+                    "Error embedding a batch of %d texts", len(batch.hashes), exc_info=error
+                )
+                stats["failed"] += count
+                continue
+
+            generated = dict(zip(batch.hashes, vectors))
+            rows = [(req, generated[h]) for h in batch.hashes for req in by_hash[h]]
+            try:
+                self.service.store_embeddings([(req.id, vector) for req, vector in rows])
+                if self.service.cache:
+                    self.service.cache.put_many(generated)
+                self.db.commit()
+            except Exception:
+                logger.exception("Error storing a batch of %d embeddings", count)
+                stats["failed"] += count
+                self.db.rollback()
+                continue
+
+            stats["processed"] += count
+            embedded.extend(rows)
+
+        self.service._update_index(embedded)
+        return stats
+
+    def _lookup_cache(self, hashes: list[str]) -> dict[str, np.ndarray]:
+        if not self.service.cache:
+            return {}
+        found = {}
+        for i in range(0, len(hashes), CACHE_LOOKUP_CHUNK):
+            found.update(self.service.cache.get_many(hashes[i:i + CACHE_LOOKUP_CHUNK]))
+        return found
+
+    async def _embed_batch(
+        self,
+        batch: _Batch,
+        limiter: AdaptiveConcurrency,
+        stats: dict[str, int],
+    ) -> tuple[_Batch, Optional[list[Sequence[float]]], Optional[Exception]]:
+        """Send one batch, retrying rate-limited attempts with backoff."""
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                vectors = await self.backend.aembed(batch.texts)
+            except RateLimitedError as e:
+                stats["rate_limited"] += 1
+                delay = e.retry_after
+                if delay is None:
+                    delay = min(60.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+                await limiter.release(retry_after=delay)
+                last_error: Exception = e
+                continue
+            except Exception as e:
+                await limiter.release()
+                return batch, None, e
+
+            await limiter.release()
+            if len(vectors) != len(batch.texts):
+                return batch, None, ValueError(
+                    f"Provider returned {len(vectors)} vectors for {len(batch.texts)} texts"
+                )
+            return batch, vectors, None
+
+        return batch, None, last_error
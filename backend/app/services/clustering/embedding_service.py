@@ -1,35 +1,47 @@
 """Service for generating and managing embeddings for requirements."""
 
+import logging
 import uuid
-from typing import Optional
+from typing import Optional, Sequence
 
+import numpy as np
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
-from app.models.unified_framework import FrameworkRequirement
+from app.models.unified_framework import FrameworkRequirement, RequirementEmbedding
+from app.services.clustering.ann_index import (
+    RequirementIndex,
+    get_requirement_index,
+    set_requirement_index,
+)
+from app.services.clustering.embedding_backends import EmbeddingBackend
+from app.services.clustering.embedding_cache import EmbeddingCache, content_hash
+
+logger = logging.getLogger(__name__)
 
 
 class EmbeddingService:
     """Service for generating text embeddings.
 
-    Uses OpenAI's text-embedding-3-small model (or configured alternative)
-    to generate vector embeddings for requirements and other text content.
+    Vectors come from the configured ``EmbeddingBackend`` (OpenAI's
+    text-embedding-3-small by default, or the in-process hashing backend)
+    and are stored per backend model, so backends can be switched without
+    mixing embedding spaces.
     """
 
-    def __init__(self, db: Optional[Session] = None):
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        backend: Optional[EmbeddingBackend] = None,
+    ):
         self.db = db
-        self._client = None
-
-    @property
-    def client(self):
-        """Lazy initialization of OpenAI client."""
-        if self._client is None:
-            if not settings.openai_api_key:
-                raise ValueError("OPENAI_API_KEY not configured")
-            from openai import OpenAI
-            self._client = OpenAI(api_key=settings.openai_api_key)
-        return self._client
+        self.backend = backend or EmbeddingBackend.get_backend()
+        self.cache = (
+            EmbeddingCache(db, self.backend.model, self.backend.dimensions)
+            if db is not None and settings.embedding_cache_enabled and self.backend.cacheable
+            else None
+        )
 
     def prepare_requirement_text(self, requirement: FrameworkRequirement) -> str:
         """Prepare text for embedding from a requirement.
@@ -56,73 +68,73 @@ class EmbeddingService:
 
         return " | ".join(parts)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
-    def generate_embedding(self, text: str) -> list[float]:
+    @staticmethod
+    def truncate_text(text: str) -> str:
+        """Trim text to what the embedding model accepts."""
+        # Truncate text if too long (OpenAI has 8191 token limit)
+        # Rough estimate: 4 chars per token
+        max_chars = 8000 * 4
+        return text[:max_chars] if len(text) > max_chars else text
+
+    def generate_embedding(self, text: str) -> Sequence[float]:
         """Generate an embedding vector for the given text.
 
         Args:
             text: The text to generate an embedding for
 
         Returns:
-            List of floats representing the embedding vector
+            The embedding vector
         """
-        # Truncate text if too long (OpenAI has 8191 token limit)
-        # Rough estimate: 4 chars per token
-        max_chars = 8000 * 4
-        if len(text) > max_chars:
-            text = text[:max_chars]
-
-        response = self.client.embeddings.create(
-            model=settings.embedding_model,
-            input=text,
-            dimensions=settings.embedding_dimensions,
-        )
-
-        return response.data[0].embedding
+        return self.generate_embeddings_batch([text])[0]
 
     def generate_embeddings_batch(
         self,
         texts: list[str],
         batch_size: int = 100,
-    ) -> list[list[float]]:
+    ) -> list[Sequence[float]]:
         """Generate embeddings for multiple texts in batches.
 
+        Texts already in the embedding cache are served from it, and each
+        distinct text is sent to the provider at most once.
+
         Args:
             texts: List of texts to generate embeddings for
             batch_size: Number of texts to process per API call
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in the same order as ``texts``
         """
-        all_embeddings = []
+        texts = [self.truncate_text(t) for t in texts]
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        hashes = [content_hash(t) for t in texts]
+        vectors = self.cache.get_many(hashes) if self.cache else {}
 
-            # Truncate each text if needed
-            max_chars = 8000 * 4
-            batch = [t[:max_chars] if len(t) > max_chars else t for t in batch]
+        # Distinct texts that still need a provider call
+        pending = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in vectors:
+                pending.setdefault(digest, text)
 
-            response = self.client.embeddings.create(
-                model=settings.embedding_model,
-                input=batch,
-                dimensions=settings.embedding_dimensions,
-            )
+        generated = {}
+        keys = list(pending)
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            embeddings = self.backend.embed([pending[k] for k in batch])
+            generated.update(zip(batch, embeddings))
 
-            # Sort by index to maintain order
-            sorted_data = sorted(response.data, key=lambda x: x.index)
-            all_embeddings.extend([d.embedding for d in sorted_data])
+        if self.cache:
+            self.cache.hits += len(texts) - len(pending)
+            self.cache.misses += len(pending)
+            self.cache.put_many(generated)
 
-        return all_embeddings
+        vectors.update(generated)
+        return [vectors[digest] for digest in hashes]
 
     def embed_requirement(
         self,
         requirement_id: uuid.UUID,
         force: bool = False,
-    ) -> Optional[list[float]]:
+    ) -> Optional[Sequence[float]]:
         """Generate and store embedding for a single requirement.
 
         Args:
@@ -145,16 +157,20 @@ class EmbeddingService:
             return None
 
         # Skip if embedding exists and not forcing
-        if requirement.embedding and not force:
-            return requirement.embedding
+        existing = self.get_embedding(requirement_id)
+        if existing is not None and not force:
+            return existing
 
         # Generate embedding
         text = self.prepare_requirement_text(requirement)
         embedding = self.generate_embedding(text)
 
         # Store embedding
-        requirement.embedding = embedding
+        self.store_embeddings([(requirement.id, embedding)])
         self.db.commit()
+        # Saving rewrites the whole index file, so single additions stay in
+        # memory until the next batch run or rebuild saves it
+        self._update_index([(requirement, embedding)], persist=False)
 
         return embedding
 
@@ -168,26 +184,19 @@ class EmbeddingService:
 
         Args:
             framework_id: Optional framework filter
-            force: If True, regenerate all embeddings
+            force: If True, regenerate all embeddings (unchanged text is
+                still served from the embedding cache)
             batch_size: Number of requirements to process per batch
 
         Returns:
-            Dictionary with counts of processed, skipped, and failed
+            Dictionary with counts of processed, skipped, failed, and
+            embedding cache hits and misses
         """
-        if not self.db:
-            raise ValueError("Database session required")
-
-        query = self.db.query(FrameworkRequirement)
-
-        if framework_id:
-            query = query.filter(FrameworkRequirement.framework_id == framework_id)
-
-        if not force:
-            query = query.filter(FrameworkRequirement.embedding.is_(None))
+        requirements = self.requirements_to_embed(framework_id, force)
 
-        requirements = query.all()
-
-        stats = {"processed": 0, "skipped": 0, "failed": 0}
+        stats = {"processed": 0, "skipped": 0, "failed": 0, "cache_hits": 0, "cache_misses": 0}
+        embedded = []
+        hits, misses = (self.cache.hits, self.cache.misses) if self.cache else (0, 0)
 
         # Process in batches
         for i in range(0, len(requirements), batch_size):
@@ -201,48 +210,178 @@ class EmbeddingService:
                 embeddings = self.generate_embeddings_batch(texts, batch_size=batch_size)
 
                 # Store embeddings
-                for req, embedding in zip(batch, embeddings):
-                    req.embedding = embedding
-                    stats["processed"] += 1
-
+                self.store_embeddings(
+                    [(req.id, embedding) for req, embedding in zip(batch, embeddings)]
+                )
                 self.db.commit()
+                stats["processed"] += len(batch)
+                embedded.extend(zip(batch, embeddings))
 
-            except Exception as e:
+            except Exception:
                 # Log error and continue with next batch
-                print(f"Error processing batch: {e}")
+                logger.exception("Error embedding a batch of %d requirements", len(batch))
                 stats["failed"] += len(batch)
                 self.db.rollback()
 
+        self._update_index(embedded)
+        if self.cache:
+            stats["cache_hits"] = self.cache.hits - hits
+            stats["cache_misses"] = self.cache.misses - misses
         return stats
 
+    def requirements_to_embed(
+        self,
+        framework_id: Optional[uuid.UUID] = None,
+        force: bool = False,
+    ) -> list[FrameworkRequirement]:
+        """Requirements that need an embedding for the configured model.
+
+        Args:
+            framework_id: Optional framework filter
+            force: If True, include requirements that already have one
+
+        Returns:
+            List of requirements
+        """
+        if not self.db:
+            raise ValueError("Database session required")
+
+        query = self.db.query(FrameworkRequirement)
+
+        if framework_id:
+            query = query.filter(FrameworkRequirement.framework_id == framework_id)
+
+        if not force:
+            query = query.filter(~self.has_embedding())
+
+        return query.all()
+
     def get_embedding(
         self,
         requirement_id: uuid.UUID,
-    ) -> Optional[list[float]]:
+    ) -> Optional[np.ndarray]:
         """Get the embedding for a requirement.
 
         Args:
             requirement_id: The requirement's UUID
 
         Returns:
-            The embedding vector, or None if not found
+            The embedding as a read-only float32 array, or None if not found
         """
         if not self.db:
             raise ValueError("Database session required")
 
-        requirement = (
-            self.db.query(FrameworkRequirement)
-            .filter(FrameworkRequirement.id == requirement_id)
-            .first()
+        return (
+            self.db.query(RequirementEmbedding.vector)
+            .filter(
+                RequirementEmbedding.requirement_id == requirement_id,
+                *self._active_model_filter(),
+            )
+            .scalar()
+        )
+
+    def get_embeddings(
+        self,
+        requirement_ids: list[uuid.UUID],
+    ) -> dict[uuid.UUID, np.ndarray]:
+        """Bulk-load embeddings for a set of requirements.
+
+        Args:
+            requirement_ids: Requirement UUIDs to load
+
+        Returns:
+            Dictionary mapping requirement id to embedding (missing ids omitted)
+        """
+        if not self.db:
+            raise ValueError("Database session required")
+
+        if not requirement_ids:
+            return {}
+
+        rows = (
+            self.db.query(RequirementEmbedding.requirement_id, RequirementEmbedding.vector)
+            .filter(
+                RequirementEmbedding.requirement_id.in_(requirement_ids),
+                *self._active_model_filter(),
+            )
+            .all()
         )
+        return {req_id: vector for req_id, vector in rows}
+
+    def store_embeddings(
+        self,
+        embeddings: list[tuple[uuid.UUID, Sequence[float]]],
+    ) -> None:
+        """Insert or update embeddings for the configured model (caller commits).
 
-        return requirement.embedding if requirement else None
+        Args:
+            embeddings: List of (requirement_id, vector) tuples
+        """
+        if not embeddings:
+            return
+
+        existing = {
+            row.requirement_id: row
+            for row in self.db.query(RequirementEmbedding).filter(
+                RequirementEmbedding.requirement_id.in_([rid for rid, _ in embeddings]),
+                *self._active_model_filter(),
+            )
+        }
+
+        for requirement_id, vector in embeddings:
+            row = existing.get(requirement_id)
+            if row is not None:
+                row.vector = vector
+            else:
+                self.db.add(RequirementEmbedding(
+                    id=uuid.uuid4(),
+                    requirement_id=requirement_id,
+                    model=self.backend.model,
+                    dimensions=self.backend.dimensions,
+                    vector=vector,
+                ))
+
+    def query_with_embeddings(self, *entities):
+        """Start a query over requirements that have an embedding for the configured model.
+
+        Select ``RequirementEmbedding.vector`` alongside requirement columns to
+        load vectors in the same round trip, e.g.
+        ``query_with_embeddings(FrameworkRequirement, RequirementEmbedding.vector)``.
+        """
+        return (
+            self.db.query(*entities)
+            .select_from(FrameworkRequirement)
+            .join(
+                RequirementEmbedding,
+                and_(
+                    RequirementEmbedding.requirement_id == FrameworkRequirement.id,
+                    *self._active_model_filter(),
+                ),
+            )
+        )
+
+    def has_embedding(self):
+        """EXISTS clause: the requirement has an embedding for the configured model."""
+        return (
+            self.db.query(RequirementEmbedding.id)
+            .filter(
+                RequirementEmbedding.requirement_id == FrameworkRequirement.id,
+                *self._active_model_filter(),
+            )
+            .exists()
+        )
+
+    def _active_model_filter(self) -> tuple:
+        return (
+            RequirementEmbedding.model == self.backend.model,
+            RequirementEmbedding.dimensions == self.backend.dimensions,
+        )
 
     def get_requirements_with_embeddings(
         self,
         framework_id: Optional[uuid.UUID] = None,
         is_assessable: Optional[bool] = None,
-    ) -> list[tuple[FrameworkRequirement, list[float]]]:
+    ) -> list[tuple[FrameworkRequirement, np.ndarray]]:
         """Get all requirements that have embeddings.
 
         Args:
@@ -255,9 +394,7 @@ class EmbeddingService:
         if not self.db:
             raise ValueError("Database session required")
 
-        query = self.db.query(FrameworkRequirement).filter(
-            FrameworkRequirement.embedding.isnot(None)
-        )
+        query = self.query_with_embeddings(FrameworkRequirement, RequirementEmbedding.vector)
 
         if framework_id:
             query = query.filter(FrameworkRequirement.framework_id == framework_id)
@@ -265,5 +402,55 @@ class EmbeddingService:
         if is_assessable is not None:
             query = query.filter(FrameworkRequirement.is_assessable == is_assessable)
 
-        requirements = query.all()
-        return [(req, req.embedding) for req in requirements]
+        return [(req, vector) for req, vector in query.all()]
+
+    def rebuild_index(self, nlist: Optional[int] = None) -> RequirementIndex:
+        """Build the nearest-neighbour index from all stored embeddings and save it.
+
+        Args:
+            nlist: Optional number of inverted lists (defaults to sqrt(n))
+
+        Returns:
+            The newly built RequirementIndex
+        """
+        index = RequirementIndex.build(
+            [
+                (req.id, req.framework_id, req.is_assessable, embedding)
+                for req, embedding in self.get_requirements_with_embeddings()
+            ],
+            dimensions=self.backend.dimensions,
+            nlist=nlist,
+            model=self.backend.model,
+        )
+        set_requirement_index(index)
+        return index
+
+    def get_index(self) -> Optional[RequirementIndex]:
+        """The nearest-neighbour index, if one was built for the active backend."""
+        index = get_requirement_index()
+        if index is None or index.dimensions != self.backend.dimensions:
+            return None
+        if index.model is not None and index.model != self.backend.model:
+            return None
+        return index
+
+    def _update_index(
+        self,
+        embedded: list[tuple[FrameworkRequirement, Sequence[float]]],
+        persist: bool = True,
+    ) -> None:
+        """Write freshly stored embeddings into the index, if one has been built.
+
+        Args:
+            embedded: Requirements with their new embeddings
+            persist: Also save the index file (the whole index is rewritten)
+        """
+        index = self.get_index()
+        if index is None or not embedded:
+            return
+
+        index.add(
+            (req.id, req.framework_id, req.is_assessable, vector)
+            for req, vector in embedded
+        )
+        set_requirement_index(index, persist=persist)
@@ -0,0 +1,286 @@
+"""Average-linkage agglomerative clustering cut at a similarity threshold.
+
+Requirements are first split into connected components of the threshold
+graph (pairs with similarity >= threshold). Average linkage over a
+thresholded matrix can never merge clusters with no such pair between them,
+so each component is clustered independently with the nearest-neighbour
+chain algorithm. This gives the same clusters as repeatedly merging the most
+similar pair until none reaches the threshold, in roughly O(n * m) time for
+components of size m instead of O(n^3).
+
+Components of up to ``DENSE_COMPONENT_SIZE`` requirements are clustered on a
+dense float64 matrix updated with the Lance-Williams formula, which costs
+8 * m^2 bytes (32 MB at the default limit). Larger components, such as one
+giant component at a low threshold, keep per-cluster dicts of summed
+similarities to neighbouring clusters instead, so memory stays proportional
+to the number of edges at the cost of slower Python-level updates.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from app.services.clustering.similarity_graph import SimilarityGraph
+from app.services.clustering.vector_engine import VectorEngine
+
+# Largest component clustered on a dense matrix (8 * m^2 bytes)
+DENSE_COMPONENT_SIZE = 2048
+
+
+def connected_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Label the connected components of an undirected graph with union-find.
+
+    Args:
+        n: Number of nodes
+        rows: Edge source indices
+        cols: Edge target indices
+
+    Returns:
+        Array of length n; nodes in the same component share a label
+    """
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
+    for a, b in zip(rows.tolist(), cols.tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            # Lower index becomes the root so labels are deterministic
+            if ra < rb:
+                parent[rb] = ra
+            else:
+                parent[ra] = rb
+
+    return np.fromiter((find(i) for i in range(n)), dtype=np.int64, count=n)
+
+
+def average_linkage(similarity: np.ndarray, threshold: float) -> list[list[int]]:
+    """Cluster one component with the nearest-neighbour chain algorithm.
+
+    Args:
+        similarity: Dense (m, m) similarity matrix; it is overwritten
+        threshold: Clusters merge only while their average similarity reaches this
+
+    Returns:
+        Clusters as sorted lists of row indices, including singletons
+    """
+    m = similarity.shape[0]
+    sim = similarity.astype(np.float64, copy=False)
+    np.fill_diagonal(sim, -np.inf)
+
+    sizes = np.ones(m, dtype=np.float64)
+    members: dict[int, list[int]] = {i: [i] for i in range(m)}
+    final: list[list[int]] = []
+    active = np.ones(m, dtype=bool)
+    chain: list[int] = []
+    next_start = 0
+
+    while True:
+        if not chain:
+            while next_start < m and not active[next_start]:
+                next_start += 1
+            if next_start == m:
+                break
+            chain.append(next_start)
+
+        a = chain[-1]
+        row = sim[a]
+        b = int(np.argmax(row))
+        best = row[b]
+        # Prefer the previous chain element on ties so reciprocal pairs are found
+        if len(chain) > 1 and row[chain[-2]] >= best:
+            b = chain[-2]
+            best = row[b]
+
+        if best < threshold:
+            # Average linkage never raises a cluster's best similarity, so
+            # nothing below the threshold now can reach it later
+            final.append(members.pop(a))
+            _deactivate(sim, active, a)
+            chain.pop()
+            continue
+
+        if len(chain) > 1 and b == chain[-2]:
+            chain.pop()
+            chain.pop()
+            keep, drop = min(a, b), max(a, b)
+            # Lance-Williams update for average linkage
+            merged = (sizes[a] * sim[a] + sizes[b] * sim[b]) / (sizes[a] + sizes[b])
+            merged[a] = merged[b] = -np.inf
+            sim[keep] = merged
+            sim[:, keep] = merged
+            sizes[keep] += sizes[drop]
+            members[keep] = members[keep] + members.pop(drop)
+            _deactivate(sim, active, drop)
+        else:
+            chain.append(b)
+
+    return sorted(sorted(cluster) for cluster in final)
+
+
+def _deactivate(sim: np.ndarray, active: np.ndarray, i: int) -> None:
+    active[i] = False
+    sim[i, :] = -np.inf
+    sim[:, i] = -np.inf
+
+
+def sparse_average_linkage(
+    neighbors: list[dict[int, float]],
+    threshold: float,
+) -> list[list[int]]:
+    """Cluster one component with the nearest-neighbour chain over its edges.
+
+    Each cluster keeps the summed similarity of all member pairs to every
+    neighbouring cluster, so the average linkage between two clusters is
+    that sum divided by the product of their sizes, and a merge adds the two
+    neighbour dicts. Pairs without an edge count as 0, which is below any
+    positive threshold.
+
+    Args:
+        neighbors: Per-node {neighbour: similarity} dicts; they are overwritten
+        threshold: Clusters merge only while their average similarity reaches this
+
+    Returns:
+        Clusters as sorted lists of node indices, including singletons
+    """
+    m = len(neighbors)
+    sums = neighbors
+    sizes = [1] * m
+    members: dict[int, list[int]] = {i: [i] for i in range(m)}
+    final: list[list[int]] = []
+    active = [True] * m
+    chain: list[int] = []
+    next_start = 0
+
+    while True:
+        if not chain:
+            while next_start < m and not active[next_start]:
+                next_start += 1
+            if next_start == m:
+                break
+            chain.append(next_start)
+
+        a = chain[-1]
+        b, best = -1, -np.inf
+        for c, total in sums[a].items():
+            score = total / (sizes[a] * sizes[c])
+            # Lowest index wins ties, as with argmax over a dense row
+            if score > best or (score == best and c < b):
+                b, best = c, score
+        # Prefer the previous chain element on ties so reciprocal pairs are found
+        if len(chain) > 1 and chain[-2] in sums[a]:
+            prev = chain[-2]
+            score = sums[a][prev] / (sizes[a] * sizes[prev])
+            if score >= best:
+                b, best = prev, score
+
+        if best < threshold:
+            final.append(members.pop(a))
+            for c in sums[a]:
+                del sums[c][a]
+            sums[a] = {}
+            active[a] = False
+            chain.pop()
+            continue
+
+        if len(chain) > 1 and b == chain[-2]:
+            chain.pop()
+            chain.pop()
+            keep, drop = min(a, b), max(a, b)
+            merged = dict(sums[keep])
+            for c, total in sums[drop].items():
+                merged[c] = merged.get(c, 0.0) + total
+            merged.pop(keep, None)
+            merged.pop(drop, None)
+            for c in sums[drop]:
+                if c != keep:
+                    del sums[c][drop]
+            for c, total in merged.items():
+                sums[c][keep] = total
+            sums[keep] = merged
+            sums[drop] = {}
+            sizes[keep] += sizes[drop]
+            members[keep] = members[keep] + members.pop(drop)
+            active[drop] = False
+        else:
+            chain.append(b)
+
+    return sorted(sorted(cluster) for cluster in final)
+
+
+def cluster_graph(
+    graph: SimilarityGraph,
+    threshold: float,
+    min_cluster_size: int = 2,
+    dense_limit: int = DENSE_COMPONENT_SIZE,
+) -> list[list[int]]:
+    """Average-linkage clusters over a thresholded similarity graph.
+
+    Pairs missing from the graph count as similarity 0, as in
+    ``SimilarityService.build_similarity_matrix``.
+
+    Args:
+        graph: Symmetric graph holding every pair with similarity >= threshold
+        threshold: Similarity threshold for merging (must be positive)
+        min_cluster_size: Minimum cluster size to return
+        dense_limit: Largest component clustered on a dense matrix
+
+    Returns:
+        Clusters as sorted lists of node indices, ordered by first member
+    """
+    n = len(graph)
+    if n == 0:
+        return []
+
+    rows, cols, _ = graph.edges()
+    labels = connected_components(n, rows, cols)
+
+    components = defaultdict(list)
+    for i, label in enumerate(labels.tolist()):
+        components[label].append(i)
+
+    clusters = []
+    for component in components.values():
+        if len(component) < max(2, min_cluster_size):
+            continue
+
+        if len(component) <= dense_limit:
+            local_clusters = average_linkage(graph.dense_submatrix(component), threshold)
+        else:
+            local_clusters = sparse_average_linkage(
+                graph.neighbor_dicts(component), threshold
+            )
+
+        for local in local_clusters:
+            if len(local) >= min_cluster_size:
+                clusters.append([component[i] for i in local])
+
+    clusters.sort(key=lambda cluster: cluster[0])
+    return clusters
+
+
+def cluster_vectors(
+    engine: VectorEngine,
+    threshold: float,
+    min_cluster_size: int = 2,
+    block_size: int = 1024,
+    dense_limit: int = DENSE_COMPONENT_SIZE,
+) -> list[list[int]]:
+    """Average-linkage clusters over the thresholded cosine similarities of ``engine``.
+
+    Args:
+        engine: Vectors to cluster
+        threshold: Similarity threshold for merging
+        min_cluster_size: Minimum cluster size to return
+        block_size: Rows per block when building the similarity graph
+        dense_limit: Largest component clustered on a dense matrix
+
+    Returns:
+        Clusters as sorted lists of row indices, ordered by first member
+    """
+    graph = SimilarityGraph.build(engine, threshold, block_size=block_size)
+    return cluster_graph(graph, threshold, min_cluster_size, dense_limit=dense_limit)
@@ -0,0 +1,211 @@
+"""Sparse thresholded similarity graph."""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.services.clustering.vector_engine import VectorEngine
+
+
+class SimilarityGraph:
+    """Similarity edges at or above a threshold, stored in CSR form.
+
+    Row ``i`` holds its neighbours in ``indices[indptr[i]:indptr[i + 1]]``
+    with similarities in the matching slice of ``data``. Everything not
+    stored is treated as 0, so memory grows with the number of edges rather
+    than with n^2.
+
+    Graphs built with ``build`` are square and symmetric (no self-loops);
+    ``between`` builds a rectangular graph from one set of vectors to another.
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        shape: tuple[int, int],
+        threshold: float = 0.0,
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+        self.threshold = threshold
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    @property
+    def num_edges(self) -> int:
+        """Stored entries (each undirected edge of a symmetric graph counts twice)."""
+        return int(self.indptr[-1])
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+
+    @classmethod
+    def from_edges(
+        cls,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        shape: tuple[int, int],
+        symmetric: bool = False,
+        threshold: float = 0.0,
+    ) -> "SimilarityGraph":
+        """Build a graph from COO edge arrays.
+
+        Args:
+            rows: Edge row indices
+            cols: Edge column indices
+            values: Edge similarities
+            shape: (rows, columns) of the full matrix
+            symmetric: Also store every edge in the reverse direction
+            threshold: Threshold the edges were selected with
+
+        Returns:
+            SimilarityGraph with each row's entries sorted by column
+        """
+        if symmetric:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+            values = np.concatenate([values, values])
+
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+
+        return cls(
+            indptr=indptr,
+            indices=np.asarray(cols, dtype=np.int32)[order],
+            data=np.asarray(values, dtype=np.float32)[order],
+            shape=shape,
+            threshold=threshold,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        engine: VectorEngine,
+        threshold: float,
+        block_size: int = 1024,
+    ) -> "SimilarityGraph":
+        """Symmetric graph of all pairs in ``engine`` with similarity >= threshold.
+
+        Similarities are computed in row blocks, so peak memory is bounded by
+        ``block_size * len(engine)`` scores plus the edges kept.
+        """
+        rows, cols, values = engine.threshold_pairs(threshold, block_size=block_size)
+        n = len(engine)
+        return cls.from_edges(rows, cols, values, (n, n), symmetric=True, threshold=threshold)
+
+    @classmethod
+    def between(
+        cls,
+        source: VectorEngine,
+        target: VectorEngine,
+        threshold: float,
+        top_k: Optional[int] = None,
+        block_size: int = 1024,
+    ) -> "SimilarityGraph":
+        """Graph from each source vector to the target vectors it matches.
+
+        Args:
+            source: Row vectors
+            target: Column vectors
+            threshold: Minimum similarity to keep an edge
+            top_k: Optional cap on edges per source row; capped rows keep their
+                best matches, ordered by similarity
+            block_size: Source rows per matrix product
+
+        Returns:
+            Rectangular SimilarityGraph of shape (len(source), len(target))
+        """
+        shape = (len(source), len(target))
+        rows, cols, values = [], [], []
+        if len(target) and source.dimensions == target.dimensions:
+            for start in range(0, len(source), block_size):
+                block = source.matrix[start:start + block_size] @ target.matrix.T
+                if top_k is None:
+                    r, c = np.nonzero(block >= threshold)
+                    rows.append(r + start)
+                    cols.append(c)
+                    values.append(block[r, c])
+                    continue
+                for offset, scores in enumerate(block):
+                    picked = VectorEngine.select_top_k(scores, top_k, threshold)
+                    if picked:
+                        idx, picked_scores = zip(*picked)
+                        rows.append(np.full(len(idx), start + offset))
+                        cols.append(np.asarray(idx))
+                        values.append(np.asarray(picked_scores))
+
+        if not rows:
+            return cls.from_edges(
+                np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                np.zeros(0, dtype=np.float32), shape, threshold=threshold,
+            )
+
+        rows = np.concatenate(rows).astype(np.int64)
+        cols = np.concatenate(cols).astype(np.int64)
+        values = np.concatenate(values).astype(np.float32)
+        if top_k is None:
+            return cls.from_edges(rows, cols, values, shape, threshold=threshold)
+
+        # Edges were generated row by row in rank order; keep that order
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32), values, shape, threshold=threshold)
+
+    def neighbors(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """Column indices and similarities stored for row ``i``."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All stored entries as COO (rows, columns, similarities) arrays."""
+        rows = np.repeat(np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr))
+        return rows, self.indices.astype(np.int64), self.data
+
+    def dense_submatrix(self, nodes: Sequence[int]) -> np.ndarray:
+        """Dense float64 similarity matrix among ``nodes`` (missing edges are 0).
+
+        Takes 8 * len(nodes)^2 bytes; see ``neighbor_dicts`` for large node sets.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        position = np.full(self.shape[1], -1, dtype=np.int64)
+        position[nodes] = np.arange(len(nodes))
+
+        out = np.zeros((len(nodes), len(nodes)), dtype=np.float64)
+        for local, node in enumerate(nodes.tolist()):
+            cols, values = self.neighbors(node)
+            mapped = position[cols]
+            keep = mapped >= 0
+            out[local, mapped[keep]] = values[keep]
+        return out
+
+    def neighbor_dicts(self, nodes: Sequence[int]) -> list[dict[int, float]]:
+        """Edges among ``nodes`` as per-node {neighbour: similarity} dicts.
+
+        Nodes and neighbours are numbered by position in ``nodes``; unlike
+        ``dense_submatrix`` this takes memory proportional to the edges.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        position = np.full(self.shape[1], -1, dtype=np.int64)
+        position[nodes] = np.arange(len(nodes))
+
+        out = []
+        for node in nodes.tolist():
+            cols, values = self.neighbors(node)
+            mapped = position[cols]
+            keep = mapped >= 0
+            out.append(dict(zip(mapped[keep].tolist(), values[keep].astype(np.float64).tolist())))
+        return out
+
+    def to_dense(self) -> np.ndarray:
+        """Full dense matrix; only sensible for small graphs."""
+        out = np.zeros(self.shape, dtype=np.float32)
+        rows, cols, values = self.edges()
+        out[rows, cols] = values
+        return out
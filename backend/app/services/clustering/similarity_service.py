@@ -1,21 +1,27 @@
 """Service for computing similarity between requirements."""
 
 import uuid
-from typing import Optional
+from typing import Optional, Sequence
 import math
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.unified_framework import FrameworkRequirement
+from app.models.unified_framework import FrameworkRequirement, RequirementEmbedding
+from app.services.clustering.ann_index import RequirementIndex
 from app.services.clustering.embedding_service import EmbeddingService
+from app.services.clustering.similarity_graph import SimilarityGraph
+from app.services.clustering.vector_engine import VectorEngine
 
 
 class SimilarityService:
     """Service for computing semantic similarity between requirements.
 
     Uses cosine similarity on embedding vectors to find related requirements
-    across different frameworks.
+    across different frameworks. Bulk operations run on a ``VectorEngine``
+    so candidates are scored with batched matrix products; single-query
+    lookups use the persistent nearest-neighbour index once it has been built.
     """
 
     def __init__(self, db: Session):
@@ -23,7 +29,7 @@ class SimilarityService:
         self.embedding_service = EmbeddingService(db)
 
     @staticmethod
-    def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
+    def cosine_similarity(vec1: Sequence[float], vec2: Sequence[float]) -> float:
         """Compute cosine similarity between two vectors.
 
         Args:
@@ -33,7 +39,7 @@ class SimilarityService:
         Returns:
             Cosine similarity score (0.0 to 1.0)
         """
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
+        if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec1) != len(vec2):
             return 0.0
 
         dot_product = sum(a * b for a, b in zip(vec1, vec2))
@@ -46,7 +52,7 @@ class SimilarityService:
         return dot_product / (norm1 * norm2)
 
     @staticmethod
-    def euclidean_distance(vec1: list[float], vec2: list[float]) -> float:
+    def euclidean_distance(vec1: Sequence[float], vec2: Sequence[float]) -> float:
         """Compute Euclidean distance between two vectors.
 
         Args:
@@ -56,7 +62,7 @@ class SimilarityService:
         Returns:
             Euclidean distance (lower = more similar)
         """
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
+        if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec1) != len(vec2):
             return float('inf')
 
         return math.sqrt(sum((a - b) ** 2 for a, b in zip(vec1, vec2)))
@@ -87,16 +93,28 @@ class SimilarityService:
             .filter(FrameworkRequirement.id == requirement_id)
             .first()
         )
+        source_embedding = (
+            self.embedding_service.get_embedding(requirement_id) if source else None
+        )
 
-        if not source or not source.embedding:
+        if source_embedding is None or len(source_embedding) == 0:
             return []
 
-        source_embedding = source.embedding
+        index = self.embedding_service.get_index()
+        if index is not None and index.dimensions == len(source_embedding):
+            return self._search_index(
+                index,
+                source_embedding,
+                top_k=top_k,
+                threshold=threshold,
+                exclude_framework_id=source.framework_id if exclude_same_framework else None,
+                only_assessable=only_assessable,
+                exclude_ids=[requirement_id],
+            )
 
         # Query all requirements with embeddings
-        query = self.db.query(FrameworkRequirement).filter(
+        query = self._embedded_requirements().filter(
             FrameworkRequirement.id != requirement_id,
-            FrameworkRequirement.embedding.isnot(None),
         )
 
         if exclude_same_framework:
@@ -109,16 +127,7 @@ class SimilarityService:
 
         candidates = query.all()
 
-        # Compute similarities
-        results = []
-        for candidate in candidates:
-            similarity = self.cosine_similarity(source_embedding, candidate.embedding)
-            if similarity >= threshold:
-                results.append((candidate, similarity))
-
-        # Sort by similarity (descending) and take top_k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        return self._rank_candidates(source_embedding, candidates, top_k, threshold)
 
     def find_similar_to_text(
         self,
@@ -145,10 +154,19 @@ class SimilarityService:
         # Generate embedding for the text
         text_embedding = self.embedding_service.generate_embedding(text)
 
+        index = self.embedding_service.get_index()
+        if index is not None and index.dimensions == len(text_embedding):
+            return self._search_index(
+                index,
+                text_embedding,
+                top_k=top_k,
+                threshold=threshold,
+                framework_id=framework_id,
+                only_assessable=only_assessable,
+            )
+
         # Query all requirements with embeddings
-        query = self.db.query(FrameworkRequirement).filter(
-            FrameworkRequirement.embedding.isnot(None)
-        )
+        query = self._embedded_requirements()
 
         if framework_id:
             query = query.filter(FrameworkRequirement.framework_id == framework_id)
@@ -158,16 +176,108 @@ class SimilarityService:
 
         candidates = query.all()
 
-        # Compute similarities
-        results = []
-        for candidate in candidates:
-            similarity = self.cosine_similarity(text_embedding, candidate.embedding)
-            if similarity >= threshold:
-                results.append((candidate, similarity))
+        return self._rank_candidates(text_embedding, candidates, top_k, threshold)
 
-        # Sort by similarity (descending) and take top_k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+    def _search_index(
+        self,
+        index: RequirementIndex,
+        vector: Sequence[float],
+        top_k: int,
+        threshold: float,
+        framework_id: Optional[uuid.UUID] = None,
+        exclude_framework_id: Optional[uuid.UUID] = None,
+        only_assessable: bool = False,
+        exclude_ids: Optional[list[uuid.UUID]] = None,
+    ) -> list[tuple[FrameworkRequirement, float]]:
+        """Search the index and load the hits, re-checking filters against the database.
+
+        The index keeps each requirement's framework and assessability from
+        when it was written, and other processes may have changed or deleted
+        rows since. Hits that no longer pass the filters are excluded and the
+        search repeated, so callers still get up to ``top_k`` results; the
+        stale entries are corrected in the index as they are found.
+        """
+        excluded = set(exclude_ids or ())
+        while True:
+            ranked_ids = index.search(
+                vector,
+                top_k=top_k,
+                threshold=threshold,
+                framework_id=framework_id,
+                exclude_framework_id=exclude_framework_id,
+                only_assessable=only_assessable,
+                exclude_ids=excluded,
+            )
+            by_id = self._load_requirements([rid for rid, _ in ranked_ids])
+
+            stale = []
+            for rid, _ in ranked_ids:
+                req = by_id.get(rid)
+                if req is None:
+                    index.remove([rid])
+                    stale.append(rid)
+                elif only_assessable and not req.is_assessable:
+                    index.set_assessable([rid], False)
+                    stale.append(rid)
+                elif framework_id is not None and req.framework_id != framework_id:
+                    stale.append(rid)
+                elif exclude_framework_id is not None and req.framework_id == exclude_framework_id:
+                    stale.append(rid)
+
+            if not stale:
+                return [(by_id[rid], score) for rid, score in ranked_ids]
+            excluded.update(stale)
+
+    def _load_requirements(
+        self,
+        requirement_ids: list[uuid.UUID],
+    ) -> dict[uuid.UUID, FrameworkRequirement]:
+        """Load requirements by id."""
+        if not requirement_ids:
+            return {}
+
+        requirements = (
+            self.db.query(FrameworkRequirement)
+            .filter(FrameworkRequirement.id.in_(requirement_ids))
+            .all()
+        )
+        return {req.id: req for req in requirements}
+
+    def _embedded_requirements(self):
+        """Query yielding (requirement, vector) rows for embedded requirements."""
+        return self.embedding_service.query_with_embeddings(
+            FrameworkRequirement, RequirementEmbedding.vector
+        )
+
+    @staticmethod
+    def _rank_candidates(
+        query_embedding: Sequence[float],
+        candidates: list[tuple[FrameworkRequirement, np.ndarray]],
+        top_k: int,
+        threshold: float,
+    ) -> list[tuple[FrameworkRequirement, float]]:
+        """Score candidates against a query embedding and keep the top-k.
+
+        Args:
+            query_embedding: Embedding to compare against
+            candidates: (requirement, embedding) rows
+            top_k: Maximum number of results to return
+            threshold: Minimum similarity score
+
+        Returns:
+            List of (requirement, similarity_score) tuples, sorted by similarity
+        """
+        if not candidates:
+            return []
+
+        engine = VectorEngine(
+            (vector for _, vector in candidates),
+            dimensions=len(query_embedding),
+        )
+        return [
+            (candidates[idx][0], score)
+            for idx, score in engine.top_k(query_embedding, top_k, threshold)
+        ]
 
     def compute_pairwise_similarities(
         self,
@@ -181,32 +291,51 @@ class SimilarityService:
         Returns:
             Dictionary mapping (id1, id2) pairs to similarity scores
         """
-        # Fetch all requirements
-        requirements = (
-            self.db.query(FrameworkRequirement)
-            .filter(
-                FrameworkRequirement.id.in_(requirement_ids),
-                FrameworkRequirement.embedding.isnot(None),
-            )
-            .all()
-        )
+        # Fetch embeddings only; no requirement rows are needed here
+        vectors = self.embedding_service.get_embeddings(requirement_ids)
+        present_ids = [rid for rid in requirement_ids if rid in vectors]
+        if not present_ids:
+            return {}
 
-        req_map = {req.id: req for req in requirements}
+        engine = VectorEngine(vectors[rid] for rid in present_ids)
+        matrix = engine.pairwise().tolist()
 
         # Compute pairwise similarities
         similarities = {}
-        for i, id1 in enumerate(requirement_ids):
-            for id2 in requirement_ids[i + 1:]:
-                if id1 in req_map and id2 in req_map:
-                    similarity = self.cosine_similarity(
-                        req_map[id1].embedding,
-                        req_map[id2].embedding,
-                    )
-                    similarities[(id1, id2)] = similarity
-                    similarities[(id2, id1)] = similarity
+        for i, id1 in enumerate(present_ids):
+            row = matrix[i]
+            for j in range(i + 1, len(present_ids)):
+                id2 = present_ids[j]
+                similarities[(id1, id2)] = row[j]
+                similarities[(id2, id1)] = row[j]
 
         return similarities
 
+    def get_requirement_vectors(
+        self,
+        framework_ids: Optional[list[uuid.UUID]] = None,
+        only_assessable: bool = True,
+    ) -> tuple[list[FrameworkRequirement], list[np.ndarray]]:
+        """Load embedded requirements and their vectors in one query.
+
+        Args:
+            framework_ids: Optional list of frameworks to include
+            only_assessable: If True, only include assessable requirements
+
+        Returns:
+            Tuple of (requirements, vectors) in matching order
+        """
+        query = self._embedded_requirements()
+
+        if framework_ids:
+            query = query.filter(FrameworkRequirement.framework_id.in_(framework_ids))
+
+        if only_assessable:
+            query = query.filter(FrameworkRequirement.is_assessable == True)
+
+        rows = query.all()
+        return [req for req, _ in rows], [vector for _, vector in rows]
+
     def build_similarity_matrix(
         self,
         framework_ids: Optional[list[uuid.UUID]] = None,
@@ -222,35 +351,45 @@ class SimilarityService:
 
         Returns:
             Tuple of (list of requirements, similarity matrix)
+
+        The matrix is dense Python floats, n^2 in memory; prefer
+        ``build_similarity_graph`` for anything beyond a few thousand requirements.
         """
-        query = self.db.query(FrameworkRequirement).filter(
-            FrameworkRequirement.embedding.isnot(None)
-        )
+        requirements, vectors = self.get_requirement_vectors(framework_ids, only_assessable)
+        if not requirements:
+            return requirements, []
 
-        if framework_ids:
-            query = query.filter(FrameworkRequirement.framework_id.in_(framework_ids))
+        # Build similarity matrix
+        matrix = VectorEngine(vectors).pairwise()
+        matrix[matrix < threshold] = 0.0
+        np.fill_diagonal(matrix, 1.0)  # Self-similarity
 
-        if only_assessable:
-            query = query.filter(FrameworkRequirement.is_assessable == True)
+        return requirements, matrix.tolist()
 
-        requirements = query.all()
-        n = len(requirements)
+    def build_similarity_graph(
+        self,
+        framework_ids: Optional[list[uuid.UUID]] = None,
+        only_assessable: bool = True,
+        threshold: float = 0.85,
+        block_size: int = 1024,
+    ) -> tuple[list[FrameworkRequirement], SimilarityGraph]:
+        """Build a sparse graph of requirement pairs at or above a threshold.
 
-        # Build similarity matrix
-        matrix = [[0.0] * n for _ in range(n)]
+        Similarities are computed in row blocks and only edges at or above
+        ``threshold`` are kept, so memory scales with the number of edges.
 
-        for i in range(n):
-            matrix[i][i] = 1.0  # Self-similarity
-            for j in range(i + 1, n):
-                similarity = self.cosine_similarity(
-                    requirements[i].embedding,
-                    requirements[j].embedding,
-                )
-                if similarity >= threshold:
-                    matrix[i][j] = similarity
-                    matrix[j][i] = similarity
+        Args:
+            framework_ids: Optional list of frameworks to include
+            only_assessable: If True, only include assessable requirements
+            threshold: Minimum similarity to keep an edge
+            block_size: Requirements per block
 
-        return requirements, matrix
+        Returns:
+            Tuple of (list of requirements, graph indexed like the list)
+        """
+        requirements, vectors = self.get_requirement_vectors(framework_ids, only_assessable)
+        graph = SimilarityGraph.build(VectorEngine(vectors), threshold, block_size=block_size)
+        return requirements, graph
 
     def find_cross_framework_candidates(
         self,
@@ -270,41 +409,42 @@ class SimilarityService:
         Returns:
             List of (source, target, similarity) tuples
         """
-        # Get source requirements
-        source_reqs = (
-            self.db.query(FrameworkRequirement)
+        # Get source and target requirements with their embeddings
+        source_rows = (
+            self._embedded_requirements()
             .filter(
                 FrameworkRequirement.framework_id == source_framework_id,
                 FrameworkRequirement.is_assessable == True,
-                FrameworkRequirement.embedding.isnot(None),
             )
             .all()
         )
-
-        # Get target requirements
-        target_reqs = (
-            self.db.query(FrameworkRequirement)
+        target_rows = (
+            self._embedded_requirements()
             .filter(
                 FrameworkRequirement.framework_id == target_framework_id,
                 FrameworkRequirement.is_assessable == True,
-                FrameworkRequirement.embedding.isnot(None),
             )
             .all()
         )
 
-        candidates = []
+        if not source_rows or not target_rows:
+            return []
 
-        for source in source_reqs:
-            # Find top similar targets
-            similarities = []
-            for target in target_reqs:
-                sim = self.cosine_similarity(source.embedding, target.embedding)
-                if sim >= threshold:
-                    similarities.append((target, sim))
+        source_engine = VectorEngine(vector for _, vector in source_rows)
+        target_engine = VectorEngine(
+            (vector for _, vector in target_rows),
+            dimensions=source_engine.dimensions,
+        )
 
-            # Sort and take top-k
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            for target, sim in similarities[:top_k_per_requirement]:
-                candidates.append((source, target, sim))
+        graph = SimilarityGraph.between(
+            source_engine,
+            target_engine,
+            threshold=threshold,
+            top_k=top_k_per_requirement,
+        )
+        rows, cols, sims = graph.edges()
 
-        return candidates
+        return [
+            (source_rows[i][0], target_rows[j][0], sim)
+            for i, j, sim in zip(rows.tolist(), cols.tolist(), sims.tolist())
+        ]
@@ -0,0 +1,203 @@
+"""NumPy-backed vector engine for batched similarity search over embeddings."""
+
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+
+class VectorEngine:
+    """In-memory matrix of L2-normalized float32 embeddings.
+
+    Vectors are normalized once at load time so that cosine similarity
+    reduces to a dot product, letting every similarity operation run as a
+    batched matrix product instead of a per-pair Python loop.
+
+    Vectors that are missing, empty, or of the wrong dimension are stored
+    as zero rows, which score 0.0 against everything - the same result the
+    pure-Python ``SimilarityService.cosine_similarity`` gives for them.
+    """
+
+    def __init__(
+        self,
+        vectors: Iterable[Optional[Sequence[float]]],
+        keys: Optional[Sequence[Any]] = None,
+        dimensions: Optional[int] = None,
+    ):
+        vectors = list(vectors)
+        if dimensions is None:
+            dimensions = next((len(v) for v in vectors if v is not None and len(v)), 0)
+
+        self.dimensions = dimensions
+        self.keys = list(keys) if keys is not None else list(range(len(vectors)))
+        self.matrix = self._build_matrix(vectors, dimensions)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @staticmethod
+    def _build_matrix(
+        vectors: list[Optional[Sequence[float]]],
+        dimensions: int,
+    ) -> np.ndarray:
+        """Stack vectors into a row-normalized float32 matrix."""
+        matrix = np.zeros((len(vectors), dimensions), dtype=np.float32)
+        for i, vec in enumerate(vectors):
+            if vec is not None and len(vec) == dimensions:
+                matrix[i] = vec
+        return VectorEngine.normalize_rows(matrix)
+
+    @staticmethod
+    def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row in place, leaving zero rows untouched."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def normalize(self, vector: Optional[Sequence[float]]) -> np.ndarray:
+        """Normalize a single query vector against this engine's dimension.
+
+        Args:
+            vector: Raw query embedding
+
+        Returns:
+            Normalized float32 vector (all zeros if the vector is unusable)
+        """
+        if vector is None or len(vector) != self.dimensions:
+            return np.zeros(self.dimensions, dtype=np.float32)
+        return self.normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1).copy())[0]
+
+    def scores(self, vector: Optional[Sequence[float]]) -> np.ndarray:
+        """Cosine similarity of a query vector against every stored vector."""
+        return self.matrix @ self.normalize(vector)
+
+    @staticmethod
+    def select_top_k(
+        scores: np.ndarray,
+        top_k: int,
+        threshold: float,
+    ) -> list[tuple[int, float]]:
+        """Pick the highest-scoring indices above a threshold.
+
+        Uses ``argpartition`` so only the top-k slice is fully sorted. Ties
+        are broken by index, matching a stable descending sort over the
+        original candidate order.
+
+        Args:
+            scores: 1-D array of similarity scores
+            top_k: Maximum number of results
+            threshold: Minimum score to include
+
+        Returns:
+            List of (index, score) tuples, sorted by score descending
+        """
+        candidates = np.flatnonzero(scores >= threshold)
+        if top_k <= 0 or candidates.size == 0:
+            return []
+
+        if candidates.size > top_k:
+            candidate_scores = scores[candidates]
+            # Include every index tied with the k-th score so the tie-break is stable
+            kth = np.partition(candidate_scores, -top_k)[-top_k]
+            candidates = candidates[candidate_scores >= kth]
+
+        order = np.lexsort((candidates, -scores[candidates]))[:top_k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+    def top_k(
+        self,
+        vector: Optional[Sequence[float]],
+        top_k: int = 20,
+        threshold: float = 0.0,
+        mask: Optional[np.ndarray] = None,
+    ) -> list[tuple[int, float]]:
+        """Find the stored vectors most similar to a query vector.
+
+        Args:
+            vector: Query embedding
+            top_k: Maximum number of results
+            threshold: Minimum similarity score
+            mask: Optional boolean array; rows where it is False are skipped
+
+        Returns:
+            List of (row index, similarity) tuples, sorted by similarity
+        """
+        if len(self) == 0:
+            return []
+
+        scores = self.scores(vector)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+        return self.select_top_k(scores, top_k, threshold)
+
+    def top_k_against(
+        self,
+        other: "VectorEngine",
+        top_k: int = 5,
+        threshold: float = 0.0,
+        block_size: int = 1024,
+    ) -> list[list[tuple[int, float]]]:
+        """Find top-k matches in ``other`` for every vector in this engine.
+
+        Queries are processed in row blocks so peak memory stays bounded by
+        ``block_size * len(other)`` scores.
+
+        Args:
+            other: Engine holding the candidate vectors
+            top_k: Maximum matches per query row
+            threshold: Minimum similarity score
+            block_size: Number of query rows per matrix product
+
+        Returns:
+            One list of (row index in ``other``, similarity) tuples per row
+        """
+        results: list[list[tuple[int, float]]] = []
+        if len(other) == 0 or self.dimensions != other.dimensions:
+            return [[] for _ in range(len(self))]
+
+        for start in range(0, len(self), block_size):
+            block_scores = self.matrix[start:start + block_size] @ other.matrix.T
+            for row in block_scores:
+                results.append(self.select_top_k(row, top_k, threshold))
+
+        return results
+
+    def pairwise(self) -> np.ndarray:
+        """Full cosine similarity matrix between all stored vectors."""
+        return self.matrix @ self.matrix.T
+
+    def threshold_pairs(
+        self,
+        threshold: float,
+        block_size: int = 1024,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All pairs i < j whose similarity is at least ``threshold``.
+
+        Rows are processed in blocks so peak memory stays bounded by
+        ``block_size * len(self)`` scores plus the pairs found.
+
+        Args:
+            threshold: Minimum similarity score
+            block_size: Number of rows per matrix product
+
+        Returns:
+            Tuple of (row indices, column indices, similarities) arrays
+        """
+        rows, cols, values = [], [], []
+        for start in range(0, len(self), block_size):
+            block = self.matrix[start:start + block_size] @ self.matrix[start:].T
+            r, c = np.nonzero(block >= threshold)
+            # Keep the strict upper triangle (column offset is relative to start)
+            upper = c > r
+            r, c = r[upper], c[upper]
+            rows.append(r + start)
+            cols.append(c + start)
+            values.append(block[r, c])
+
+        if not rows:
+            return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                    np.zeros(0, dtype=np.float32))
+        return (
+            np.concatenate(rows).astype(np.int64),
+            np.concatenate(cols).astype(np.int64),
+            np.concatenate(values),
+        )
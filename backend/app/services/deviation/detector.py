@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Query, Session, joinedload
 
 from app.models.deviation import Deviation, DeviationType, DeviationSeverity, DeviationStatus
 from app.models.score import SubcategoryScore
@@ -288,6 +288,17 @@ class DeviationDetector:
         status: str | None = None,
     ) -> list[Deviation]:
         """Get deviations for an assessment with optional filters."""
+        return self.query_deviations(
+            assessment_id, severity=severity, status=status
+        ).order_by(Deviation.risk_score.desc()).all()
+
+    def query_deviations(
+        self,
+        assessment_id: uuid.UUID,
+        severity: str | None = None,
+        status: str | None = None,
+    ) -> Query:
+        """Unordered query of deviations matching the filters of ``get_deviations``."""
         query = self.db.query(Deviation).filter(
             Deviation.assessment_id == assessment_id
         )
@@ -298,7 +309,7 @@ class DeviationDetector:
         if status:
             query = query.filter(Deviation.status == status)
 
-        return query.order_by(Deviation.risk_score.desc()).all()
+        return query
 
     def get_risk_summary(
         self,
@@ -1,14 +1,21 @@
 """Service for managing cross-framework requirement mappings (crosswalks)."""
 
-import uuid
 import json
+import logging
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Optional, Any
 
-from sqlalchemy.orm import Session
-from tenacity import retry, stop_after_attempt, wait_exponential
+from sqlalchemy.orm import Query, Session
 
+from app.core.ai_client import ai_client
+from app.core.ai_governor import BULK, AIUnavailableError, call_priority
+from app.core.concurrency import run_concurrently
 from app.core.config import settings
+from app.core.llm_batch import BatchPrompt
+from app.core.llm_metrics import current_stage, llm_run
 from app.models.unified_framework import (
     Framework,
     FrameworkRequirement,
@@ -16,8 +23,51 @@ from app.models.unified_framework import (
     MappingType,
     MappingSource,
 )
+from app.services.audit.audit_service import AuditService
+from app.services.clustering.embedding_pipeline import estimate_tokens
 from app.services.clustering.similarity_service import SimilarityService
 
+logger = logging.getLogger(__name__)
+
+# Estimated tokens of a batched validation prompt's fixed instructions, and
+# of each "P<n>: R<a> -> R<b>" pair line
+BATCH_PROMPT_OVERHEAD_TOKENS = 350
+PAIR_LINE_TOKENS = 8
+
+
+@dataclass(frozen=True)
+class RequirementText:
+    """The fields of a requirement that validation prompts use."""
+
+    id: uuid.UUID
+    code: str
+    name: str
+    description: Optional[str]
+    guidance: Optional[str]
+
+    @classmethod
+    def of(cls, requirement: FrameworkRequirement) -> "RequirementText":
+        return cls(
+            id=requirement.id,
+            code=requirement.code,
+            name=requirement.name,
+            description=requirement.description,
+            guidance=requirement.guidance,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "id": str(self.id)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RequirementText":
+        return cls(**{**data, "id": uuid.UUID(data["id"])})
+
+    def prompt_text(self) -> str:
+        text = f"{self.code}: {self.name}\nDescription: {self.description or 'N/A'}"
+        if self.guidance:
+            text += f"\nGuidance: {self.guidance}"
+        return text
+
 
 class CrosswalkService:
     """Service for managing cross-framework requirement mappings.
@@ -29,17 +79,9 @@ class CrosswalkService:
     def __init__(self, db: Session):
         self.db = db
         self.similarity_service = SimilarityService(db)
-        self._ai_client = None
-
-    @property
-    def ai_client(self):
-        """Lazy initialization of Anthropic client for LLM validation."""
-        if self._ai_client is None:
-            if not settings.anthropic_api_key:
-                raise ValueError("ANTHROPIC_API_KEY not configured")
-            from anthropic import Anthropic
-            self._ai_client = Anthropic(api_key=settings.anthropic_api_key)
-        return self._ai_client
+        self.audit_service = AuditService(db)
+        # Candidate pairs validated by each model tier in the last generation run
+        self.model_tiers: Counter[str] = Counter()
 
     def generate_crosswalks(
         self,
@@ -50,6 +92,8 @@ class CrosswalkService:
         validate_with_llm: bool = True,
         auto_approve_threshold: float = 0.9,
         prompt_suffix: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> list[RequirementCrosswalk]:
         """Generate cross-framework mappings using embeddings and optional LLM validation.
 
@@ -66,6 +110,10 @@ class CrosswalkService:
             top_k_per_requirement: Max candidates per source requirement
             validate_with_llm: Whether to validate candidates with LLM
             auto_approve_threshold: Auto-approve if confidence >= this
+            prompt_suffix: Additional assessor context appended to LLM prompts
+            batch_size: Maximum candidate pairs per validation prompt; 1 validates
+                each pair on its own (default from settings)
+            concurrency: Validation prompts in flight at once (default from settings)
 
         Returns:
             List of created RequirementCrosswalk objects
@@ -81,73 +129,471 @@ class CrosswalkService:
         if not candidates:
             return []
 
-        created_crosswalks = []
-
-        for source, target, similarity in candidates:
-            # Check if mapping already exists
-            existing = self._get_existing_crosswalk(source.id, target.id)
-            if existing:
-                continue
+        # Skip pairs that already have a mapping
+        existing = self._get_existing_pairs({source.id for source, _, _ in candidates})
+        candidates = [
+            (source, target, similarity) for source, target, similarity in candidates
+            if (source.id, target.id) not in existing
+        ]
+
+        # Stage 2: LLM validation (optional)
+        llm_results: list[Optional[dict[str, Any]]] = [None] * len(candidates)
+        # Validation is a bulk run: interactive AI calls are admitted first
+        with llm_run("crosswalk_validation") as llm_usage, call_priority(BULK):
+            if validate_with_llm:
+                llm_results = self._validate_candidates(
+                    candidates,
+                    prompt_suffix=prompt_suffix,
+                    batch_size=batch_size if batch_size is not None else settings.crosswalk_batch_size,
+                    concurrency=concurrency or settings.crosswalk_concurrency,
+                )
 
-            # Stage 2: LLM validation (optional)
-            mapping_type = MappingType.RELATED
-            confidence = similarity
-            reasoning = None
+        self.model_tiers = Counter(
+            result["model_tier"] for result in llm_results if result is not None
+        )
+        created_crosswalks = []
 
-            if validate_with_llm:
-                llm_result = self._validate_mapping_with_llm(source, target, prompt_suffix=prompt_suffix)
-                if llm_result:
-                    mapping_type = llm_result.get("mapping_type", MappingType.RELATED)
-                    # Combine embedding and LLM confidence
-                    llm_confidence = llm_result.get("confidence", 0.5)
-                    confidence = (similarity + llm_confidence) / 2
-                    reasoning = llm_result.get("reasoning")
-
-                    # Skip if LLM says no relationship
-                    if mapping_type == "none":
-                        continue
-
-            # Stage 3: Create crosswalk
-            crosswalk = RequirementCrosswalk(
-                id=uuid.uuid4(),
-                source_requirement_id=source.id,
-                target_requirement_id=target.id,
-                mapping_type=mapping_type.value if isinstance(mapping_type, MappingType) else mapping_type,
-                confidence_score=confidence,
-                mapping_source=MappingSource.AI_GENERATED.value,
-                reasoning=reasoning,
-                is_approved=confidence >= auto_approve_threshold,
-                approved_at=datetime.utcnow() if confidence >= auto_approve_threshold else None,
+        for (source, target, similarity), llm_result in zip(candidates, llm_results):
+            crosswalk = self._build_crosswalk(
+                source.id, target.id, similarity, llm_result, auto_approve_threshold
             )
-            self.db.add(crosswalk)
-            created_crosswalks.append(crosswalk)
-
+            if crosswalk is not None:
+                self.db.add(crosswalk)
+                created_crosswalks.append(crosswalk)
+
+        self.audit_service.log_generation(
+            entity_type="framework",
+            entity_id=source_framework_id,
+            generation_type="crosswalks",
+            details=f"Generated {len(created_crosswalks)} crosswalks to framework {target_framework_id}",
+            new_values={"target_framework_id": str(target_framework_id), "llm": llm_usage.as_dict()},
+        )
         self.db.commit()
         return created_crosswalks
 
-    def _get_existing_crosswalk(
+    # Batch-job mode: app.services.batch.LLMBatchService drives these hooks to
+    # validate candidates through a provider batch API instead of inline
+
+    def prepare_batch_job(
         self,
+        source_framework_id: uuid.UUID,
+        target_framework_id: uuid.UUID,
+        similarity_threshold: float = 0.75,
+        top_k_per_requirement: int = 5,
+        auto_approve_threshold: float = 0.9,
+        prompt_suffix: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Snapshot the candidate pairs of a crosswalk run for a batch job.
+
+        Returns:
+            (params, items): run options, and one item per candidate pair
+            without a crosswalk yet, with both requirements' prompt fields
+        """
+        candidates = self.similarity_service.find_cross_framework_candidates(
+            source_framework_id=source_framework_id,
+            target_framework_id=target_framework_id,
+            top_k_per_requirement=top_k_per_requirement,
+            threshold=similarity_threshold,
+        )
+        existing = self._get_existing_pairs({source.id for source, _, _ in candidates})
+        items = [
+            {
+                "key": f"{source.id}:{target.id}",
+                "source": RequirementText.of(source).as_dict(),
+                "target": RequirementText.of(target).as_dict(),
+                "similarity": similarity,
+            }
+            for source, target, similarity in candidates
+            if (source.id, target.id) not in existing
+        ]
+        params = {
+            "source_framework_id": str(source_framework_id),
+            "target_framework_id": str(target_framework_id),
+            "auto_approve_threshold": auto_approve_threshold,
+            "prompt_suffix": prompt_suffix,
+            "batch_size": settings.crosswalk_batch_size if batch_size is None else batch_size,
+        }
+        return params, items
+
+    def batch_prompts(self, job, keys: list[str]) -> list[BatchPrompt]:
+        """Validation prompts for the given pairs, packed as in an inline run."""
+        by_key = {item["key"]: item for item in job.items}
+        pairs = [
+            (RequirementText.from_dict(by_key[key]["source"]),
+             RequirementText.from_dict(by_key[key]["target"]))
+            for key in keys
+        ]
+        suffix = job.params["prompt_suffix"]
+
+        batches = self._pack_pair_batches(
+            pairs, job.params["batch_size"], settings.crosswalk_batch_max_tokens
+        )
+        batched = {i for batch in batches for i in batch}
+
+        prompts = [
+            BatchPrompt(
+                prompt=self._batch_validation_prompt([pairs[i] for i in batch], suffix),
+                keys=[keys[i] for i in batch],
+                max_tokens=min(settings.ai_max_tokens, 500 + 120 * len(batch)),
+                temperature=0.2,
+            )
+            for batch in batches
+        ]
+        prompts.extend(
+            BatchPrompt(
+                prompt=self._validation_prompt(*pairs[i], suffix),
+                keys=[keys[i]],
+                max_tokens=500,
+                temperature=0.2,
+            )
+            for i in range(len(pairs)) if i not in batched
+        )
+        return prompts
+
+    def parse_batch_reply(self, job, prompt_keys: list[str], text: str) -> dict[str, dict]:
+        """Validation result per pair from one batch reply; pairs it lacks are left out."""
+        try:
+            reply = ai_client.parse_json(text)
+        except (json.JSONDecodeError, IndexError):
+            return {}
+        if not isinstance(reply, dict):
+            return {}
+        if len(prompt_keys) == 1:
+            # Single-pair prompts answer with the classification itself
+            return {prompt_keys[0]: self._normalize_validation(reply)}
+        results = {}
+        for n, key in enumerate(prompt_keys, start=1):
+            result = reply.get(f"P{n}")
+            if isinstance(result, dict):
+                results[key] = self._normalize_validation(result)
+        return results
+
+    def batch_confidences(self, job, result: dict[str, Any]) -> list[Any]:
+        return self._validation_confidences(result)
+
+    def ingest_batch_results(
+        self,
+        job,
+        answers: dict[str, tuple[dict, str]],
+    ) -> dict[str, Any]:
+        """Add the crosswalks of a finished batch job (flushed, not committed).
+
+        Pairs nobody answered fall back to embedding similarity alone, as
+        in an inline run whose validation call failed.
+
+        Args:
+            job: The LLMBatchJob
+            answers: (validation result, model tier) per pair key
+
+        Returns:
+            Counts for the job summary
+        """
+        params = job.params
+        source_ids = {uuid.UUID(item["source"]["id"]) for item in job.items}
+        # Pairs may have been mapped by another run while the batch was out
+        existing = self._get_existing_pairs(source_ids)
+
+        created = []
+        model_tiers: Counter[str] = Counter()
+        for item in job.items:
+            source_id = uuid.UUID(item["source"]["id"])
+            target_id = uuid.UUID(item["target"]["id"])
+            if (source_id, target_id) in existing:
+                continue
+            llm_result, tier = answers.get(item["key"], (None, None))
+            if llm_result is not None:
+                model_tiers[tier] += 1
+            crosswalk = self._build_crosswalk(
+                source_id, target_id, item["similarity"], llm_result,
+                params["auto_approve_threshold"],
+            )
+            if crosswalk is not None:
+                created.append(crosswalk)
+        self.db.add_all(created)
+        self.db.flush()
+
+        self.audit_service.log_generation(
+            entity_type="framework",
+            entity_id=uuid.UUID(params["source_framework_id"]),
+            generation_type="crosswalks",
+            user_id=job.created_by_id,
+            details=(
+                f"Generated {len(created)} crosswalks to framework "
+                f"{params['target_framework_id']}"
+            ),
+            new_values={
+                "target_framework_id": params["target_framework_id"],
+                "batch_job_id": str(job.id),
+                "rounds": job.round,
+            },
+        )
+        return {
+            "crosswalks_created": len(created),
+            "auto_approved": sum(1 for cw in created if cw.is_approved),
+            "pending_review": sum(1 for cw in created if not cw.is_approved),
+            "model_tiers": dict(model_tiers),
+            "prompt_count": job.request_count,
+        }
+
+    @staticmethod
+    def _build_crosswalk(
         source_id: uuid.UUID,
         target_id: uuid.UUID,
+        similarity: float,
+        llm_result: Optional[dict[str, Any]],
+        auto_approve_threshold: float,
     ) -> Optional[RequirementCrosswalk]:
-        """Check if a crosswalk already exists between two requirements."""
-        return (
-            self.db.query(RequirementCrosswalk)
-            .filter(
-                RequirementCrosswalk.source_requirement_id == source_id,
-                RequirementCrosswalk.target_requirement_id == target_id,
+        """Crosswalk for a candidate pair, or None if the LLM found no relationship."""
+        mapping_type = MappingType.RELATED
+        confidence = similarity
+        reasoning = None
+
+        if llm_result:
+            mapping_type = llm_result.get("mapping_type", MappingType.RELATED)
+            # Combine embedding and LLM confidence
+            llm_confidence = llm_result.get("confidence", 0.5)
+            confidence = (similarity + llm_confidence) / 2
+            reasoning = llm_result.get("reasoning")
+
+            # Skip if LLM says no relationship
+            if mapping_type == "none":
+                return None
+
+        # Stage 3: Create crosswalk
+        return RequirementCrosswalk(
+            id=uuid.uuid4(),
+            source_requirement_id=source_id,
+            target_requirement_id=target_id,
+            mapping_type=mapping_type.value if isinstance(mapping_type, MappingType) else mapping_type,
+            confidence_score=confidence,
+            mapping_source=MappingSource.AI_GENERATED.value,
+            reasoning=reasoning,
+            is_approved=confidence >= auto_approve_threshold,
+            approved_at=datetime.utcnow() if confidence >= auto_approve_threshold else None,
+        )
+
+    def _get_existing_pairs(
+        self,
+        source_ids: set[uuid.UUID],
+    ) -> set[tuple[uuid.UUID, uuid.UUID]]:
+        """(source, target) ids of crosswalks already stored for these sources."""
+        if not source_ids:
+            return set()
+        rows = (
+            self.db.query(
+                RequirementCrosswalk.source_requirement_id,
+                RequirementCrosswalk.target_requirement_id,
             )
-            .first()
+            .filter(RequirementCrosswalk.source_requirement_id.in_(source_ids))
+            .all()
+        )
+        return {(source_id, target_id) for source_id, target_id in rows}
+
+    def _validate_candidates(
+        self,
+        candidates: list[tuple[FrameworkRequirement, FrameworkRequirement, float]],
+        prompt_suffix: Optional[str],
+        batch_size: int,
+        concurrency: int,
+    ) -> list[Optional[dict[str, Any]]]:
+        """LLM validation results for every candidate pair, in candidate order.
+
+        Pairs are packed into multi-pair prompts; any pair a batch reply
+        leaves out is validated on its own. Prompts run on worker threads
+        and only see snapshots of the requirement text, never the session.
+        """
+        pairs = [
+            (RequirementText.of(source), RequirementText.of(target))
+            for source, target, _ in candidates
+        ]
+        results: list[Optional[dict[str, Any]]] = [None] * len(pairs)
+
+        batches = self._pack_pair_batches(pairs, batch_size, settings.crosswalk_batch_max_tokens)
+        batch_results = run_concurrently(
+            lambda batch: self._validate_mappings_batch_with_llm(
+                [pairs[i] for i in batch], prompt_suffix=prompt_suffix
+            ),
+            batches,
+            concurrency,
+        )
+        for batch, batch_result in zip(batches, batch_results):
+            for i, result in zip(batch, batch_result):
+                results[i] = result
+
+        single = [i for i, result in enumerate(results) if result is None]
+        single_results = run_concurrently(
+            lambda i: self._validate_mapping_with_llm(*pairs[i], prompt_suffix=prompt_suffix),
+            single,
+            concurrency,
+        )
+        for i, result in zip(single, single_results):
+            results[i] = result
+
+        return results
+
+    @staticmethod
+    def _pack_pair_batches(
+        pairs: list[tuple["RequirementText", "RequirementText"]],
+        max_pairs: int,
+        max_tokens: int,
+    ) -> list[list[int]]:
+        """Group candidate pairs into multi-pair prompts under a token budget.
+
+        Each requirement's text appears once per prompt however many pairs
+        use it, so consecutive pairs sharing a source pack cheaply.
+
+        Args:
+            pairs: (source, target) snapshots, grouped by source
+            max_pairs: Maximum pairs per prompt
+            max_tokens: Estimated prompt token budget
+
+        Returns:
+            Batches of pair indexes; pairs that end up alone are left out,
+            since the single-pair prompt suits them better
+        """
+        if max_pairs <= 1:
+            return []
+
+        def cost(i: int, seen: set) -> int:
+            return PAIR_LINE_TOKENS + sum(
+                estimate_tokens(req.prompt_text())
+                for req in {pairs[i][0].id: pairs[i][0], pairs[i][1].id: pairs[i][1]}.values()
+                if req.id not in seen
+            )
+
+        batches = []
+        current: list[int] = []
+        seen: set = set()
+        tokens = BATCH_PROMPT_OVERHEAD_TOKENS
+        for i in range(len(pairs)):
+            added = cost(i, seen)
+            if current and (len(current) >= max_pairs or tokens + added > max_tokens):
+                batches.append(current)
+                current, seen = [], set()
+                tokens = BATCH_PROMPT_OVERHEAD_TOKENS
+                added = cost(i, seen)
+            current.append(i)
+            seen.update((pairs[i][0].id, pairs[i][1].id))
+            tokens += added
+
+        if current:
+            batches.append(current)
+        return [batch for batch in batches if len(batch) > 1]
+
+    def _validate_mappings_batch_with_llm(
+        self,
+        pairs: list[tuple["RequirementText", "RequirementText"]],
+        prompt_suffix: Optional[str] = None,
+    ) -> list[Optional[dict[str, Any]]]:
+        """Classify several requirement pairs in one LLM prompt.
+
+        Pairs the fast model leaves out or scores as ambiguous are asked
+        again of the strong model, in one smaller prompt.
+
+        Args:
+            pairs: (source, target) requirement snapshots
+
+        Returns:
+            One result per pair, as from ``_validate_mapping_with_llm``; None
+            for pairs neither model's reply covered
+        """
+        def ask(subset, model: str) -> list[Optional[dict[str, Any]]]:
+            try:
+                reply = ai_client.complete_json(
+                    self._batch_validation_prompt(subset, prompt_suffix),
+                    model=model,
+                    max_tokens=min(settings.ai_max_tokens, 500 + 120 * len(subset)),
+                    temperature=0.2,
+                )
+            except AIUnavailableError:
+                raise
+            except Exception:
+                logger.exception(
+                    "LLM batch validation of %d pairs failed in stage %s",
+                    len(subset), current_stage(),
+                )
+                return [None] * len(subset)
+
+            if not isinstance(reply, dict):
+                return [None] * len(subset)
+            results = [reply.get(f"P{n}") for n in range(1, len(subset) + 1)]
+            return [self._normalize_validation(r) if isinstance(r, dict) else None for r in results]
+
+        return [
+            self._tag_tier(result, tier)
+            for result, tier in ai_client.route(pairs, ask, self._validation_confidences)
+        ]
+
+    @staticmethod
+    def _batch_validation_prompt(
+        pairs: list[tuple["RequirementText", "RequirementText"]],
+        prompt_suffix: Optional[str],
+    ) -> str:
+        labels: dict[uuid.UUID, str] = {}
+        blocks = []
+        for source, target in pairs:
+            for req in (source, target):
+                if req.id not in labels:
+                    labels[req.id] = f"R{len(labels) + 1}"
+                    blocks.append(f"[{labels[req.id]}] {req.prompt_text()}")
+        pair_lines = "\n".join(
+            f"- P{n}: {labels[source.id]} -> {labels[target.id]}"
+            for n, (source, target) in enumerate(pairs, start=1)
         )
+        requirements_text = "\n\n".join(blocks)
+
+        prompt = f"""Analyze the relationship in each of the following pairs of compliance requirements from different frameworks.
+
+REQUIREMENTS:
+{requirements_text}
+
+PAIRS (source -> target):
+{pair_lines}
+
+Classify each pair and respond with a JSON object keyed by pair id:
+{{
+    "P1": {{
+        "mapping_type": "equivalent" | "partial" | "related" | "none",
+        "confidence": 0.0-1.0,
+        "reasoning": "Brief explanation of the relationship"
+    }}
+}}
+
+Definitions:
+- "equivalent": Requirements are essentially the same, addressing identical objectives
+- "partial": Target partially satisfies source OR source partially satisfies target
+- "related": Requirements are related but distinct, covering adjacent topics
+- "none": No meaningful relationship between requirements
+
+Include every pair id. Respond ONLY with the JSON object."""
+
+        if prompt_suffix:
+            prompt += f"\n\nAdditional context from the assessor:\n{prompt_suffix}"
+        return prompt
+
+    @staticmethod
+    def _validation_confidences(result: dict[str, Any]) -> list[Any]:
+        return [result.get("confidence")]
+
+    @staticmethod
+    def _tag_tier(result: Optional[dict[str, Any]], tier: str) -> Optional[dict[str, Any]]:
+        if result is not None:
+            result["model_tier"] = tier
+        return result
+
+    @staticmethod
+    def _normalize_validation(result: dict[str, Any]) -> dict[str, Any]:
+        """Validate and normalize an LLM classification's mapping_type."""
+        valid_types = {"equivalent", "partial", "related", "none"}
+        if result.get("mapping_type") not in valid_types:
+            result["mapping_type"] = "related"
+        return result
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def _validate_mapping_with_llm(
         self,
-        source: FrameworkRequirement,
-        target: FrameworkRequirement,
+        source: "FrameworkRequirement | RequirementText",
+        target: "FrameworkRequirement | RequirementText",
         prompt_suffix: Optional[str] = None,
     ) -> Optional[dict[str, Any]]:
         """Use LLM to validate and classify a requirement mapping.
@@ -157,8 +603,34 @@ class CrosswalkService:
             target: Target requirement
 
         Returns:
-            Dictionary with mapping_type, confidence, and reasoning
+            Dictionary with mapping_type, confidence, reasoning, and the
+            model_tier that answered; None if neither model answered
         """
+        prompt = self._validation_prompt(source, target, prompt_suffix)
+
+        def ask(prompts, model: str) -> list[Optional[dict[str, Any]]]:
+            try:
+                # Shares the AI client's rate limiter and response cache
+                result = ai_client.complete_json(
+                    prompts[0], model=model, max_tokens=500, temperature=0.2
+                )
+            except AIUnavailableError:
+                raise
+            except Exception:
+                # Log error and return None to skip LLM validation
+                logger.exception("LLM validation error in stage %s", current_stage())
+                return [None]
+            return [self._normalize_validation(result) if isinstance(result, dict) else None]
+
+        [(result, tier)] = ai_client.route([prompt], ask, self._validation_confidences)
+        return self._tag_tier(result, tier)
+
+    @staticmethod
+    def _validation_prompt(
+        source: "FrameworkRequirement | RequirementText",
+        target: "FrameworkRequirement | RequirementText",
+        prompt_suffix: Optional[str],
+    ) -> str:
         prompt = f"""Analyze the relationship between these two compliance requirements from different frameworks.
 
 SOURCE REQUIREMENT ({source.code}):
@@ -188,35 +660,7 @@ Respond ONLY with the JSON object."""
 
         if prompt_suffix:
             prompt += f"\n\nAdditional context from the assessor:\n{prompt_suffix}"
-
-        try:
-            response = self.ai_client.messages.create(
-                model=settings.ai_model,
-                max_tokens=500,
-                temperature=0.2,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            content = response.content[0].text.strip()
-            # Handle markdown code blocks
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-
-            result = json.loads(content)
-
-            # Validate and normalize mapping_type
-            valid_types = {"equivalent", "partial", "related", "none"}
-            if result.get("mapping_type") not in valid_types:
-                result["mapping_type"] = "related"
-
-            return result
-
-        except Exception as e:
-            # Log error and return None to skip LLM validation
-            print(f"LLM validation error: {e}")
-            return None
+        return prompt
 
     def approve_crosswalk(
         self,
@@ -335,6 +779,23 @@ Respond ONLY with the JSON object."""
         Returns:
             List of RequirementCrosswalk objects
         """
+        return self.query_crosswalks(
+            source_framework_id=source_framework_id,
+            target_framework_id=target_framework_id,
+            is_approved=is_approved,
+            mapping_type=mapping_type,
+            min_confidence=min_confidence,
+        ).order_by(RequirementCrosswalk.confidence_score.desc()).all()
+
+    def query_crosswalks(
+        self,
+        source_framework_id: Optional[uuid.UUID] = None,
+        target_framework_id: Optional[uuid.UUID] = None,
+        is_approved: Optional[bool] = None,
+        mapping_type: Optional[MappingType] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Query:
+        """Unordered query of crosswalks matching the filters of ``list_crosswalks``."""
         query = self.db.query(RequirementCrosswalk)
 
         if source_framework_id:
@@ -367,7 +828,7 @@ Respond ONLY with the JSON object."""
                 RequirementCrosswalk.confidence_score >= min_confidence
             )
 
-        return query.order_by(RequirementCrosswalk.confidence_score.desc()).all()
+        return query
 
     def get_mappings_for_requirement(
         self,
@@ -12,6 +12,7 @@ from app.models.unified_framework import (
     CompanyFramework,
     AssessmentFrameworkScope,
 )
+from app.services.clustering.ann_index import get_requirement_index
 from app.services.frameworks.loaders.base_loader import BaseFrameworkLoader
 
 
@@ -166,6 +167,9 @@ class FrameworkService:
 
         self.db.delete(framework)
         self.db.commit()
+        index = get_requirement_index()
+        if index is not None:
+            index.remove_framework(framework_id)
         return True
 
     def load_builtin_framework(
@@ -11,7 +11,9 @@ import json
 from pathlib import Path
 from typing import Optional, Any
 
+from app.core.ai_client import ai_client
 from app.core.config import settings
+from app.core.llm_metrics import observe_call, pipeline_stage, record_parse_failure
 from app.models.unified_framework import FrameworkType
 from app.services.frameworks.loaders.base_loader import (
     BaseFrameworkLoader,
@@ -308,7 +310,7 @@ class DocumentFrameworkLoader(BaseFrameworkLoader):
         }
 
     @classmethod
-    async def parse_document_with_ai(
+    def parse_document_with_ai(
         cls,
         file_content: bytes,
         filename: str,
@@ -343,7 +345,7 @@ class DocumentFrameworkLoader(BaseFrameworkLoader):
             text = text[:max_chars] + "\n\n[Document truncated...]"
 
         # Use AI to parse requirements
-        return await cls._ai_parse_requirements(text, filename)
+        return cls._ai_parse_requirements(text, filename)
 
     @classmethod
     def _extract_pdf_text(cls, content: bytes) -> str:
@@ -373,7 +375,7 @@ class DocumentFrameworkLoader(BaseFrameworkLoader):
         return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
 
     @classmethod
-    async def _ai_parse_requirements(cls, text: str, filename: str) -> list[dict]:
+    def _ai_parse_requirements(cls, text: str, filename: str) -> list[dict]:
         """Use Claude to extract structured requirements from text."""
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY required for AI document parsing")
@@ -403,24 +405,32 @@ If the document doesn't have explicit codes, create logical ones based on sectio
 
 Respond ONLY with the JSON array, no other text."""
 
-        response = client.messages.create(
-            model=settings.ai_model,
-            max_tokens=settings.ai_max_tokens,
-            temperature=0.1,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        content = response.content[0].text.strip()
-        # Handle markdown code blocks
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            content = content.strip()
+        with pipeline_stage("document_parse"):
+            # Shares the AI client's concurrency limit and circuit breaker
+            with ai_client.governor.slot():
+                response = observe_call("anthropic", settings.ai_model, lambda: client.messages.create(
+                    model=settings.ai_model,
+                    max_tokens=settings.ai_max_tokens,
+                    temperature=0.1,
+                    messages=[{"role": "user", "content": prompt}],
+                ))
 
-        requirements = json.loads(content)
+            content = response.content[0].text.strip()
+            # Handle markdown code blocks
+            if content.startswith("```"):
+                content = content.split("```")[1]
+                if content.startswith("json"):
+                    content = content[4:]
+                content = content.strip()
 
-        if not isinstance(requirements, list):
-            raise ValueError("AI did not return a valid requirements list")
+            try:
+                requirements = json.loads(content)
+            except json.JSONDecodeError:
+                record_parse_failure()
+                raise
+
+            if not isinstance(requirements, list):
+                record_parse_failure()
+                raise ValueError("AI did not return a valid requirements list")
 
         return requirements
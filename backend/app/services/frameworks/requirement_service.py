@@ -1,15 +1,17 @@
 """Service for managing framework requirements."""
 
 import uuid
+from collections import defaultdict
 from typing import Optional
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Query, Session, joinedload
 
 from app.models.unified_framework import (
     Framework,
     FrameworkRequirement,
     AssessmentFrameworkScope,
 )
+from app.services.clustering.ann_index import get_requirement_index
 
 
 class RequirementService:
@@ -77,6 +79,18 @@ class RequirementService:
         Returns:
             List of FrameworkRequirement objects
         """
+        return self.query_requirements(
+            framework_id, parent_id=parent_id, level=level, is_assessable=is_assessable
+        ).order_by(FrameworkRequirement.display_order).all()
+
+    def query_requirements(
+        self,
+        framework_id: uuid.UUID,
+        parent_id: Optional[uuid.UUID] = None,
+        level: Optional[int] = None,
+        is_assessable: Optional[bool] = None,
+    ) -> Query:
+        """Unordered query of requirements matching the filters of ``list_requirements``."""
         query = self.db.query(FrameworkRequirement).filter(
             FrameworkRequirement.framework_id == framework_id
         )
@@ -93,7 +107,7 @@ class RequirementService:
         if is_assessable is not None:
             query = query.filter(FrameworkRequirement.is_assessable == is_assessable)
 
-        return query.order_by(FrameworkRequirement.display_order).all()
+        return query
 
     def get_root_requirements(
         self,
@@ -192,6 +206,9 @@ class RequirementService:
     ) -> list[dict]:
         """Get the full requirement hierarchy as a nested tree.
 
+        Loads the framework's requirements in one query and links them in
+        memory, rather than querying the children of every node.
+
         Args:
             framework_id: The framework's UUID
             max_depth: Maximum depth to traverse (None for full tree)
@@ -199,27 +216,43 @@ class RequirementService:
         Returns:
             List of dictionaries with requirement data and nested children
         """
+        rows = (
+            self.db.query(
+                FrameworkRequirement.id,
+                FrameworkRequirement.parent_id,
+                FrameworkRequirement.code,
+                FrameworkRequirement.name,
+                FrameworkRequirement.description,
+                FrameworkRequirement.level,
+                FrameworkRequirement.is_assessable,
+            )
+            .filter(FrameworkRequirement.framework_id == framework_id)
+            .order_by(FrameworkRequirement.display_order)
+            .all()
+        )
+        children = defaultdict(list)
+        for row in rows:
+            children[row.parent_id].append(row)
 
-        def build_node(req: FrameworkRequirement, depth: int) -> dict:
+        def build_node(row, depth: int) -> dict:
             node = {
-                "id": str(req.id),
-                "code": req.code,
-                "name": req.name,
-                "description": req.description,
-                "level": req.level,
-                "is_assessable": req.is_assessable,
+                "id": str(row.id),
+                "code": row.code,
+                "name": row.name,
+                "description": row.description,
+                "level": row.level,
+                "is_assessable": row.is_assessable,
             }
 
             if max_depth is None or depth < max_depth:
-                children = self.get_children(req.id)
-                if children:
+                if children[row.id]:
                     node["children"] = [
-                        build_node(child, depth + 1) for child in children
+                        build_node(child, depth + 1) for child in children[row.id]
                     ]
 
             return node
 
-        roots = self.get_root_requirements(framework_id)
+        roots = [row for row in children[None] if row.level == 0]
         return [build_node(root, 0) for root in roots]
 
     def get_requirements_in_scope(
@@ -399,6 +432,11 @@ class RequirementService:
             requirement.extra_metadata = {**(requirement.extra_metadata or {}), **metadata}
 
         self.db.commit()
+        if is_assessable is not None:
+            # Keep the nearest-neighbour index's assessability filter in step
+            index = get_requirement_index()
+            if index is not None:
+                index.set_assessable([requirement.id], is_assessable)
         return requirement
 
     def delete_requirement(
@@ -427,6 +465,9 @@ class RequirementService:
 
         self.db.delete(requirement)
         self.db.commit()
+        index = get_requirement_index()
+        if index is not None:
+            index.remove([requirement_id])
         return True
 
     def search_requirements(
@@ -0,0 +1,6 @@
+"""Background jobs for long-running generation endpoints."""
+
+from app.services.jobs.job_service import JobService
+from app.services.jobs.worker import JobWorker
+
+__all__ = ["JobService", "JobWorker"]
@@ -0,0 +1,172 @@
+"""Handlers for background jobs, one per long-running endpoint.
+
+A handler gets a fresh database session, the job's params (JSON-encoded
+endpoint arguments) and a ``progress(completed, total)`` callback, and
+returns what the synchronous endpoint would have returned.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.unified_framework import ClusterType, RequirementCluster, RequirementCrosswalk
+from app.schemas.report import ReportResponse
+from app.services.clustering.clustering_service import ClusteringService
+from app.services.clustering.embedding_pipeline import EmbeddingPipeline
+from app.services.clustering.embedding_service import EmbeddingService
+from app.services.frameworks.crosswalk_service import CrosswalkService
+from app.services.mapping.ai_mapper import AIMappingService
+from app.services.report.generator import ReportGenerator
+from app.services.scoring.scoring_engine import ScoringEngine
+
+Progress = Callable[[int, int], None]
+Handler = Callable[[Session, dict[str, Any], Progress], Any]
+
+JOB_HANDLERS: dict[str, Handler] = {}
+
+
+def job_handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register a handler for jobs of ``kind``."""
+    def register(fn: Handler) -> Handler:
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def _uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    return uuid.UUID(value) if value else None
+
+
+def embedding_summary(stats: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "message": "Embedding generation complete",
+        "processed": stats["processed"],
+        "skipped": stats["skipped"],
+        "failed": stats["failed"],
+        "cache_hits": stats["cache_hits"],
+        "cache_misses": stats["cache_misses"],
+    }
+
+
+def cluster_summary(clusters: list[RequirementCluster]) -> dict[str, Any]:
+    return {
+        "message": f"Generated {len(clusters)} clusters",
+        "total_clusters": len(clusters),
+        "clusters": [
+            {
+                "id": str(c.id),
+                "name": c.name,
+                "member_count": len(c.members) if c.members else 0,
+            }
+            for c in clusters
+        ],
+    }
+
+
+def crosswalk_summary(crosswalks: list[RequirementCrosswalk], model_tiers: dict) -> dict[str, Any]:
+    return {
+        "message": f"Generated {len(crosswalks)} crosswalk mappings",
+        "total_generated": len(crosswalks),
+        "auto_approved": sum(1 for cw in crosswalks if cw.is_approved),
+        "pending_review": sum(1 for cw in crosswalks if not cw.is_approved),
+        "model_tiers": dict(model_tiers),
+        "crosswalks": [
+            {
+                "id": str(cw.id),
+                "source_requirement_id": str(cw.source_requirement_id),
+                "target_requirement_id": str(cw.target_requirement_id),
+                "mapping_type": cw.mapping_type,
+                "confidence_score": cw.confidence_score,
+                "is_approved": cw.is_approved,
+            }
+            for cw in crosswalks
+        ],
+    }
+
+
+@job_handler("embeddings.generate")
+def generate_embeddings(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    service = EmbeddingService(db)
+    framework_id = _uuid(params.get("framework_id"))
+    force = params.get("force", False)
+    if params.get("pipeline"):
+        stats = asyncio.run(
+            EmbeddingPipeline(service, concurrency=params.get("concurrency")).run(
+                framework_id=framework_id, force=force,
+            )
+        )
+    else:
+        stats = service.embed_all_requirements(framework_id=framework_id, force=force)
+    return embedding_summary(stats)
+
+
+@job_handler("clusters.generate")
+def generate_clusters(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    framework_ids = params.get("framework_ids")
+    clusters = ClusteringService(db).generate_clusters(
+        framework_ids=[uuid.UUID(fid) for fid in framework_ids] if framework_ids else None,
+        threshold=params["threshold"],
+        min_cluster_size=params["min_cluster_size"],
+        cluster_type=ClusterType(params["cluster_type"]),
+    )
+    return cluster_summary(clusters)
+
+
+@job_handler("crosswalks.generate")
+def generate_crosswalks(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    service = CrosswalkService(db)
+    crosswalks = service.generate_crosswalks(
+        source_framework_id=uuid.UUID(params["source_framework_id"]),
+        target_framework_id=uuid.UUID(params["target_framework_id"]),
+        similarity_threshold=params["similarity_threshold"],
+        top_k_per_requirement=params["top_k_per_requirement"],
+        validate_with_llm=params["validate_with_llm"],
+        auto_approve_threshold=params["auto_approve_threshold"],
+        batch_size=params.get("batch_size"),
+        concurrency=params.get("concurrency"),
+    )
+    return crosswalk_summary(crosswalks, service.model_tiers)
+
+
+@job_handler("mappings.generate")
+def generate_mappings(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    """Streams the run, so finished entities are saved (and reported) as it goes."""
+    suggestions = []
+    summary: dict[str, Any] = {}
+    events = AIMappingService(db).stream_mappings_for_assessment(
+        assessment_id=uuid.UUID(params["assessment_id"]),
+        user_id=_uuid(params.get("user_id")),
+        include_policies=params["include_policies"],
+        include_controls=params["include_controls"],
+        confidence_threshold=params["confidence_threshold"],
+        shortlist_size=params.get("shortlist_size"),
+        concurrency=params.get("concurrency"),
+        batch_size=params.get("batch_size"),
+    )
+    for event in events:
+        if event["event"] == "entity":
+            suggestions.extend(event["suggestions"])
+        elif event["event"] == "progress":
+            progress(event["completed"], event["total"])
+        elif event["event"] == "complete":
+            summary = {key: value for key, value in event.items() if key != "event"}
+    return {**summary, "suggestions": suggestions}
+
+
+@job_handler("scores.calculate")
+def calculate_scores(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    return ScoringEngine(db).calculate_all_scores(
+        assessment_id=uuid.UUID(params["assessment_id"]),
+        user_id=_uuid(params.get("user_id")),
+    )
+
+
+@job_handler("reports.generate")
+def generate_report(db: Session, params: dict[str, Any], progress: Progress) -> dict[str, Any]:
+    report = ReportGenerator(db).generate_full_report(
+        assessment_id=uuid.UUID(params["assessment_id"]),
+        user_id=_uuid(params.get("user_id")),
+    )
+    return ReportResponse.model_validate(report).model_dump(mode="json")
@@ -0,0 +1,154 @@
+"""Queue of background jobs for long-running endpoints."""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.jobs.handlers import JOB_HANDLERS
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobService:
+    """Enqueue, claim and finish background jobs.
+
+    Claiming locks the row with ``FOR UPDATE SKIP LOCKED`` (a no-op on
+    SQLite), so concurrent workers never take the same job and never wait on
+    each other's locks.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        user_id: Optional[uuid.UUID] = None,
+    ) -> Job:
+        """
+        Queue a job for a worker.
+
+        Args:
+            kind: Registered handler name, e.g. "crosswalks.generate"
+            params: Handler arguments (UUIDs and dates are JSON-encoded)
+            user_id: User who requested it
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If no handler is registered for ``kind``
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = Job(
+            id=uuid.uuid4(),
+            kind=kind,
+            status=QUEUED,
+            params=jsonable_encoder(params),
+            created_by_id=user_id,
+        )
+        self.db.add(job)
+        self.db.commit()
+        return job
+
+    def get_job(self, job_id: uuid.UUID) -> Optional[Job]:
+        return self.db.query(Job).filter(Job.id == job_id).first()
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Take the oldest queued job and mark it running (committed), if any."""
+        self.requeue_stale()
+
+        job = (
+            self.db.query(Job)
+            .filter(Job.status == QUEUED)
+            .order_by(Job.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(1)
+            .first()
+        )
+        if job is None:
+            self.db.rollback()
+            return None
+
+        now = datetime.utcnow()
+        job.status = RUNNING
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = None
+        self.db.commit()
+        return job
+
+    def requeue_stale(self) -> int:
+        """Queue again running jobs whose worker stopped sending heartbeats.
+
+        A job that has already been started ``settings.job_max_attempts``
+        times is failed instead.
+
+        Returns:
+            Number of jobs recovered
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.job_stale_seconds)
+        stale = (
+            self.db.query(Job)
+            .filter(Job.status == RUNNING, Job.heartbeat_at < cutoff)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for job in stale:
+            if job.attempts >= settings.job_max_attempts:
+                job.status = FAILED
+                job.error = f"Worker {job.worker_id} stopped responding"
+                job.completed_at = datetime.utcnow()
+            else:
+                job.status = QUEUED
+            job.worker_id = None
+        self.db.commit()
+        return len(stale)
+
+    def heartbeat(self, job_id: uuid.UUID, worker_id: str, progress: Optional[dict] = None) -> None:
+        """Record that the job's worker is alive, with its latest progress."""
+        values: dict[str, Any] = {"heartbeat_at": datetime.utcnow()}
+        if progress is not None:
+            values["progress"] = progress
+        self.db.query(Job).filter(
+            Job.id == job_id, Job.status == RUNNING, Job.worker_id == worker_id
+        ).update(values, synchronize_session=False)
+        self.db.commit()
+
+    def finish(
+        self,
+        job_id: uuid.UUID,
+        worker_id: str,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Mark a running job succeeded (with its result) or failed (with an error).
+
+        Returns:
+            False if the job is no longer this worker's (it was re-queued
+            after missing heartbeats), in which case nothing is written
+        """
+        values: dict[str, Any] = {
+            "status": FAILED if error is not None else SUCCEEDED,
+            "result": jsonable_encoder(result) if error is None else None,
+            "error": error,
+            "completed_at": datetime.utcnow(),
+        }
+        updated = self.db.query(Job).filter(
+            Job.id == job_id, Job.status == RUNNING, Job.worker_id == worker_id
+        ).update(values, synchronize_session=False)
+        self.db.commit()
+        return updated == 1
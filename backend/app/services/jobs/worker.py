@@ -0,0 +1,190 @@
+"""Worker pool that runs queued background jobs."""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.jobs.handlers import JOB_HANDLERS
+from app.services.jobs.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+# Shortest interval between two progress writes of one job
+PROGRESS_WRITE_SECONDS = 1.0
+
+
+class _Heartbeat:
+    """Writes a running job's heartbeat and progress from a side thread.
+
+    Uses its own session, so progress is visible to pollers without
+    committing any of the handler's work.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], job_id: uuid.UUID, worker_id: str):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self._progress: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+
+    def report(self, completed: int, total: int) -> None:
+        with self._lock:
+            self._progress = {"completed": completed, "total": total}
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(settings.job_heartbeat_seconds)
+            self._wake.clear()
+            with self._lock:
+                progress, self._progress = self._progress, None
+            # The final progress is written even when stopping
+            if progress is not None or not self._stopped.is_set():
+                self._write(progress)
+            if self._stopped.is_set():
+                return
+            self._stopped.wait(PROGRESS_WRITE_SECONDS)
+
+    def _write(self, progress: Optional[dict]) -> None:
+        db = self.session_factory()
+        try:
+            JobService(db).heartbeat(self.job_id, self.worker_id, progress)
+        except Exception as e:
+            logger.warning("Heartbeat for job %s failed: %s", self.job_id, e)
+        finally:
+            db.close()
+
+
+class JobWorker:
+    """Claims queued jobs and runs their handlers, on one or more threads.
+
+    Several workers, in any number of processes, can share one queue.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = 1,
+        poll_seconds: Optional[float] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Args:
+            session_factory: Creates database sessions
+            concurrency: Jobs run at once, each on its own thread
+            poll_seconds: Idle wait between queue checks (default from settings)
+            name: Worker name recorded on claimed jobs (default: host and pid)
+        """
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.job_poll_seconds
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """Claim and run one job.
+
+        Returns:
+            Whether there was a job to run
+        """
+        worker_id = worker_id or self.name
+        db = self.session_factory()
+        try:
+            job = JobService(db).claim(worker_id)
+            if job is None:
+                return False
+            job_id, kind, params = job.id, job.kind, job.params
+        finally:
+            db.close()
+
+        result, error = None, None
+        db = self.session_factory()
+        try:
+            with _Heartbeat(self.session_factory, job_id, worker_id) as heartbeat:
+                result = JOB_HANDLERS[kind](db, params, heartbeat.report)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Job %s (%s) failed on %s", job_id, kind, worker_id)
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            db.close()
+
+        db = self.session_factory()
+        try:
+            if not JobService(db).finish(job_id, worker_id, result, error):
+                logger.warning(
+                    "Job %s was re-queued while %s ran it; result dropped", job_id, worker_id
+                )
+        finally:
+            db.close()
+        return True
+
+    def run_pending(self) -> int:
+        """Run jobs on the calling thread until the queue is empty.
+
+        Returns:
+            Number of jobs run
+        """
+        count = 0
+        while self.run_once():
+            count += 1
+        return count
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        self._stopping.clear()
+        for n in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop, args=(f"{self.name}/{n}",), name=f"job-worker-{n}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming jobs and wait for running ones to finish."""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self) -> None:
+        """Run the worker threads until interrupted."""
+        self.start()
+        try:
+            while any(thread.is_alive() for thread in self._threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Stopping; waiting for running jobs to finish")
+            self.stop()
+
+    def _loop(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once(worker_id)
+            except Exception:
+                # The database may be briefly unavailable; keep polling
+                logger.exception("Job worker %s error", worker_id)
+                ran = False
+            if not ran:
+                self._stopping.wait(self.poll_seconds)
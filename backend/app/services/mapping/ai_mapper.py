@@ -1,19 +1,34 @@
 """AI-powered mapping service for policies and controls to framework requirements."""
 
+import json
+import logging
 import uuid
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from sqlalchemy.orm import Session
 
+from app.models.assessment import Assessment
 from app.models.control import Control, ControlMapping
 from app.models.policy import Policy, PolicyMapping
 from app.models.framework import CSFSubcategory
 from app.models.unified_framework import FrameworkRequirement, AssessmentFrameworkScope
 from app.core.ai_client import ai_client
+from app.core.ai_governor import BULK, AIUnavailableError, call_priority
+from app.core.concurrency import iter_concurrently, run_concurrently
+from app.core.llm_batch import BatchPrompt
+from app.core.llm_metrics import llm_run
 from app.core.config import settings
 from app.services.audit.audit_service import AuditService
+from app.services.clustering.embedding_pipeline import estimate_tokens
+from app.services.clustering.embedding_service import EmbeddingService
 from app.services.frameworks.requirement_service import RequirementService
+from app.services.mapping.requirement_shortlist import RequirementShortlist
+
+logger = logging.getLogger(__name__)
+
+# Estimated tokens of a batched mapping prompt's fixed instructions
+BATCH_PROMPT_OVERHEAD_TOKENS = 300
 
 
 class AIMappingService:
@@ -26,6 +41,7 @@ class AIMappingService:
         self.db = db
         self.audit_service = AuditService(db)
         self.requirement_service = RequirementService(db)
+        self.embedding_service = EmbeddingService(db)
 
     def generate_mappings_for_assessment(
         self,
@@ -35,6 +51,9 @@ class AIMappingService:
         include_controls: bool = True,
         confidence_threshold: float | None = None,
         use_unified_framework: bool = True,
+        shortlist_size: int | None = None,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
     ) -> dict[str, Any]:
         """
         Generate mapping suggestions for all policies and controls in an assessment.
@@ -46,6 +65,12 @@ class AIMappingService:
             include_controls: Whether to generate control mappings
             confidence_threshold: Minimum confidence score (default from settings)
             use_unified_framework: If True, map to unified requirements; else legacy CSF
+            shortlist_size: Requirements offered to the model per entity, picked by
+                embedding similarity; 0 offers all of them (default from the
+                assessment's AI overrides, then settings)
+            concurrency: Mapping prompts in flight at once (default from settings)
+            batch_size: Maximum controls per mapping prompt; 1 sends each control
+                on its own (default from settings)
 
         Returns:
             Summary of generated mappings
@@ -53,6 +78,360 @@ class AIMappingService:
         if confidence_threshold is None:
             confidence_threshold = settings.default_confidence_threshold
 
+        # API calls from here on are totalled for the audit log entry, and
+        # admitted after interactive ones
+        with llm_run("mapping") as llm_usage, call_priority(BULK):
+            entities, texts, candidates = self._prepare_run(
+                assessment_id, include_policies, include_controls,
+                use_unified_framework, shortlist_size,
+            )
+
+            # Prompts may run on worker threads (shared ai_client rate limiter);
+            # they get plain data, never the session
+            concurrency = concurrency or settings.mapping_concurrency
+            if batch_size is None:
+                batch_size = settings.mapping_batch_size
+            results: list[Optional[list[dict[str, Any]]]] = [None] * len(entities)
+
+            keys = self._batch_keys(entities)
+            prompts = self._mapping_prompts(
+                [entity_type for _, entity_type in entities], texts, candidates, batch_size
+            )
+            prompt_count = 0
+            while prompts:
+                prompt_results = run_concurrently(
+                    lambda indexes: self._suggest_prompt_mappings(
+                        indexes, keys, texts, entities, candidates, confidence_threshold
+                    ),
+                    prompts,
+                    concurrency,
+                )
+                prompt_count += len(prompts)
+                # Entities a batch response left out are asked again on their own
+                retry = []
+                for indexes, entity_results in zip(prompts, prompt_results):
+                    for i, entity_result in zip(indexes, entity_results):
+                        if entity_result is None:
+                            retry.append([i])
+                        else:
+                            results[i] = entity_result
+                prompts = retry
+
+        summary = self._persist_suggestions(entities, results, use_unified_framework)
+        summary["prompt_count"] = prompt_count
+
+        # Audit log
+        self.audit_service.log_generation(
+            entity_type="mapping",
+            entity_id=assessment_id,
+            generation_type="ai_mappings",
+            user_id=user_id,
+            details=f"Generated {summary['suggestions_count']} mapping suggestions",
+            new_values={"llm": llm_usage.as_dict()},
+        )
+
+        self.db.commit()
+
+        return {"assessment_id": assessment_id, **summary}
+
+    def stream_mappings_for_assessment(
+        self,
+        assessment_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+        include_policies: bool = True,
+        include_controls: bool = True,
+        confidence_threshold: float | None = None,
+        use_unified_framework: bool = True,
+        shortlist_size: int | None = None,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Generate mapping suggestions like ``generate_mappings_for_assessment``,
+        yielding each entity's suggestions as soon as they are committed.
+
+        Each entity's rows are committed on their own, so reviewers can approve
+        them while the run goes on. Closing the generator early (the client
+        went away) stops the run: prompts not yet sent are cancelled, entities
+        already yielded stay mapped, the others are left untouched, and the
+        audit log entry records the run as incomplete.
+
+        Args:
+            Same as ``generate_mappings_for_assessment``
+
+        Yields:
+            Events, each a dict with an ``event`` key:
+            - ``start``: entity_count and prompt_count
+            - ``entity``: one entity's committed suggestions
+            - ``progress``: completed and total entities
+            - ``complete``: the run summary, without the suggestion list
+        """
+        if confidence_threshold is None:
+            confidence_threshold = settings.default_confidence_threshold
+        concurrency = concurrency or settings.mapping_concurrency
+        if batch_size is None:
+            batch_size = settings.mapping_batch_size
+
+        counts = {"suggestions_count": 0, "policy_mappings": 0, "control_mappings": 0}
+        prompt_count = 0
+        completed = 0
+        finished = False
+
+        with llm_run("mapping") as llm_usage, call_priority(BULK):
+            entities, texts, candidates = self._prepare_run(
+                assessment_id, include_policies, include_controls,
+                use_unified_framework, shortlist_size,
+            )
+            keys = self._batch_keys(entities)
+            prompts = self._mapping_prompts(
+                [entity_type for _, entity_type in entities], texts, candidates, batch_size
+            )
+
+            def ask(indexes: list[int]) -> list[Optional[list[dict[str, Any]]]]:
+                return self._suggest_prompt_mappings(
+                    indexes, keys, texts, entities, candidates, confidence_threshold
+                )
+
+            yield {
+                "event": "start",
+                "assessment_id": assessment_id,
+                "entity_count": len(entities),
+                "prompt_count": len(prompts),
+            }
+
+            try:
+                while prompts:
+                    retry = []
+                    answers = iter_concurrently(ask, prompts, concurrency)
+                    try:
+                        # Entities a batch response left out are asked again on their own
+                        for n, results in answers:
+                            prompt_count += 1
+                            for i, result in zip(prompts[n], results):
+                                if result is None:
+                                    retry.append([i])
+                                    continue
+                                summary = self._persist_suggestions(
+                                    [entities[i]], [result], use_unified_framework
+                                )
+                                self.db.commit()
+                                completed += 1
+                                for key in counts:
+                                    counts[key] += summary[key]
+
+                                entity, entity_type = entities[i]
+                                yield {
+                                    "event": "entity",
+                                    "entity_type": entity_type,
+                                    "entity_id": entity.id,
+                                    "entity_name": entity.name,
+                                    "suggestions": summary["suggestions"],
+                                }
+                                yield {
+                                    "event": "progress",
+                                    "completed": completed,
+                                    "total": len(entities),
+                                }
+                    finally:
+                        answers.close()
+                    prompts = retry
+                finished = True
+            finally:
+                # Rows of the entity being persisted when the run stopped, if any
+                self.db.rollback()
+                details = f"Generated {counts['suggestions_count']} mapping suggestions"
+                if not finished:
+                    details += f" (stopped after {completed} of {len(entities)} entities)"
+                self.audit_service.log_generation(
+                    entity_type="mapping",
+                    entity_id=assessment_id,
+                    generation_type="ai_mappings",
+                    user_id=user_id,
+                    details=details,
+                    new_values={"llm": llm_usage.as_dict(), "completed": finished},
+                )
+                self.db.commit()
+
+        yield {
+            "event": "complete",
+            "assessment_id": assessment_id,
+            **counts,
+            "prompt_count": prompt_count,
+        }
+
+    # Batch-job mode: app.services.batch.LLMBatchService drives these hooks to
+    # run the same prompts through a provider batch API instead of inline
+
+    def prepare_batch_job(
+        self,
+        assessment_id: uuid.UUID,
+        include_policies: bool = True,
+        include_controls: bool = True,
+        confidence_threshold: float | None = None,
+        use_unified_framework: bool = True,
+        shortlist_size: int | None = None,
+        batch_size: int | None = None,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Snapshot a mapping run's prompt inputs for a batch job.
+
+        Returns:
+            (params, items): run options with the candidate requirements'
+            prompt fields, and one item per policy or control with its text
+            and candidate requirement ids
+        """
+        entities, texts, candidates = self._prepare_run(
+            assessment_id, include_policies, include_controls,
+            use_unified_framework, shortlist_size,
+        )
+        requirements = {
+            str(req["id"]): {"code": req["code"], "description": req["description"]}
+            for shortlist in candidates for req in shortlist
+        }
+        items = [
+            {
+                "key": key,
+                "entity_type": entity_type,
+                "entity_id": str(entity.id),
+                "text": text,
+                "requirement_ids": [str(req["id"]) for req in shortlist],
+            }
+            for key, (entity, entity_type), text, shortlist
+            in zip(self._batch_keys(entities), entities, texts, candidates)
+        ]
+        params = {
+            "assessment_id": str(assessment_id),
+            "confidence_threshold": (
+                settings.default_confidence_threshold
+                if confidence_threshold is None else confidence_threshold
+            ),
+            "use_unified_framework": use_unified_framework,
+            "batch_size": settings.mapping_batch_size if batch_size is None else batch_size,
+            "requirements": requirements,
+        }
+        return params, items
+
+    @staticmethod
+    def _batch_candidates(params: dict[str, Any], item: dict[str, Any]) -> list[dict]:
+        return [
+            {"id": uuid.UUID(req_id), **params["requirements"][req_id]}
+            for req_id in item["requirement_ids"]
+        ]
+
+    def batch_prompts(self, job, keys: list[str]) -> list[BatchPrompt]:
+        """Prompts answering the given items, packed as in an inline run."""
+        by_key = {item["key"]: item for item in job.items}
+        items = [by_key[key] for key in keys]
+        texts = [item["text"] for item in items]
+        candidates = [self._batch_candidates(job.params, item) for item in items]
+
+        prompts = []
+        for indexes in self._mapping_prompts(
+            [item["entity_type"] for item in items],
+            texts,
+            candidates,
+            job.params["batch_size"],
+        ):
+            if len(indexes) == 1:
+                i = indexes[0]
+                prompt = ai_client.mapping_prompt(texts[i], items[i]["entity_type"], candidates[i])
+            else:
+                prompt = ai_client.batch_mapping_prompt(
+                    [{"key": items[i]["key"], "text": texts[i]} for i in indexes],
+                    "control",
+                    self._merge_requirements([candidates[i] for i in indexes]),
+                )
+            prompts.append(BatchPrompt(
+                prompt=prompt,
+                keys=[items[i]["key"] for i in indexes],
+                max_tokens=settings.ai_max_tokens,
+                temperature=settings.ai_temperature,
+            ))
+        return prompts
+
+    @staticmethod
+    def parse_batch_reply(job, prompt_keys: list[str], text: str) -> dict[str, list]:
+        """Raw suggestions per item from one batch reply; items it lacks are left out."""
+        try:
+            reply = ai_client.parse_json(text)
+        except (json.JSONDecodeError, IndexError):
+            return {}
+        if len(prompt_keys) == 1:
+            # Single-entity prompts answer with a bare array
+            return {prompt_keys[0]: reply} if isinstance(reply, list) else {}
+        if not isinstance(reply, dict):
+            return {}
+        return {key: reply[key] for key in prompt_keys if isinstance(reply.get(key), list)}
+
+    @staticmethod
+    def batch_confidences(job, result: list) -> list[Any]:
+        return ai_client.suggestion_confidences(result, job.params["confidence_threshold"])
+
+    def ingest_batch_results(
+        self,
+        job,
+        answers: dict[str, tuple[list, str]],
+    ) -> dict[str, Any]:
+        """Add the mapping rows of a finished batch job (flushed, not committed).
+
+        Args:
+            job: The LLMBatchJob
+            answers: (raw suggestions, model tier) per item key
+
+        Returns:
+            Counts for the job summary
+        """
+        params = job.params
+        loaded = {}
+        for entity_type, model in (("policy", Policy), ("control", Control)):
+            ids = [
+                uuid.UUID(item["entity_id"]) for item in job.items
+                if item["entity_type"] == entity_type
+            ]
+            if ids:
+                loaded.update(
+                    ((entity_type, entity.id), entity)
+                    for entity in self.db.query(model).filter(model.id.in_(ids)).all()
+                )
+
+        entities, results = [], []
+        for item in job.items:
+            entity = loaded.get((item["entity_type"], uuid.UUID(item["entity_id"])))
+            if entity is None:
+                # Deleted while the batch was running
+                continue
+            raw, tier = answers.get(item["key"], ([], None))
+            tagged = [dict(s, model_tier=tier) for s in raw if isinstance(s, dict)]
+            entities.append((entity, item["entity_type"]))
+            results.append(self._parse_suggestions(
+                tagged, self._batch_candidates(params, item), params["confidence_threshold"]
+            ))
+
+        summary = self._persist_suggestions(entities, results, params["use_unified_framework"])
+        summary.pop("suggestions")
+        summary["prompt_count"] = job.request_count
+
+        self.audit_service.log_generation(
+            entity_type="mapping",
+            entity_id=uuid.UUID(params["assessment_id"]),
+            generation_type="ai_mappings",
+            user_id=job.created_by_id,
+            details=f"Generated {summary['suggestions_count']} mapping suggestions",
+            new_values={"batch_job_id": str(job.id), "rounds": job.round},
+        )
+        return summary
+
+    def _prepare_run(
+        self,
+        assessment_id: uuid.UUID,
+        include_policies: bool,
+        include_controls: bool,
+        use_unified_framework: bool,
+        shortlist_size: int | None,
+    ) -> tuple[list[tuple[Policy | Control, str]], list[str], list[list[dict]]]:
+        """Entities to map, their prompt texts, and each one's candidate requirements."""
+        if shortlist_size is None:
+            shortlist_size = self._get_shortlist_size(assessment_id)
+
         # Get requirements to map to
         if use_unified_framework:
             requirements = self._get_assessment_requirements(assessment_id)
@@ -62,6 +441,7 @@ class AIMappingService:
                     "description": req.description or req.name,
                     "id": req.id,
                     "framework_id": req.framework_id,
+                    "text": self.embedding_service.prepare_requirement_text(req),
                 }
                 for req in requirements
             ]
@@ -69,112 +449,96 @@ class AIMappingService:
             # Legacy: use CSF subcategories
             subcategories = self.db.query(CSFSubcategory).all()
             req_data = [
-                {"code": sc.code, "description": sc.description, "id": sc.id}
+                {
+                    "code": sc.code,
+                    "description": sc.description,
+                    "id": sc.id,
+                    "text": f"{sc.code} | {sc.description}",
+                }
                 for sc in subcategories
             ]
 
-        suggestions = []
-        policy_mappings_count = 0
-        control_mappings_count = 0
-
-        # Generate policy mappings
+        entities: list[tuple[Policy | Control, str]] = []
         if include_policies:
             policies = self.db.query(Policy).filter(
                 Policy.assessment_id == assessment_id
-            ).all()
+            ).order_by(Policy.name, Policy.id).all()
+            entities.extend((policy, "policy") for policy in policies)
 
-            for policy in policies:
-                if not policy.content_text:
-                    continue
+        if include_controls:
+            controls = self.db.query(Control).filter(
+                Control.assessment_id == assessment_id
+            ).order_by(Control.identifier, Control.id).all()
+            entities.extend((control, "control") for control in controls)
 
-                policy_suggestions = self._generate_mappings_for_entity(
-                    entity=policy,
-                    entity_type="policy",
-                    requirements=req_data,
-                    confidence_threshold=confidence_threshold,
-                )
+        # Skip entities with nothing to map
+        entities = [
+            (entity, entity_type) for entity, entity_type in entities
+            if self._entity_text(entity, entity_type).strip()
+        ]
 
-                for suggestion in policy_suggestions:
-                    # Create policy mapping
+        texts = [self._entity_text(entity, entity_type) for entity, entity_type in entities]
+        return entities, texts, self._shortlist_requirements(texts, req_data, shortlist_size)
+
+    def _persist_suggestions(
+        self,
+        entities: list[tuple[Policy | Control, str]],
+        results: list[list[dict[str, Any]]],
+        use_unified_framework: bool,
+    ) -> dict[str, Any]:
+        """Add mapping rows for each entity's parsed suggestions (flushed, not committed).
+
+        Returns:
+            Counts and the suggestion list for the generation summary
+        """
+        suggestions = []
+        mappings = []
+        policy_mappings_count = 0
+        control_mappings_count = 0
+
+        # Rows are built in entity order, so the output does not depend on
+        # which prompt finished first
+        for (entity, entity_type), entity_suggestions in zip(entities, results):
+            for suggestion in entity_suggestions:
+                if entity_type == "policy":
                     mapping = PolicyMapping(
                         id=uuid.uuid4(),
-                        policy_id=policy.id,
+                        policy_id=entity.id,
                         subcategory_id=suggestion["requirement_id"],  # For backward compat
                         requirement_id=suggestion["requirement_id"] if use_unified_framework else None,
                         confidence_score=suggestion["confidence_score"],
                         is_approved=False,
                         created_at=datetime.utcnow(),
                     )
-                    self.db.add(mapping)
                     policy_mappings_count += 1
-
-                    suggestions.append({
-                        "entity_type": "policy",
-                        "entity_id": policy.id,
-                        "entity_name": policy.name,
-                        "requirement_id": suggestion["requirement_id"],
-                        "requirement_code": suggestion["requirement_code"],
-                        "confidence_score": suggestion["confidence_score"],
-                        "reasoning": suggestion.get("reasoning"),
-                    })
-
-        # Generate control mappings
-        if include_controls:
-            controls = self.db.query(Control).filter(
-                Control.assessment_id == assessment_id
-            ).all()
-
-            for control in controls:
-                control_text = f"{control.name}\n{control.description or ''}"
-                if not control_text.strip():
-                    continue
-
-                control_suggestions = self._generate_mappings_for_entity(
-                    entity=control,
-                    entity_type="control",
-                    requirements=req_data,
-                    confidence_threshold=confidence_threshold,
-                )
-
-                for suggestion in control_suggestions:
-                    # Create control mapping
+                else:
                     mapping = ControlMapping(
                         id=uuid.uuid4(),
-                        control_id=control.id,
+                        control_id=entity.id,
                         subcategory_id=suggestion["requirement_id"],  # For backward compat
                         requirement_id=suggestion["requirement_id"] if use_unified_framework else None,
                         confidence_score=suggestion["confidence_score"],
                         is_approved=False,
                         created_at=datetime.utcnow(),
                     )
-                    self.db.add(mapping)
                     control_mappings_count += 1
+                mappings.append(mapping)
 
-                    suggestions.append({
-                        "entity_type": "control",
-                        "entity_id": control.id,
-                        "entity_name": control.name,
-                        "requirement_id": suggestion["requirement_id"],
-                        "requirement_code": suggestion["requirement_code"],
-                        "confidence_score": suggestion["confidence_score"],
-                        "reasoning": suggestion.get("reasoning"),
-                    })
+                suggestions.append({
+                    "entity_type": entity_type,
+                    "entity_id": entity.id,
+                    "entity_name": entity.name,
+                    "requirement_id": suggestion["requirement_id"],
+                    "requirement_code": suggestion["requirement_code"],
+                    "confidence_score": suggestion["confidence_score"],
+                    "reasoning": suggestion.get("reasoning"),
+                    "model_tier": suggestion.get("model_tier"),
+                })
 
+        self.db.add_all(mappings)
         self.db.flush()
 
-        # Audit log
-        self.audit_service.log_generation(
-            entity_type="mapping",
-            entity_id=assessment_id,
-            generation_type="ai_mappings",
-            user_id=user_id,
-            details=f"Generated {len(suggestions)} mapping suggestions",
-        )
-
-        self.db.commit()
-
         return {
-            "assessment_id": assessment_id,
             "suggestions_count": len(suggestions),
             "policy_mappings": policy_mappings_count,
             "control_mappings": control_mappings_count,
@@ -204,19 +568,224 @@ class AIMappingService:
                 .all()
             )
 
-    def _generate_mappings_for_entity(
+    def _get_shortlist_size(self, assessment_id: uuid.UUID) -> int:
+        """Shortlist size from the assessment's AI overrides, else the global default."""
+        assessment = self.db.query(Assessment).filter(Assessment.id == assessment_id).first()
+        overrides = (assessment.ai_prompt_overrides or {}) if assessment else {}
+        size = overrides.get("mapping_shortlist_size")
+        return settings.mapping_shortlist_size if size is None else size
+
+    def _shortlist_requirements(
         self,
-        entity: Policy | Control,
+        texts: list[str],
+        requirements: list[dict],
+        shortlist_size: int,
+    ) -> list[list[dict]]:
+        """Candidate requirements for each entity text, most similar first."""
+        if shortlist_size <= 0 or shortlist_size >= len(requirements):
+            return [requirements for _ in texts]
+
+        try:
+            return RequirementShortlist(requirements, self.embedding_service).select(
+                texts, shortlist_size
+            )
+        except Exception:
+            # Without embeddings, fall back to offering every requirement
+            logger.exception("Requirement shortlisting failed")
+            return [requirements for _ in texts]
+
+    @staticmethod
+    def _entity_text(entity: Policy | Control, entity_type: str) -> str:
+        if entity_type == "policy":
+            return entity.content_text or ""
+        return f"{entity.name}\n{entity.description or ''}"
+
+    @staticmethod
+    def _batch_keys(entities: list[tuple[Policy | Control, str]]) -> list[str]:
+        """Identifiers the batched prompt uses for each entity, made unique."""
+        keys = []
+        used = set()
+        for entity, entity_type in entities:
+            base = (entity.identifier if entity_type == "control" else None) or entity.name
+            key, n = base, 1
+            while key in used:
+                n += 1
+                key = f"{base}#{n}"
+            used.add(key)
+            keys.append(key)
+        return keys
+
+    @staticmethod
+    def _merge_requirements(shortlists: list[list[dict]]) -> list[dict]:
+        """Union of several entities' candidate requirements, first occurrence kept."""
+        merged = {}
+        for shortlist in shortlists:
+            for req in shortlist:
+                merged.setdefault(req["id"], req)
+        return list(merged.values())
+
+    @classmethod
+    def _mapping_prompts(
+        cls,
+        entity_types: list[str],
+        texts: list[str],
+        candidates: list[list[dict]],
+        batch_size: int,
+    ) -> list[list[int]]:
+        """Entity indexes answered by each prompt of a mapping run.
+
+        Short control descriptions are packed several to a prompt; policy
+        documents are long enough to go alone, as do controls left out of
+        every batch.
+
+        Args:
+            entity_types: "policy" or "control" for every entity
+            texts: Text of every entity
+            candidates: Candidate requirements of every entity
+            batch_size: Maximum entities per prompt
+
+        Returns:
+            Multi-entity batches first, then one single-entity prompt per
+            remaining entity
+        """
+        batches = cls._pack_mapping_batches(
+            [i for i, entity_type in enumerate(entity_types) if entity_type == "control"],
+            texts,
+            candidates,
+            max_entities=batch_size,
+            max_tokens=settings.mapping_batch_max_tokens,
+        )
+        batched = {i for batch in batches for i in batch}
+        return batches + [[i] for i in range(len(entity_types)) if i not in batched]
+
+    @staticmethod
+    def _pack_mapping_batches(
+        indexes: list[int],
+        texts: list[str],
+        candidates: list[list[dict]],
+        max_entities: int,
+        max_tokens: int,
+    ) -> list[list[int]]:
+        """Group entities into multi-entity prompts under a token budget.
+
+        A prompt's cost is estimated from its entity texts plus the union of
+        their candidate requirements, which is listed once per prompt.
+
+        Args:
+            indexes: Entities eligible for batching, in order
+            texts: Text of every entity
+            candidates: Candidate requirements of every entity
+            max_entities: Maximum entities per prompt
+            max_tokens: Estimated prompt token budget
+
+        Returns:
+            Batches of entity indexes; entities that end up alone are left
+            out, since the single-entity prompt suits them better
+        """
+        if max_entities <= 1:
+            return []
+
+        def cost(i: int, seen: set) -> int:
+            return estimate_tokens(texts[i][:2000]) + sum(
+                estimate_tokens(f"- {req['code']}: {req['description']}")
+                for req in candidates[i] if req["id"] not in seen
+            )
+
+        batches = []
+        current: list[int] = []
+        seen: set = set()
+        tokens = BATCH_PROMPT_OVERHEAD_TOKENS
+        for i in indexes:
+            added = cost(i, seen)
+            if current and (len(current) >= max_entities or tokens + added > max_tokens):
+                batches.append(current)
+                current, seen = [], set()
+                tokens = BATCH_PROMPT_OVERHEAD_TOKENS
+                added = cost(i, seen)
+            current.append(i)
+            seen.update(req["id"] for req in candidates[i])
+            tokens += added
+
+        if current:
+            batches.append(current)
+        return [batch for batch in batches if len(batch) > 1]
+
+    def _suggest_prompt_mappings(
+        self,
+        indexes: list[int],
+        keys: list[str],
+        texts: list[str],
+        entities: list[tuple[Policy | Control, str]],
+        candidates: list[list[dict]],
+        confidence_threshold: float,
+    ) -> list[Optional[list[dict[str, Any]]]]:
+        """Ask one prompt of ``_mapping_prompts`` (no database access).
+
+        Returns:
+            Suggestions per entity of the prompt; None for an entity a batch
+            response did not cover
+        """
+        if len(indexes) == 1:
+            i = indexes[0]
+            return [self._suggest_mappings(
+                texts[i], entities[i][1], candidates[i], confidence_threshold
+            )]
+        return self._suggest_batch_mappings(
+            [keys[i] for i in indexes],
+            [texts[i] for i in indexes],
+            "control",
+            self._merge_requirements([candidates[i] for i in indexes]),
+            confidence_threshold,
+        )
+
+    def _suggest_batch_mappings(
+        self,
+        keys: list[str],
+        texts: list[str],
         entity_type: str,
         requirements: list[dict],
         confidence_threshold: float,
-    ) -> list[dict[str, Any]]:
-        """Generate mapping suggestions for a single entity."""
-        if entity_type == "policy":
-            text = entity.content_text or ""
-        else:
-            text = f"{entity.name}\n{entity.description or ''}"
+    ) -> list[Optional[list[dict[str, Any]]]]:
+        """Ask the model for several entities' mappings in one prompt (no database access).
 
+        Returns:
+            Suggestions per entity, in key order; None for an entity the
+            response did not cover, so it can be retried on its own
+        """
+        try:
+            response = ai_client.generate_batch_mapping_suggestions(
+                entities=[{"key": key, "text": text} for key, text in zip(keys, texts)],
+                entity_type=entity_type,
+                subcategories=[
+                    {"code": req["code"], "description": req["description"]}
+                    for req in requirements
+                ],
+                confidence_threshold=confidence_threshold,
+            )
+        except AIUnavailableError:
+            raise
+        except Exception:
+            return [None] * len(keys)
+
+        results = []
+        for key in keys:
+            ai_suggestions = response.get(key)
+            if isinstance(ai_suggestions, list):
+                results.append(
+                    self._parse_suggestions(ai_suggestions, requirements, confidence_threshold)
+                )
+            else:
+                results.append(None)
+        return results
+
+    def _suggest_mappings(
+        self,
+        text: str,
+        entity_type: str,
+        requirements: list[dict],
+        confidence_threshold: float,
+    ) -> list[dict[str, Any]]:
+        """Ask the model for mappings of one entity's text (no database access)."""
         if not text.strip():
             return []
 
@@ -228,16 +797,31 @@ class AIMappingService:
                     {"code": req["code"], "description": req["description"]}
                     for req in requirements
                 ],
+                confidence_threshold=confidence_threshold,
             )
+        except AIUnavailableError:
+            # The provider is down; fail the run rather than store an empty one
+            raise
         except Exception:
             # If AI fails, return empty list
             return []
 
-        # Map AI suggestions to internal format
+        return self._parse_suggestions(ai_suggestions, requirements, confidence_threshold)
+
+    @staticmethod
+    def _parse_suggestions(
+        ai_suggestions: list,
+        requirements: list[dict],
+        confidence_threshold: float,
+    ) -> list[dict[str, Any]]:
+        """Map AI suggestions to internal format, dropping unknown codes and low confidence."""
         code_to_id = {req["code"]: req["id"] for req in requirements}
         suggestions = []
 
         for suggestion in ai_suggestions:
+            if not isinstance(suggestion, dict):
+                continue
+
             code = suggestion.get("subcategory_code")
             confidence = suggestion.get("confidence_score", 0)
 
@@ -252,6 +836,7 @@ class AIMappingService:
                 "requirement_code": code,
                 "confidence_score": confidence,
                 "reasoning": suggestion.get("reasoning"),
+                "model_tier": suggestion.get("model_tier"),
             })
 
         return suggestions
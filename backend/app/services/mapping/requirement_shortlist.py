@@ -0,0 +1,78 @@
+"""Embedding-based shortlisting of requirements for mapping prompts."""
+
+from typing import Any, Optional
+
+from app.services.clustering.embedding_service import EmbeddingService
+from app.services.clustering.vector_engine import VectorEngine
+
+
+class RequirementShortlist:
+    """Ranks candidate requirements against policy and control text.
+
+    Mapping prompts used to list every in-scope requirement, which with a
+    few frameworks in scope runs to hundreds of lines per entity. The
+    shortlist embeds the entity text and keeps only the ``top_k``
+    requirements by cosine similarity, so the model chooses from a handful
+    of likely candidates.
+
+    Requirement vectors come from stored embeddings where available; any
+    requirement without one (including legacy CSF subcategories) is embedded
+    from its ``text`` on the fly, which the embedding cache makes cheap on
+    later runs. Requirements are dicts with at least "id" and "text" keys.
+    """
+
+    def __init__(
+        self,
+        requirements: list[dict[str, Any]],
+        embedding_service: EmbeddingService,
+    ):
+        self.requirements = requirements
+        self.embedding_service = embedding_service
+        self._engine: Optional[VectorEngine] = None
+
+    @property
+    def engine(self) -> VectorEngine:
+        """Vector engine over the requirement embeddings, loaded on first use."""
+        if self._engine is None:
+            self._engine = VectorEngine(
+                self._requirement_vectors(),
+                dimensions=self.embedding_service.backend.dimensions,
+            )
+        return self._engine
+
+    def _requirement_vectors(self) -> list:
+        ids = [req["id"] for req in self.requirements]
+        stored = self.embedding_service.get_embeddings(ids) if self.embedding_service.db else {}
+
+        missing = [req for req in self.requirements if req["id"] not in stored]
+        if missing:
+            generated = self.embedding_service.generate_embeddings_batch(
+                [req["text"] for req in missing]
+            )
+            stored = {**stored, **{req["id"]: v for req, v in zip(missing, generated)}}
+
+        return [stored[req_id] for req_id in ids]
+
+    def select(self, texts: list[str], top_k: int) -> list[list[dict[str, Any]]]:
+        """Pick the ``top_k`` most similar requirements for each text.
+
+        Args:
+            texts: Policy or control texts
+            top_k: Requirements to keep per text; 0 or at least the number of
+                requirements keeps them all
+
+        Returns:
+            One list of requirement dicts per text, most similar first
+        """
+        if not texts:
+            return []
+        if top_k <= 0 or top_k >= len(self.requirements):
+            return [list(self.requirements) for _ in texts]
+
+        queries = VectorEngine(
+            self.embedding_service.generate_embeddings_batch(texts),
+            dimensions=self.embedding_service.backend.dimensions,
+        )
+        # Threshold -1 keeps exactly top_k per text, however weak the matches
+        matches = queries.top_k_against(self.engine, top_k=top_k, threshold=-1.0)
+        return [[self.requirements[i] for i, _ in row] for row in matches]
@@ -0,0 +1,38 @@
+"""
+Background job worker.
+
+Runs jobs queued by endpoints called with async=true. Any number of
+workers, on any number of nodes, can share the queue; set
+JOB_WORKERS_IN_PROCESS=0 on the API processes to leave all jobs to them.
+
+Usage:
+    cd backend
+    python -m app.worker
+    python -m app.worker --concurrency 4
+    python -m app.worker --once
+"""
+
+import argparse
+import logging
+
+from app.services.jobs import JobWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs run at once")
+    parser.add_argument("--once", action="store_true", help="Run queued jobs, then exit")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    worker = JobWorker(concurrency=args.concurrency)
+    if args.once:
+        print(f"Ran {worker.run_pending()} jobs")
+    else:
+        worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
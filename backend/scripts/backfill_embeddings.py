@@ -0,0 +1,105 @@
+"""
+Convert legacy JSON embedding columns to packed float32 bytes.
+
+Migration 011 renames the JSON columns to ``embedding_json`` and
+``embedding_centroid_json`` and adds empty binary columns in their place.
+This script fills the binary columns in batches, so it can be interrupted
+and re-run safely: only rows whose binary column is still NULL are touched.
+
+Migration 012 moves requirement vectors into ``requirement_embeddings`` and
+converts any remaining JSON itself, so on later revisions only cluster
+centroids are backfilled here; columns that no longer exist are skipped.
+
+Usage:
+    cd backend
+    python -m scripts.backfill_embeddings
+    python -m scripts.backfill_embeddings --batch-size 500 --clear-legacy
+"""
+
+import argparse
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.db.types import pack_vector
+
+
+VECTOR_COLUMNS = [
+    ("framework_requirements", "embedding"),
+    ("requirement_clusters", "embedding_centroid"),
+]
+
+
+def backfill_column(
+    db: Session,
+    table: str,
+    column: str,
+    batch_size: int,
+    clear_legacy: bool,
+) -> int:
+    """Convert one JSON column, committing after every batch.
+
+    Returns:
+        Number of rows converted
+    """
+    legacy = f"{column}_json"
+    t = sa.table(
+        table,
+        sa.column("id"),
+        sa.column(column, sa.LargeBinary()),
+        sa.column(legacy, sa.JSON()),
+    )
+
+    converted = 0
+    while True:
+        rows = db.execute(
+            sa.select(t.c.id, t.c[legacy])
+            .where(t.c[column].is_(None), t.c[legacy].isnot(None))
+            .limit(batch_size)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row_id, values in rows:
+            updates = {column: pack_vector(values)}
+            if clear_legacy:
+                updates[legacy] = None
+            db.execute(t.update().where(t.c.id == row_id).values(updates))
+
+        db.commit()
+        converted += len(rows)
+        print(f"  {table}.{column}: {converted} rows converted")
+
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill binary embedding columns")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--clear-legacy",
+        action="store_true",
+        help="Set the *_json source column to NULL once a row is converted",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        inspector = sa.inspect(db.get_bind())
+        for table, column in VECTOR_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if not {column, f"{column}_json"} <= existing:
+                print(f"{table}.{column}: nothing to backfill at this revision")
+                continue
+
+            start = time.perf_counter()
+            total = backfill_column(db, table, column, args.batch_size, args.clear_legacy)
+            print(f"{table}.{column}: {total} rows in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark top-k lookups on the IVF-flat requirement index.
+
+Builds a RequirementIndex over synthetic clustered embeddings and reports
+build time, per-query latency (p50/p99) and recall@k against exact search.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_ann_index
+    python -m scripts.benchmarks.bench_ann_index --n 100000 --dim 1536 --nprobe 8
+"""
+
+import argparse
+import time
+import uuid
+
+import numpy as np
+
+from app.services.clustering.ann_index import RequirementIndex
+from app.services.clustering.vector_engine import VectorEngine
+
+
+def make_entries(n: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 50, 1), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), size=n)]
+    vectors += rng.standard_normal((n, dim)).astype(np.float32) * 0.05
+    frameworks = [uuid.uuid4() for _ in range(4)]
+    entries = [
+        (uuid.uuid4(), frameworks[i % 4], True, vectors[i])
+        for i in range(n)
+    ]
+    return entries, vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+
+    entries, vectors = make_entries(args.n, args.dim)
+
+    start = time.perf_counter()
+    index = RequirementIndex.build(entries, dimensions=args.dim, nprobe=args.nprobe)
+    build_time = time.perf_counter() - start
+
+    exact = VectorEngine(vectors)
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(args.n, size=args.queries, replace=False)
+
+    latencies, recalls = [], []
+    for row in query_rows:
+        query = vectors[row] + rng.standard_normal(args.dim).astype(np.float32) * 0.02
+        start = time.perf_counter()
+        results = index.search(query, top_k=args.top_k)
+        latencies.append(time.perf_counter() - start)
+
+        expected = {entries[i][0] for i, _ in exact.top_k(query, top_k=args.top_k)}
+        recalls.append(len(expected & {rid for rid, _ in results}) / len(expected))
+
+    latencies_ms = np.asarray(latencies) * 1000
+    print(f"vectors:      {args.n} x {args.dim}")
+    print(f"lists:        {index.nlist} (nprobe={index.nprobe})")
+    print(f"build time:   {build_time:.2f}s")
+    print(f"query p50:    {np.percentile(latencies_ms, 50):.2f} ms")
+    print(f"query p99:    {np.percentile(latencies_ms, 99):.2f} ms")
+    print(f"recall@{args.top_k}:    {np.mean(recalls):.3f}")
+
+
+if __name__ == "__main__":
+    main()
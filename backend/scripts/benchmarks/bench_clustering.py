@@ -0,0 +1,119 @@
+"""
+Benchmark requirement clustering on synthetic embeddings.
+
+Runs the nearest-neighbour-chain average linkage used by ClusteringService
+on --n clustered vectors, and checks it against the original greedy
+pairwise-merge loop on a small sample (which is too slow to run at scale).
+
+It then clusters a random walk on the sphere, whose thresholded graph is one
+giant component of --chain-n nodes. That component is too large for a dense
+matrix, so it exercises the sparse linkage path; both paths are first
+checked against each other on a --check-n walk.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_clustering
+    python -m scripts.benchmarks.bench_clustering --n 20000 --dim 1536 --threshold 0.85
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.clustering.linkage import cluster_vectors
+from app.services.clustering.vector_engine import VectorEngine
+
+
+def make_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Groups of 2-8 near-duplicates (same control across frameworks) plus noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 4, 1), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), size=n)]
+    noise = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors + noise * rng.uniform(0.1, 0.6, size=(n, 1)).astype(np.float32)
+
+
+def make_chain_vectors(n: int, dim: int, step: float = 0.4, seed: int = 0) -> np.ndarray:
+    """Random walk on the unit sphere: each vector is only close to its neighbours in the walk."""
+    rng = np.random.default_rng(seed)
+    steps = rng.standard_normal((n, dim)).astype(np.float32) * (step / np.sqrt(dim))
+    vectors = np.empty((n, dim), dtype=np.float32)
+    current = rng.standard_normal(dim).astype(np.float32)
+    current /= np.linalg.norm(current)
+    for i in range(n):
+        current = current + steps[i]
+        current /= np.linalg.norm(current)
+        vectors[i] = current
+    return vectors
+
+
+def greedy_clusters(vectors: np.ndarray, threshold: float, min_cluster_size: int):
+    """The original implementation: merge the most similar pair until none reaches threshold."""
+    matrix = VectorEngine(vectors).pairwise()
+    matrix[matrix < threshold] = 0.0
+    matrix = matrix.tolist()
+    clusters = [[i] for i in range(len(vectors))]
+    active = set(range(len(vectors)))
+    while len(active) > 1:
+        best_sim, best_pair = -1, None
+        active_list = list(active)
+        for i in range(len(active_list)):
+            for j in range(i + 1, len(active_list)):
+                ci, cj = active_list[i], active_list[j]
+                total = sum(matrix[a][b] for a in clusters[ci] for b in clusters[cj])
+                sim = total / (len(clusters[ci]) * len(clusters[cj]))
+                if sim > best_sim:
+                    best_sim, best_pair = sim, (ci, cj)
+        if best_sim < threshold or best_pair is None:
+            break
+        ci, cj = best_pair
+        clusters[ci] = clusters[ci] + clusters[cj]
+        active.remove(cj)
+    return sorted(sorted(clusters[i]) for i in active if len(clusters[i]) >= min_cluster_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--min-cluster-size", type=int, default=2)
+    parser.add_argument("--check-n", type=int, default=300, help="Sample size for the greedy comparison")
+    parser.add_argument("--chain-n", type=int, default=20_000, help="Size of the giant-component walk")
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.n, args.dim)
+
+    sample = make_vectors(args.check_n, args.dim, seed=1)
+    start = time.perf_counter()
+    expected = greedy_clusters(sample, args.threshold, args.min_cluster_size)
+    greedy_time = time.perf_counter() - start
+    actual = cluster_vectors(VectorEngine(sample), args.threshold, args.min_cluster_size)
+    print(f"greedy, n={args.check_n}: {greedy_time:.2f}s, identical output: {actual == expected}")
+
+    engine = VectorEngine(vectors)
+    start = time.perf_counter()
+    clusters = cluster_vectors(engine, args.threshold, args.min_cluster_size)
+    elapsed = time.perf_counter() - start
+
+    sizes = [len(c) for c in clusters]
+    print(f"nn-chain, n={args.n}, dim={args.dim}: {elapsed:.2f}s")
+    print(f"  {len(clusters)} clusters, {sum(sizes)} requirements clustered, largest {max(sizes, default=0)}")
+
+    walk = VectorEngine(make_chain_vectors(args.check_n, args.dim, seed=1))
+    dense = cluster_vectors(walk, args.threshold, args.min_cluster_size)
+    sparse = cluster_vectors(walk, args.threshold, args.min_cluster_size, dense_limit=0)
+    print(f"giant component, n={args.check_n}: sparse and dense paths agree: {sparse == dense}")
+
+    chain = VectorEngine(make_chain_vectors(args.chain_n, args.dim))
+    start = time.perf_counter()
+    clusters = cluster_vectors(chain, args.threshold, args.min_cluster_size)
+    elapsed = time.perf_counter() - start
+    sizes = [len(c) for c in clusters]
+    print(f"giant component, n={args.chain_n}: {elapsed:.2f}s (dense would need {8 * args.chain_n ** 2 / 1024 ** 3:.1f} GB)")
+    print(f"  {len(clusters)} clusters, {sum(sizes)} requirements clustered, largest {max(sizes, default=0)}")
+
+
+if __name__ == "__main__":
+    main()
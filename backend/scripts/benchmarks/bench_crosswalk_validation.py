@@ -0,0 +1,134 @@
+"""
+Benchmark crosswalk LLM validation against the stub LLM server.
+
+Starts scripts/stub_llm_server.py in-process, seeds an in-memory SQLite
+database with two synthetic frameworks embedded by the hashing backend, and
+generates crosswalks twice: one pair per prompt sequentially, then up to
+--batch-size pairs per prompt with --concurrency prompts in flight.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_crosswalk_validation
+    python -m scripts.benchmarks.bench_crosswalk_validation --requirements 200 --latency 1.5
+"""
+
+import argparse
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register all tables)
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter
+from app.db.base import Base
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.services.clustering.embedding_service import EmbeddingService
+from app.services.frameworks.crosswalk_service import CrosswalkService
+from scripts.stub_llm_server import make_server
+
+TOPICS = [
+    "access", "encryption", "backup", "incident", "vendor", "training", "logging",
+    "vulnerability", "network", "asset", "change", "recovery", "identity", "physical",
+]
+
+
+def make_session(requirements: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    framework_ids = []
+    for f, phrasing in enumerate([
+        "The organization manages {topic} controls for scope{scope} systems.",
+        "Manage {topic} safeguards covering scope{scope} assets.",
+    ]):
+        framework = Framework(id=uuid.uuid4(), code=f"BENCH{f}", name=f"Benchmark {f}", version="1.0")
+        db.add(framework)
+        for i in range(requirements):
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(),
+                framework_id=framework.id,
+                code=f"B{f}-{i:04d}",
+                name=f"{TOPICS[i % len(TOPICS)].title()} requirement",
+                description=phrasing.format(topic=TOPICS[i % len(TOPICS)], scope=i % 23),
+            ))
+        framework_ids.append(framework.id)
+    db.commit()
+    EmbeddingService(db).embed_all_requirements()
+    return db, framework_ids
+
+
+def run(args, batch_size: int, concurrency: int) -> tuple[float, int, list[tuple]]:
+    db, (source_id, target_id) = make_session(args.requirements)
+    start = time.perf_counter()
+    crosswalks = CrosswalkService(db).generate_crosswalks(
+        source_id, target_id,
+        similarity_threshold=args.threshold,
+        top_k_per_requirement=args.top_k,
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+    elapsed = time.perf_counter() - start
+    codes = dict(db.query(FrameworkRequirement.id, FrameworkRequirement.code).all())
+    rows = sorted(
+        (codes[cw.source_requirement_id], codes[cw.target_requirement_id], cw.mapping_type)
+        for cw in crosswalks
+    )
+    db.close()
+    return elapsed, len(crosswalks), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requirements", type=int, default=40, help="Per framework")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per request")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--rpm", type=int, default=0, help="Shared rate limit (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = make_server(port=0, latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.anthropic_base_url = f"http://127.0.0.1:{server.server_port}"
+    settings.anthropic_api_key = settings.anthropic_api_key or "stub"
+    settings.embedding_backend = "hashing"
+    settings.ann_index_enabled = False
+    settings.llm_cache_enabled = False
+    ai_client.rate_limiter = RateLimiter(args.rpm)
+
+    single, single_count, single_rows = run(args, batch_size=1, concurrency=1)
+    single_prompts, single_tokens = server.state.requests, server.state.input_tokens
+    batched, batched_count, batched_rows = run(args, args.batch_size, args.concurrency)
+    batched_prompts = server.state.requests - single_prompts
+    batched_tokens = server.state.input_tokens - single_tokens
+    server.shutdown()
+
+    print(
+        f"{args.requirements} requirements per framework, top_k={args.top_k}, "
+        f"{args.latency * 1000:.0f} ms/request"
+    )
+    print(f"  single pairs:  {single:7.2f}s  prompts={single_prompts}  input_tokens={single_tokens}")
+    print(
+        f"  batched:       {batched:7.2f}s  prompts={batched_prompts}  input_tokens={batched_tokens}  "
+        f"speedup={single / batched:.1f}x"
+    )
+    print(
+        f"  crosswalks:    {single_count} single, {batched_count} batched, "
+        f"{len(set(single_rows) & set(batched_rows))} shared"
+    )
+
+
+if __name__ == "__main__":
+    main()
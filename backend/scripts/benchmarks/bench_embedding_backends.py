@@ -0,0 +1,74 @@
+"""
+Benchmark throughput of the in-process hashing embedding backend.
+
+Embeds synthetic requirement-like texts in batches and reports texts per
+second, plus how often a paraphrase ranks its source text first among all
+texts (a rough sanity check of retrieval quality).
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_embedding_backends
+    python -m scripts.benchmarks.bench_embedding_backends --n 50000 --dim 1536 --batch-size 2000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.services.clustering.embedding_backends import HashingEmbeddingBackend
+
+WORDS = (
+    "access control policy review annual encrypt data rest transit backup recovery "
+    "incident response plan asset inventory vendor risk assessment logging monitoring "
+    "audit trail privileged account authentication password network segmentation "
+    "vulnerability patch management change approval training awareness physical "
+    "security retention disposal continuity disaster testing configuration baseline"
+).split()
+
+
+def make_texts(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        f"REQ-{i}: The organization shall " + " ".join(rng.choices(WORDS, k=rng.randint(15, 60)))
+        for i in range(n)
+    ]
+
+
+def paraphrase(text: str, rng: random.Random) -> str:
+    words = text.split()[4:]
+    rng.shuffle(words)
+    return " ".join(words[: max(5, len(words) * 2 // 3)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    backend = HashingEmbeddingBackend(dimensions=args.dim)
+    texts = make_texts(args.n)
+
+    start = time.perf_counter()
+    matrix = np.vstack([
+        backend.embed_matrix(texts[i:i + args.batch_size])
+        for i in range(0, len(texts), args.batch_size)
+    ])
+    elapsed = time.perf_counter() - start
+
+    rng = random.Random(1)
+    sample = rng.sample(range(args.n), args.queries)
+    queries = backend.embed_matrix([paraphrase(texts[i], rng) for i in sample])
+    top1 = np.mean(np.argmax(queries @ matrix.T, axis=1) == np.asarray(sample))
+
+    print(f"{args.n} texts, dim={args.dim}, batch={args.batch_size}")
+    print(f"  embed:  {elapsed:.2f}s  ({args.n / elapsed:,.0f} texts/s)")
+    print(f"  paraphrase top-1 over {args.queries} queries: {top1:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark embedding generation throughput against the stub backend.
+
+Seeds an in-memory SQLite database with synthetic requirements and embeds
+them once sequentially (one request in flight, fixed 100-text batches) and
+once through EmbeddingPipeline. The stub simulates round-trip latency and
+rejects requests above --provider-limit in flight with HTTP 429.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_embedding_pipeline
+    python -m scripts.benchmarks.bench_embedding_pipeline --n 5000 --concurrency 16 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register all tables)
+from app.core.config import settings
+from app.db.base import Base
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.services.clustering.embedding_backends import StubEmbeddingBackend
+from app.services.clustering.embedding_pipeline import EmbeddingPipeline
+from app.services.clustering.embedding_service import EmbeddingService
+
+
+def make_session(n: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    framework = Framework(id=uuid.uuid4(), code="BENCH", name="Benchmark", version="1.0")
+    db.add(framework)
+    for i in range(n):
+        db.add(FrameworkRequirement(
+            id=uuid.uuid4(),
+            framework_id=framework.id,
+            code=f"B-{i:05d}",
+            name=f"Requirement {i}",
+            description=" ".join(f"word{(i * 7 + j) % 997}" for j in range(20 + i % 80)),
+        ))
+    db.commit()
+    return db
+
+
+class SequentialStub(StubEmbeddingBackend):
+    """Stub backend called synchronously, one request at a time."""
+
+    def embed(self, texts):
+        return asyncio.run(self.aembed(texts))
+
+
+def run_sequential(n: int, backend: StubEmbeddingBackend) -> float:
+    db = make_session(n)
+    service = EmbeddingService(db, backend=backend)
+    start = time.perf_counter()
+    service.embed_all_requirements()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def run_pipeline(n: int, backend: StubEmbeddingBackend, concurrency: int) -> tuple[float, dict]:
+    db = make_session(n)
+    pipeline = EmbeddingPipeline(EmbeddingService(db, backend=backend), concurrency=concurrency)
+    start = time.perf_counter()
+    stats = asyncio.run(pipeline.run())
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per request")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--provider-limit", type=int, default=6)
+    args = parser.parse_args()
+
+    settings.embedding_dimensions = args.dim
+    settings.ann_index_enabled = False
+
+    options = dict(
+        dimensions=args.dim,
+        latency=args.latency,
+        latency_per_1k_tokens=args.latency / 10,
+    )
+    sequential = run_sequential(args.n, SequentialStub(**options))
+    stub = StubEmbeddingBackend(max_concurrent=args.provider_limit, **options)
+    concurrent, stats = run_pipeline(args.n, stub, args.concurrency)
+
+    print(f"{args.n} requirements, {args.latency * 1000:.0f} ms/request, dim={args.dim}")
+    print(f"  sequential: {sequential:7.2f}s  ({args.n / sequential:8.0f} texts/s)")
+    print(
+        f"  pipeline:   {concurrent:7.2f}s  ({args.n / concurrent:8.0f} texts/s)  "
+        f"batches={stats['batches']} rate_limited={stats['rate_limited']} "
+        f"peak_in_flight={stub.peak_in_flight}"
+    )
+    print(f"  speedup:    {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
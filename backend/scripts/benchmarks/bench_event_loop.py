@@ -0,0 +1,163 @@
+"""
+Benchmark read latency while heavy crosswalk requests hold the server.
+
+Starts scripts/stub_llm_server.py in-process, seeds a file-backed SQLite
+database with --heavy pairs of synthetic frameworks, and drives the ASGI app
+in-process: --heavy crosswalk generations (each validating pairs with the
+stub LLM) run at once while /health and GET /api/v1/frameworks are requested
+back to back. Reports read latency percentiles with and without the heavy load.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_event_loop
+    python -m scripts.benchmarks.bench_event_loop --heavy 8 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (register all tables)
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter
+from app.db.base import Base
+from app.db.session import get_db
+from app.main import app
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.services.clustering.embedding_service import EmbeddingService
+from scripts.stub_llm_server import make_server
+
+TOPICS = [
+    "access", "encryption", "backup", "incident", "vendor", "training", "logging",
+    "vulnerability", "network", "asset", "change", "recovery", "identity", "physical",
+]
+
+
+def seed(sessions, pairs: int, requirements: int) -> list[tuple[str, str]]:
+    db = sessions()
+    ids = []
+    for p in range(pairs):
+        pair = []
+        for f, phrasing in enumerate([
+            "The organization manages {topic} controls for scope{scope} systems.",
+            "Manage {topic} safeguards covering scope{scope} assets.",
+        ]):
+            framework = Framework(id=uuid.uuid4(), code=f"EL{p}-{f}", name=f"Loop {p}-{f}", version="1.0")
+            db.add(framework)
+            for i in range(requirements):
+                db.add(FrameworkRequirement(
+                    id=uuid.uuid4(),
+                    framework_id=framework.id,
+                    code=f"EL{p}-{f}-{i:04d}",
+                    name=f"{TOPICS[i % len(TOPICS)].title()} requirement",
+                    description=phrasing.format(topic=TOPICS[i % len(TOPICS)], scope=i % 23),
+                ))
+            pair.append(str(framework.id))
+        ids.append(tuple(pair))
+    db.commit()
+    EmbeddingService(db).embed_all_requirements()
+    db.close()
+    return ids
+
+
+async def read_latencies(client: httpx.AsyncClient, rounds: int) -> list[float]:
+    latencies = []
+    for _ in range(rounds):
+        for url in ("/health", "/api/v1/frameworks"):
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    return latencies
+
+
+async def run(args, pairs: list[tuple[str, str]]) -> tuple[list[float], list[float], float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        idle = await read_latencies(client, args.rounds)
+
+        async def heavy(source_id: str, target_id: str) -> float:
+            start = time.perf_counter()
+            response = await client.post("/api/v1/crosswalks/generate", json={
+                "source_framework_id": source_id,
+                "target_framework_id": target_id,
+                "similarity_threshold": 0.0,
+                "top_k_per_requirement": 1,
+                "batch_size": 1,
+                "concurrency": 1,
+            })
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        tasks = [asyncio.create_task(heavy(*pair)) for pair in pairs]
+        await asyncio.sleep(0.1)
+        loaded = await read_latencies(client, args.rounds)
+        heavy_seconds = max(await asyncio.gather(*tasks))
+    return idle, loaded, heavy_seconds
+
+
+def percentiles(latencies: list[float]) -> str:
+    cuts = statistics.quantiles(latencies, n=100)
+    return f"p50={cuts[49] * 1000:6.1f} ms  p99={cuts[98] * 1000:6.1f} ms  max={max(latencies) * 1000:6.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--heavy", type=int, default=4, help="Concurrent crosswalk requests")
+    parser.add_argument("--requirements", type=int, default=10, help="Per framework")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per LLM request")
+    parser.add_argument("--rounds", type=int, default=50, help="Read requests per endpoint")
+    args = parser.parse_args()
+
+    server = make_server(port=0, latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.anthropic_base_url = f"http://127.0.0.1:{server.server_port}"
+    settings.anthropic_api_key = settings.anthropic_api_key or "stub"
+    settings.embedding_backend = "hashing"
+    settings.ann_index_enabled = False
+    settings.llm_cache_enabled = False
+    ai_client.rate_limiter = RateLimiter(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Handler threads need their own connections, so the database is a file
+        engine = create_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = sessions()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        pairs = seed(sessions, args.heavy, args.requirements)
+        idle, loaded, heavy_seconds = asyncio.run(run(args, pairs))
+        app.dependency_overrides.clear()
+        engine.dispose()
+    server.shutdown()
+
+    print(
+        f"{args.heavy} heavy crosswalk requests x {args.requirements} pairs, "
+        f"{args.latency * 1000:.0f} ms/LLM request; slowest took {heavy_seconds:.2f}s"
+    )
+    print(f"  reads, idle:        {percentiles(idle)}")
+    print(f"  reads, under load:  {percentiles(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
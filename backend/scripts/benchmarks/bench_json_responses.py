@@ -0,0 +1,131 @@
+"""
+Benchmark response time of large JSON endpoints.
+
+Seeds an in-memory SQLite database with a synthetic framework (--requirements
+requirements in a --depth level hierarchy) and --crosswalks crosswalks, then
+times GET /frameworks/{id}/hierarchy and paging through all of GET /crosswalks
+with the in-process test client. Prints the median of --repeat runs and the
+response size.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_json_responses
+    python -m scripts.benchmarks.bench_json_responses --requirements 20000 --crosswalks 50000
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register all tables)
+from app.db.base import Base
+from app.db.session import get_db
+from app.main import app
+from app.models.unified_framework import Framework, FrameworkRequirement, RequirementCrosswalk
+
+
+def seed(sessions, requirements: int, depth: int, crosswalks: int) -> str:
+    db = sessions()
+    framework_id = uuid.uuid4()
+    db.add(Framework(id=framework_id, code="JSON", name="Benchmark", version="1.0"))
+    # Requirement i's parent is requirement (i - 1) // fanout, giving ``depth`` levels
+    fanout = max(2, round(requirements ** (1 / depth)))
+    ids = [uuid.uuid4() for _ in range(requirements)]
+    db.bulk_insert_mappings(FrameworkRequirement, [
+        {
+            "id": ids[i],
+            "framework_id": framework_id,
+            "parent_id": ids[(i - 1) // fanout] if i else None,
+            "code": f"J-{i:06d}",
+            "name": f"Requirement {i}",
+            "description": f"The organization maintains control objective {i} for scope {i % 37}.",
+            "level": 0 if i == 0 else 1 + len(str(i)),
+            "display_order": i,
+        }
+        for i in range(requirements)
+    ])
+    db.bulk_insert_mappings(RequirementCrosswalk, [
+        {
+            "id": uuid.uuid4(),
+            "source_requirement_id": ids[i % requirements],
+            "target_requirement_id": ids[(i * 7 + 1) % requirements],
+            "mapping_type": "related",
+            "confidence_score": (i % 100) / 100,
+            "mapping_source": "ai",
+            "reasoning": "Both require documented procedures for the same control area.",
+        }
+        for i in range(crosswalks)
+    ])
+    db.commit()
+    db.close()
+    return str(framework_id)
+
+
+def timed(fn, repeat: int) -> tuple[float, int]:
+    times, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requirements", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--crosswalks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    framework_id = seed(sessions, args.requirements, args.depth, args.crosswalks)
+    client = TestClient(app)
+
+    def hierarchy() -> int:
+        response = client.get(f"/api/v1/frameworks/{framework_id}/hierarchy")
+        response.raise_for_status()
+        return len(response.content)
+
+    def crosswalk_pages() -> int:
+        size, cursor = 0, None
+        while True:
+            params = {"limit": 500, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/api/v1/crosswalks", params=params)
+            response.raise_for_status()
+            size += len(response.content)
+            cursor = response.json()["next_cursor"]
+            if not cursor:
+                return size
+
+    print(f"{args.requirements} requirements ({args.depth} levels), {args.crosswalks} crosswalks")
+    for name, fn in [("hierarchy", hierarchy), ("crosswalks, all pages", crosswalk_pages)]:
+        median, size = timed(fn, args.repeat)
+        print(f"  {name:<22s} {median * 1000:8.1f} ms  {size / 1e6:6.2f} MB")
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark mapping generation wall-clock time against the stub LLM server.
+
+Starts scripts/stub_llm_server.py in-process, seeds an in-memory SQLite
+database with an assessment of synthetic controls and requirements, and
+generates mappings three ways: sequentially with one control per prompt,
+with --concurrency prompts in flight, and with up to --batch-size controls
+packed into each prompt. The first two runs must produce identical mappings.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_mapping_concurrency
+    python -m scripts.benchmarks.bench_mapping_concurrency --controls 400 --concurrency 16 --latency 1.5
+"""
+
+import argparse
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register all tables)
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter
+from app.db.base import Base
+from app.models.assessment import Assessment
+from app.models.control import Control, ControlMapping
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.models.user import User
+from app.services.mapping.ai_mapper import AIMappingService
+from scripts.stub_llm_server import make_server
+
+TOPICS = [
+    "access", "encryption", "backup", "incident", "vendor", "training", "logging",
+    "vulnerability", "network", "asset", "change", "recovery", "identity", "physical",
+]
+
+
+def make_session(controls: int, requirements: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    user = User(id=uuid.uuid4(), email="bench@example.com", name="Bench")
+    assessment = Assessment(id=uuid.uuid4(), name="Bench", organization_name="Bench", created_by_id=user.id)
+    framework = Framework(id=uuid.uuid4(), code="BENCH", name="Benchmark", version="1.0")
+    db.add_all([user, assessment, framework])
+    for i in range(requirements):
+        topic = TOPICS[i % len(TOPICS)]
+        db.add(FrameworkRequirement(
+            id=uuid.uuid4(),
+            framework_id=framework.id,
+            code=f"B-{i:04d}",
+            name=f"Requirement {i}",
+            description=f"The organization manages {topic} controls for scope{i % 37} systems.",
+        ))
+    for i in range(controls):
+        topic = TOPICS[(i * 5) % len(TOPICS)]
+        db.add(Control(
+            id=uuid.uuid4(),
+            assessment_id=assessment.id,
+            identifier=f"CTRL-{i:04d}",
+            name=f"{topic.title()} control {i}",
+            description=f"Procedures for {topic} on scope{i % 37} systems.",
+        ))
+    db.commit()
+    return db, assessment.id
+
+
+def run(args, concurrency: int, batch_size: int = 1) -> tuple[float, int, list[tuple[str, str, float]]]:
+    db, assessment_id = make_session(args.controls, args.requirements)
+    start = time.perf_counter()
+    result = AIMappingService(db).generate_mappings_for_assessment(
+        assessment_id, include_policies=False, concurrency=concurrency, batch_size=batch_size
+    )
+    elapsed = time.perf_counter() - start
+
+    rows = (
+        db.query(Control.identifier, FrameworkRequirement.code, ControlMapping.confidence_score)
+        .join(ControlMapping, ControlMapping.control_id == Control.id)
+        .join(FrameworkRequirement, FrameworkRequirement.id == ControlMapping.requirement_id)
+        .order_by(Control.identifier, FrameworkRequirement.code)
+        .all()
+    )
+    db.close()
+    return elapsed, result["prompt_count"], [tuple(row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--controls", type=int, default=60)
+    parser.add_argument("--requirements", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per request")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--rpm", type=int, default=0, help="Shared rate limit (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = make_server(port=0, latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.anthropic_base_url = f"http://127.0.0.1:{server.server_port}"
+    settings.anthropic_api_key = settings.anthropic_api_key or "stub"
+    settings.embedding_backend = "hashing"
+    settings.ann_index_enabled = False
+    settings.llm_cache_enabled = False
+    ai_client.rate_limiter = RateLimiter(args.rpm)
+
+    sequential, prompts, expected = run(args, concurrency=1)
+    concurrent, _, actual = run(args, concurrency=args.concurrency)
+    peak_in_flight = server.state.peak_in_flight
+    tokens_before = server.state.input_tokens
+    batched, batch_prompts, batched_rows = run(args, args.concurrency, args.batch_size)
+    batch_tokens = server.state.input_tokens - tokens_before
+    server.shutdown()
+
+    print(
+        f"{args.controls} controls, {args.requirements} requirements, "
+        f"{args.latency * 1000:.0f} ms/request"
+    )
+    print(f"  sequential:       {sequential:7.2f}s  prompts={prompts}")
+    print(
+        f"  concurrency={args.concurrency:<3d}  {concurrent:7.2f}s  "
+        f"speedup={sequential / concurrent:.1f}x  peak_in_flight={peak_in_flight}"
+    )
+    print(
+        f"  batch_size={args.batch_size:<4d}  {batched:7.2f}s  "
+        f"speedup={sequential / batched:.1f}x  prompts={batch_prompts}  "
+        f"input_tokens={batch_tokens} (single: {tokens_before // 2})"
+    )
+    print(f"  identical mappings: {actual == expected} ({len(actual)} rows)")
+    print(f"  batched mappings:   {len(batched_rows)} rows, "
+          f"{len(set(batched_rows) & set(expected))} shared with single-entity run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark the NumPy vector engine against the legacy pure-Python similarity loop.
+
+Uses synthetic clustered embeddings (no database or API keys required) and times
+the operations behind SimilarityService: single-query top-k search and
+cross-framework candidate generation. The pure-Python timings for the larger
+sizes are extrapolated from a sample of query rows, since running them in full
+would take hours.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_similarity
+    python -m scripts.benchmarks.bench_similarity --sizes 1000 5000 20000 --dim 1536
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.clustering.similarity_service import SimilarityService
+from app.services.clustering.vector_engine import VectorEngine
+
+
+def make_embeddings(n: int, dim: int, seed: int = 0) -> list[list[float]]:
+    """Generate clustered unit-ish vectors so thresholds produce real matches."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 20, 1), dim)).astype(np.float32)
+    assignments = rng.integers(0, len(centers), size=n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * 0.03
+    return (centers[assignments] + noise).tolist()
+
+
+def legacy_top_k(query, candidates, top_k, threshold):
+    results = []
+    for idx, candidate in enumerate(candidates):
+        similarity = SimilarityService.cosine_similarity(query, candidate)
+        if similarity >= threshold:
+            results.append((idx, similarity))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results[:top_k]
+
+
+def bench_size(n: int, dim: int, sample_rows: int) -> dict[str, float]:
+    vectors = make_embeddings(n, dim)
+    source, target = vectors[: n // 2], vectors[n // 2:]
+
+    # Single query against the full corpus
+    start = time.perf_counter()
+    legacy_top_k(vectors[0], vectors, 20, 0.75)
+    legacy_query = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = VectorEngine(vectors)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.top_k(vectors[0], 20, 0.75)
+    engine_query = time.perf_counter() - start
+
+    # Cross-framework candidates: every source row against every target row
+    sample = source[:sample_rows]
+    start = time.perf_counter()
+    for query in sample:
+        legacy_top_k(query, target, 5, 0.75)
+    legacy_cross = (time.perf_counter() - start) * len(source) / len(sample)
+
+    start = time.perf_counter()
+    VectorEngine(source).top_k_against(VectorEngine(target), top_k=5, threshold=0.75)
+    engine_cross = time.perf_counter() - start
+
+    return {
+        "legacy_query": legacy_query,
+        "engine_query": engine_query,
+        "engine_load": load_time,
+        "legacy_cross": legacy_cross,
+        "engine_cross": engine_cross,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument(
+        "--sample-rows", type=int, default=5,
+        help="Source rows timed for the legacy cross-framework loop",
+    )
+    args = parser.parse_args()
+
+    print(f"{'n':>7} | {'op':<22} | {'legacy (s)':>11} | {'engine (s)':>11} | {'speedup':>8}")
+    print("-" * 72)
+    for n in args.sizes:
+        r = bench_size(n, args.dim, args.sample_rows)
+        for op, legacy, fast in (
+            ("top-k query", r["legacy_query"], r["engine_query"]),
+            ("cross-framework (est.)", r["legacy_cross"], r["engine_cross"]),
+        ):
+            print(f"{n:>7} | {op:<22} | {legacy:>11.3f} | {fast:>11.4f} | {legacy / fast:>7.0f}x")
+        print(f"{n:>7} | {'engine load':<22} | {'':>11} | {r['engine_load']:>11.4f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare memory of the dense similarity matrix with the sparse similarity graph.
+
+The dense path (SimilarityService.build_similarity_matrix) materialises an
+n x n list of Python floats; its size is measured at --dense-n and
+extrapolated quadratically. The sparse graph is built in row blocks at --n
+and keeps only pairs at or above --threshold. Peak memory is traced with
+tracemalloc (NumPy buffers included).
+
+A second run builds a random walk on the sphere, whose thresholded graph is
+one giant component, and compares the dense matrix clustering would need for
+it with the per-node neighbour dicts the sparse linkage path uses instead.
+
+Usage:
+    cd backend
+    python -m scripts.benchmarks.bench_similarity_graph
+    python -m scripts.benchmarks.bench_similarity_graph --n 20000 --dim 1536 --threshold 0.85
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services.clustering.linkage import connected_components
+from app.services.clustering.similarity_graph import SimilarityGraph
+from app.services.clustering.vector_engine import VectorEngine
+
+
+def make_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 4, 1), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), size=n)]
+    return vectors + rng.standard_normal((n, dim)).astype(np.float32) * 0.3
+
+
+def make_chain_vectors(n: int, dim: int, step: float = 0.4, seed: int = 0) -> np.ndarray:
+    """Random walk on the unit sphere: each vector is only close to its neighbours in the walk."""
+    rng = np.random.default_rng(seed)
+    steps = rng.standard_normal((n, dim)).astype(np.float32) * (step / np.sqrt(dim))
+    vectors = np.empty((n, dim), dtype=np.float32)
+    current = rng.standard_normal(dim).astype(np.float32)
+    current /= np.linalg.norm(current)
+    for i in range(n):
+        current = current + steps[i]
+        current /= np.linalg.norm(current)
+        vectors[i] = current
+    return vectors
+
+
+def traced(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def dense_matrix(engine: VectorEngine, threshold: float) -> list[list[float]]:
+    matrix = engine.pairwise()
+    matrix[matrix < threshold] = 0.0
+    np.fill_diagonal(matrix, 1.0)
+    return matrix.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--dense-n", type=int, default=3000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--block-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    mb = 1024 * 1024
+
+    small = VectorEngine(make_vectors(args.dense_n, args.dim))
+    _, dense_time, dense_peak = traced(lambda: dense_matrix(small, args.threshold))
+    projected = dense_peak * (args.n / args.dense_n) ** 2
+    print(f"dense,  n={args.dense_n}: {dense_time:6.2f}s  peak {dense_peak / mb:8.1f} MB")
+    print(f"dense,  n={args.n}: projected peak {projected / mb:8.0f} MB")
+
+    engine = VectorEngine(make_vectors(args.n, args.dim))
+    graph, graph_time, graph_peak = traced(
+        lambda: SimilarityGraph.build(engine, args.threshold, block_size=args.block_size)
+    )
+    print(
+        f"sparse, n={args.n}: {graph_time:6.2f}s  peak {graph_peak / mb:8.1f} MB  "
+        f"({graph.num_edges} entries, {graph.nbytes / mb:.1f} MB stored)"
+    )
+
+    chain = VectorEngine(make_chain_vectors(args.n, args.dim))
+    giant = SimilarityGraph.build(chain, args.threshold, block_size=args.block_size)
+    labels = connected_components(len(giant), *giant.edges()[:2])
+    component = np.flatnonzero(labels == np.bincount(labels).argmax())
+    _, dicts_time, dicts_peak = traced(lambda: giant.neighbor_dicts(component))
+    print(
+        f"giant component, n={args.n}: {len(component)} nodes, {giant.num_edges} entries; "
+        f"dense submatrix would take {8 * len(component) ** 2 / mb:.0f} MB, "
+        f"neighbour dicts peak {dicts_peak / mb:.1f} MB ({dicts_time:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Advance provider batch jobs until every one is ingested or failed.
+
+Jobs keep all their state in the llm_batch_jobs table, so this worker can
+be stopped at any point and started again: it picks up submitted batches
+where they were, polls the provider, submits follow-up rounds and ingests
+finished jobs.
+
+With --answer-locally, batches of the file-based "local" provider are
+answered by the stub LLM server's deterministic model, for trying the
+whole flow offline (LLM_BATCH_PROVIDER=local).
+
+Usage:
+    cd backend
+    python -m scripts.run_llm_batches
+    python -m scripts.run_llm_batches --once
+    LLM_BATCH_PROVIDER=local python -m scripts.run_llm_batches --answer-locally
+"""
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.llm_batch import LocalBatchProvider
+from app.db.session import SessionLocal
+from app.services.batch import LLMBatchService
+from app.services.batch.llm_batch_service import FAILED, INGESTED
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Advance LLM batch jobs")
+    parser.add_argument("--once", action="store_true", help="Advance each job once and exit")
+    parser.add_argument("--poll-seconds", type=float, default=settings.llm_batch_poll_seconds)
+    parser.add_argument(
+        "--answer-locally",
+        action="store_true",
+        help="Answer pending local-provider batches with the stub LLM model",
+    )
+    args = parser.parse_args()
+
+    if args.answer_locally:
+        from scripts.stub_llm_server import answer_prompt
+        local = LocalBatchProvider()
+
+    db = SessionLocal()
+    try:
+        while True:
+            if args.answer_locally:
+                for batch_id in local.pending_batches():
+                    local.answer(batch_id, lambda prompt, model: answer_prompt(prompt))
+
+            jobs = LLMBatchService(db).advance_all()
+            for job in jobs:
+                print(
+                    f"{job.id} {job.kind}: {job.status}, round {job.round}, "
+                    f"{len(job.results or {})}/{len(job.items)} answered"
+                )
+            running = [job for job in jobs if job.status not in (INGESTED, FAILED)]
+            if args.once or not running:
+                break
+            time.sleep(args.poll_seconds)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Stub of the Anthropic Messages API for offline benchmarks.
+
+Answers ``POST /v1/messages`` with a deterministic mapping response after a
+simulated delay: a fixed round trip plus a per-1k-prompt-token cost, so
+shorter prompts come back faster just as with the real API. Requests beyond
+--max-concurrent in flight get HTTP 429 with a ``retry-after`` header, and
+--error-rate of requests fail with --error-status (e.g. 500, 529) to
+simulate a provider brown-out; ``server.state.inject`` queues exact failures.
+
+Mapping prompts, single-entity or batched, are answered by word overlap
+between each entity's text and the listed requirements, and crosswalk
+validation prompts, single-pair or batched, by word overlap between the two
+requirements, so the same prompt always gets the same answer.
+
+Point the backend at it by setting ``ANTHROPIC_BASE_URL``.
+
+Usage:
+    cd backend
+    python -m scripts.stub_llm_server --port 8765 --latency 1.5
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=stub uvicorn app.main:app
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# "- CODE: description" lines listing the requirements in a mapping prompt
+REQUIREMENT_LINE = re.compile(r"^- (\S+): (.*)$", re.MULTILINE)
+# "### KEY" headers starting each entity in a batched mapping prompt
+ENTITY_HEADER = re.compile(r"^### (.+)$", re.MULTILINE)
+WORD = re.compile(r"[a-z]{3,}")
+# "[R1] text" blocks and "- P1: R1 -> R2" lines in a batched crosswalk prompt
+CROSSWALK_BLOCK = re.compile(r"^\[(R\d+)\] (.*?)(?=^\[R\d+\] |^PAIRS)", re.MULTILINE | re.DOTALL)
+# Field labels the single and batched crosswalk prompts format differently
+PROMPT_LABELS = {"source", "target", "requirement", "name", "description", "guidance"}
+CROSSWALK_PAIR = re.compile(r"^- (P\d+): (R\d+) -> (R\d+)$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _words(text: str) -> set[str]:
+    return set(WORD.findall(text.lower()))
+
+
+def suggest_mappings(entity_text: str, requirements: list[tuple[str, str]], limit: int = 2) -> list[dict]:
+    """Deterministic stand-in for the model: rank requirements by shared words."""
+    entity_words = _words(entity_text)
+    scored = []
+    for code, description in requirements:
+        overlap = len(entity_words & _words(description))
+        if overlap:
+            scored.append((overlap, code))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    return [
+        {
+            "subcategory_code": code,
+            "confidence_score": round(min(0.95, 0.4 + 0.1 * overlap), 2),
+            "reasoning": f"Shares {overlap} key terms with the requirement.",
+        }
+        for overlap, code in scored[:limit]
+    ]
+
+
+def classify_pair(source_text: str, target_text: str) -> dict:
+    """Deterministic stand-in for crosswalk validation: Jaccard of shared words."""
+    source_words = _words(source_text) - PROMPT_LABELS
+    target_words = _words(target_text) - PROMPT_LABELS
+    union = source_words | target_words
+    score = len(source_words & target_words) / len(union) if union else 0.0
+    if score >= 0.6:
+        mapping_type = "equivalent"
+    elif score >= 0.35:
+        mapping_type = "partial"
+    elif score >= 0.15:
+        mapping_type = "related"
+    else:
+        mapping_type = "none"
+    return {
+        "mapping_type": mapping_type,
+        "confidence": round(min(0.95, 0.3 + score), 2),
+        "reasoning": f"Word overlap {score:.2f}.",
+    }
+
+
+def answer_crosswalk_prompt(prompt: str) -> str:
+    if "SOURCE REQUIREMENT" in prompt:
+        body = prompt.partition("SOURCE REQUIREMENT")[2].partition("Classify the relationship")[0]
+        source_text, _, target_text = body.partition("TARGET REQUIREMENT")
+        return json.dumps(classify_pair(source_text, target_text))
+
+    body = prompt.partition("Classify each pair")[0]
+    texts = dict(CROSSWALK_BLOCK.findall(body))
+    return json.dumps({
+        pair: classify_pair(texts.get(source, ""), texts.get(target, ""))
+        for pair, source, target in CROSSWALK_PAIR.findall(body)
+    })
+
+
+def answer_prompt(prompt: str) -> str:
+    """Build the response text for a prompt."""
+    if "compliance requirements from different frameworks" in prompt:
+        return answer_crosswalk_prompt(prompt)
+
+    head, _, listing = prompt.partition("AVAILABLE SUBCATEGORIES:")
+    if not listing:
+        return "[]"
+    requirements = REQUIREMENT_LINE.findall(listing)
+
+    parts = ENTITY_HEADER.split(head)
+    if len(parts) > 1:
+        # Batched prompt: [preamble, key1, text1, key2, text2, ...]
+        return json.dumps({
+            key.strip(): suggest_mappings(text, requirements)
+            for key, text in zip(parts[1::2], parts[2::2])
+        })
+
+    entity_text = head.partition("TEXT:")[2] or head
+    return json.dumps(suggest_mappings(entity_text, requirements))
+
+
+# Anthropic error types by injected HTTP status
+ERROR_TYPES = {429: "rate_limit_error", 500: "api_error", 503: "api_error", 529: "overloaded_error"}
+
+
+class StubState:
+    """Request counters shared by all handler threads."""
+
+    def __init__(
+        self,
+        latency: float,
+        latency_per_1k_tokens: float,
+        max_concurrent: int,
+        error_rate: float = 0.0,
+        error_status: int = 529,
+    ):
+        self.latency = latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.max_concurrent = max_concurrent
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.rate_limited = 0
+        self.failed = 0
+        # Statuses to answer the next requests with, before anything else
+        self.injected: deque[int] = deque()
+        self.random = random.Random(0)
+        self.input_tokens = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def inject(self, *statuses: int) -> None:
+        """Fail the next requests with these HTTP statuses, in order."""
+        with self.lock:
+            self.injected.extend(statuses)
+
+    def next_failure(self) -> int | None:
+        """Status to fail the current request with, if any (call under the lock)."""
+        if self.injected:
+            return self.injected.popleft()
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path.rstrip("/") != "/v1/messages":
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+                return
+
+            prompt = "".join(
+                message["content"] if isinstance(message["content"], str)
+                else "".join(part.get("text", "") for part in message["content"])
+                for message in request.get("messages", [])
+            )
+            tokens = estimate_tokens(prompt)
+
+            with state.lock:
+                failure = state.next_failure()
+                if failure is not None:
+                    state.failed += 1
+            if failure is not None:
+                self._send_json(
+                    failure,
+                    {"type": "error", "error": {
+                        "type": ERROR_TYPES.get(failure, "api_error"), "message": "Injected failure",
+                    }},
+                )
+                return
+
+            with state.lock:
+                if state.max_concurrent and state.in_flight >= state.max_concurrent:
+                    state.rate_limited += 1
+                    limited = True
+                else:
+                    limited = False
+                    state.requests += 1
+                    state.input_tokens += tokens
+                    state.in_flight += 1
+                    state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+
+            if limited:
+                self._send_json(
+                    429,
+                    {"type": "error", "error": {"type": "rate_limit_error", "message": "Too many requests"}},
+                    headers={"retry-after": "1"},
+                )
+                return
+
+            try:
+                time.sleep(state.latency + state.latency_per_1k_tokens * tokens / 1000)
+                text = answer_prompt(prompt)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+            self._send_json(200, {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", "stub"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": tokens, "output_tokens": estimate_tokens(text)},
+            })
+
+    return Handler
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    latency: float = 1.0,
+    latency_per_1k_tokens: float = 0.05,
+    max_concurrent: int = 0,
+    error_rate: float = 0.0,
+    error_status: int = 529,
+) -> ThreadingHTTPServer:
+    """Create (but do not start) a stub server; counters are on ``server.state``."""
+    state = StubState(latency, latency_per_1k_tokens, max_concurrent, error_rate, error_status)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds per request")
+    parser.add_argument("--latency-per-1k-tokens", type=float, default=0.05,
+                        help="Extra seconds per 1000 prompt tokens")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Answer 429 above this many requests in flight (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests failed with --error-status")
+    parser.add_argument("--error-status", type=int, default=529,
+                        help="HTTP status of injected failures (429, 500, 503, 529)")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.latency, args.latency_per_1k_tokens, args.max_concurrent,
+        args.error_rate, args.error_status,
+    )
+    print(f"Stub LLM server listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state = server.state
+        print(f"requests={state.requests} rate_limited={state.rate_limited} "
+              f"input_tokens={state.input_tokens} peak_in_flight={state.peak_in_flight}")
+
+
+if __name__ == "__main__":
+    main()
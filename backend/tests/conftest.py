@@ -1,12 +1,40 @@
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.config import settings
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.main import app
+from app.models.assessment import Assessment
+from app.models.control import Control
+from app.models.policy import Policy
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.models.user import User
+from app.services.clustering.embedding_service import EmbeddingService
+
+
+# Control topics the shared frameworks phrase in different words
+TOPICS = [
+    "multi-factor authentication for remote access",
+    "encryption of data at rest in databases",
+    "incident response plan with escalation contacts",
+    "security awareness training for employees",
+    "vulnerability scanning of network hosts",
+    "backup restoration testing for disaster recovery",
+]
+
+
+@pytest.fixture(autouse=True)
+def offline_embeddings(monkeypatch):
+    """Use the in-process embedding backend so tests never call a remote API."""
+    monkeypatch.setattr(settings, "embedding_backend", "hashing")
+    # The global LLM cache uses the application database, not the test one
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
 
 
 @pytest.fixture(scope="function")
@@ -28,11 +56,87 @@ def test_db():
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     yield engine
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def db(test_db):
+    """A session on the test database."""
+    session = sessionmaker(bind=test_db)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_frameworks(db, monkeypatch):
+    """Factory for two frameworks covering the same topics, with embedded requirements."""
+    monkeypatch.setattr(settings, "ann_index_enabled", False)
+
+    def make(topics=TOPICS):
+        created = []
+        for f, phrasing in enumerate(["The organization maintains {}.", "Maintain {} at all times."]):
+            framework = Framework(
+                id=uuid.uuid4(), code=f"FW{f}", name=f"Framework {f}", version="1"
+            )
+            db.add(framework)
+            for i, topic in enumerate(topics):
+                db.add(FrameworkRequirement(
+                    id=uuid.uuid4(), framework_id=framework.id, code=f"FW{f}-{i}",
+                    name=f"Requirement {i}", description=phrasing.format(topic),
+                ))
+            created.append(framework)
+        db.commit()
+        EmbeddingService(db).embed_all_requirements()
+        return created
+
+    return make
+
+
+@pytest.fixture
+def frameworks(make_frameworks):
+    """Two frameworks covering ``TOPICS``, with embedded requirements."""
+    return make_frameworks()
+
+
+@pytest.fixture
+def make_assessment(db):
+    """Factory for an assessment with controls, policies and a framework covering ``topics``.
+
+    Controls are (identifier, name, description) and policies (name, text)
+    tuples; requirement codes run FW-00, FW-01, ...
+    """
+    def make(topics=TOPICS, controls=(), policies=()):
+        user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com", name="Tester")
+        assessment = Assessment(
+            id=uuid.uuid4(), name="A", organization_name="Org", created_by_id=user.id
+        )
+        framework = Framework(id=uuid.uuid4(), code="FW", name="FW", version="1")
+        db.add_all([user, assessment, framework])
+        for i, topic in enumerate(topics):
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(), framework_id=framework.id, code=f"FW-{i:02d}",
+                name=f"Requirement {i}", description=f"The organization maintains {topic}.",
+            ))
+        for identifier, name, description in controls:
+            db.add(Control(
+                id=uuid.uuid4(), assessment_id=assessment.id, identifier=identifier,
+                name=name, description=description,
+            ))
+        for name, text in policies:
+            db.add(Policy(
+                id=uuid.uuid4(), assessment_id=assessment.id, name=name, content_text=text,
+            ))
+        db.commit()
+        return assessment
+
+    return make
+
+
 @pytest.fixture(scope="function")
 def client(test_db):
     """Create a test client with the test database."""
@@ -0,0 +1,331 @@
+"""Tests for the AI call governor: adaptive concurrency, circuit breaker, priority."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from tenacity import wait_none
+
+from app.core import ai_governor
+from app.core.ai_client import AIClient
+from app.core.ai_governor import (
+    BULK,
+    INTERACTIVE,
+    AIGovernor,
+    CircuitOpenError,
+    QueueTimeoutError,
+    call_priority,
+)
+from app.core.config import settings
+from app.core.llm_metrics import RETRIES
+from app.core.metrics import metrics
+from app.core.rate_limiter import RateLimiter
+from app.main import app
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.services.clustering.embedding_service import EmbeddingService
+from scripts.stub_llm_server import make_server
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def api_error(status, retry_after=None):
+    """The exception the Anthropic SDK raises for an HTTP error status."""
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    response = httpx.Response(
+        status, headers=headers, request=httpx.Request("POST", "http://stub/v1/messages")
+    )
+    error_class = {429: anthropic.RateLimitError, 400: anthropic.BadRequestError}.get(
+        status, anthropic.InternalServerError
+    )
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+def fail_with(governor, error):
+    with pytest.raises(type(error)):
+        with governor.slot():
+            raise error
+
+
+def fake_provider(statuses):
+    """Anthropic stand-in failing with each status in turn, then answering."""
+    statuses = iter(statuses)
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["model"])
+        status = next(statuses, None)
+        if status is not None:
+            raise api_error(status)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text='{"ok": true}')],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+        )
+
+    return SimpleNamespace(messages=SimpleNamespace(create=create)), calls
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "ai_circuit_failure_threshold", 3)
+    monkeypatch.setattr(AIClient._send.retry, "wait", wait_none())
+    client = AIClient()
+    client.rate_limiter.requests_per_minute = 0
+    return client
+
+
+class TestAdaptiveLimit:
+    def test_overload_halves_the_limit_once_per_window(self):
+        governor = AIGovernor(initial_limit=8, max_limit=16, failure_threshold=100)
+
+        # Both calls were admitted at the old limit: only the first halves it
+        first, second = governor._acquire(BULK), governor._acquire(BULK)
+        governor._release(*first, ai_governor.OVERLOAD, None)
+        governor._release(*second, ai_governor.OVERLOAD, None)
+        assert governor.limit == 4
+
+        fail_with(governor, api_error(503))
+        assert governor.limit == 2
+        assert ai_governor.LIMIT.value() == 2
+
+    def test_successes_grow_the_limit_additively(self):
+        governor = AIGovernor(initial_limit=2, max_limit=3)
+
+        for _ in range(2):
+            with governor.slot():
+                pass
+        assert governor.limit == 3
+        for _ in range(10):
+            with governor.slot():
+                pass
+        assert governor.limit == 3
+
+    def test_client_errors_do_not_shrink_the_limit(self):
+        governor = AIGovernor(initial_limit=4, failure_threshold=1)
+
+        fail_with(governor, api_error(400))
+
+        assert (governor.limit, governor.state) == (4, "closed")
+        assert ai_governor.OUTCOMES.value(outcome="client_error") == 1
+
+    def test_retry_after_pauses_every_caller(self):
+        governor = AIGovernor(initial_limit=4, failure_threshold=100)
+        fail_with(governor, api_error(429, retry_after=0.2))
+
+        start = time.monotonic()
+        with governor.slot():
+            pass
+
+        assert time.monotonic() - start >= 0.15
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_and_probes_after_reset(self):
+        governor = AIGovernor(failure_threshold=3, reset_seconds=0.1)
+        for _ in range(3):
+            fail_with(governor, api_error(500))
+        assert governor.state == "open"
+
+        with pytest.raises(CircuitOpenError) as refused:
+            with governor.slot(INTERACTIVE):
+                pytest.fail("call made while the circuit is open")
+        assert 0 < refused.value.retry_after <= 0.1
+        assert ai_governor.REJECTED.value(reason="circuit_open", priority=INTERACTIVE) == 1
+        assert ai_governor.CIRCUIT.value() == 2
+
+        time.sleep(0.12)
+        with governor.slot():
+            # Only the probe goes through while half-open
+            assert governor.state == "half_open"
+            with pytest.raises(CircuitOpenError):
+                with governor.slot():
+                    pass
+        assert governor.state == "closed"
+        assert ai_governor.CIRCUIT.value() == 0
+
+    def test_failed_probe_reopens(self):
+        governor = AIGovernor(failure_threshold=1, reset_seconds=0.05)
+        fail_with(governor, api_error(529))
+        time.sleep(0.06)
+
+        fail_with(governor, ConnectionError("reset by peer"))
+
+        assert governor.state == "open"
+
+    def test_success_resets_the_failure_count(self):
+        governor = AIGovernor(failure_threshold=2)
+        fail_with(governor, api_error(500))
+        with governor.slot():
+            pass
+        fail_with(governor, api_error(500))
+
+        assert governor.state == "closed"
+
+
+class TestPriority:
+    def test_interactive_callers_are_admitted_before_bulk(self):
+        governor = AIGovernor(initial_limit=1, min_limit=1)
+        admitted = []
+
+        def call(priority):
+            with call_priority(priority), governor.slot():
+                admitted.append(priority)
+
+        def wait_for_queue(n):
+            while governor.snapshot()["queued"] < n:
+                time.sleep(0.005)
+
+        with governor.slot():
+            bulk = threading.Thread(target=call, args=(BULK,))
+            bulk.start()
+            wait_for_queue(1)
+            interactive = threading.Thread(target=call, args=(INTERACTIVE,))
+            interactive.start()
+            wait_for_queue(2)
+            assert ai_governor.QUEUED.value(priority=BULK) == 1
+        bulk.join()
+        interactive.join()
+
+        assert admitted == [INTERACTIVE, BULK]
+
+    def test_interactive_overtakes_bulk_callers_waiting_for_rate_tokens(self, client):
+        client.rate_limiter = RateLimiter(requests_per_minute=600, burst=1)
+        client._client, _ = fake_provider([])
+        sent = []
+        create = client._client.messages.create
+        client._client.messages.create = lambda **kwargs: (
+            sent.append(ai_governor.current_priority()) or create(**kwargs)
+        )
+
+        def call(priority, prompt):
+            with call_priority(priority):
+                client.complete_json(prompt)
+
+        bulk = [threading.Thread(target=call, args=(BULK, f"bulk {i}")) for i in range(5)]
+        for thread in bulk:
+            thread.start()
+        while client.rate_limiter.waiting < 4:
+            time.sleep(0.005)
+        # Bulk callers waiting for tokens hold no slots
+        assert client.governor.snapshot()["in_flight"] == 0
+
+        interactive = threading.Thread(target=call, args=(INTERACTIVE, "interactive"))
+        interactive.start()
+        for thread in [*bulk, interactive]:
+            thread.join()
+
+        # Only the burst token and the bulk caller already at the head go first
+        assert sent.index(INTERACTIVE) <= 2
+
+    def test_queue_timeout(self):
+        governor = AIGovernor(initial_limit=1, queue_timeout=0.05)
+
+        with governor.slot():
+            with pytest.raises(QueueTimeoutError):
+                with governor.slot(BULK):
+                    pass
+
+        assert ai_governor.REJECTED.value(reason="queue_timeout", priority=BULK) == 1
+        assert governor.snapshot()["queued"] == 0
+
+
+class TestAIClientGovernor:
+    def test_transient_errors_are_retried_outside_the_slot(self, client):
+        client._client, calls = fake_provider([429, 503])
+
+        assert client.complete_json("prompt") == {"ok": True}
+
+        assert len(calls) == 3
+        assert RETRIES.value(stage="other", call="AIClient._send") == 2
+        assert client.governor.snapshot()["in_flight"] == 0
+        assert client.governor.limit == settings.ai_concurrency_initial // 4
+
+    def test_client_errors_are_not_retried(self, client):
+        client._client, calls = fake_provider([400])
+
+        with pytest.raises(anthropic.BadRequestError):
+            client.complete_json("prompt")
+        assert len(calls) == 1
+
+    def test_brown_out_fails_fast_once_the_circuit_opens(self, client):
+        client._client, calls = fake_provider([500] * 10)
+
+        with pytest.raises(anthropic.InternalServerError):
+            client.complete_json("prompt")
+        with pytest.raises(CircuitOpenError):
+            client.complete_json("another prompt")
+
+        # Three attempts opened the circuit; the second call never reached the provider
+        assert len(calls) == 3
+
+    def test_open_circuit_is_a_503_with_retry_after(self, test_db, monkeypatch):
+        from app.core.ai_client import ai_client
+
+        db = sessionmaker(bind=test_db)()
+        framework_ids = []
+        for f in range(2):
+            framework = Framework(id=uuid.uuid4(), code=f"GV{f}", name=f"GV{f}", version="1")
+            db.add(framework)
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(), framework_id=framework.id, code=f"GV{f}-1",
+                name="MFA", description="Enforce multi-factor authentication.",
+            ))
+            framework_ids.append(str(framework.id))
+        db.commit()
+        EmbeddingService(db).embed_all_requirements()
+        db.close()
+
+        governor = AIGovernor(failure_threshold=1, reset_seconds=30)
+        fail_with(governor, api_error(529))
+        monkeypatch.setattr(ai_client, "governor", governor)
+        monkeypatch.setattr(settings, "ai_fast_model", None)
+        monkeypatch.setattr(settings, "ann_index_enabled", False)
+
+        response = TestClient(app).post("/api/v1/crosswalks/generate", json={
+            "source_framework_id": framework_ids[0],
+            "target_framework_id": framework_ids[1],
+            "similarity_threshold": 0.0,
+        })
+
+        assert response.status_code == 503
+        assert "circuit is open" in response.json()["detail"]
+        assert 1 <= int(response.headers["retry-after"]) <= 30
+
+
+def test_stub_server_injects_failures():
+    server = make_server(port=0, latency=0.0, latency_per_1k_tokens=0.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.state.inject(429, 529)
+
+    def post():
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/v1/messages",
+            data=json.dumps({"messages": [{"role": "user", "content": "hi"}]}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())["type"]
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())["error"]["type"]
+
+    try:
+        assert [post() for _ in range(3)] == [
+            (429, "rate_limit_error"), (529, "overloaded_error"), (200, "message"),
+        ]
+        assert (server.state.failed, server.state.requests) == (2, 1)
+    finally:
+        server.shutdown()
@@ -0,0 +1,230 @@
+"""Tests for requirement clustering."""
+
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.unified_framework import (
+    Framework,
+    FrameworkRequirement,
+    RequirementClusterMember,
+    RequirementEmbedding,
+)
+from app.services.clustering.clustering_service import ClusteringService
+from app.services.clustering.embedding_backends import EmbeddingBackend
+from app.services.clustering.linkage import cluster_vectors, connected_components
+from app.services.clustering.vector_engine import VectorEngine
+
+
+DIM = 16
+
+
+def clustered_vectors(n: int, spread: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 5, 1), DIM))
+    return centers[rng.integers(0, len(centers), size=n)] + rng.standard_normal((n, DIM)) * spread
+
+
+def legacy_clusters(vectors, threshold, min_cluster_size):
+    """The original greedy average-linkage loop over the thresholded matrix."""
+    matrix = VectorEngine(vectors).pairwise()
+    matrix[matrix < threshold] = 0.0
+    matrix = matrix.tolist()
+
+    clusters = [[i] for i in range(len(vectors))]
+    active = set(range(len(vectors)))
+    while len(active) > 1:
+        best_sim, best_pair = -1, None
+        active_list = list(active)
+        for i in range(len(active_list)):
+            for j in range(i + 1, len(active_list)):
+                ci, cj = active_list[i], active_list[j]
+                sims = [matrix[a][b] for a in clusters[ci] for b in clusters[cj]]
+                sim = sum(sims) / len(sims)
+                if sim > best_sim:
+                    best_sim, best_pair = sim, (ci, cj)
+        if best_sim < threshold or best_pair is None:
+            break
+        ci, cj = best_pair
+        clusters[ci] = clusters[ci] + clusters[cj]
+        active.remove(cj)
+
+    return sorted(
+        sorted(clusters[i]) for i in active if len(clusters[i]) >= min_cluster_size
+    )
+
+
+class TestLinkage:
+    def test_connected_components(self):
+        labels = connected_components(6, np.array([0, 3, 4]), np.array([2, 4, 5]))
+
+        assert labels.tolist() == [0, 1, 0, 3, 3, 3]
+
+    @pytest.mark.parametrize("threshold", [0.5, 0.7, 0.85, 0.95])
+    @pytest.mark.parametrize("spread", [0.2, 0.5])
+    def test_matches_greedy_clustering(self, threshold, spread):
+        vectors = clustered_vectors(120, spread)
+
+        expected = legacy_clusters(vectors, threshold, min_cluster_size=2)
+        actual = cluster_vectors(VectorEngine(vectors), threshold, min_cluster_size=2, block_size=32)
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("threshold", [0.5, 0.85])
+    def test_sparse_path_matches_greedy_clustering(self, threshold):
+        vectors = clustered_vectors(120, 0.5)
+
+        expected = legacy_clusters(vectors, threshold, min_cluster_size=2)
+        actual = cluster_vectors(VectorEngine(vectors), threshold, min_cluster_size=2, dense_limit=0)
+
+        assert actual == expected
+
+    def test_min_cluster_size(self):
+        vectors = clustered_vectors(80, 0.3, seed=3)
+
+        clusters = cluster_vectors(VectorEngine(vectors), 0.8, min_cluster_size=3)
+
+        assert clusters == legacy_clusters(vectors, 0.8, min_cluster_size=3)
+        assert all(len(c) >= 3 for c in clusters)
+
+
+class TestClusteringService:
+    @pytest.fixture
+    def db(self, test_db, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_dimensions", DIM)
+        session = sessionmaker(bind=test_db)()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def test_generate_clusters(self, db):
+        vectors = clustered_vectors(30, 0.2, seed=5)
+        model = EmbeddingBackend.get_backend().model
+        requirements = []
+        for f in range(2):
+            framework = Framework(id=uuid.uuid4(), code=f"C{f}", name=f"C{f}", version="1")
+            db.add(framework)
+            for i in range(15):
+                requirement = FrameworkRequirement(
+                    id=uuid.uuid4(), framework_id=framework.id, code=f"C{f}-{i:02d}", name="r"
+                )
+                db.add(requirement)
+                db.add(RequirementEmbedding(
+                    requirement_id=requirement.id,
+                    model=model,
+                    dimensions=DIM,
+                    vector=vectors[f * 15 + i],
+                ))
+                requirements.append(requirement)
+        db.commit()
+
+        clusters = ClusteringService(db).generate_clusters(threshold=0.85)
+
+        index_by_id = {req.id: i for i, req in enumerate(requirements)}
+        members = sorted(
+            sorted(
+                index_by_id[m.requirement_id]
+                for m in db.query(RequirementClusterMember).filter_by(cluster_id=c.id)
+            )
+            for c in clusters
+        )
+        assert members == legacy_clusters(vectors, 0.85, min_cluster_size=2)
+
+    def test_assign_new_requirements_keeps_existing_clusters(self, db):
+        rng = np.random.default_rng(7)
+        centers = rng.standard_normal((3, DIM))
+        model = EmbeddingBackend.get_backend().model
+
+        def add_framework(code, vectors):
+            framework = Framework(id=uuid.uuid4(), code=code, name=code, version="1")
+            db.add(framework)
+            for i, vector in enumerate(vectors):
+                requirement = FrameworkRequirement(
+                    id=uuid.uuid4(), framework_id=framework.id, code=f"{code}-{i}", name="r"
+                )
+                db.add(requirement)
+                db.add(RequirementEmbedding(
+                    requirement_id=requirement.id, model=model, dimensions=DIM, vector=vector
+                ))
+            db.commit()
+            return framework
+
+        def noise():
+            return rng.standard_normal(DIM) * 0.05
+
+        add_framework("OLD", [centers[c] + noise() for c in (0, 0, 0, 1, 1, 1)])
+        service = ClusteringService(db)
+        existing = {c.id: c.embedding_centroid.copy() for c in service.generate_clusters(threshold=0.9)}
+        assert len(existing) == 2
+
+        # Two join cluster 0, two form a new cluster around an unseen center, one stays alone
+        new = add_framework("NEW", [
+            centers[0] + noise(), centers[0] + noise(),
+            centers[2] + noise(), centers[2] + noise(),
+            rng.standard_normal(DIM),
+        ])
+        stats = service.assign_new_requirements(framework_ids=[new.id], threshold=0.9)
+
+        assert stats == {
+            "new_requirements": 5,
+            "assigned": 2,
+            "clusters_updated": 1,
+            "clusters_created": 1,
+            "unclustered": 1,
+        }
+        clusters = service.list_clusters()
+        assert existing.keys() < {c.id for c in clusters}
+        grown = next(c for c in clusters if c.extra_metadata["requirement_count"] == 5)
+        assert grown.id in existing
+        assert not np.allclose(grown.embedding_centroid, existing[grown.id])
+
+        # The singleton was considered already; nothing new on a second run
+        assert service.assign_new_requirements(threshold=0.9)["new_requirements"] == 0
+
+    def test_assign_new_requirements_pairs_with_older_unclustered(self, db):
+        rng = np.random.default_rng(11)
+        center = rng.standard_normal(DIM)
+        model = EmbeddingBackend.get_backend().model
+
+        def add_framework(code, vectors):
+            framework = Framework(id=uuid.uuid4(), code=code, name=code, version="1")
+            db.add(framework)
+            for i, vector in enumerate(vectors):
+                requirement = FrameworkRequirement(
+                    id=uuid.uuid4(), framework_id=framework.id, code=f"{code}-{i}", name="r"
+                )
+                db.add(requirement)
+                db.add(RequirementEmbedding(
+                    requirement_id=requirement.id, model=model, dimensions=DIM, vector=vector
+                ))
+            db.commit()
+            return framework
+
+        service = ClusteringService(db)
+        old = add_framework("OLD", [center + rng.standard_normal(DIM) * 0.05])
+        assert service.assign_new_requirements(framework_ids=[old.id], threshold=0.9) == {
+            "new_requirements": 1,
+            "assigned": 0,
+            "clusters_updated": 0,
+            "clusters_created": 0,
+            "unclustered": 1,
+        }
+
+        # The new requirement is compared with the older singleton of another framework
+        new = add_framework("NEW", [center + rng.standard_normal(DIM) * 0.05])
+        stats = service.assign_new_requirements(framework_ids=[new.id], threshold=0.9)
+
+        assert stats["new_requirements"] == 1
+        assert stats["clusters_created"] == 1
+        assert stats["unclustered"] == 0
+        (cluster,) = service.list_clusters()
+        assert cluster.extra_metadata["requirement_count"] == 2
+        assert service.assign_new_requirements(threshold=0.9)["new_requirements"] == 0
+
+        # Deleting clusters makes their requirements new again
+        service.delete_clusters()
+        assert service.assign_new_requirements(threshold=0.9)["new_requirements"] == 2
@@ -0,0 +1,170 @@
+"""Tests for cross-framework crosswalk generation."""
+
+import json
+import re
+import uuid
+
+import pytest
+
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.models.unified_framework import RequirementCrosswalk
+from app.services.frameworks.crosswalk_service import CrosswalkService, RequirementText
+from scripts.stub_llm_server import answer_prompt
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Answer validation prompts with the stub server's word-overlap model."""
+    sent = []
+
+    def fake_complete_json(prompt, **kwargs):
+        sent.append(prompt)
+        return json.loads(answer_prompt(prompt))
+
+    monkeypatch.setattr(ai_client, "complete_json", fake_complete_json)
+    return sent
+
+
+def generate(db, frameworks, **kwargs):
+    source, target = frameworks
+    return CrosswalkService(db).generate_crosswalks(
+        source.id, target.id, similarity_threshold=0.0, top_k_per_requirement=2, **kwargs
+    )
+
+
+def summary(crosswalks):
+    return sorted(
+        (cw.source_requirement_id, cw.target_requirement_id, cw.mapping_type,
+         round(cw.confidence_score, 6))
+        for cw in crosswalks
+    )
+
+
+class TestBatchedValidation:
+    @pytest.fixture(autouse=True)
+    def strong_model_only(self, monkeypatch):
+        monkeypatch.setattr(settings, "ai_fast_model", None)
+
+    def test_batched_matches_single_pair_prompts(self, db, frameworks, prompts):
+        single = summary(generate(db, frameworks, batch_size=1, concurrency=1))
+        single_prompts = len(prompts)
+        db.query(RequirementCrosswalk).delete()
+        db.commit()
+        prompts.clear()
+
+        batched = summary(generate(db, frameworks, batch_size=5, concurrency=3))
+
+        assert single_prompts == 12
+        assert len(prompts) == 3
+        assert all("PAIRS" in prompt for prompt in prompts)
+        assert batched == single
+        assert batched
+
+    def test_pairs_missing_from_reply_are_validated_alone(self, db, frameworks, prompts, monkeypatch):
+        def drop_first_pair(prompt, **kwargs):
+            prompts.append(prompt)
+            reply = json.loads(answer_prompt(prompt))
+            if "PAIRS" in prompt:
+                reply.pop("P1")
+                reply["P2"] = "not an object"
+            return reply
+
+        monkeypatch.setattr(ai_client, "complete_json", drop_first_pair)
+
+        crosswalks = generate(db, frameworks, batch_size=6, concurrency=2)
+
+        batches = [prompt for prompt in prompts if "PAIRS" in prompt]
+        assert len(batches) == 2
+        assert len(prompts) == 2 + 4
+        assert all(cw.mapping_type for cw in crosswalks)
+
+    def test_existing_crosswalks_are_skipped(self, db, frameworks, prompts):
+        first = generate(db, frameworks, validate_with_llm=False)
+
+        assert generate(db, frameworks, batch_size=5, concurrency=1) == []
+        assert prompts == []
+        assert db.query(RequirementCrosswalk).count() == len(first)
+
+    def test_shared_requirements_are_listed_once(self):
+        source = RequirementText(uuid.uuid4(), "S-1", "Source", "x" * 400, None)
+        targets = [RequirementText(uuid.uuid4(), f"T-{i}", "Target", "y" * 400, None) for i in range(5)]
+        pairs = [(source, target) for target in targets]
+
+        # Each pair adds only its target (~115 tokens) once the source is listed;
+        # the last pair would be alone in a second prompt, so it is left out
+        assert CrosswalkService._pack_pair_batches(pairs, max_pairs=10, max_tokens=1000) == [
+            [0, 1, 2, 3]
+        ]
+        assert CrosswalkService._pack_pair_batches(pairs, max_pairs=2, max_tokens=10_000) == [
+            [0, 1], [2, 3]
+        ]
+        assert CrosswalkService._pack_pair_batches(pairs, max_pairs=1, max_tokens=10_000) == []
+
+    def test_batched_prompt_labels_each_requirement_once(self, prompts):
+        source = RequirementText(uuid.uuid4(), "S-1", "Source", "shared text", "guide")
+        targets = [RequirementText(uuid.uuid4(), f"T-{i}", "Target", "other", None) for i in range(3)]
+
+        results = CrosswalkService(None)._validate_mappings_batch_with_llm(
+            [(source, target) for target in targets]
+        )
+
+        assert len(results) == 3
+        assert prompts[0].count("[R1] S-1") == 1
+        assert re.findall(r"^- P\d: R\d -> R\d$", prompts[0], re.MULTILINE) == [
+            "- P1: R1 -> R2", "- P2: R1 -> R3", "- P3: R1 -> R4",
+        ]
+
+
+class TestModelRouting:
+    @pytest.fixture
+    def models(self, monkeypatch):
+        """Fast model is unsure of the first pair of each prompt; strong model is sure."""
+        monkeypatch.setattr(settings, "ai_fast_model", "fast-model")
+        monkeypatch.setattr(settings, "ai_model", "strong-model")
+        calls = []
+
+        def fake_complete_json(prompt, model=None, **kwargs):
+            calls.append((model, len(re.findall(r"^- P\d+:", prompt, re.MULTILINE))))
+            reply = json.loads(answer_prompt(prompt))
+            if "PAIRS" not in prompt:
+                reply = {"P1": reply}
+            for n, result in enumerate(reply.values()):
+                result["confidence"] = 0.5 if model == "fast-model" and n == 0 else 0.9
+                result["mapping_type"] = "partial"
+            return reply if "PAIRS" in prompt else reply["P1"]
+
+        monkeypatch.setattr(ai_client, "complete_json", fake_complete_json)
+        return calls
+
+    def test_only_ambiguous_pairs_are_escalated(self, db, frameworks, models):
+        service = CrosswalkService(db)
+        source, target = frameworks
+        crosswalks = service.generate_crosswalks(
+            source.id, target.id, similarity_threshold=0.0, top_k_per_requirement=2,
+            batch_size=6, concurrency=1,
+        )
+
+        # Two fast batches of 6 pairs, each re-asking only its first pair
+        assert models == [
+            ("fast-model", 6), ("strong-model", 1), ("fast-model", 6), ("strong-model", 1),
+        ]
+        assert dict(service.model_tiers) == {"fast": 10, "strong": 2}
+        assert len(crosswalks) == 12
+
+    def test_unparseable_fast_reply_is_escalated(self, models, monkeypatch):
+        def fast_garbage(prompt, model=None, **kwargs):
+            models.append(model)
+            if model == "fast-model":
+                raise json.JSONDecodeError("bad", "", 0)
+            return {"mapping_type": "equivalent", "confidence": 0.95, "reasoning": "Same"}
+
+        monkeypatch.setattr(ai_client, "complete_json", fast_garbage)
+        source = RequirementText(uuid.uuid4(), "S-1", "Source", "text", None)
+        target = RequirementText(uuid.uuid4(), "T-1", "Target", "text", None)
+
+        result = CrosswalkService(None)._validate_mapping_with_llm(source, target)
+
+        assert models == ["fast-model", "strong-model"]
+        assert result["mapping_type"] == "equivalent"
+        assert result["model_tier"] == "strong"
@@ -0,0 +1,123 @@
+"""Tests that blocking route handlers keep off the event loop."""
+
+import asyncio
+import inspect
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.session import get_db
+from app.dependencies.auth import require_user
+from app.main import app
+from app.models.unified_framework import Framework
+from app.models.user import User
+from app.services.scoring.scoring_engine import ScoringEngine
+
+HEAVY_SECONDS = 1.0
+
+
+def _api_routes(routes):
+    for route in routes:
+        if isinstance(route, APIRoute):
+            yield route
+        elif hasattr(route, "original_router"):
+            # Included routers are wrapped rather than copied into app.routes
+            yield from _api_routes(route.original_router.routes)
+
+
+def _dependencies(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency
+        yield from _dependencies(dependency)
+
+
+@pytest.fixture
+def threaded_db(tmp_path):
+    """A file database, since concurrent handler threads need their own connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_user] = lambda: User(
+        id=uuid.uuid4(), email="load@example.com", name="Load"
+    )
+    yield sessions
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_database_handlers_are_not_coroutines():
+    """Handlers and dependencies using a Session must run on the thread pool."""
+    offenders = []
+    routes = list(_api_routes(app.routes))
+    for route in routes:
+        calls = [d.call for d in _dependencies(route.dependant)]
+        if get_db not in calls:
+            continue
+        for call in [route.endpoint] + calls:
+            if inspect.iscoroutinefunction(call) and "db" in inspect.signature(call).parameters:
+                offenders.append(f"{route.path}: {call.__qualname__}")
+
+    assert len(routes) > 100
+    assert offenders == []
+
+
+def test_reads_stay_fast_while_heavy_requests_run(threaded_db, monkeypatch):
+    db = threaded_db()
+    db.add(Framework(id=uuid.uuid4(), code="EL", name="Event Loop", version="1"))
+    db.commit()
+    db.close()
+
+    def slow_scoring(self, assessment_id, user_id=None):
+        time.sleep(HEAVY_SECONDS)
+        return {"message": "done"}
+
+    monkeypatch.setattr(ScoringEngine, "calculate_all_scores", slow_scoring)
+
+    async def timed(client, method, url):
+        start = time.perf_counter()
+        response = await client.request(method, url)
+        assert response.status_code == 200, response.text
+        return time.perf_counter() - start
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            heavy = [
+                asyncio.create_task(
+                    timed(client, "POST", f"/api/v1/scores/assessments/{uuid.uuid4()}/calculate")
+                )
+                for _ in range(4)
+            ]
+            # Let the heavy requests reach their handlers first
+            await asyncio.sleep(0.1)
+            reads = []
+            for _ in range(10):
+                reads.append(await timed(client, "GET", "/health"))
+                reads.append(await timed(client, "GET", "/api/v1/frameworks"))
+            still_running = not any(task.done() for task in heavy)
+            return await asyncio.gather(*heavy), reads, still_running
+
+    heavy, reads, still_running = asyncio.run(run())
+
+    assert still_running
+    assert min(heavy) >= HEAVY_SECONDS
+    # Twenty sequential reads finished while the heavy requests were still going
+    assert sum(reads) < HEAVY_SECONDS - 0.1
+    assert max(reads) < HEAVY_SECONDS / 4
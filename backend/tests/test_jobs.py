@@ -0,0 +1,201 @@
+"""Tests for background jobs: queue, worker and async=true endpoints."""
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.db.base import Base
+from app.dependencies.auth import require_user
+from app.main import app
+from app.models.assessment import Assessment
+from app.models.control import Control, ControlMapping
+from app.models.job import Job
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.models.user import User
+from app.services.jobs import JobService, JobWorker
+from app.services.jobs.handlers import JOB_HANDLERS, job_handler
+from tests.conftest import TOPICS
+
+
+@pytest.fixture
+def worker(test_db):
+    return JobWorker(sessionmaker(bind=test_db), poll_seconds=0.01)
+
+
+@pytest.fixture
+def user():
+    user = User(id=uuid.uuid4(), email="jobs@example.com", name="Jobs")
+    app.dependency_overrides[require_user] = lambda: user
+    return user
+
+
+@pytest.fixture
+def flaky_kind():
+    """A job kind whose handler fails when asked to."""
+    @job_handler("test.flaky")
+    def flaky(db, params, progress):
+        progress(1, 2)
+        if params.get("fail"):
+            raise RuntimeError("provider exploded")
+        progress(2, 2)
+        return {"echo": params["value"]}
+
+    yield "test.flaky"
+    del JOB_HANDLERS["test.flaky"]
+
+
+class TestAsyncEndpoints:
+    def test_crosswalks_run_as_a_job(self, client, worker, frameworks):
+        body = {
+            "source_framework_id": str(frameworks[0].id),
+            "target_framework_id": str(frameworks[1].id),
+            "similarity_threshold": 0.0,
+            "top_k_per_requirement": 1,
+            "validate_with_llm": False,
+        }
+
+        response = client.post("/api/v1/crosswalks/generate?async=true", json=body)
+
+        assert response.status_code == 202
+        job = response.json()
+        assert (job["kind"], job["status"], job["result"]) == ("crosswalks.generate", "queued", None)
+        assert response.headers["location"] == f"/api/v1/jobs/{job['id']}"
+
+        assert worker.run_pending() == 1
+
+        job = client.get(f"/api/v1/jobs/{job['id']}").json()
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 1
+        assert job["result"]["total_generated"] == len(TOPICS)
+        assert len(job["result"]["crosswalks"]) == len(TOPICS)
+        assert job["completed_at"] is not None
+
+    def test_mapping_job_reports_progress(self, client, worker, db, user, monkeypatch):
+        monkeypatch.setattr(
+            ai_client, "generate_mapping_suggestions",
+            lambda entity_text, entity_type, subcategories, confidence_threshold=None: [
+                {"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}
+            ],
+        )
+        framework = Framework(id=uuid.uuid4(), code="FW", name="FW", version="1")
+        assessment = Assessment(
+            id=uuid.uuid4(), name="A", organization_name="Org", created_by_id=user.id
+        )
+        db.add_all([User(id=user.id, email=user.email, name=user.name), framework, assessment])
+        for i, topic in enumerate(TOPICS):
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(), framework_id=framework.id, code=f"FW-{i}",
+                name=f"Requirement {i}", description=topic,
+            ))
+            db.add(Control(
+                id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"C-{i}",
+                name=f"Control {i}", description=topic,
+            ))
+        db.commit()
+
+        response = client.post(
+            f"/api/v1/mappings/assessments/{assessment.id}/generate?async=true",
+            json={"include_policies": False, "batch_size": 1},
+        )
+        assert response.status_code == 202
+        worker.run_pending()
+
+        job = client.get(f"/api/v1/jobs/{response.json()['id']}").json()
+        assert job["status"] == "succeeded"
+        assert job["progress"] == {"completed": len(TOPICS), "total": len(TOPICS)}
+        assert job["result"]["control_mappings"] == len(TOPICS)
+        assert len(job["result"]["suggestions"]) == len(TOPICS)
+        assert db.query(ControlMapping).count() == len(TOPICS)
+        assert db.query(Job).one().created_by_id == user.id
+
+    def test_failed_handler_records_the_error(self, client, worker, user):
+        response = client.post(f"/api/v1/reports/assessments/{uuid.uuid4()}/generate?async=true")
+        assert response.status_code == 202
+
+        worker.run_pending()
+
+        job = client.get(f"/api/v1/jobs/{response.json()['id']}").json()
+        assert job["status"] == "failed"
+        assert job["error"].startswith("ValueError: ")
+        assert job["result"] is None
+
+    def test_unknown_job_is_404(self, client):
+        assert client.get(f"/api/v1/jobs/{uuid.uuid4()}").status_code == 404
+
+
+class TestJobQueue:
+    def test_jobs_are_claimed_oldest_first_and_once(self, db, flaky_kind):
+        service = JobService(db)
+        first = service.enqueue(flaky_kind, {"value": 1})
+        second = service.enqueue(flaky_kind, {"value": 2})
+        first.created_at = second.created_at - timedelta(seconds=1)
+        db.commit()
+
+        assert service.claim("a").id == first.id
+        assert service.claim("b").id == second.id
+        assert service.claim("c") is None
+
+    def test_unknown_kind(self, db):
+        with pytest.raises(ValueError):
+            JobService(db).enqueue("no.such.kind", {})
+
+    def test_stale_jobs_are_requeued_then_failed(self, db, flaky_kind, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_attempts", 2)
+        service = JobService(db)
+        job = service.enqueue(flaky_kind, {"value": 1})
+
+        def die(worker_id):
+            claimed = service.claim(worker_id)
+            claimed.heartbeat_at = datetime.utcnow() - timedelta(seconds=settings.job_stale_seconds + 1)
+            db.commit()
+            return claimed
+
+        die("crashed-1")
+        assert service.claim("healthy").id == job.id
+        assert job.attempts == 2
+        # The first worker's late result no longer counts
+        assert service.finish(job.id, "crashed-1", {"late": True}) is False
+        assert service.finish(job.id, "healthy", {"echo": 1}) is True
+
+        other = service.enqueue(flaky_kind, {"value": 2})
+        die("crashed-1")
+        die("crashed-2")
+        assert service.requeue_stale() == 1
+        db.refresh(other)
+        assert (other.status, other.error) == ("failed", "Worker crashed-2 stopped responding")
+
+    def test_worker_threads_share_the_queue(self, tmp_path, flaky_kind):
+        # Threads need their own connections, which the in-memory test database cannot give
+        engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+        Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+        sessions = sessionmaker(bind=engine)
+        db = sessions()
+        service = JobService(db)
+        ids = [service.enqueue(flaky_kind, {"value": n, "fail": n == 3}).id for n in range(6)]
+        worker = JobWorker(sessions, concurrency=3, poll_seconds=0.01)
+
+        worker.start()
+        try:
+            for _ in range(500):
+                db.expire_all()
+                if db.query(Job).filter(Job.status.in_(["queued", "running"])).count() == 0:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            worker.stop()
+
+        jobs = {job.id: job for job in db.query(Job).all()}
+        assert [jobs[i].status for i in ids] == ["succeeded"] * 3 + ["failed"] + ["succeeded"] * 2
+        assert jobs[ids[0]].result == {"echo": 0}
+        assert jobs[ids[0]].progress == {"completed": 2, "total": 2}
+        assert jobs[ids[3]].error == "RuntimeError: provider exploded"
+        assert jobs[ids[3]].progress == {"completed": 1, "total": 2}
+        assert len({job.worker_id for job in jobs.values()}) > 1
+        db.close()
+        engine.dispose()
@@ -0,0 +1,238 @@
+"""Tests for provider batch-job mapping and crosswalk runs."""
+
+import json
+import re
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.core.llm_batch import LocalBatchProvider
+from app.dependencies.auth import require_user
+from app.main import app
+from app.models.control import ControlMapping
+from app.models.llm_batch import LLMBatchJob
+from app.models.policy import PolicyMapping
+from app.models.unified_framework import RequirementCrosswalk
+from app.models.user import User
+from app.services.batch import LLMBatchService
+from app.services.frameworks.crosswalk_service import CrosswalkService
+from app.services.mapping.ai_mapper import AIMappingService
+from scripts.stub_llm_server import answer_prompt
+from tests.conftest import TOPICS
+
+
+def stub_responder(prompt, model):
+    return answer_prompt(prompt)
+
+
+@pytest.fixture(autouse=True)
+def batch_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "llm_batch_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "llm_batch_max_rounds", 3)
+    monkeypatch.setattr(settings, "ai_fast_model", None)
+    monkeypatch.setattr(settings, "ann_index_enabled", False)
+
+
+@pytest.fixture
+def assessment(make_assessment):
+    return make_assessment(
+        controls=[(f"C-{i}", f"Control {i}", f"We enforce {topic}") for i, topic in enumerate(TOPICS)],
+        policies=[("Security policy", "Employees complete security awareness training every year.")],
+    )
+
+
+def mapping_rows(db):
+    rows = [
+        (m.control_id, m.requirement_id, m.confidence_score)
+        for m in db.query(ControlMapping).all()
+    ]
+    rows += [
+        (m.policy_id, m.requirement_id, m.confidence_score)
+        for m in db.query(PolicyMapping).all()
+    ]
+    return sorted(rows, key=str)
+
+
+class TestMappingBatchJob:
+    def test_matches_inline_run(self, db, assessment, monkeypatch):
+        monkeypatch.setattr(
+            ai_client, "complete_json",
+            lambda prompt, **kwargs: json.loads(answer_prompt(prompt)),
+        )
+        AIMappingService(db).generate_mappings_for_assessment(assessment.id, batch_size=4)
+        inline = mapping_rows(db)
+        db.query(ControlMapping).delete()
+        db.query(PolicyMapping).delete()
+        db.commit()
+
+        service = LLMBatchService(db, LocalBatchProvider(responder=stub_responder))
+        job = service.create_mapping_job(assessment.id, batch_size=4)
+        assert job.status == "submitted"
+        assert mapping_rows(db) == []
+
+        job = service.advance(job)
+
+        assert job.status == "ingested"
+        assert job.round == 1
+        # 6 controls in batches of 4, plus the policy alone
+        assert job.request_count == 3
+        assert job.summary["suggestions_count"] == len(inline)
+        assert job.summary["unanswered"] == 0
+        assert mapping_rows(db) == inline
+        assert inline
+
+    def test_errored_requests_are_asked_again(self, db, assessment):
+        failed_once = set()
+
+        def flaky(prompt, model):
+            # The first attempt at every single-entity prompt errors
+            if "### " not in prompt and prompt not in failed_once:
+                failed_once.add(prompt)
+                return None
+            return answer_prompt(prompt)
+
+        service = LLMBatchService(db, LocalBatchProvider(responder=flaky))
+        job = service.wait(service.create_mapping_job(assessment.id, batch_size=4), poll_seconds=0)
+
+        assert job.status == "ingested"
+        assert job.round == 2
+        assert job.request_count == 3 + 1
+        assert job.summary["unanswered"] == 0
+
+
+    def test_concurrent_callers_ingest_once(self, db, assessment, test_db):
+        provider = LocalBatchProvider(responder=stub_responder)
+        job = LLMBatchService(db, provider).create_mapping_job(assessment.id, batch_size=4)
+        # A second process (e.g. the advance endpoint next to the batch runner)
+        # loaded the job before the first one ingested it
+        other = sessionmaker(bind=test_db)()
+        other_service = LLMBatchService(other, provider)
+        stale = other_service.get_job(job.id)
+        assert stale.status == "submitted"
+
+        LLMBatchService(db, provider).advance(job)
+        ingested = mapping_rows(db)
+        assert job.status == "ingested" and ingested
+
+        # Advancing the stale copy re-reads the status and does nothing
+        assert other_service.advance(stale).status == "ingested"
+        # Even an ingest of a copy still marked pending claims nothing
+        set_committed_value(stale, "status", "pending")
+        other_service._ingest(stale)
+        assert stale.status == "ingested"
+        assert job.request_count == 3
+        db.expire_all()
+        assert mapping_rows(db) == ingested
+        other.close()
+
+
+class TestCrosswalkBatchJob:
+    def test_resumes_after_restart(self, db, frameworks, test_db, tmp_path):
+        source, target = frameworks
+        job = LLMBatchService(db, LocalBatchProvider()).create_crosswalk_job(
+            source.id, target.id, similarity_threshold=0.0, top_k_per_requirement=2, batch_size=5,
+        )
+        job_id = job.id
+        db.close()
+
+        # A new process: fresh session, service and provider
+        session = sessionmaker(bind=test_db)()
+        provider = LocalBatchProvider()
+        service = LLMBatchService(session, provider)
+        job = service.get_job(job_id)
+        assert job.status == "submitted"
+        assert service.advance(job).status == "submitted"
+        assert provider.pending_batches() == [job.provider_batch_id]
+
+        provider.answer(job.provider_batch_id, stub_responder)
+        job = service.advance_all()[0]
+
+        assert job.status == "ingested"
+        assert job.request_count == 3
+        crosswalks = session.query(RequirementCrosswalk).all()
+        assert len(crosswalks) == job.summary["crosswalks_created"] > 0
+        assert (tmp_path / str(job_id) / "round-1.jsonl").exists()
+        session.close()
+
+    def test_ambiguous_fast_answers_go_to_strong_model(self, db, frameworks, monkeypatch):
+        monkeypatch.setattr(settings, "ai_fast_model", "fast-model")
+        monkeypatch.setattr(settings, "ai_model", "strong-model")
+        asked = []
+
+        def routed(prompt, model):
+            """Fast model is unsure of the first pair of each prompt."""
+            asked.append((model, len(re.findall(r"^- P\d+:", prompt, re.MULTILINE)) or 1))
+            reply = json.loads(answer_prompt(prompt))
+            results = reply.values() if "PAIRS" in prompt else [reply]
+            for n, result in enumerate(results):
+                result["mapping_type"] = "partial"
+                result["confidence"] = 0.5 if model == "fast-model" and n == 0 else 0.9
+            return json.dumps(reply)
+
+        source, target = frameworks
+        service = LLMBatchService(db, LocalBatchProvider(responder=routed))
+        job = service.wait(
+            service.create_crosswalk_job(
+                source.id, target.id, similarity_threshold=0.0,
+                top_k_per_requirement=2, batch_size=6,
+            ),
+            poll_seconds=0,
+        )
+
+        # Two fast prompts of 6 pairs, then the 2 unsure pairs in one strong prompt
+        assert asked == [("fast-model", 6), ("fast-model", 6), ("strong-model", 2)]
+        assert job.round == 2
+        assert job.summary["model_tiers"] == {"fast": 10, "strong": 2}
+        assert db.query(RequirementCrosswalk).count() == 12
+
+    def test_pairs_mapped_meanwhile_are_skipped(self, db, frameworks):
+        source, target = frameworks
+        service = LLMBatchService(db, LocalBatchProvider())
+        job = service.create_crosswalk_job(
+            source.id, target.id, similarity_threshold=0.0, top_k_per_requirement=2,
+        )
+        # An inline run maps every pair while the batch is out
+        CrosswalkService(db).generate_crosswalks(
+            source.id, target.id, similarity_threshold=0.0, top_k_per_requirement=2,
+            validate_with_llm=False,
+        )
+        LocalBatchProvider().answer(job.provider_batch_id, stub_responder)
+
+        job = service.advance(job)
+
+        assert job.status == "ingested"
+        assert job.summary["crosswalks_created"] == 0
+        assert db.query(RequirementCrosswalk).count() == 12
+
+
+def test_batch_job_endpoints(client, test_db, frameworks, monkeypatch):
+    monkeypatch.setattr(settings, "llm_batch_provider", "local")
+    source, target = frameworks
+
+    response = client.post("/api/v1/crosswalks/generate-batch", json={
+        "source_framework_id": str(source.id),
+        "target_framework_id": str(target.id),
+        "similarity_threshold": 0.0,
+        "top_k_per_requirement": 2,
+    })
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["status"], job["item_count"], job["answered_count"]) == ("submitted", 12, 0)
+
+    db = sessionmaker(bind=test_db)()
+    batch_id = db.query(LLMBatchJob).one().provider_batch_id
+    db.close()
+    LocalBatchProvider().answer(batch_id, stub_responder)
+
+    response = client.get(f"/api/v1/llm-batches/{job['id']}")
+    assert response.json()["status"] == "submitted"
+
+    app.dependency_overrides[require_user] = lambda: User(id=uuid.uuid4(), email="u@x", name="U")
+    response = client.post(f"/api/v1/llm-batches/{job['id']}/advance")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ingested"
+    assert response.json()["summary"]["crosswalks_created"] > 0
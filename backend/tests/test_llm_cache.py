@@ -0,0 +1,222 @@
+"""Tests for the LLM response cache."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import app.core.ai_client as ai_client_module
+from app.core.ai_client import AIClient
+from app.core.config import settings
+from app.core.llm_cache import LLMResponseCache, request_hash
+from app.models.llm_cache import LLMResponseCacheEntry
+
+
+@pytest.fixture
+def session_factory(test_db):
+    return sessionmaker(bind=test_db)
+
+
+@pytest.fixture
+def cache(session_factory):
+    return LLMResponseCache(session_factory=session_factory, ttl_hours=1, max_entries=3)
+
+
+class Counter:
+    def __init__(self, value="[]", delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+class TestLLMResponseCache:
+    def test_second_request_is_served_from_cache(self, cache):
+        compute = Counter('{"a": 1}')
+
+        assert cache.get_or_compute("k", "m", compute) == '{"a": 1}'
+        assert cache.get_or_compute("k", "m", compute) == '{"a": 1}'
+
+        assert compute.calls == 1
+        assert cache.stats() == {
+            "hits": 1, "misses": 1, "coalesced": 0, "errors": 0, "hit_rate": 0.5,
+        }
+
+    def test_identical_requests_in_flight_share_one_call(self, cache):
+        compute = Counter(delay=0.2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", "m", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["[]"] * 5
+        assert compute.calls == 1
+        assert cache.coalesced == 4
+
+    def test_failures_are_not_cached(self, cache):
+        def fail():
+            raise ValueError("bad reply")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute("k", "m", fail)
+
+        compute = Counter()
+        cache.get_or_compute("k", "m", compute)
+        assert compute.calls == 1
+
+    def test_expired_entries_are_recomputed(self, cache, session_factory):
+        compute = Counter()
+        cache.get_or_compute("k", "m", compute)
+        with session_factory() as db:
+            db.query(LLMResponseCacheEntry).update(
+                {"created_at": datetime.utcnow() - timedelta(hours=2)}
+            )
+            db.commit()
+
+        cache.get_or_compute("k", "m", compute)
+
+        assert compute.calls == 2
+        with session_factory() as db:
+            assert db.query(LLMResponseCacheEntry).count() == 1
+
+    def test_least_recently_used_entries_are_evicted(self, cache, session_factory):
+        for key in ["a", "b", "c"]:
+            cache.get_or_compute(key, "m", Counter())
+        with session_factory() as db:
+            db.query(LLMResponseCacheEntry).filter_by(request_hash="a").update(
+                {"last_used_at": datetime.utcnow() - timedelta(minutes=5)}
+            )
+            db.commit()
+        cache.get_or_compute("b", "m", Counter())
+
+        cache.get_or_compute("d", "m", Counter())
+
+        with session_factory() as db:
+            keys = {row.request_hash for row in db.query(LLMResponseCacheEntry)}
+        assert keys == {"b", "c", "d"}
+
+    def test_request_hash_covers_model_and_temperature(self):
+        base = request_hash("m", 0.2, 500, "p")
+
+        assert base == request_hash("m", 0.2, 500, "p")
+        assert base != request_hash("other", 0.2, 500, "p")
+        assert base != request_hash("m", 0.3, 500, "p")
+        assert base != request_hash("m", 0.2, 500, "q")
+
+
+class TestAIClientCaching:
+    @pytest.fixture
+    def client(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "llm_cache_enabled", True)
+        monkeypatch.setattr(settings, "ai_fast_model", None)
+        monkeypatch.setattr(ai_client_module, "llm_cache", cache)
+        client = AIClient()
+        client.rate_limiter.requests_per_minute = 0
+        replies = []
+
+        def create(**kwargs):
+            replies.append(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(text=client.next_reply)])
+
+        client._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        client.requests = replies
+        return client
+
+    def test_repeated_prompt_is_not_resent(self, client):
+        client.next_reply = '```json\n[{"subcategory_code": "A", "confidence_score": 0.8}]\n```'
+        subcategories = [{"code": "A", "description": "Access"}]
+
+        first = client.generate_mapping_suggestions("text", "control", subcategories)
+        second = client.generate_mapping_suggestions("text", "control", subcategories)
+
+        assert first == second == [
+            {"subcategory_code": "A", "confidence_score": 0.8, "model_tier": "strong"}
+        ]
+        assert len(client.requests) == 1
+
+    def test_unparseable_reply_is_not_cached(self, client):
+        client.next_reply = "Sorry, I cannot help with that."
+        assert client.generate_mapping_suggestions("text", "control", []) == []
+
+        client.next_reply = "[]"
+        assert client.generate_mapping_suggestions("text", "control", []) == []
+        assert len(client.requests) == 2
+
+
+class TestModelRouting:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(settings, "ai_fast_model", "fast-model")
+        monkeypatch.setattr(settings, "ai_model", "strong-model")
+        client = AIClient()
+        client.rate_limiter.requests_per_minute = 0
+        client.requests = []
+        client.replies = {}
+
+        def create(model, messages, **kwargs):
+            client.requests.append((model, messages[0]["content"]))
+            return SimpleNamespace(content=[SimpleNamespace(text=client.replies[model])])
+
+        client._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        return client
+
+    def test_batch_escalates_only_uncertain_entities(self, client):
+        client.replies = {
+            "fast-model": json.dumps({
+                "A": [{"subcategory_code": "X", "confidence_score": 0.9}],
+                "B": [{"subcategory_code": "X", "confidence_score": 0.5}],
+                "C": "not a list",
+            }),
+            "strong-model": json.dumps({
+                "B": [{"subcategory_code": "X", "confidence_score": 0.7}],
+                "C": [],
+            }),
+        }
+        entities = [{"key": key, "text": f"text {key}"} for key in "ABC"]
+
+        result = client.generate_batch_mapping_suggestions(
+            entities, "control", [{"code": "X", "description": "x"}]
+        )
+
+        assert [model for model, _ in client.requests] == ["fast-model", "strong-model"]
+        assert "### A" not in client.requests[1][1]
+        assert result == {
+            "A": [{"subcategory_code": "X", "confidence_score": 0.9, "model_tier": "fast"}],
+            "B": [{"subcategory_code": "X", "confidence_score": 0.7, "model_tier": "strong"}],
+            "C": [],
+        }
+        assert client.routing_stats() == {"fast": 1, "strong": 2, "escalated": 2}
+
+    def test_confident_answer_stays_with_fast_model(self, client):
+        client.replies = {"fast-model": '[{"subcategory_code": "X", "confidence_score": 0.2}]'}
+
+        result = client.generate_mapping_suggestions("text", "control", [])
+
+        assert [model for model, _ in client.requests] == ["fast-model"]
+        assert result[0]["model_tier"] == "fast"
+
+    def test_suggestions_below_the_run_threshold_are_not_escalated(self, client):
+        client.replies = {"fast-model": json.dumps([
+            {"subcategory_code": "X", "confidence_score": 0.9},
+            {"subcategory_code": "Y", "confidence_score": 0.45},
+        ])}
+
+        client.generate_mapping_suggestions("text", "control", [], confidence_threshold=0.5)
+        assert [model for model, _ in client.requests] == ["fast-model"]
+
+        client.replies["strong-model"] = "[]"
+        client.generate_mapping_suggestions("text", "control", [], confidence_threshold=0.4)
+        assert [model for model, _ in client.requests][1:] == ["fast-model", "strong-model"]
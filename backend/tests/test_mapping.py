@@ -0,0 +1,335 @@
+"""Tests for AI mapping generation."""
+
+import json
+import threading
+import time
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.ai_client import ai_client
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter
+from app.dependencies.auth import require_user
+from app.main import app
+from app.models.audit import AuditLog
+from app.models.control import Control, ControlMapping
+from app.models.user import User
+from app.services.mapping.ai_mapper import AIMappingService
+
+
+TOPICS = [
+    "password complexity and rotation for user accounts",
+    "encryption of data at rest in databases and backups",
+    "incident response plan with escalation contacts",
+    "physical access badges for the data center",
+    "vendor risk assessments before onboarding suppliers",
+    "security awareness training for all employees",
+    "vulnerability scanning of external network hosts",
+    "multi-factor authentication for remote access",
+    "logging and monitoring of privileged administrator activity",
+    "disaster recovery testing of backup restoration",
+    "change management approvals for production releases",
+    "asset inventory of hardware and software",
+]
+
+
+@pytest.fixture
+def assessment(make_assessment):
+    return make_assessment(TOPICS, controls=[
+        ("C-1", "MFA", "Remote access requires multi-factor authentication"),
+        ("C-2", "Backups", "Database backups use encryption at rest"),
+    ])
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Record the requirements offered per single-entity prompt; suggest the first one."""
+    monkeypatch.setattr(settings, "mapping_batch_size", 1)
+    calls = []
+
+    def fake_suggestions(entity_text, entity_type, subcategories, confidence_threshold=None):
+        calls.append((entity_text, [sc["code"] for sc in subcategories]))
+        return [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+
+    monkeypatch.setattr(ai_client, "generate_mapping_suggestions", fake_suggestions)
+    return calls
+
+
+class TestRequirementShortlist:
+    def test_prompts_only_include_shortlisted_requirements(self, db, assessment, prompts):
+        result = AIMappingService(db).generate_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=3
+        )
+
+        assert result["control_mappings"] == 2
+        offered = {text.split("\n")[0]: codes for text, codes in prompts}
+        assert all(len(codes) == 3 for codes in offered.values())
+        assert offered["MFA"][0] == "FW-07"
+        assert offered["Backups"][0] == "FW-01"
+        assert db.query(ControlMapping).count() == 2
+
+    def test_shortlist_size_from_assessment_overrides(self, db, assessment, prompts):
+        assessment.ai_prompt_overrides = {"mapping_shortlist_size": 5}
+        db.commit()
+
+        AIMappingService(db).generate_mappings_for_assessment(assessment.id, include_policies=False)
+
+        assert [len(codes) for _, codes in prompts] == [5, 5]
+
+    def test_zero_offers_every_requirement(self, db, assessment, prompts):
+        AIMappingService(db).generate_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=0
+        )
+
+        assert [len(codes) for _, codes in prompts] == [len(TOPICS)] * 2
+
+
+class TestConcurrentMapping:
+    def test_concurrent_run_matches_sequential(self, db, assessment, monkeypatch):
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow_suggestions(entity_text, entity_type, subcategories, confidence_threshold=None):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            # Answer depends only on the prompt, as a deterministic model would
+            return [
+                {"subcategory_code": sc["code"], "confidence_score": 0.8}
+                for sc in subcategories[:2]
+            ]
+
+        monkeypatch.setattr(ai_client, "generate_mapping_suggestions", slow_suggestions)
+        for i in range(10):
+            db.add(Control(
+                id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"X-{i}",
+                name=f"Control {i}", description=TOPICS[i],
+            ))
+        db.commit()
+        service = AIMappingService(db)
+
+        sequential = service.generate_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=4, concurrency=1, batch_size=1
+        )
+        assert peak[0] == 1
+        concurrent = service.generate_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=4, concurrency=6, batch_size=1
+        )
+
+        assert peak[0] > 1
+        key = lambda s: (s["entity_id"], s["requirement_id"], s["confidence_score"])
+        assert [key(s) for s in concurrent["suggestions"]] == [key(s) for s in sequential["suggestions"]]
+        assert concurrent["control_mappings"] == 24
+
+
+class TestBatchedMapping:
+    @pytest.fixture
+    def controls(self, db, assessment):
+        for i, topic in enumerate(TOPICS):
+            db.add(Control(
+                id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"B-{i:02d}",
+                name=f"Control {i}", description=f"We maintain {topic}",
+            ))
+        db.commit()
+        return assessment
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Fake both prompt paths: suggest the top listed requirement, recording each call."""
+        calls = {"batch": [], "single": []}
+
+        def fake_batch(entities, entity_type, subcategories, confidence_threshold=None):
+            calls["batch"].append([entity["key"] for entity in entities])
+            return {
+                entity["key"]: [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+                for entity in entities
+            }
+
+        def fake_single(entity_text, entity_type, subcategories, confidence_threshold=None):
+            calls["single"].append(entity_text)
+            return [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+
+        monkeypatch.setattr(ai_client, "generate_batch_mapping_suggestions", fake_batch)
+        monkeypatch.setattr(ai_client, "generate_mapping_suggestions", fake_single)
+        return calls
+
+    def test_controls_share_prompts(self, db, controls, calls):
+        result = AIMappingService(db).generate_mappings_for_assessment(
+            controls.id, include_policies=False, shortlist_size=3, batch_size=5, concurrency=1
+        )
+
+        # 14 controls (2 from the assessment fixture) in batches of 5, 5 and 4
+        assert [len(keys) for keys in calls["batch"]] == [5, 5, 4]
+        assert calls["single"] == []
+        assert result["prompt_count"] == 3
+        assert result["control_mappings"] == 14
+
+    def test_missing_entities_fall_back_to_single_prompts(self, db, controls, calls, monkeypatch):
+        def partial_batch(entities, entity_type, subcategories, confidence_threshold=None):
+            calls["batch"].append([entity["key"] for entity in entities])
+            response = {
+                entity["key"]: [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+                for entity in entities[2:]
+            }
+            response[entities[1]["key"]] = "not a list"
+            return response
+
+        monkeypatch.setattr(ai_client, "generate_batch_mapping_suggestions", partial_batch)
+
+        result = AIMappingService(db).generate_mappings_for_assessment(
+            controls.id, include_policies=False, shortlist_size=3, batch_size=7, concurrency=1
+        )
+
+        assert len(calls["batch"]) == 2
+        assert len(calls["single"]) == 4
+        assert result["prompt_count"] == 6
+        assert result["control_mappings"] == 14
+
+    def test_token_budget_limits_batches(self):
+        requirements = [
+            {"id": i, "code": f"R-{i}", "description": "x" * 400} for i in range(6)
+        ]
+        texts = ["y" * 400] * 6
+        # Every entity shares the same two requirements, listed once per prompt
+        shared = [requirements[:2]] * 6
+
+        assert AIMappingService._pack_mapping_batches(
+            list(range(6)), texts, shared, max_entities=10, max_tokens=1000
+        ) == [[0, 1, 2, 3], [4, 5]]
+        # Distinct requirements per entity cost more, and singletons are left out
+        distinct = [[req] for req in requirements]
+        assert AIMappingService._pack_mapping_batches(
+            list(range(6)), texts, distinct, max_entities=10, max_tokens=700
+        ) == []
+
+
+class TestStreamingMapping:
+    @pytest.fixture
+    def fake_ai(self, monkeypatch):
+        calls = []
+
+        def fake_suggestions(entity_text, entity_type, subcategories, confidence_threshold=None):
+            calls.append(entity_text)
+            return [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+
+        monkeypatch.setattr(ai_client, "generate_mapping_suggestions", fake_suggestions)
+        return calls
+
+    def test_entities_are_committed_as_they_are_yielded(self, db, assessment, fake_ai, test_db):
+        other = sessionmaker(bind=test_db)()
+        events = AIMappingService(db).stream_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=3, batch_size=1, concurrency=1
+        )
+
+        start = next(events)
+        assert (start["event"], start["entity_count"], start["prompt_count"]) == ("start", 2, 2)
+        entity = next(events)
+        assert entity["event"] == "entity"
+        assert [s["requirement_code"] for s in entity["suggestions"]] == ["FW-07"]
+        # Visible to other sessions (reviewers) before the run finishes
+        assert other.query(ControlMapping).count() == 1
+        assert next(events) == {"event": "progress", "completed": 1, "total": 2}
+
+        rest = list(events)
+        assert [e["event"] for e in rest] == ["entity", "progress", "complete"]
+        assert rest[-1]["control_mappings"] == rest[-1]["suggestions_count"] == 2
+        assert rest[-1]["prompt_count"] == 2
+        log = db.query(AuditLog).one()
+        assert log.new_values["completed"] is True
+        other.close()
+
+    def test_stopping_early_keeps_finished_entities(self, db, assessment, fake_ai, test_db):
+        events = AIMappingService(db).stream_mappings_for_assessment(
+            assessment.id, include_policies=False, shortlist_size=3, batch_size=1, concurrency=1
+        )
+        next(events)
+        finished = next(events)
+
+        events.close()
+
+        other = sessionmaker(bind=test_db)()
+        mappings = other.query(ControlMapping).all()
+        assert [m.control_id for m in mappings] == [finished["entity_id"]]
+        assert len(fake_ai) == 1
+        log = other.query(AuditLog).one()
+        assert log.details == "Generated 1 mapping suggestions (stopped after 1 of 2 entities)"
+        assert log.new_values["completed"] is False
+        other.close()
+
+    def test_batches_stream_like_the_inline_run(self, db, assessment, monkeypatch):
+        def fake_batch(entities, entity_type, subcategories, confidence_threshold=None):
+            # The first entity of each prompt is left out, and asked again alone
+            return {
+                entity["key"]: [{"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}]
+                for entity in entities[1:]
+            }
+
+        monkeypatch.setattr(ai_client, "generate_batch_mapping_suggestions", fake_batch)
+        monkeypatch.setattr(
+            ai_client, "generate_mapping_suggestions",
+            lambda entity_text, entity_type, subcategories, confidence_threshold=None: [
+                {"subcategory_code": subcategories[0]["code"], "confidence_score": 0.9}
+            ],
+        )
+        for i, topic in enumerate(TOPICS):
+            db.add(Control(
+                id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"S-{i:02d}",
+                name=f"Control {i}", description=f"We maintain {topic}",
+            ))
+        db.commit()
+        service = AIMappingService(db)
+        options = dict(include_policies=False, shortlist_size=3, batch_size=5, concurrency=4)
+
+        inline = service.generate_mappings_for_assessment(assessment.id, **options)
+        key = lambda s: (s["entity_id"], s["requirement_id"])
+        expected = sorted(key(s) for s in inline["suggestions"])
+        db.query(ControlMapping).delete()
+        db.commit()
+
+        events = list(service.stream_mappings_for_assessment(assessment.id, **options))
+
+        streamed = [s for e in events if e["event"] == "entity" for s in e["suggestions"]]
+        assert sorted(key(s) for s in streamed) == expected
+        assert events[-1]["prompt_count"] == inline["prompt_count"] == 6
+        assert [e["completed"] for e in events if e["event"] == "progress"] == list(range(1, 15))
+
+    def test_endpoint_streams_ndjson_and_sse(self, client, assessment, fake_ai):
+        app.dependency_overrides[require_user] = lambda: User(
+            id=uuid.uuid4(), email="u@example.com", name="U"
+        )
+        url = f"/api/v1/mappings/assessments/{assessment.id}/generate-stream"
+        body = {"include_policies": False, "shortlist_size": 3}
+
+        response = client.post(url, json=body)
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["event"] for e in events] == [
+            "start", "entity", "progress", "entity", "progress", "complete",
+        ]
+        assert events[-1]["control_mappings"] == 2
+
+        response = client.post(url, json=body, headers={"Accept": "text/event-stream"})
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = response.text.strip().split("\n\n")
+        assert frames[0].splitlines()[0] == "event: start"
+        assert json.loads(frames[-1].splitlines()[1][len("data: "):])["event"] == "complete"
+
+
+class TestRateLimiter:
+    def test_spaces_requests_after_burst(self):
+        limiter = RateLimiter(requests_per_minute=1200, burst=2)
+
+        start = time.monotonic()
+        waits = [limiter.acquire() for _ in range(5)]
+
+        assert waits[:2] == [0.0, 0.0]
+        # 3 requests beyond the burst at 20 per second
+        assert time.monotonic() - start >= 0.14
+
+    def test_disabled(self):
+        assert RateLimiter(0).acquire() == 0.0
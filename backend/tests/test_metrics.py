@@ -0,0 +1,183 @@
+"""Tests for the metrics registry and LLM call instrumentation."""
+
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from tenacity import retry, stop_after_attempt, wait_none
+
+from app.core import llm_metrics
+from app.core.ai_client import AIClient, ai_client
+from app.core.concurrency import run_concurrently
+from app.core.config import settings
+from app.core.llm_metrics import current_stage, llm_run, pipeline_stage, record_retry
+from app.core.metrics import MetricsRegistry, metrics
+from app.models.assessment import Assessment
+from app.models.audit import AuditLog
+from app.models.control import Control
+from app.models.unified_framework import Framework, FrameworkRequirement
+from app.models.user import User
+from app.services.mapping.ai_mapper import AIMappingService
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def fake_anthropic(replies):
+    """Anthropic stand-in answering each request with the next reply text."""
+    replies = iter(replies)
+
+    def create(model, **kwargs):
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=next(replies))],
+            usage=SimpleNamespace(input_tokens=1000, output_tokens=200),
+        )
+
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "ai_fast_model", None)
+    monkeypatch.setattr(settings, "ai_model", "priced-model")
+    monkeypatch.setattr(settings, "llm_prices_per_million_tokens", {"priced-model": [3.0, 15.0]})
+    client = AIClient()
+    client.rate_limiter.requests_per_minute = 0
+    return client
+
+
+class TestMetricsRegistry:
+    def test_renders_prometheus_text(self):
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls.", ["stage"])
+        latency = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0))
+
+        calls.inc(stage="mapping")
+        calls.inc(2, stage="mapping")
+        latency.observe(0.05, stage="mapping")
+        latency.observe(0.5, stage="mapping")
+
+        assert registry.counter("calls_total", "Calls.", ["stage"]) is calls
+        assert registry.render().splitlines() == [
+            "# HELP calls_total Calls.",
+            "# TYPE calls_total counter",
+            'calls_total{stage="mapping"} 3',
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{stage="mapping",le="0.1"} 1',
+            'latency_seconds_bucket{stage="mapping",le="1"} 2',
+            'latency_seconds_bucket{stage="mapping",le="+Inf"} 2',
+            'latency_seconds_sum{stage="mapping"} 0.55',
+            'latency_seconds_count{stage="mapping"} 2',
+        ]
+
+    def test_rejects_wrong_labels(self):
+        counter = MetricsRegistry().counter("c_total", "C.", ["stage"])
+        with pytest.raises(ValueError):
+            counter.inc(model="x")
+
+
+class TestLLMInstrumentation:
+    def test_calls_are_recorded_against_the_run_stage(self, client):
+        client._client = fake_anthropic(['[{"subcategory_code": "A", "confidence_score": 0.9}]'])
+
+        with llm_run("mapping") as run:
+            client.generate_mapping_suggestions("text", "control", [])
+
+        labels = {"provider": "anthropic", "stage": "mapping", "model": "priced-model"}
+        assert llm_metrics.CALLS.value(outcome="ok", **labels) == 1
+        assert llm_metrics.LATENCY.count(**labels) == 1
+        assert llm_metrics.TOKENS.value(direction="input", **labels) == 1000
+        assert llm_metrics.COST.value(**labels) == pytest.approx(0.006)
+        summary = run.as_dict()
+        assert (summary["calls"], summary["input_tokens"], summary["output_tokens"]) == (1, 1000, 200)
+        assert summary["cost_usd"] == pytest.approx(0.006)
+
+    def test_parse_failures_are_counted(self, client):
+        client._client = fake_anthropic(["Sorry, I cannot help."])
+
+        with llm_run("mapping") as run:
+            assert client.generate_mapping_suggestions("text", "control", []) == []
+
+        assert llm_metrics.PARSE_FAILURES.value(stage="mapping") == 1
+        assert run.parse_failures == 1
+
+    def test_retries_are_counted(self, caplog):
+        attempts = []
+
+        @retry(stop=stop_after_attempt(3), wait=wait_none(), before_sleep=record_retry)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        with llm_run("crosswalk_validation") as run:
+            assert flaky() == "ok"
+
+        assert run.retries == 2
+        assert llm_metrics.RETRIES.value(
+            stage="crosswalk_validation", call=flaky.__wrapped__.__qualname__
+        ) == 2
+        retries = [r for r in caplog.records if r.name == "app.core.llm_metrics"]
+        assert len(retries) == 2
+        assert "attempt 1 (stage crosswalk_validation)" in retries[0].getMessage()
+
+    def test_stage_follows_worker_threads(self):
+        with pipeline_stage("crosswalk_validation"):
+            stages = run_concurrently(lambda _: current_stage(), range(4), concurrency=4)
+
+        assert stages == ["crosswalk_validation"] * 4
+        assert current_stage() == "other"
+
+    def test_metrics_endpoint(self, client, test_db):
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        client._client = fake_anthropic(["[]"])
+        with pipeline_stage("mapping"):
+            client.generate_mapping_suggestions("text", "control", [])
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'llm_calls_total{provider="anthropic",stage="mapping",model="priced-model",outcome="ok"} 1'
+            in response.text
+        )
+
+
+class TestRunSummaryAudit:
+    def test_mapping_audit_entry_has_llm_summary(self, test_db, client, monkeypatch):
+        db = sessionmaker(bind=test_db)()
+        user = User(id=uuid.uuid4(), email="m@example.com", name="M")
+        assessment = Assessment(id=uuid.uuid4(), name="A", organization_name="O", created_by_id=user.id)
+        framework = Framework(id=uuid.uuid4(), code="FW", name="FW", version="1")
+        db.add_all([user, assessment, framework])
+        db.add(FrameworkRequirement(
+            id=uuid.uuid4(), framework_id=framework.id, code="FW-1", name="R", description="Backups",
+        ))
+        db.add(Control(
+            id=uuid.uuid4(), assessment_id=assessment.id, identifier="C-1", name="Backups",
+            description="Nightly backups",
+        ))
+        db.commit()
+        monkeypatch.setattr(ai_client, "_client", fake_anthropic([
+            json.dumps([{"subcategory_code": "FW-1", "confidence_score": 0.9}]),
+        ]))
+        monkeypatch.setattr(ai_client, "rate_limiter", client.rate_limiter)
+
+        AIMappingService(db).generate_mappings_for_assessment(assessment.id, include_policies=False)
+
+        entry = db.query(AuditLog).filter(AuditLog.action == "generate_ai_mappings").one()
+        assert entry.new_values["llm"]["stage"] == "mapping"
+        assert entry.new_values["llm"]["calls"] == 1
+        assert entry.new_values["llm"]["input_tokens"] == 1000
+        db.close()
@@ -0,0 +1,123 @@
+"""Tests for keyset pagination of list endpoints."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.assessment import Assessment
+from app.models.control import Control
+from app.models.deviation import Deviation
+from app.models.unified_framework import Framework, FrameworkRequirement, RequirementCrosswalk
+from app.models.user import User
+
+
+@pytest.fixture
+def assessment(db):
+    user = User(id=uuid.uuid4(), email="pages@example.com", name="Pages")
+    assessment = Assessment(
+        id=uuid.uuid4(), name="A", organization_name="Org", created_by_id=user.id
+    )
+    db.add_all([user, assessment])
+    db.commit()
+    return assessment
+
+
+def fetch_all(client, url, limit):
+    """Follow next_cursor to the end, returning every page."""
+    pages = [client.get(url, params={"limit": limit}).json()]
+    while pages[-1]["next_cursor"]:
+        response = client.get(url, params={"limit": limit, "cursor": pages[-1]["next_cursor"]})
+        assert response.status_code == 200
+        pages.append(response.json())
+    return pages
+
+
+def test_controls_page_in_creation_order_across_ties(client, db, assessment):
+    start = datetime(2026, 1, 1)
+    for i in range(7):
+        db.add(Control(
+            id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"C-{i}", name=f"Control {i}",
+            # Pairs of controls share a timestamp, so the id must break ties
+            created_at=start + timedelta(minutes=i // 2),
+        ))
+    db.commit()
+
+    pages = fetch_all(client, f"/api/v1/assessments/{assessment.id}/controls", limit=3)
+
+    assert [len(page["items"]) for page in pages] == [3, 3, 1]
+    assert pages[-1]["next_cursor"] is None
+    identifiers = [c["identifier"] for page in pages for c in page["items"]]
+    # Each pair is in timestamp order; within a pair, in id order
+    assert [sorted(identifiers[i:i + 2]) for i in range(0, 7, 2)] == [
+        ["C-0", "C-1"], ["C-2", "C-3"], ["C-4", "C-5"], ["C-6"]
+    ]
+
+
+def test_crosswalks_page_by_confidence_with_total(client, db):
+    framework = Framework(id=uuid.uuid4(), code="PG", name="Pages", version="1")
+    requirements = [
+        FrameworkRequirement(id=uuid.uuid4(), framework_id=framework.id, code=f"PG-{i}", name=f"R{i}")
+        for i in range(6)
+    ]
+    db.add_all([framework, *requirements])
+    for i, confidence in enumerate([0.5, 0.9, 0.7, 0.9, 0.6]):
+        db.add(RequirementCrosswalk(
+            id=uuid.uuid4(),
+            source_requirement_id=requirements[i].id,
+            target_requirement_id=requirements[i + 1].id,
+            mapping_type="related",
+            confidence_score=confidence,
+            mapping_source="ai",
+        ))
+    db.commit()
+
+    first = client.get("/api/v1/crosswalks", params={"limit": 2, "include_total": True}).json()
+    assert first["total_estimate"] == 5
+    assert [cw["confidence_score"] for cw in first["items"]] == [0.9, 0.9]
+    assert first["items"][0]["source_requirement_code"].startswith("PG-")
+
+    rest = client.get("/api/v1/crosswalks", params={"limit": 10, "cursor": first["next_cursor"]}).json()
+    assert [cw["confidence_score"] for cw in rest["items"]] == [0.7, 0.6, 0.5]
+    assert rest["next_cursor"] is None
+    assert rest["total_estimate"] is None
+
+
+def test_deviation_counts_cover_all_pages(client, db, assessment):
+    for i, (severity, status) in enumerate(
+        [("critical", "open"), ("high", "open"), ("high", "resolved"), ("low", "open")]
+    ):
+        db.add(Deviation(
+            id=uuid.uuid4(), assessment_id=assessment.id, subcategory_id=uuid.uuid4(),
+            deviation_type="missing_control", severity=severity, status=status,
+            title=f"Deviation {i}", description="Gap",
+            impact_score=4 - i, likelihood_score=4, risk_score=(4 - i) * 4,
+        ))
+    db.commit()
+
+    page = client.get(
+        f"/api/v1/assessments/{assessment.id}/deviations", params={"limit": 1}
+    ).json()
+
+    assert [d["risk_score"] for d in page["items"]] == [16]
+    assert page["next_cursor"] is not None
+    assert page["total"] == 4
+    assert page["by_severity"] == {"critical": 1, "high": 2, "medium": 0, "low": 1}
+    assert page["by_status"] == {"open": 3, "resolved": 1}
+
+
+def test_cursor_from_another_list_is_rejected(client, db, assessment):
+    for i in range(2):
+        db.add(Control(id=uuid.uuid4(), assessment_id=assessment.id, identifier=f"C-{i}", name="C"))
+    db.commit()
+    cursor = client.get(
+        f"/api/v1/assessments/{assessment.id}/controls", params={"limit": 1}
+    ).json()["next_cursor"]
+
+    # A (created_at, id) cursor cannot be read as a (confidence_score, id) one
+    response = client.get("/api/v1/crosswalks", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid cursor")
+
+    assert client.get("/api/v1/crosswalks", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/crosswalks", params={"limit": 0}).status_code == 422
@@ -0,0 +1,119 @@
+"""Tests for per-request timing and query-count instrumentation."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.request_metrics import (
+    POOL_CHECKED_OUT,
+    POOL_CHECKOUT_WAIT,
+    POOL_SIZE,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    TimedQueuePool,
+    instrument_engine,
+    update_pool_gauges,
+)
+from app.main import app
+from app.models.assessment import Assessment
+from app.models.control import Control
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(test_db):
+    instrument_engine(test_db)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def assessment_id(test_db):
+    db = sessionmaker(bind=test_db)()
+    user = User(id=uuid.uuid4(), email="timing@example.com", name="Timing")
+    assessment_id = uuid.uuid4()
+    db.add_all([
+        user,
+        Assessment(id=assessment_id, name="A", organization_name="Org", created_by_id=user.id),
+        *(
+            Control(id=uuid.uuid4(), assessment_id=assessment_id, identifier=f"C-{i}", name="C")
+            for i in range(3)
+        ),
+    ])
+    db.commit()
+    db.close()
+    return assessment_id
+
+
+def server_timing(response) -> dict[str, str]:
+    """Server-Timing entries by name, e.g. {"db": 'dur=1.2;desc="queries=3"'}."""
+    entries = [entry.strip().split(";", 1) for entry in response.headers["server-timing"].split(",")]
+    return {name: params for name, params in entries}
+
+
+def test_request_is_recorded_under_its_route_template(client, assessment_id):
+    response = client.get(f"/api/v1/assessments/{assessment_id}/controls")
+
+    assert response.status_code == 200
+    timing = server_timing(response)
+    assert set(timing) == {"db", "total"}
+    queries = int(timing["db"].split('desc="queries=')[1].rstrip('"'))
+    # The handler's queries run on a worker thread but count for the request
+    assert queries >= 1
+
+    route = "/api/v1/assessments/{assessment_id}/controls"
+    assert REQUEST_DURATION.count(method="GET", route=route, status="200") == 1
+    assert REQUEST_DB_QUERIES.sum(method="GET", route=route) == queries
+    rendered = client.get("/metrics").text
+    assert f'http_request_duration_seconds_count{{method="GET",route="{route}",status="200"}} 1' in rendered
+    assert str(assessment_id) not in rendered
+
+
+def test_root_and_unmatched_routes(client):
+    client.get("/api/v1/frameworks")
+    client.get("/no/such/path")
+
+    assert REQUEST_DURATION.count(method="GET", route="/api/v1/frameworks", status="200") == 1
+    assert REQUEST_DURATION.count(method="GET", route="unmatched", status="404") == 1
+
+
+def test_unhandled_error_is_recorded_as_500(test_db):
+    client = TestClient(app, raise_server_exceptions=False)
+
+    # Not a UUID: the handler raises ValueError
+    response = client.get("/api/v1/crosswalks/requirement/not-a-uuid/mappings")
+
+    assert response.status_code == 500
+    route = "/api/v1/crosswalks/requirement/{requirement_id}/mappings"
+    assert REQUEST_DURATION.count(method="GET", route=route, status="500") == 1
+
+
+def test_server_timing_header_can_be_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "server_timing_header", False)
+
+    response = client.get("/health")
+
+    assert "server-timing" not in response.headers
+    assert REQUEST_DURATION.count(method="GET", route="/health", status="200") == 1
+
+
+def test_pool_checkout_wait_and_gauges(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=3, max_overflow=0
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        update_pool_gauges(engine.pool)
+        assert POOL_SIZE.value() == 3
+        assert POOL_CHECKED_OUT.value() == 1
+
+    update_pool_gauges(engine.pool)
+    assert POOL_CHECKED_OUT.value() == 0
+    assert POOL_CHECKOUT_WAIT.count() == 1
+    engine.dispose()
@@ -0,0 +1,100 @@
+"""Tests for orjson-rendered and streamed JSON responses."""
+
+import json
+import uuid
+from datetime import datetime
+
+import anyio
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse, dumps, stream_json_array
+from app.models.unified_framework import Framework, FrameworkRequirement
+
+
+class Item(BaseModel):
+    id: uuid.UUID
+    score: float
+
+
+def test_dumps_handles_api_types():
+    item_id = uuid.uuid4()
+    content = {
+        "id": item_id,
+        "at": datetime(2026, 1, 2, 3, 4, 5),
+        "vector": np.array([0.5, 1.0]),
+        "item": Item(id=item_id, score=0.25),
+        1: "non-string key",
+    }
+
+    assert json.loads(dumps(content)) == {
+        "id": str(item_id),
+        "at": "2026-01-02T03:04:05",
+        "vector": [0.5, 1.0],
+        "item": {"id": str(item_id), "score": 0.25},
+        "1": "non-string key",
+    }
+    assert json.loads(FastJSONResponse({"a": [1, 2]}).body) == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_stream_json_array_is_one_valid_array(count):
+    response = stream_json_array(({"n": i} for i in range(count)), chunk_size=3)
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = anyio.run(collect)
+
+    assert json.loads(b"".join(chunks)) == [{"n": i} for i in range(count)]
+    # One chunk per started group of three, plus the closing bracket
+    assert len(chunks) == max(1, -(-count // 3)) + 1
+
+
+def test_hierarchy_streams_nested_tree(client, db):
+    framework = Framework(id=uuid.uuid4(), code="HT", name="Tree", version="1")
+    root = FrameworkRequirement(
+        id=uuid.uuid4(), framework_id=framework.id, code="HT-1", name="Root", level=0, display_order=0
+    )
+    # Children are inserted out of display order
+    second = FrameworkRequirement(
+        id=uuid.uuid4(), framework_id=framework.id, parent_id=root.id,
+        code="HT-1.2", name="Second", level=1, display_order=2,
+    )
+    first = FrameworkRequirement(
+        id=uuid.uuid4(), framework_id=framework.id, parent_id=root.id,
+        code="HT-1.1", name="First", level=1, display_order=1,
+    )
+    leaf = FrameworkRequirement(
+        id=uuid.uuid4(), framework_id=framework.id, parent_id=first.id,
+        code="HT-1.1.a", name="Leaf", level=2, display_order=3, is_assessable=True,
+    )
+    other_root = FrameworkRequirement(
+        id=uuid.uuid4(), framework_id=framework.id, code="HT-2", name="Other", level=0, display_order=4
+    )
+    db.add_all([framework, root, second, first, leaf, other_root])
+    db.commit()
+
+    response = client.get(f"/api/v1/frameworks/{framework.id}/hierarchy")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    tree = response.json()
+    assert [node["code"] for node in tree] == ["HT-1", "HT-2"]
+    assert "children" not in tree[1]
+    assert [child["code"] for child in tree[0]["children"]] == ["HT-1.1", "HT-1.2"]
+    assert tree[0]["children"][0]["children"] == [{
+        "id": str(leaf.id),
+        "code": "HT-1.1.a",
+        "name": "Leaf",
+        "description": None,
+        "level": 2,
+        "is_assessable": True,
+    }]
+
+    shallow = client.get(
+        f"/api/v1/frameworks/{framework.id}/hierarchy", params={"max_depth": 1}
+    ).json()
+    assert [child["code"] for child in shallow[0]["children"]] == ["HT-1.1", "HT-1.2"]
+    assert "children" not in shallow[0]["children"][0]
@@ -0,0 +1,545 @@
+"""Tests for embedding similarity search."""
+
+import asyncio
+import random
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.unified_framework import (
+    Framework,
+    FrameworkRequirement,
+    RequirementEmbedding,
+)
+from app.services.clustering.ann_index import RequirementIndex, set_requirement_index
+from app.services.clustering.embedding_backends import (
+    EmbeddingBackend,
+    HashingEmbeddingBackend,
+    StubEmbeddingBackend,
+)
+from app.services.clustering.embedding_pipeline import EmbeddingPipeline, pack_batches
+from app.services.clustering.embedding_service import EmbeddingService
+from app.services.clustering.similarity_graph import SimilarityGraph
+from app.services.clustering.similarity_service import SimilarityService
+from app.services.clustering.vector_engine import VectorEngine
+from app.services.frameworks.requirement_service import RequirementService
+
+
+DIM = 16
+
+
+def random_vectors(n: int, seed: int = 42) -> list[list[float]]:
+    rng = random.Random(seed)
+    base = [[rng.gauss(0, 1) for _ in range(DIM)] for _ in range(max(n // 4, 1))]
+    return [
+        [x + rng.gauss(0, 0.3) for x in base[i % len(base)]]
+        for i in range(n)
+    ]
+
+
+def legacy_rank(query, vectors, top_k, threshold):
+    results = []
+    for idx, vec in enumerate(vectors):
+        sim = SimilarityService.cosine_similarity(query, vec)
+        if sim >= threshold:
+            results.append((idx, sim))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results[:top_k]
+
+
+class RecordingBackend(StubEmbeddingBackend):
+    """Stub backend that records the texts of every request."""
+
+    def __init__(self, **kwargs):
+        super().__init__(dimensions=DIM, **kwargs)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+
+@pytest.fixture(autouse=True)
+def embedding_dimensions(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_dimensions", DIM)
+
+
+@pytest.fixture
+def frameworks(db):
+    """Two frameworks with embedded requirements."""
+    vectors = random_vectors(40)
+    created = []
+    for f in range(2):
+        framework = Framework(
+            id=uuid.uuid4(), code=f"FW{f}", name=f"Framework {f}", version="1.0"
+        )
+        db.add(framework)
+        for i in range(20):
+            requirement = FrameworkRequirement(
+                id=uuid.uuid4(),
+                framework_id=framework.id,
+                code=f"FW{f}-{i:02d}",
+                name=f"Requirement {i}",
+            )
+            db.add(requirement)
+            db.add(RequirementEmbedding(
+                requirement_id=requirement.id,
+                model=EmbeddingBackend.get_backend().model,
+                dimensions=DIM,
+                vector=vectors[f * 20 + i],
+            ))
+        created.append(framework)
+    db.commit()
+    return created
+
+
+class TestVectorStorage:
+    """Tests for packed float32 embedding storage."""
+
+    def test_roundtrip_returns_float32_view(self, db, frameworks):
+        expected = random_vectors(40)[0]
+        db.expire_all()
+
+        requirement = (
+            db.query(FrameworkRequirement)
+            .filter(FrameworkRequirement.code == "FW0-00")
+            .one()
+        )
+        vector = EmbeddingService(db).get_embedding(requirement.id)
+
+        assert isinstance(vector, np.ndarray)
+        assert vector.dtype == np.float32
+        assert not vector.flags.writeable
+        assert vector.tolist() == pytest.approx(expected, abs=1e-6)
+
+    def test_stored_as_packed_bytes(self, db, frameworks):
+        raw = db.execute(
+            text("SELECT vector FROM requirement_embeddings LIMIT 1")
+        ).scalar()
+        assert isinstance(raw, bytes)
+        assert len(raw) == DIM * 4
+
+
+class TestVectorEngine:
+    """Tests for the NumPy vector engine."""
+
+    def test_top_k_matches_legacy_ranking(self):
+        vectors = random_vectors(50)
+        engine = VectorEngine(vectors)
+
+        for query in vectors[:5]:
+            expected = legacy_rank(query, vectors, 10, 0.5)
+            actual = engine.top_k(query, top_k=10, threshold=0.5)
+            assert [idx for idx, _ in actual] == [idx for idx, _ in expected]
+            for (_, a), (_, e) in zip(actual, expected):
+                assert a == pytest.approx(e, abs=1e-5)
+
+    def test_unusable_vectors_score_zero(self):
+        engine = VectorEngine([[1.0, 0.0], None, [0.0, 0.0], [1.0, 0.0, 0.0]])
+        scores = engine.scores([1.0, 0.0])
+        assert scores.tolist() == pytest.approx([1.0, 0.0, 0.0, 0.0])
+
+    def test_top_k_against_respects_threshold_and_k(self):
+        vectors = random_vectors(30)
+        source, target = VectorEngine(vectors[:10]), VectorEngine(vectors[10:])
+
+        matches = source.top_k_against(target, top_k=3, threshold=0.6, block_size=4)
+
+        assert len(matches) == 10
+        for row, query in zip(matches, vectors[:10]):
+            expected = legacy_rank(query, vectors[10:], 3, 0.6)
+            assert [idx for idx, _ in row] == [idx for idx, _ in expected]
+
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    """Point the ANN index at a temp file and reset the global instance."""
+    path = tmp_path / "index.npz"
+    monkeypatch.setattr(settings, "ann_index_path", str(path))
+    yield path
+    set_requirement_index(None, persist=False)
+
+
+class TestSimilarityGraph:
+    """Sparse thresholded similarity graph."""
+
+    def test_matches_thresholded_dense_matrix(self):
+        engine = VectorEngine(random_vectors(50))
+        dense = engine.pairwise()
+        dense[dense < 0.6] = 0.0
+        np.fill_diagonal(dense, 0.0)
+
+        graph = SimilarityGraph.build(engine, 0.6, block_size=7)
+
+        np.testing.assert_allclose(graph.to_dense(), dense, atol=1e-6)
+        assert graph.num_edges == np.count_nonzero(dense)
+        nodes = [3, 10, 11, 40]
+        np.testing.assert_allclose(
+            graph.dense_submatrix(nodes), dense[np.ix_(nodes, nodes)], atol=1e-6
+        )
+
+    def test_between_matches_top_k_against(self):
+        vectors = random_vectors(40)
+        source, target = VectorEngine(vectors[:15]), VectorEngine(vectors[15:])
+
+        graph = SimilarityGraph.between(source, target, threshold=0.3, top_k=3, block_size=4)
+        expected = source.top_k_against(target, top_k=3, threshold=0.3)
+
+        for i, matches in enumerate(expected):
+            cols, sims = graph.neighbors(i)
+            assert cols.tolist() == [idx for idx, _ in matches]
+            np.testing.assert_allclose(sims, [s for _, s in matches], rtol=1e-6)
+
+
+class TestRequirementIndex:
+    """Tests for the IVF-flat nearest-neighbour index."""
+
+    def entries(self, n=200):
+        fw_a, fw_b = uuid.uuid4(), uuid.uuid4()
+        return [
+            (uuid.uuid4(), fw_a if i % 2 else fw_b, i % 5 != 0, vec)
+            for i, vec in enumerate(random_vectors(n))
+        ]
+
+    def test_full_probe_matches_exact_search(self):
+        entries = self.entries()
+        index = RequirementIndex.build(entries, dimensions=DIM, nlist=8)
+        vectors = [e[3] for e in entries]
+
+        for query in vectors[:5]:
+            expected = legacy_rank(query, vectors, 10, 0.3)
+            actual = index.search(query, top_k=10, threshold=0.3, nprobe=index.nlist)
+            assert [rid for rid, _ in actual] == [entries[i][0] for i, _ in expected]
+
+    def test_filters(self):
+        entries = self.entries()
+        index = RequirementIndex.build(entries, dimensions=DIM, nlist=4)
+        framework_id = entries[0][1]
+        by_id = {e[0]: e for e in entries}
+
+        results = index.search(
+            entries[0][3], top_k=50, framework_id=framework_id, only_assessable=True,
+            exclude_ids=[entries[0][0]],
+        )
+
+        assert results
+        for rid, _ in results:
+            assert rid != entries[0][0]
+            assert by_id[rid][1] == framework_id
+            assert by_id[rid][2] is True
+
+    def test_add_replaces_and_save_load_roundtrip(self, tmp_path):
+        entries = self.entries(50)
+        index = RequirementIndex.build(entries, dimensions=DIM)
+        req_id, fw_id, _, _ = entries[0]
+        new_vector = [1.0] + [0.0] * (DIM - 1)
+
+        index.add([(req_id, fw_id, True, new_vector)])
+        index.save(tmp_path / "index.npz")
+        loaded = RequirementIndex.load(tmp_path / "index.npz")
+
+        assert len(loaded) == 50
+        top_id, score = loaded.search(new_vector, top_k=1)[0]
+        assert top_id == req_id
+        assert score == pytest.approx(1.0)
+
+
+class TestSimilarityService:
+    """Tests for SimilarityService on top of the vector engine."""
+
+    def test_build_similarity_matrix(self, db, frameworks):
+        service = SimilarityService(db)
+        requirements, matrix = service.build_similarity_matrix(threshold=0.5)
+        vectors = service.embedding_service.get_embeddings([r.id for r in requirements])
+
+        assert len(matrix) == len(requirements) == 40
+        for i in range(len(requirements)):
+            assert matrix[i][i] == 1.0
+            for j in range(i + 1, len(requirements)):
+                sim = SimilarityService.cosine_similarity(
+                    vectors[requirements[i].id], vectors[requirements[j].id]
+                )
+                expected = sim if sim >= 0.5 else 0.0
+                assert matrix[i][j] == pytest.approx(expected, abs=1e-5)
+                assert matrix[j][i] == matrix[i][j]
+
+    def test_find_cross_framework_candidates(self, db, frameworks):
+        service = SimilarityService(db)
+        source_fw, target_fw = frameworks
+
+        candidates = service.find_cross_framework_candidates(
+            source_framework_id=source_fw.id,
+            target_framework_id=target_fw.id,
+            top_k_per_requirement=2,
+            threshold=0.5,
+        )
+
+        assert candidates
+        per_source: dict = {}
+        for source, target, sim in candidates:
+            assert source.framework_id == source_fw.id
+            assert target.framework_id == target_fw.id
+            assert sim >= 0.5
+            per_source.setdefault(source.id, []).append(sim)
+        for sims in per_source.values():
+            assert len(sims) <= 2
+            assert sims == sorted(sims, reverse=True)
+
+    def test_find_similar_requirements_excludes_same_framework(self, db, frameworks):
+        service = SimilarityService(db)
+        source = frameworks[0].requirements[0]
+
+        results = service.find_similar_requirements(source.id, top_k=5, threshold=0.0)
+
+        assert 0 < len(results) <= 5
+        assert all(req.framework_id != source.framework_id for req, _ in results)
+
+    def test_index_results_match_brute_force(self, db, frameworks, index_path):
+        service = SimilarityService(db)
+        source = frameworks[0].requirements[3]
+        expected = service.find_similar_requirements(source.id, top_k=5, threshold=0.2)
+
+        EmbeddingService(db).rebuild_index()
+        assert index_path.exists()
+        actual = service.find_similar_requirements(source.id, top_k=5, threshold=0.2)
+
+        assert [r.id for r, _ in actual] == [r.id for r, _ in expected]
+
+    def test_index_skips_and_tops_up_stale_entries(self, db, frameworks, index_path):
+        service = SimilarityService(db)
+        source = frameworks[0].requirements[3]
+        EmbeddingService(db).rebuild_index()
+        hits = service.find_similar_requirements(source.id, top_k=5, threshold=0.0)
+
+        # Changed behind the index's back, as another process would
+        hits[0][0].is_assessable = False
+        db.query(RequirementEmbedding).filter(
+            RequirementEmbedding.requirement_id == hits[1][0].id
+        ).delete()
+        db.delete(hits[1][0])
+        db.commit()
+
+        expected = service._rank_candidates(
+            service.embedding_service.get_embedding(source.id),
+            service._embedded_requirements().filter(
+                FrameworkRequirement.framework_id != source.framework_id,
+                FrameworkRequirement.is_assessable == True,
+            ).all(),
+            5,
+            0.0,
+        )
+        actual = service.find_similar_requirements(source.id, top_k=5, threshold=0.0)
+
+        assert len(actual) == 5
+        assert [r.id for r, _ in actual] == [r.id for r, _ in expected]
+
+    def test_requirement_updates_and_deletes_reach_index(self, db, frameworks, index_path):
+        index = EmbeddingService(db).rebuild_index()
+        first, second = frameworks[0].requirements[:2]
+        vector = index.get_vector(first.id)
+
+        RequirementService(db).update_requirement(first.id, is_assessable=False)
+        RequirementService(db).delete_requirement(second.id)
+
+        hits = [rid for rid, _ in index.search(vector, top_k=40, only_assessable=True)]
+        assert first.id not in hits
+        assert index.get_vector(second.id) is None
+
+        index.remove_framework(frameworks[1].id)
+        assert len(index) == 19
+
+    def test_single_embedding_updates_index_in_memory(self, db, frameworks, index_path):
+        service = EmbeddingService(db)
+        service.rebuild_index()
+        saved = index_path.read_bytes()
+        requirement = FrameworkRequirement(
+            id=uuid.uuid4(), framework_id=frameworks[0].id, code="FW0-NEW", name="New",
+            description="Rotate encryption keys every year.",
+        )
+        db.add(requirement)
+        db.commit()
+
+        vector = service.embed_requirement(requirement.id)
+
+        # Searchable straight away, without rewriting the whole file
+        assert service.get_index().search(vector, top_k=1)[0][0] == requirement.id
+        assert index_path.read_bytes() == saved
+        assert [p.name for p in index_path.parent.iterdir()] == [index_path.name]
+
+
+class TestEmbeddingCache:
+    """Content-addressed cache in front of the embedding provider."""
+
+    @pytest.fixture
+    def unembedded(self, db):
+        """Two frameworks sharing the same requirement text, no embeddings yet."""
+        for f in range(2):
+            framework = Framework(
+                id=uuid.uuid4(), code=f"CF{f}", name=f"Cached {f}", version="1.0"
+            )
+            db.add(framework)
+            for i in range(5):
+                db.add(FrameworkRequirement(
+                    id=uuid.uuid4(),
+                    framework_id=framework.id,
+                    code=f"REQ-{i}",
+                    name=f"Shared requirement {i}",
+                ))
+        db.commit()
+
+    def test_duplicate_and_unchanged_text_hits_cache(self, db, unembedded, index_path):
+        backend = RecordingBackend()
+        service = EmbeddingService(db, backend=backend)
+
+        stats = service.embed_all_requirements()
+        assert stats["processed"] == 10
+        assert stats["cache_misses"] == 5
+        assert stats["cache_hits"] == 5
+        assert sum(len(batch) for batch in backend.calls) == 5
+
+        backend.calls.clear()
+        stats = EmbeddingService(db, backend=backend).embed_all_requirements(force=True)
+        assert stats["processed"] == 10
+        assert stats["cache_hits"] == 10
+        assert stats["cache_misses"] == 0
+        assert backend.calls == []
+
+    def test_evicts_least_recently_used(self, db):
+        backend = RecordingBackend()
+        service = EmbeddingService(db, backend=backend)
+        service.cache.max_entries = 3
+
+        for sample in ["a", "bb", "ccc"]:
+            service.generate_embedding(sample)
+        service.generate_embedding("a")  # refresh "a"
+        service.generate_embedding("dddd")
+        db.commit()
+
+        backend.calls.clear()
+        service.generate_embedding("a")
+        assert backend.calls == []
+        service.generate_embedding("bb")
+        assert backend.calls == [["bb"]]
+
+    def test_concurrently_cached_hash_is_skipped(self, db, test_db):
+        backend = StubEmbeddingBackend(dimensions=DIM)
+        cache = EmbeddingService(db, backend=backend).cache
+        other = sessionmaker(bind=test_db)()
+        try:
+            EmbeddingService(other, backend=backend).cache.put_many({"h1": [1.0] * DIM})
+            other.commit()
+        finally:
+            other.close()
+
+        # Neither lookup saw the other's entry before writing it
+        cache.put_many({"h1": [2.0] * DIM, "h2": [3.0] * DIM})
+        db.commit()
+
+        cached = cache.get_many(["h1", "h2"])
+        assert cached["h1"].tolist() == [1.0] * DIM
+        assert cached["h2"].tolist() == [3.0] * DIM
+
+
+class TestEmbeddingPipeline:
+    """Concurrent embedding generation against the stub backend."""
+
+    @pytest.fixture
+    def unembedded(self, db):
+        framework = Framework(id=uuid.uuid4(), code="PIPE", name="Pipeline", version="1.0")
+        db.add(framework)
+        for i in range(60):
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(),
+                framework_id=framework.id,
+                code=f"P-{i:02d}",
+                name=f"Requirement {i % 50}",
+                description="Shared description" if i >= 50 else f"Text {i}",
+            ))
+        db.commit()
+        return framework
+
+    def test_pack_batches_respects_budgets(self):
+        items = [(str(i), "x" * 400) for i in range(10)]  # ~101 tokens each
+
+        batches = pack_batches(items, max_batch_size=4, max_batch_tokens=250)
+
+        assert [len(b.texts) for b in batches] == [2, 2, 2, 2, 2]
+        assert [h for b in batches for h in b.hashes] == [str(i) for i in range(10)]
+        assert len(pack_batches(items, max_batch_size=4, max_batch_tokens=10_000)) == 3
+
+    def test_embeds_all_and_backs_off_on_rate_limits(self, db, unembedded, index_path):
+        provider = StubEmbeddingBackend(dimensions=DIM, latency=0.01, max_concurrent=2)
+        service = EmbeddingService(db, backend=provider)
+        pipeline = EmbeddingPipeline(service, concurrency=6, max_batch_size=5)
+
+        stats = asyncio.run(pipeline.run(framework_id=unembedded.id))
+
+        assert stats["processed"] == 60
+        assert stats["failed"] == 0
+        assert stats["rate_limited"] > 0
+        assert provider.peak_in_flight <= 2
+
+        stored = service.get_embeddings([r.id for r in unembedded.requirements])
+        assert len(stored) == 60
+        for requirement in unembedded.requirements:
+            text = service.prepare_requirement_text(requirement)
+            np.testing.assert_allclose(stored[requirement.id], provider.vector(text), rtol=1e-6)
+
+        # Nothing left to do, and a forced run is served from the cache
+        assert asyncio.run(pipeline.run(framework_id=unembedded.id))["processed"] == 0
+        stats = asyncio.run(pipeline.run(framework_id=unembedded.id, force=True))
+        assert stats["cache_hits"] == 60
+        assert stats["batches"] == 0
+
+
+class TestHashingBackend:
+    """In-process character n-gram embeddings."""
+
+    def test_vectors_are_normalized_and_deterministic(self):
+        backend = HashingEmbeddingBackend(dimensions=256)
+        texts = ["Review access rights quarterly", "", "Encrypt backups"]
+
+        matrix = backend.embed_matrix(texts)
+
+        assert matrix.shape == (3, 256)
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), [1.0, 0.0, 1.0], atol=1e-6)
+        np.testing.assert_array_equal(matrix, backend.embed_matrix(texts))
+        # Batch composition doesn't change a text's vector
+        np.testing.assert_array_equal(matrix[2], backend.embed_matrix(["Encrypt backups"])[0])
+
+    def test_shared_wording_scores_higher(self):
+        backend = HashingEmbeddingBackend(dimensions=512)
+        query, close, far = backend.embed_matrix([
+            "Access control policy is reviewed annually",
+            "Access control policies are reviewed every year",
+            "Encrypt customer data at rest",
+        ])
+
+        assert query @ close > query @ far + 0.3
+
+    def test_find_similar_to_text_offline(self, db, index_path):
+        framework = Framework(id=uuid.uuid4(), code="HB", name="Hashing", version="1.0")
+        db.add(framework)
+        names = ["Multi-factor authentication", "Data backup and recovery", "Security awareness training"]
+        for i, name in enumerate(names):
+            db.add(FrameworkRequirement(
+                id=uuid.uuid4(), framework_id=framework.id, code=f"HB-{i}", name=name
+            ))
+        db.commit()
+
+        service = EmbeddingService(db)
+        assert isinstance(service.backend, HashingEmbeddingBackend)
+        assert service.embed_all_requirements()["processed"] == 3
+
+        results = SimilarityService(db).find_similar_to_text(
+            "backup and recovery of data", top_k=1, threshold=0.0
+        )
+        assert [r.code for r, _ in results] == ["HB-1"]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            EmbeddingBackend.get_backend("word2vec")
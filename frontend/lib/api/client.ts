@@ -1,3 +1,5 @@
+import { CursorPage } from '../types/common';
+
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
 const TOKEN_KEY = 'compliance-ai-access-token';
 
@@ -49,6 +51,25 @@ export async function apiRequest<T>(
   return res.json();
 }
 
+// List endpoints return pages; follow next_cursor to collect every item
+export async function apiRequestAllPages<T>(
+  endpoint: string,
+  options: { userId?: string } = {}
+): Promise<T[]> {
+  const separator = endpoint.includes('?') ? '&' : '?';
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: CursorPage<T> = await apiRequest<CursorPage<T>>(
+      `${endpoint}${separator}limit=500${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`,
+      options
+    );
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 export async function uploadFile<T>(
   endpoint: string,
   file: File,
@@ -1,4 +1,4 @@
-import { apiRequest } from './client';
+import { apiRequest, apiRequestAllPages } from './client';
 import {
   RequirementCluster,
   ClusterMember,
@@ -17,7 +17,7 @@ export async function listClusters(
   if (clusterType) params.append('cluster_type', clusterType);
   if (isActive !== undefined) params.append('is_active', String(isActive));
   const query = params.toString();
-  return apiRequest<RequirementCluster[]>(`/clusters${query ? `?${query}` : ''}`);
+  return apiRequestAllPages<RequirementCluster>(`/clusters${query ? `?${query}` : ''}`);
 }
 
 export async function getCluster(clusterId: string): Promise<RequirementCluster> {
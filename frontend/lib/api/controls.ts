@@ -1,4 +1,4 @@
-import { apiRequest, uploadFile } from './client';
+import { apiRequest, apiRequestAllPages, uploadFile } from './client';
 import { Control, ControlUploadResponse } from '../types';
 
 export async function uploadControls(
@@ -17,7 +17,7 @@ export async function listControls(
   assessmentId: string,
   userId?: string
 ): Promise<Control[]> {
-  return apiRequest<Control[]>(`/assessments/${assessmentId}/controls`, { userId });
+  return apiRequestAllPages<Control>(`/assessments/${assessmentId}/controls`, { userId });
 }
 
 export async function getControl(controlId: string, userId?: string): Promise<Control> {
@@ -1,4 +1,4 @@
-import { apiRequest } from './client';
+import { apiRequest, apiRequestAllPages } from './client';
 import {
   Crosswalk,
   CrosswalkStats,
@@ -26,7 +26,7 @@ export async function listCrosswalks(options?: {
   if (options?.minConfidence !== undefined)
     params.append('min_confidence', String(options.minConfidence));
   const query = params.toString();
-  return apiRequest<Crosswalk[]>(`/crosswalks${query ? `?${query}` : ''}`);
+  return apiRequestAllPages<Crosswalk>(`/crosswalks${query ? `?${query}` : ''}`);
 }
 
 export async function getCrosswalk(crosswalkId: string): Promise<Crosswalk> {
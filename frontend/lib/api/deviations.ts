@@ -23,11 +23,21 @@ export async function listDeviations(
   if (params.severity) searchParams.set('severity', params.severity);
   if (params.status) searchParams.set('status', params.status);
 
-  const query = searchParams.toString();
-  return apiRequest<DeviationListResponse>(
-    `/assessments/${assessmentId}/deviations${query ? `?${query}` : ''}`,
-    { userId }
-  );
+  searchParams.set('limit', '500');
+
+  // The counts cover all matching deviations; follow the cursor for the items
+  const endpoint = `/assessments/${assessmentId}/deviations?${searchParams.toString()}`;
+  const result = await apiRequest<DeviationListResponse>(endpoint, { userId });
+  let cursor = result.next_cursor;
+  while (cursor) {
+    const page = await apiRequest<DeviationListResponse>(
+      `${endpoint}&cursor=${encodeURIComponent(cursor)}`,
+      { userId }
+    );
+    result.items.push(...page.items);
+    cursor = page.next_cursor;
+  }
+  return { ...result, next_cursor: null };
 }
 
 export async function updateDeviation(
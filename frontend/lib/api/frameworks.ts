@@ -1,4 +1,4 @@
-import { apiRequest } from './client';
+import { apiRequest, apiRequestAllPages } from './client';
 import {
   Framework,
   FrameworkRequirement,
@@ -83,7 +83,7 @@ export async function getFrameworkRequirements(
   if (options?.isAssessable !== undefined)
     params.append('is_assessable', String(options.isAssessable));
   const query = params.toString();
-  return apiRequest<FrameworkRequirement[]>(
+  return apiRequestAllPages<FrameworkRequirement>(
     `/frameworks/${frameworkId}/requirements${query ? `?${query}` : ''}`
   );
 }
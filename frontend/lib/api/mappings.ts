@@ -1,4 +1,4 @@
-import { apiRequest } from './client';
+import { apiRequest, apiRequestAllPages } from './client';
 import {
   MappingGenerateRequest,
   MappingGenerateResponse,
@@ -53,7 +53,7 @@ export async function listControlMappings(
   assessmentId: string,
   userId?: string
 ): Promise<ControlMapping[]> {
-  return apiRequest<ControlMapping[]>(
+  return apiRequestAllPages<ControlMapping>(
     `/mappings/assessments/${assessmentId}/controls`,
     { userId }
   );
@@ -63,7 +63,7 @@ export async function listPolicyMappings(
   assessmentId: string,
   userId?: string
 ): Promise<PolicyMapping[]> {
-  return apiRequest<PolicyMapping[]>(
+  return apiRequestAllPages<PolicyMapping>(
     `/mappings/assessments/${assessmentId}/policies`,
     { userId }
   );
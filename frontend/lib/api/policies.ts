@@ -1,4 +1,4 @@
-import { uploadFile, apiRequest } from './client';
+import { uploadFile, apiRequest, apiRequestAllPages } from './client';
 import { Policy, PolicyUploadResponse } from '../types';
 
 export async function uploadPolicy(
@@ -24,7 +24,7 @@ export async function listPolicies(
   assessmentId: string,
   userId?: string
 ): Promise<Policy[]> {
-  return apiRequest<Policy[]>(`/assessments/${assessmentId}/policies`, { userId });
+  return apiRequestAllPages<Policy>(`/assessments/${assessmentId}/policies`, { userId });
 }
 
 export async function getPolicy(policyId: string, userId?: string): Promise<Policy> {
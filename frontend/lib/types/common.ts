@@ -4,3 +4,9 @@ export interface PaginatedResponse<T> {
   items: T[];
   total: number;
 }
+
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+  total_estimate?: number | null;
+}
@@ -26,6 +26,7 @@ export interface Deviation {
 
 export interface DeviationListResponse {
   items: Deviation[];
+  next_cursor: string | null;
   total: number;
   by_severity: Record<string, number>;
   by_status: Record<string, number>;